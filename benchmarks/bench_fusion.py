@@ -0,0 +1,83 @@
+"""
+검색 결과 융합 마이크로벤치마크 (DB 불필요)
+
+합성 검색 결과 10k 개에 대해 기존 방식(키워드 매칭 개수 가산 + 람다 정렬 2회)과
+services/fusion.py 의 numpy 융합(weighted / rrf)을 비교합니다.
+
+실행: python benchmarks/bench_fusion.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.models import SearchResult  # noqa: E402
+from services.fusion import fuse, fuse_scores  # noqa: E402
+
+RESULTS = 10_000
+REPEAT = 20
+
+
+def _synthetic(count: int):
+    rng = np.random.default_rng(0)
+    vector = rng.uniform(-0.1, 0.95, count)
+    keyword = np.where(rng.random(count) < 0.3, rng.random(count), np.nan)
+    matches = rng.integers(0, 5, count)
+    return vector, keyword, matches
+
+
+def _results(vector, keyword):
+    return [
+        SearchResult(chunk_id=i, document_id=1, chunk_text="", similarity=float(v),
+                     vector_similarity=float(v), keyword_score=None if np.isnan(k) else float(k))
+        for i, (v, k) in enumerate(zip(vector, keyword))
+    ]
+
+
+def _legacy_rank(results, matches):
+    # 기존 PostgresRAGService._rank_results 의 가산/정렬 부분 (부분 문자열 매칭 비용 제외)
+    for result, keyword_matches in zip(results, matches):
+        result.keyword_matches = keyword_matches
+        if keyword_matches > 0:
+            result.similarity += min(0.6, keyword_matches * 0.15)
+    keyword_matched = [r for r in results if hasattr(r, 'keyword_matches') and r.keyword_matches > 0]
+    others = [r for r in results if not hasattr(r, 'keyword_matches') or r.keyword_matches == 0]
+    keyword_matched.sort(key=lambda x: (-x.keyword_matches, -x.similarity))
+    others.sort(key=lambda x: x.similarity, reverse=True)
+    return keyword_matched + others
+
+
+def _timed_ms(func) -> float:
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        func()
+    return (time.perf_counter() - started) / REPEAT * 1000
+
+
+def bench():
+    vector, keyword, matches = _synthetic(RESULTS)
+    matches = matches.tolist()
+
+    legacy_ms = _timed_ms(lambda: _legacy_rank(_results(vector, keyword), matches))
+    build_ms = _timed_ms(lambda: _results(vector, keyword))
+    print(f"[{RESULTS:,}개 융합] 기존 가산+정렬 (객체 생성 포함): {legacy_ms:.2f}ms, 객체 생성만: {build_ms:.2f}ms")
+
+    for strategy in ("weighted", "rrf"):
+        arrays_ms = _timed_ms(lambda: fuse_scores(vector, keyword, strategy))
+        objects_ms = _timed_ms(lambda: fuse(_results(vector, keyword), strategy))
+        print(f"  {strategy:8s} 배열 융합: {arrays_ms:.2f}ms, SearchResult 융합 (객체 생성 포함): {objects_ms:.2f}ms")
+
+
+def check_calibration():
+    vector, keyword, _ = _synthetic(RESULTS)
+    for strategy in ("weighted", "rrf"):
+        _, calibrated = fuse_scores(vector, keyword, strategy)
+        assert calibrated.min() >= 0.0 and calibrated.max() <= 1.0, f"{strategy}: 보정 점수 범위 벗어남"
+
+
+if __name__ == "__main__":
+    check_calibration()
+    bench()
@@ -0,0 +1,178 @@
+"""
+검색/적재 핫패스 마이크로벤치마크 스위트 (DB/네트워크 불필요)
+
+- 청킹: PostgresRAGService._split_into_chunks, ChunkService._split_text_into_chunks
+- 키워드 추출/조사 제거: query_terms, tokenize, strip_particle
+- 결과 병합/정렬: fuse (하이브리드 검색 결과 크기 / 1k)
+- 관련성 검증: RelevanceService / EnglishRelevanceService.check_relevance
+- 결과 행 디코딩: ChunkService._row_to_search_result
+- 임베딩 encode: 배치 1/8/64 (모델을 불러올 수 없으면 건너뜀)
+
+측정 결과를 benchmarks/baselines.json 과 비교해 허용치(기본 25%, BENCHMARK_TOLERANCE)
+이상 느려진 항목이 있으면 종료 코드 1 로 끝납니다. 기준선은 장비에 따라 다르므로
+성능 변경 전후를 같은 장비에서 비교하고, 의도한 변경이면 --save 로 갱신합니다.
+
+실행:
+  python benchmarks/bench_hot_paths.py                 # 기준선과 비교
+  python benchmarks/bench_hot_paths.py --save          # 기준선 저장/갱신
+  python benchmarks/bench_hot_paths.py -k chunking --tolerance 0.1
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import (  # noqa: E402
+    DEFAULT_TOLERANCE, compare, load_baselines, measure, save_baselines
+)
+from database.document_service import ChunkService  # noqa: E402
+from database.models import SearchResult  # noqa: E402
+from services.english_relevance_service import EnglishRelevanceService  # noqa: E402
+from services.fusion import fuse  # noqa: E402
+from services.postgres_rag_service import PostgresRAGService  # noqa: E402
+from services.relevance_service import RelevanceService  # noqa: E402
+from utils.korean_tokenizer import query_terms, strip_particle, tokenize  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+PARAGRAPH = (
+    "호작도는 까치와 호랑이를 함께 그린 조선 후기 민화입니다. 까치는 기쁜 소식을, "
+    "호랑이는 나쁜 기운을 막는 힘을 상징합니다.\n"
+    "The magpie and tiger painting was hung at the new year to bring good luck. "
+    "국립중앙박물관 호랑이 전시에서는 맹호도, 용호도, 산신도를 함께 볼 수 있습니다. "
+)
+DOCUMENT = PARAGRAPH * 250  # 약 6만 자 (PDF 수십 쪽 분량)
+CHUNK = DOCUMENT[:1200]
+
+KOREAN_QUESTIONS = [
+    "호작도에 그려진 까치는 무슨 의미인가요?",
+    "이 그림을 그린 화가는 누구야",
+    "오늘 날씨 어때요?",
+    "맹호도랑 용호도는 어떻게 달라?",
+    "국립중앙박물관 호랑이 전시 티켓은 어디서 사?",
+]
+ENGLISH_QUESTIONS = [
+    "what is the meaning of the magpie in minhwa",
+    "how is the weather today",
+    "tell me about joseon dynasty tiger paintings",
+    "where can i find a good place to eat nearby",
+]
+WORDS = tokenize(DOCUMENT[:3000])
+EMBEDDING_BATCH_SIZES = (1, 8, 64)
+
+
+def _search_results(count: int) -> List[SearchResult]:
+    rng = np.random.default_rng(0)
+    results = []
+    for i in range(count):
+        keyword = float(rng.random()) if rng.random() < 0.3 else None
+        vector = float(rng.uniform(-0.1, 0.95))
+        results.append(SearchResult(
+            chunk_id=i, document_id=i % 7, chunk_text=CHUNK[:200], similarity=vector,
+            vector_similarity=vector, keyword_score=keyword,
+        ))
+    return results
+
+
+def _rows(count: int, json_metadata: bool) -> List[Dict[str, Any]]:
+    metadata = {"chunk_size": 1200, "page": 3}
+    return [{
+        "chunk_id": i, "document_id": 1, "chunk_text": CHUNK,
+        "similarity": 0.8, "vector_similarity": 0.8, "keyword_score": 0.5 if i % 2 else None,
+        "metadata": json.dumps(metadata) if json_metadata else metadata,
+        "tokens": sorted(set(tokenize(CHUNK))), "document_title": "호랑이 전시 안내",
+        "source_url": "https://example.org/tiger",
+    } for i in range(count)]
+
+
+def _embedding_benchmarks(name_filter: str = "") -> List[Tuple[str, Callable[[], Any]]]:
+    """실제 임베딩 모델 encode (필터에 걸리는 항목이 없거나 모델을 불러올 수 없으면 빈 목록)"""
+    batch_sizes = [size for size in EMBEDDING_BATCH_SIZES if name_filter in f"embedding.encode_batch_{size}"]
+    if not batch_sizes:
+        return []
+    try:
+        from services.model_registry import get_embedding_model
+        model = get_embedding_model()
+    except Exception as e:
+        print(f"[건너뜀] 임베딩 encode 벤치마크 - 모델 로드 실패: {e}")
+        return []
+    benchmarks = []
+    for batch_size in batch_sizes:
+        texts = [f"{KOREAN_QUESTIONS[i % len(KOREAN_QUESTIONS)]} {i}" for i in range(batch_size)]
+        benchmarks.append((
+            f"embedding.encode_batch_{batch_size}",
+            lambda texts=texts: model.encode(texts, batch_size=64, show_progress_bar=False),
+        ))
+    return benchmarks
+
+
+def hot_paths(name_filter: str = "") -> List[Tuple[str, Callable[[], Any]]]:
+    """(이름, 호출 1회) 목록 - 이름에 name_filter 가 들어간 항목만"""
+    rag_service = PostgresRAGService.__new__(PostgresRAGService)
+    chunk_service = ChunkService()
+    korean = RelevanceService()
+    english = EnglishRelevanceService()
+    hybrid_results = _search_results(15)
+    large_results = _search_results(1000)
+    dict_rows = _rows(10, json_metadata=False)
+    json_rows = _rows(10, json_metadata=True)
+
+    benchmarks = [
+        ("chunking.rag_service_split", lambda: rag_service._split_into_chunks(DOCUMENT)),
+        ("chunking.chunk_service_split", lambda: chunk_service._split_text_into_chunks(DOCUMENT, 500, 50)),
+        ("keywords.query_terms", lambda: [query_terms(q) for q in KOREAN_QUESTIONS]),
+        ("keywords.tokenize_chunk", lambda: tokenize(CHUNK)),
+        ("keywords.strip_particle", lambda: [strip_particle(word) for word in WORDS]),
+        ("merge.fuse_hybrid_15", lambda: fuse(hybrid_results)),
+        ("merge.fuse_1k", lambda: fuse(large_results, limit=20)),
+        ("relevance.korean", lambda: [korean.check_relevance(q) for q in KOREAN_QUESTIONS]),
+        ("relevance.english", lambda: [english.check_relevance(q) for q in ENGLISH_QUESTIONS]),
+        ("decode.rows_dict_metadata_10", lambda: [ChunkService._row_to_search_result(r) for r in dict_rows]),
+        ("decode.rows_json_metadata_10", lambda: [ChunkService._row_to_search_result(r) for r in json_rows]),
+    ]
+    return [(name, func) for name, func in benchmarks if name_filter in name] + _embedding_benchmarks(name_filter)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="검색/적재 핫패스 마이크로벤치마크")
+    parser.add_argument("--save", action="store_true", help="측정 결과를 기준선으로 저장")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="기준선 JSON 경로")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="허용 회귀 비율 (기본 BENCHMARK_TOLERANCE 또는 0.25)")
+    parser.add_argument("-k", "--filter", default="", help="이름에 이 문자열이 들어간 벤치마크만 실행")
+    parser.add_argument("--rounds", type=int, default=7, help="측정 라운드 수")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    benchmarks = hot_paths(args.filter)
+    measurements = [measure(name, func, rounds=args.rounds) for name, func in benchmarks]
+    baselines = load_baselines(args.baseline)
+
+    print(f"{'벤치마크':<32} {'기준선(us)':>12} {'현재(us)':>12} {'비율':>7}")
+    regressions = []
+    for comparison in compare(measurements, baselines, args.tolerance):
+        baseline = f"{comparison.baseline_us:.2f}" if comparison.baseline_us else "-"
+        ratio = f"{comparison.ratio:.2f}x" if comparison.ratio else "-"
+        flag = "  <-- 회귀" if comparison.regressed else ""
+        print(f"{comparison.name:<32} {baseline:>12} {comparison.current_us:>12.2f} {ratio:>7}{flag}")
+        if comparison.regressed:
+            regressions.append(comparison)
+
+    if args.save:
+        save_baselines(args.baseline, measurements, baselines)
+        print(f"기준선 저장: {args.baseline}")
+        return 0
+    if regressions:
+        print(f"회귀 {len(regressions)}건 (허용치 {args.tolerance:.0%} 초과)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+키워드 매칭 마이크로벤치마크 (DB/모델 불필요)
+
+관련성 검증의 기존 루프(키워드마다 `in`, 키워드 × 조사 f-string 조합)와
+utils/keyword_matcher.py 의 Aho-Corasick 단일 스캔을 비교합니다.
+한국어는 조사 조합 루프가 사라져 빨라지고, 짧은 영어 질문은 C 로 구현된 `in` 이
+워낙 빨라 수 us 느려집니다 (요청 전체 지연 대비 무시 가능한 수준).
+
+긴 컨텍스트(검색 청크 전체)에서 질문 키워드 몇 개를 찾는 경우도 함께 측정합니다.
+패턴이 적고 텍스트가 길면 C 로 구현된 `in` 이 순수 파이썬 오토마톤보다 빠르므로
+그 경로는 매처로 바꾸지 않았습니다.
+
+실행: python benchmarks/bench_keyword_matcher.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.english_relevance_service import EnglishRelevanceService  # noqa: E402
+from services.relevance_service import (  # noqa: E402
+    IRRELEVANT_KEYWORDS, QUESTION_WORDS, RELEVANT_KEYWORDS, RelevanceService
+)
+from utils.keyword_matcher import KeywordMatcher  # noqa: E402
+
+REPEAT = 20_000
+PARTICLES = ['가', '는', '은', '을', '를', '의', '에', '에서', '로', '으로', '와', '과', '도', '만']
+
+KOREAN_MESSAGES = [
+    "오늘 날씨 어때요?",
+    "호작도에 그려진 까치는 무슨 의미인가요?",
+    "이 그림을 그린 화가는 누구야",
+    "주식 추천해줘",
+    "아무 관련없는 질문입니다 정말로 아무것도 없어요",
+]
+ENGLISH_MESSAGES = [
+    "what is the meaning of the magpie in minhwa",
+    "how is the weather today",
+    "tell me about joseon dynasty tiger paintings",
+    "where can i find a good place to eat nearby",
+]
+
+
+def _legacy_korean(user_message: str) -> bool:
+    # 기존 RelevanceService.check_relevance 의 매칭 루프
+    text = user_message.lower()
+    for keyword in IRRELEVANT_KEYWORDS:
+        if keyword in text:
+            return False
+    for keyword in RELEVANT_KEYWORDS:
+        if keyword in text:
+            return True
+    for keyword in RELEVANT_KEYWORDS:
+        if len(keyword) >= 3:
+            for particle in PARTICLES:
+                if f"{keyword}{particle}" in text:
+                    return True
+    return False
+
+
+def _legacy_english(service: EnglishRelevanceService, query: str) -> bool:
+    text = query.lower().strip()
+    for keyword in service.irrelevant_keywords:
+        if keyword in text:
+            return False
+    for keyword in service.relevant_keywords:
+        if keyword in text:
+            return True
+    any(indicator in text for indicator in service.exhibition_indicators)  # 질문어 유무는 로그용
+    return False
+
+
+def _timed_us(func, messages) -> float:
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        for message in messages:
+            func(message)
+    return (time.perf_counter() - started) / (REPEAT * len(messages)) * 1e6
+
+
+def bench_relevance():
+    korean = RelevanceService()
+    legacy_us = _timed_us(_legacy_korean, KOREAN_MESSAGES)
+    matcher_us = _timed_us(korean.check_relevance, KOREAN_MESSAGES)
+    print(f"[한국어 관련성 검증] 기존 루프: {legacy_us:.2f}us -> 매처: {matcher_us:.2f}us (질문 1건)")
+
+    english = EnglishRelevanceService()
+    legacy_us = _timed_us(lambda q: _legacy_english(english, q), ENGLISH_MESSAGES)
+    matcher_us = _timed_us(english.check_relevance, ENGLISH_MESSAGES)
+    print(f"[영어 관련성 검증] 기존 루프: {legacy_us:.2f}us -> 매처: {matcher_us:.2f}us (질문 1건)")
+
+
+def bench_context():
+    keywords = ["호작도", "까치", "의미"]
+    context = ("호작도는 까치와 호랑이를 함께 그린 조선 후기 민화입니다. " * 25 + "\n") * 10
+    repeat = 200
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        lowered = context.lower()
+        [keyword for keyword in keywords if keyword.lower() in lowered]
+    in_us = (time.perf_counter() - started) / repeat * 1e6
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        KeywordMatcher({"question": keywords}).scan(context)
+    matcher_us = (time.perf_counter() - started) / repeat * 1e6
+    print(f"[컨텍스트 {len(context):,}자, 키워드 {len(keywords)}개] `in` 반복: {in_us:.0f}us, 매처: {matcher_us:.0f}us")
+
+
+def check_parity():
+    korean = RelevanceService()
+    for message in KOREAN_MESSAGES:
+        assert korean.check_relevance(message) == _legacy_korean(message), message
+    english = EnglishRelevanceService()
+    for query in ENGLISH_MESSAGES:
+        assert english.check_relevance(query) == _legacy_english(english, query), query
+
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.INFO)
+    check_parity()
+    bench_relevance()
+    bench_context()
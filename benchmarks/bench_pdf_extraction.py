@@ -0,0 +1,139 @@
+"""
+PDF 텍스트 추출 처리량 벤치마크 (합성 PDF, DB/모델 불필요)
+
+한국어/영어가 섞인 합성 PDF(기본 500쪽)를 만들어 다음을 비교합니다.
+- pypdf2_concat: 이전 관리자 업로드 방식 (PyPDF2 + 문자열 += 누적, PyPDF2 가 없으면 건너뜀)
+- pymupdf_inline: utils/pdf_extractor, 현재 프로세스에서 순차 추출
+- pymupdf_pool_N: utils/pdf_extractor, 작업 프로세스 N 개에 페이지 범위 분배
+
+각 방식마다 전체 시간, 초당 페이지 수, 첫 페이지가 나오기까지 걸린 시간(청크 분할이 시작되는 시점)을
+보고합니다. 프로세스 풀 생성 비용은 서버에서 한 번만 들기 때문에 측정 전에 한 번 데워 둡니다.
+병렬 효과는 코어 수에 비례하므로 결과에 CPU 수를 함께 기록합니다.
+
+실행:
+  python benchmarks/bench_pdf_extraction.py
+  python benchmarks/bench_pdf_extraction.py --pages 1000 --workers 1,2,4,8 --output pdf_bench.json
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+import fitz  # PyMuPDF
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.app_config import PDF_PAGES_PER_TASK  # noqa: E402
+from utils.pdf_extractor import iter_pdf_pages, shutdown_pdf_pool  # noqa: E402
+
+LINES = [
+    "호작도는 까치와 호랑이를 함께 그린 조선 후기 민화입니다.",
+    "까치는 기쁜 소식을, 호랑이는 나쁜 기운을 막는 힘을 상징합니다.",
+    "The magpie and tiger painting was hung at the new year to bring good luck.",
+    "국립중앙박물관 호랑이 전시에서는 맹호도, 용호도, 산신도를 함께 볼 수 있습니다.",
+]
+LINES_PER_PAGE = 40
+
+
+def make_synthetic_pdf(pages: int) -> bytes:
+    """페이지마다 약 40줄(2천 자 안팎)의 텍스트가 있는 PDF"""
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        text = "\n".join(f"{number + 1}-{line_no} {LINES[(number + line_no) % len(LINES)]}"
+                         for line_no in range(LINES_PER_PAGE))
+        page.insert_textbox(page.rect + (36, 36, -36, -36), text, fontname="korea", fontsize=8)
+    content = doc.tobytes()
+    doc.close()
+    return content
+
+
+def pypdf2_pages(content: bytes) -> Iterator[str]:
+    import PyPDF2
+    reader = PyPDF2.PdfReader(io.BytesIO(content))
+    for page in reader.pages:
+        yield page.extract_text()
+
+
+def run_legacy(content: bytes) -> Dict[str, float]:
+    """이전 방식 그대로: 모든 페이지를 추출해 += 로 이어 붙인 뒤에야 청크 분할 시작"""
+    started = time.perf_counter()
+    text_content = ""
+    for page_text in pypdf2_pages(content):
+        text_content += page_text + "\n"
+    elapsed = time.perf_counter() - started
+    return {"seconds": elapsed, "first_page_seconds": elapsed, "chars": len(text_content)}
+
+
+def run_engine(content: bytes, workers: int) -> Dict[str, float]:
+    started = time.perf_counter()
+    first_page: Optional[float] = None
+    chars = 0
+    for page in iter_pdf_pages(content, workers=workers, parallel_min_pages=0 if workers > 1 else 10 ** 9):
+        if first_page is None:
+            first_page = time.perf_counter() - started
+        chars += len(page.text)
+    return {"seconds": time.perf_counter() - started, "first_page_seconds": first_page or 0.0, "chars": chars}
+
+
+def measure(name: str, func: Callable[[], Dict[str, float]], pages: int, rounds: int) -> Dict[str, float]:
+    func()  # 워밍업 (프로세스 풀 생성, 폰트/모듈 로드)
+    runs = [func() for _ in range(rounds)]
+    seconds = statistics.median(run["seconds"] for run in runs)
+    return {
+        "name": name,
+        "seconds": round(seconds, 4),
+        "pages_per_second": round(pages / seconds, 1),
+        "first_page_ms": round(statistics.median(run["first_page_seconds"] for run in runs) * 1000, 1),
+        "chars": int(runs[-1]["chars"]),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="PDF 텍스트 추출 처리량 벤치마크")
+    parser.add_argument("--pages", type=int, default=500, help="합성 PDF 페이지 수")
+    parser.add_argument("--workers", default=f"2,{max(2, os.cpu_count() or 1)}",
+                        help="비교할 프로세스 풀 크기 (쉼표 구분)")
+    parser.add_argument("--rounds", type=int, default=3, help="방식별 반복 횟수 (중앙값 보고)")
+    parser.add_argument("--skip-legacy", action="store_true", help="PyPDF2 비교 생략")
+    parser.add_argument("--output", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args(argv)
+
+    content = make_synthetic_pdf(args.pages)
+    print(f"합성 PDF {args.pages}쪽 ({len(content) / 1024 / 1024:.1f} MiB), CPU {os.cpu_count()}개, "
+          f"작업당 {PDF_PAGES_PER_TASK}쪽")
+
+    results: List[Dict[str, float]] = []
+    if not args.skip_legacy:
+        try:
+            import PyPDF2  # noqa: F401
+            results.append(measure("pypdf2_concat", lambda: run_legacy(content), args.pages, args.rounds))
+        except ImportError:
+            print("PyPDF2 가 없어 이전 방식 비교를 건너뜁니다.")
+    results.append(measure("pymupdf_inline", lambda: run_engine(content, 1), args.pages, args.rounds))
+    try:
+        for workers in sorted({int(w) for w in args.workers.split(",") if int(w) > 1}):
+            results.append(measure(f"pymupdf_pool_{workers}", lambda: run_engine(content, workers),
+                                   args.pages, args.rounds))
+    finally:
+        shutdown_pdf_pool()
+
+    print(f"{'방식':<20} {'시간(s)':>9} {'페이지/s':>10} {'첫 페이지(ms)':>14} {'글자 수':>10}")
+    for result in results:
+        print(f"{result['name']:<20} {result['seconds']:>9.3f} {result['pages_per_second']:>10.1f} "
+              f"{result['first_page_ms']:>14.1f} {result['chars']:>10}")
+
+    if args.output:
+        with open(args.output, "w", encoding='utf-8') as f:
+            json.dump({"pages": args.pages, "cpu_count": os.cpu_count(), "results": results},
+                      f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+벡터 전송 마이크로벤치마크 (DB 불필요)
+
+기존 경로(.tolist() -> psycopg2 ARRAY[...] 리터럴)와 numpy 어댑터
+('[...]'::vector 리터럴)의 직렬화 CPU 시간과 전송 바이트를 비교합니다.
+
+- 쿼리 1건: 하이브리드 검색은 예전에는 벡터를 2번, 지금은 query_vector CTE 로 1번 전송
+- 10k 청크 적재: INSERT 파라미터 직렬화 + 조회 결과 파싱
+
+실행: python benchmarks/bench_vector_transport.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+from psycopg2.extensions import adapt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.vector_adapter import Vector, parse_vector, to_vector_literal  # noqa: E402
+
+DIMENSION = 384
+INGEST_CHUNKS = 10_000
+QUERY_REPEAT = 2_000
+
+
+def _vectors(count: int) -> np.ndarray:
+    vectors = np.random.default_rng(0).standard_normal((count, DIMENSION)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _legacy_quote(vector: np.ndarray) -> bytes:
+    return adapt(vector.tolist()).getquoted()
+
+
+def _numpy_quote(vector: np.ndarray) -> bytes:
+    return adapt(Vector(vector)).getquoted()
+
+
+def _timed(func, items) -> tuple:
+    started = time.perf_counter()
+    total_bytes = sum(len(func(item)) for item in items)
+    return time.perf_counter() - started, total_bytes
+
+
+def bench_query():
+    vectors = _vectors(QUERY_REPEAT)
+    legacy_seconds, legacy_bytes = _timed(_legacy_quote, vectors)
+    numpy_seconds, numpy_bytes = _timed(_numpy_quote, vectors)
+
+    # 하이브리드 검색: 예전 쿼리는 벡터 리터럴 2회, 현재는 1회
+    legacy_us = legacy_seconds / QUERY_REPEAT * 2 * 1e6
+    numpy_us = numpy_seconds / QUERY_REPEAT * 1e6
+    legacy_kb = legacy_bytes / QUERY_REPEAT * 2 / 1024
+    numpy_kb = numpy_bytes / QUERY_REPEAT / 1024
+
+    print(f"[쿼리 1건] 직렬화 CPU: {legacy_us:.0f}us -> {numpy_us:.0f}us "
+          f"({legacy_us - numpy_us:.0f}us 절감), 전송: {legacy_kb:.1f}KB -> {numpy_kb:.1f}KB")
+
+
+def bench_ingest():
+    vectors = _vectors(INGEST_CHUNKS)
+    legacy_seconds, legacy_bytes = _timed(_legacy_quote, vectors)
+    numpy_seconds, numpy_bytes = _timed(_numpy_quote, vectors)
+
+    # 조회 결과 파싱: 예전에는 문자열 그대로 받았으므로 numpy 변환 비용이 추가로 들었음
+    outputs = [to_vector_literal(vector) for vector in vectors]
+    started = time.perf_counter()
+    for text in outputs:
+        parse_vector(text)
+    parse_seconds = time.perf_counter() - started
+
+    print(f"[{INGEST_CHUNKS:,}청크 적재] 직렬화 CPU: {legacy_seconds:.2f}s -> {numpy_seconds:.2f}s, "
+          f"전송: {legacy_bytes / 1024 / 1024:.1f}MB -> {numpy_bytes / 1024 / 1024:.1f}MB")
+    print(f"[{INGEST_CHUNKS:,}청크 조회] vector -> numpy 파싱: {parse_seconds:.2f}s")
+
+
+def check_roundtrip():
+    vector = _vectors(1)[0]
+    restored = parse_vector(to_vector_literal(vector))
+    assert np.array_equal(vector, restored), "float32 왕복 변환 손실"
+
+
+if __name__ == "__main__":
+    check_roundtrip()
+    bench_query()
+    bench_ingest()
@@ -0,0 +1,115 @@
+"""
+마이크로벤치마크 하네스 (pytest-benchmark 와 같은 방식, 외부 의존성 없음)
+
+- 측정: 한 라운드가 min_round_seconds 이상 되도록 반복 횟수를 맞춘 뒤
+  rounds 번 측정해 호출 1회당 중앙값/최솟값을 기록
+- 기준선: JSON 파일에 벤치마크별 중앙값(us) 저장
+- 회귀 판정: 현재 중앙값 > 기준선 × (1 + 허용치) 이면 실패
+  (기준선 항목에 tolerance 가 있으면 그 값을 우선 사용)
+"""
+import json
+import os
+import platform
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_TOLERANCE = float(os.getenv('BENCHMARK_TOLERANCE', '0.25'))
+
+
+@dataclass
+class Measurement:
+    """벤치마크 하나의 측정 결과 (호출 1회당 us)"""
+    name: str
+    median_us: float
+    min_us: float
+    loops: int
+    rounds: int
+
+
+@dataclass
+class Comparison:
+    """기준선 대비 비교 결과"""
+    name: str
+    baseline_us: Optional[float]
+    current_us: float
+    tolerance: float
+
+    @property
+    def ratio(self) -> Optional[float]:
+        return self.current_us / self.baseline_us if self.baseline_us else None
+
+    @property
+    def regressed(self) -> bool:
+        return self.ratio is not None and self.ratio > 1 + self.tolerance
+
+
+def measure(name: str, func: Callable[[], Any], rounds: int = 7,
+            min_round_seconds: float = 0.05) -> Measurement:
+    """func() 호출 1회당 시간 측정 (워밍업 1회 후 반복 횟수 자동 보정)"""
+    func()
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_round_seconds or loops >= 1_000_000:
+            break
+        # 목표 시간에 맞게 반복 횟수 추정 (한 번에 최대 10배)
+        loops = min(loops * 10, max(loops + 1, int(loops * min_round_seconds / max(elapsed, 1e-9) * 1.2)))
+
+    samples = [elapsed / loops]
+    for _ in range(rounds - 1):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - started) / loops)
+    return Measurement(name, statistics.median(samples) * 1e6, min(samples) * 1e6, loops, rounds)
+
+
+def load_baselines(path: str) -> Dict[str, Dict[str, Any]]:
+    """기준선 JSON 로드 (파일이 없으면 빈 dict)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f).get("benchmarks", {})
+
+
+def save_baselines(path: str, measurements: List[Measurement],
+                   previous: Optional[Dict[str, Dict[str, Any]]] = None):
+    """측정 결과를 기준선으로 저장 (기존 항목의 tolerance 와 이번에 측정하지 않은 항목은 유지)"""
+    benchmarks = dict(previous or {})
+    for measurement in measurements:
+        entry = asdict(measurement)
+        del entry["name"]
+        entry = {key: round(value, 3) if isinstance(value, float) else value for key, value in entry.items()}
+        if "tolerance" in benchmarks.get(measurement.name, {}):
+            entry["tolerance"] = benchmarks[measurement.name]["tolerance"]
+        benchmarks[measurement.name] = entry
+    payload = {
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "processor": platform.processor() or platform.machine()},
+        "benchmarks": dict(sorted(benchmarks.items())),
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def compare(measurements: List[Measurement], baselines: Dict[str, Dict[str, Any]],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[Comparison]:
+    """기준선과 비교 (기준선이 없는 벤치마크는 baseline_us=None 으로 회귀 판정 제외)"""
+    comparisons = []
+    for measurement in measurements:
+        baseline = baselines.get(measurement.name, {})
+        comparisons.append(Comparison(
+            name=measurement.name,
+            baseline_us=baseline.get("median_us"),
+            current_us=measurement.median_us,
+            tolerance=baseline.get("tolerance", tolerance),
+        ))
+    return comparisons
@@ -0,0 +1,273 @@
+"""
+검색 품질 대 지연 평가 하네스 (골든 질문 세트 재생)
+
+버전이 붙은 골든 질문 세트(benchmarks/golden/*.json)를 설정별로 검색 단계
+(하이브리드 검색 → 점수 융합 → 선택적 cross-encoder 재정렬)에 통과시키고
+recall@k, MRR, 답변 비율, 검색 지연 p50/p95 를 보고합니다.
+인덱스(ef_search/probes)나 융합 방식을 바꿀 때 속도/품질 변화를 함께 측정하기 위한 도구입니다.
+
+- recall@k: expected_chunk_ids 가 있으면 상위 k 개에 들어온 정답 청크 비율,
+  문서/문구로 지정한 질문은 상위 k 개에 정답 청크가 하나라도 있으면 1 (hit rate)
+- MRR: 첫 정답 청크 순위의 역수 평균 (융합 후 limit 개 안에 없으면 0)
+- 답변 비율: 1위 보정 점수가 score_threshold 이상인 질문 비율 ("모르겠다" 응답이 아닌 비율)
+- 거절 비율: 답이 없는 질문(answerable=false, 전시와 무관한 질문 등) 중 1위 보정 점수가 임계값 미만인 비율
+- 권장 임계값: 1위가 정답인 질문은 답하고 답이 없는 질문은 거절하는 비율(balanced accuracy)이 가장 높은
+  임계값 구간의 가운데 값. FUSION_SCORE_THRESHOLD 는 이 값으로 정함 (--calibrate 로 확인)
+- 지연: 질문당 검색 단계 시간 (쿼리 임베딩은 설정과 무관하므로 한 번만 계산하고 제외)
+
+실제 임베딩 모델과 PostgreSQL(또는 VECTOR_SEARCH_BACKEND=memory 미러)이 필요합니다.
+운영 DB 대신 평가용 DB 를 POSTGRES_* 환경변수로 지정해 실행하세요.
+
+실행:
+  python benchmarks/retrieval_eval.py                                # 기본 설정 묶음
+  python benchmarks/retrieval_eval.py --configs my_configs.json --repeat 5 --output eval.json
+  python benchmarks/retrieval_eval.py --calibrate                    # 기본 설정의 권장 임계값만 출력
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.app_config import FUSION_SCORE_THRESHOLD, FUSION_VECTOR_WEIGHT  # noqa: E402
+from database.models import SearchResult, VectorSearchParams  # noqa: E402
+from services.fusion import fuse  # noqa: E402
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "retrieval_v2.json")
+DEFAULT_KS = (1, 3, 5)
+THRESHOLD_STEP = 0.01
+
+
+@dataclass
+class GoldenQuestion:
+    """골든 질문 하나와 정답 청크 판별 기준"""
+    id: str
+    question: str
+    language: str = "ko"
+    expected_chunk_ids: List[int] = field(default_factory=list)
+    expected_documents: List[str] = field(default_factory=list)
+    expected_text: List[str] = field(default_factory=list)
+    answerable: bool = True  # False 면 "모르겠다" 로 답해야 하는 질문 (정답 기준 없음)
+
+    def is_relevant(self, result: SearchResult) -> bool:
+        if result.chunk_id in self.expected_chunk_ids:
+            return True
+        if result.document_title and result.document_title in self.expected_documents:
+            return True
+        text = result.chunk_text.lower()
+        return any(anchor.lower() in text for anchor in self.expected_text)
+
+
+@dataclass
+class EvalConfig:
+    """평가할 검색 설정 하나"""
+    name: str
+    vector_count: int = 5
+    keyword_count: int = 5
+    limit: int = 5
+    strategy: str = "weighted"
+    vector_weight: float = FUSION_VECTOR_WEIGHT
+    ef_search: Optional[int] = None
+    probes: Optional[int] = None
+    rerank: bool = False
+    score_threshold: float = FUSION_SCORE_THRESHOLD
+
+
+# 운영 기본값(한국어 5/5, 영어 10/10) 과 자주 바꾸는 축을 하나씩 바꾼 설정들
+DEFAULT_CONFIGS = [
+    EvalConfig("default"),
+    EvalConfig("wide_10", vector_count=10, keyword_count=10),
+    EvalConfig("vector_only_weight", vector_weight=1.0),
+    EvalConfig("rrf", strategy="rrf"),
+    EvalConfig("index_ef100_probes10", ef_search=100, probes=10),
+    EvalConfig("rerank", vector_count=10, keyword_count=10, limit=10, rerank=True),
+]
+
+
+def load_golden_set(path: str = GOLDEN_PATH) -> Dict[str, Any]:
+    """골든 세트 로드 ({"version", "questions": [GoldenQuestion]})"""
+    with open(path, encoding='utf-8') as f:
+        payload = json.load(f)
+    questions = [GoldenQuestion(**question) for question in payload["questions"]]
+    for question in questions:
+        has_expected = bool(question.expected_chunk_ids or question.expected_documents or question.expected_text)
+        if question.answerable and not has_expected:
+            raise ValueError(f"정답 기준이 없는 골든 질문입니다: {question.id}")
+        if not question.answerable and has_expected:
+            raise ValueError(f"답이 없는 질문에 정답 기준이 있습니다: {question.id}")
+    return {"version": payload["version"], "questions": questions}
+
+
+def load_configs(path: str) -> List[EvalConfig]:
+    """설정 JSON (EvalConfig 필드를 가진 객체 목록) 로드"""
+    with open(path, encoding='utf-8') as f:
+        return [EvalConfig(**config) for config in json.load(f)]
+
+
+def recall_at_k(question: GoldenQuestion, results: Sequence[SearchResult], k: int) -> float:
+    top = results[:k]
+    if question.expected_chunk_ids:
+        found = {result.chunk_id for result in top} & set(question.expected_chunk_ids)
+        return len(found) / len(set(question.expected_chunk_ids))
+    return 1.0 if any(question.is_relevant(result) for result in top) else 0.0
+
+
+def reciprocal_rank(question: GoldenQuestion, results: Sequence[SearchResult]) -> float:
+    for rank, result in enumerate(results, start=1):
+        if question.is_relevant(result):
+            return 1.0 / rank
+    return 0.0
+
+
+def calibrate_threshold(answer_scores: Sequence[float], reject_scores: Sequence[float],
+                        step: float = THRESHOLD_STEP) -> Optional[float]:
+    """
+    답해야 하는 질문(answer_scores)과 거절해야 하는 질문(reject_scores)의 1위 보정 점수로 정한 임계값
+
+    balanced accuracy 가 최대인 임계값 구간의 가운데 값을 돌려줍니다 (한쪽이 비어 있으면 None).
+    """
+    if not answer_scores or not reject_scores:
+        return None
+    answer = np.asarray(answer_scores, dtype=np.float64)
+    reject = np.asarray(reject_scores, dtype=np.float64)
+    thresholds = np.round(np.arange(0.0, 1.0 + step / 2, step), 6)
+    accuracy = ((answer[None, :] >= thresholds[:, None]).mean(axis=1)
+                + (reject[None, :] < thresholds[:, None]).mean(axis=1)) / 2
+    best = np.flatnonzero(np.isclose(accuracy, accuracy.max()))
+    # 최고 구간이 여러 개면 첫 구간을 쓰고, 구간 가운데 값을 골라 양쪽 점수에서 최대한 떨어뜨림
+    end = best[0]
+    while end + 1 in best:
+        end += 1
+    return round(float((thresholds[best[0]] + thresholds[end]) / 2), 2)
+
+
+def retrieve(chunk_service, config: EvalConfig, question: str, query_embedding: np.ndarray,
+             reranker=None) -> List[SearchResult]:
+    """운영 경로와 같은 검색 단계 (하이브리드 검색 → 융합 → 선택적 재정렬)"""
+    results = chunk_service.hybrid_search(
+        query_embedding=query_embedding,
+        query=question,
+        vector_count=config.vector_count,
+        keyword_count=config.keyword_count,
+        match_threshold=0.0,
+        search_params=VectorSearchParams(ef_search=config.ef_search, probes=config.probes),
+    )
+    results = fuse(results, config.strategy, config.limit, vector_weight=config.vector_weight)
+    if reranker is not None and results:
+        results = reranker.rerank(question, results)
+    return results
+
+
+def evaluate(config: EvalConfig, questions: List[GoldenQuestion], embeddings: Dict[str, np.ndarray],
+             chunk_service, repeat: int = 3, ks: Sequence[int] = DEFAULT_KS,
+             reranker_factory: Optional[Callable[[EvalConfig], Any]] = None) -> Dict[str, Any]:
+    """설정 하나의 품질/지연 보고서"""
+    reranker = reranker_factory(config) if config.rerank and reranker_factory else None
+    recalls = {k: [] for k in ks}
+    reciprocal_ranks, answered, latencies, misses = [], [], [], []
+    answer_scores, reject_scores, rejected = [], [], []
+
+    for question in questions:
+        results: List[SearchResult] = []
+        for _ in range(repeat):
+            if reranker is not None:
+                reranker.cache.clear()  # 점수 캐시 적중으로 지연이 작게 잡히지 않도록
+            started = time.perf_counter()
+            results = retrieve(chunk_service, config, question.question, embeddings[question.id], reranker)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        top_score = results[0].similarity if results else 0.0
+        if not question.answerable:
+            reject_scores.append(top_score)
+            rejected.append(top_score < config.score_threshold)
+            continue
+        if results and question.is_relevant(results[0]):
+            answer_scores.append(top_score)
+        for k in ks:
+            recalls[k].append(recall_at_k(question, results, k))
+        rank_score = reciprocal_rank(question, results)
+        reciprocal_ranks.append(rank_score)
+        answered.append(bool(results) and results[0].similarity >= config.score_threshold)
+        if rank_score == 0.0:
+            misses.append(question.id)
+
+    return {
+        "config": asdict(config),
+        "questions": len(questions),
+        "unanswerable": len(reject_scores),
+        "recall": {f"@{k}": round(float(np.mean(values)), 4) for k, values in recalls.items()},
+        "mrr": round(float(np.mean(reciprocal_ranks)), 4),
+        "answer_rate": round(float(np.mean(answered)), 4),
+        "reject_rate": round(float(np.mean(rejected)), 4) if rejected else None,
+        "recommended_threshold": calibrate_threshold(answer_scores, reject_scores),
+        "latency_ms": {
+            "p50": round(float(np.percentile(latencies, 50)), 2),
+            "p95": round(float(np.percentile(latencies, 95)), 2),
+        },
+        "misses": misses,
+    }
+
+
+def _rerank_factory(config: EvalConfig):
+    from services.reranker import Reranker
+    # 평가에서는 지연 예산으로 건너뛰지 않고 항상 재정렬
+    return Reranker(enabled=True, top_k=config.limit, budget_ms=float("inf"))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="검색 품질 대 지연 평가")
+    parser.add_argument("--golden", default=GOLDEN_PATH, help="골든 질문 세트 JSON")
+    parser.add_argument("--configs", help="평가할 설정 목록 JSON (기본: DEFAULT_CONFIGS)")
+    parser.add_argument("--language", choices=("ko", "en"), help="이 언어 질문만 평가")
+    parser.add_argument("--repeat", type=int, default=3, help="질문당 반복 횟수 (지연 측정용)")
+    parser.add_argument("--k", default=",".join(map(str, DEFAULT_KS)), help="recall@k 의 k 목록 (쉼표 구분)")
+    parser.add_argument("--output", help="결과를 저장할 JSON 경로")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="기본 설정(default)만 평가해 FUSION_SCORE_THRESHOLD 권장값 출력")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    from database.vector_mirror import get_chunk_service
+    from services.embedding_cache import encode_query
+    from services.model_registry import get_embedding_model
+
+    golden = load_golden_set(args.golden)
+    questions = [q for q in golden["questions"] if not args.language or q.language == args.language]
+    configs = load_configs(args.configs) if args.configs else DEFAULT_CONFIGS
+    if args.calibrate:
+        configs = configs[:1]
+    ks = [int(k) for k in args.k.split(",")]
+
+    model = get_embedding_model()
+    embeddings = {q.id: encode_query(model, q.question) for q in questions}
+    chunk_service = get_chunk_service()
+
+    reports = []
+    print(f"골든 세트 {golden['version']} - 질문 {len(questions)}개, 반복 {args.repeat}회")
+    header = " ".join(f"{'R@' + str(k):>6}" for k in ks)
+    print(f"{'설정':<24} {header} {'MRR':>6} {'답변율':>6} {'거절율':>6} {'권장임계':>8} {'p50(ms)':>8} {'p95(ms)':>8}")
+    for config in configs:
+        report = evaluate(config, questions, embeddings, chunk_service, args.repeat, ks, _rerank_factory)
+        reports.append(report)
+        recall = " ".join(f"{report['recall'][f'@{k}']:>6.3f}" for k in ks)
+        reject_rate = "-" if report["reject_rate"] is None else f"{report['reject_rate']:.2f}"
+        threshold = "-" if report["recommended_threshold"] is None else f"{report['recommended_threshold']:.2f}"
+        print(f"{config.name:<24} {recall} {report['mrr']:>6.3f} {report['answer_rate']:>6.2f} {reject_rate:>6} "
+              f"{threshold:>8} {report['latency_ms']['p50']:>8.2f} {report['latency_ms']['p95']:>8.2f}")
+
+    if args.output:
+        with open(args.output, "w", encoding='utf-8') as f:
+            json.dump({"golden_version": golden["version"], "reports": reports}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,6 +13,15 @@ VECTORSTORE_PATH = "faiss_index"
 EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
 CROSS_ENCODER_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
 
+# 쿼리 임베딩 캐시 설정
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "2048"))   # 최대 항목 수
+EMBEDDING_CACHE_TTL = float(os.getenv("EMBEDDING_CACHE_TTL", "86400"))  # 초
+
+# 응답 캐시 설정
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))    # 최대 항목 수
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))    # 초
+CORPUS_VERSION_TTL = float(os.getenv("CORPUS_VERSION_TTL", "5"))       # 코퍼스 버전 재조회 주기 (초)
+
 # LLM 설정
 LLM_MODEL = "gpt-4o"
 LLM_TEMPERATURE = 0.7
@@ -21,6 +30,47 @@ LLM_TEMPERATURE = 0.7
 RETRIEVAL_K = 10  # 1차 검색 문서 수
 RERANK_K = 3      # 2차 재점수화 후 선택 문서 수
 
+# 검색 결과 융합 설정 (벡터 + BM25 키워드)
+FUSION_STRATEGY = os.getenv("FUSION_STRATEGY", "weighted")               # 'weighted' | 'rrf'
+FUSION_VECTOR_WEIGHT = float(os.getenv("FUSION_VECTOR_WEIGHT", "0.7"))   # 키워드 가중치는 1 - 이 값
+FUSION_RRF_K = int(os.getenv("FUSION_RRF_K", "60"))                      # RRF 순위 완화 상수
+# 이보다 낮으면 "모르겠다" 응답 - 골든 세트 평가(benchmarks/retrieval_eval.py --calibrate)의 권장값으로 조정
+# 기본 0.4: 벡터만으로는 코사인 0.57 이상, 흔한 단어 하나만 겹치면 0.49 이상, 드문 단어가 맞으면 0.36 이상 필요
+FUSION_SCORE_THRESHOLD = float(os.getenv("FUSION_SCORE_THRESHOLD", "0.4"))
+
+# 임베딩 주제 게이트 설정 (질문 임베딩과 코퍼스 주제 중심 벡터의 최대 코사인 유사도)
+TOPIC_GATE_ENABLED = os.getenv("TOPIC_GATE_ENABLED", "true").lower() == "true"
+TOPIC_GATE_THRESHOLD = float(os.getenv("TOPIC_GATE_THRESHOLD", "0.2"))  # 미만이면 검색/LLM 없이 "모르겠다" 응답
+TOPIC_WINDOW_CHUNKS = int(os.getenv("TOPIC_WINDOW_CHUNKS", "8"))        # 주제 하나로 묶는 연속 청크 수
+
+# Cross-encoder 재정렬 설정 (융합 결과 → 상위 RERANK_K 개만 LLM 컨텍스트로 사용)
+RERANK_ENABLED = os.getenv("RERANK_ENABLED", "false").lower() == "true"
+RERANK_CACHE_SIZE = int(os.getenv("RERANK_CACHE_SIZE", "8192"))        # (질문, 청크) 점수 캐시 항목 수
+RERANK_CACHE_TTL = float(os.getenv("RERANK_CACHE_TTL", "86400"))       # 초
+RERANK_LATENCY_BUDGET_MS = float(os.getenv("RERANK_LATENCY_BUDGET_MS", "1500"))  # 요청 시작부터 재정렬 완료까지 허용 시간
+
+# 백그라운드 문서 적재 작업 설정 (관리자 업로드 → 작업 ID 즉시 반환)
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "1"))                  # 적재 작업 스레드 수
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "16"))           # 대기 작업 최대 수 (초과 시 503)
+INGEST_MAX_ATTEMPTS = int(os.getenv("INGEST_MAX_ATTEMPTS", "3"))        # 일시적 오류 시 최대 시도 횟수
+INGEST_RETRY_BACKOFF = float(os.getenv("INGEST_RETRY_BACKOFF", "2.0"))  # 재시도 대기 (초, 시도마다 2배)
+INGEST_NICENESS = int(os.getenv("INGEST_NICENESS", "10"))               # 적재 스레드 OS 우선순위 (nice, 높을수록 낮음)
+INGEST_YIELD_MAX_WAIT = float(os.getenv("INGEST_YIELD_MAX_WAIT", "2.0"))  # 임베딩 배치마다 진행 중 질문을 기다리는 최대 시간 (초)
+INGEST_JOB_HISTORY = int(os.getenv("INGEST_JOB_HISTORY", "100"))        # 상태 조회용으로 보관할 작업 수
+INGEST_JOB_STORE = os.getenv("INGEST_JOB_STORE", "true").lower() == "true"  # 작업 상태를 PostgreSQL(ingestion_jobs)에 기록 (워커 여러 개일 때 필요)
+INGEST_TORCH_THREADS = int(os.getenv("INGEST_TORCH_THREADS", "1"))      # 적재 스레드의 torch intra-op 스레드 수 (0 이면 조정하지 않음)
+
+# PDF 텍스트 추출 설정 (PyMuPDF, 페이지 범위를 프로세스 풀에 분배)
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))  # 추출 프로세스 수
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "16"))          # 프로세스 작업 하나가 맡는 페이지 수
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "32"))  # 이보다 짧은 PDF 는 현재 프로세스에서 추출
+
+# 관리자 업로드 설정 (본문을 나눠 받아 큰 파일은 임시 파일로 스풀)
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(256 * 1024 * 1024)))          # 업로드 최대 크기 (초과 시 413)
+UPLOAD_SPOOL_MAX_MEMORY = int(os.getenv("UPLOAD_SPOOL_MAX_MEMORY", str(8 * 1024 * 1024)))  # 이보다 크면 디스크에 저장
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))            # 한 번에 읽는 크기
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None                                # 임시 파일 위치 (기본: 시스템 임시 디렉터리)
+
 # 청크 설정
 CHUNK_SIZE = 1200
 CHUNK_OVERLAP = 200
@@ -1,12 +1,18 @@
 """
 관리자 API 컨트롤러
 """
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Request, UploadFile, File, Form
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
 import logging
+from config.app_config import UPLOAD_MAX_BYTES
 from database.document_service import DocumentService, ChunkService
-from database.models import Document
-from sentence_transformers import SentenceTransformer
+from services.ingestion_jobs import (
+    IngestionQueueFullError, admin_document_key, ingestion_queue, pdf_document, text_document, upload_key
+)
+from utils.content_hash import text_hash
+from utils.upload_spool import SpooledUpload, UploadTooLargeError, iter_upload_file, spool_base64, spool_stream
+from services.response_cache import invalidate_corpus, purge_responses, response_cache
 from pydantic import BaseModel
 import os
 
@@ -19,206 +25,161 @@ class TextDocumentRequest(BaseModel):
     content: str
     category: str = "general"
     source: str = "admin_upload"
+    document_key: Optional[str] = None  # 지정하면 같은 키의 기존 문서를 이 내용으로 교체
 
-# 임베딩 모델 초기화
-embedding_model = SentenceTransformer('sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2')
 
-@router.post("/documents/text")
+def _submit(kind: str, title: str, prepare, cleanup=None, key: Optional[str] = None) -> dict:
+    """
+    적재 작업 등록 후 202 응답 본문 (대기열이 가득 차면 503)
+    
+    같은 업로드(key)가 아직 처리 중이면 그 작업의 ID 를 돌려주므로 재전송해도 작업이 늘지 않습니다.
+    작업 상태를 PostgreSQL 에 기록하므로 이벤트 루프 밖(run_in_threadpool)에서 호출합니다.
+    """
+    try:
+        job = ingestion_queue.submit(kind, title, prepare, cleanup, key=key)
+    except IngestionQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {
+        "success": True,
+        "message": "문서 적재 작업이 등록되었습니다. status_url 로 진행 상황을 확인하세요.",
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/admin/jobs/{job.id}"
+    }
+
+@router.post("/documents/text", status_code=202)
 async def upload_text_document(request: TextDocumentRequest):
     """
     텍스트 문서 업로드 (할루시네이션 방지용 정보)
+    
+    청크 분할/임베딩/저장은 백그라운드 작업으로 처리하고 작업 ID 를 바로 반환합니다.
+    document_key 를 지정하면 같은 키의 기존 문서를 갱신하고(바뀐 청크만 다시 임베딩), 지정하지 않으면
+    새 문서로 추가합니다. 어느 쪽이든 내용이 이미 적재된 것과 같으면 아무것도 바꾸지 않습니다.
     """
-    try:
-        # 문서 서비스 초기화
-        doc_service = DocumentService()
-        chunk_service = ChunkService()
-        
-        # 문서 생성
-        document = Document(
-            title=request.title,
-            file_name=f"{request.title}.txt",
-            file_type="text",
-            content=request.content,
-            source_url=f"admin://text/{request.title}",
-            metadata={
-                "source": request.source,
-                "category": request.category,
-                "upload_type": "text"
-            }
-        )
-        
-        # 문서 저장
-        document_id = doc_service.create_document(document)
-        
-        # 청크 생성 및 임베딩
-        chunk_ids = chunk_service.create_chunks_for_document(
-            document_id,
-            request.content,
-            embedding_model,
-            chunk_size=500,
-            chunk_overlap=50
-        )
-        
-        return {
-            "success": True,
-            "message": "텍스트 문서가 성공적으로 업로드되었습니다.",
-            "document_id": document_id,
-            "chunks_created": len(chunk_ids)
-        }
-        
-    except Exception as e:
-        logger.error(f"텍스트 문서 업로드 실패: {e}")
-        raise HTTPException(status_code=500, detail=f"문서 업로드 실패: {str(e)}")
+    if not request.content.strip():
+        raise HTTPException(status_code=400, detail="문서 내용이 비어 있습니다.")
+    
+    content_hash = text_hash(request.content)
+    return await run_in_threadpool(_submit, "text", request.title, lambda: text_document(
+        request.title, request.content, request.category, request.source, content_hash, request.document_key
+    ), key=upload_key(admin_document_key(content_hash, request.document_key), content_hash))
 
 class PDFDocumentRequest(BaseModel):
     title: str
     content: str  # Base64 인코딩된 PDF 내용
     category: str = "general"
     source: str = "admin_upload"
+    document_key: Optional[str] = None  # 지정하면 같은 키의 기존 문서를 이 PDF 로 교체
+
+def _submit_pdf(title: str, spool: SpooledUpload, file_name: str, category: str, source: str,
+                document_key: Optional[str] = None) -> dict:
+    """
+    스풀된 PDF 로 적재 작업 등록 (임시 파일은 작업이 끝나면 삭제)
+    
+    document_key 를 지정하면 같은 키의 기존 문서를 갱신하고, 지정하지 않으면 새 문서로 추가합니다
+    (파일 이름이 같아도 교체하지 않음). PDF 가 이미 적재된 것과 같으면 아무것도 바꾸지 않습니다.
+    """
+    if spool.size == 0:
+        spool.close()
+        raise HTTPException(status_code=400, detail="업로드된 PDF 가 비어 있습니다.")
+    
+    content_hash = spool.content_hash
+    return _submit("pdf", title, lambda: pdf_document(
+        title, spool.source(), file_name, category, source, content_hash, document_key
+    ), cleanup=spool.close, key=upload_key(admin_document_key(content_hash, document_key), content_hash))
 
-@router.post("/documents/pdf")
+@router.post("/documents/pdf", status_code=202)
 async def upload_pdf_document(request: PDFDocumentRequest):
     """
     PDF 문서 업로드 (할루시네이션 방지용 정보)
+    
+    텍스트 추출부터 저장까지 백그라운드 작업으로 처리하고 작업 ID 를 바로 반환합니다.
+    JSON 본문에 PDF 전체가 Base64 로 들어오므로, 큰 파일은 /documents/pdf-stream 을 사용하세요.
     """
+    # Base64 디코딩 (조각별로 스풀에 기록)
     try:
-        # Base64 디코딩
-        import base64
-        try:
-            pdf_content = base64.b64decode(request.content)
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"Base64 디코딩 실패: {str(e)}")
-        
-        # PDF 텍스트 추출
-        try:
-            import PyPDF2
-            import io
-            
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
-            text_content = ""
-            for page in pdf_reader.pages:
-                text_content += page.extract_text() + "\n"
-        except ImportError:
-            # PyPDF2가 없으면 기본 텍스트로 처리
-            text_content = pdf_content.decode('utf-8', errors='ignore')
-        
-        if not text_content.strip():
-            raise HTTPException(status_code=400, detail="PDF에서 텍스트를 추출할 수 없습니다.")
-        
-        # 문서 서비스 초기화
-        doc_service = DocumentService()
-        chunk_service = ChunkService()
-        
-        # 문서 생성
-        document = Document(
-            title=request.title,
-            file_name=f"{request.title}.pdf",
-            file_type="pdf",
-            content=text_content,
-            source_url=f"admin://pdf/{request.title}.pdf",
-            metadata={
-                "source": request.source,
-                "category": request.category,
-                "upload_type": "pdf",
-                "original_filename": f"{request.title}.pdf"
-            }
-        )
-        
-        # 문서 저장
-        document_id = doc_service.create_document(document)
-        
-        # 청크 생성 및 임베딩
-        chunk_ids = chunk_service.create_chunks_for_document(
-            document_id,
-            text_content,
-            embedding_model,
-            chunk_size=500,
-            chunk_overlap=50
-        )
-        
-        return {
-            "success": True,
-            "message": "PDF 문서가 성공적으로 업로드되었습니다.",
-            "document_id": document_id,
-            "chunks_created": len(chunk_ids),
-            "extracted_text_length": len(text_content)
-        }
-        
+        spool = await run_in_threadpool(spool_base64, request.content)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
-        logger.error(f"PDF 문서 업로드 실패: {e}")
-        raise HTTPException(status_code=500, detail=f"PDF 업로드 실패: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Base64 디코딩 실패: {str(e)}")
+    
+    return await run_in_threadpool(_submit_pdf, request.title, spool, f"{request.title}.pdf", request.category,
+                                   request.source, request.document_key)
 
-@router.post("/documents/pdf-upload")
+@router.post("/documents/pdf-upload", status_code=202)
 async def upload_pdf_file(
     file: UploadFile = File(...),
     title: str = Form(...),
     category: str = Form("general"),
-    source: str = Form("admin_upload")
+    source: str = Form("admin_upload"),
+    document_key: Optional[str] = Form(None)
 ):
     """
     PDF 파일 직접 업로드 (multipart/form-data)
+    
+    텍스트 추출부터 저장까지 백그라운드 작업으로 처리하고 작업 ID 를 바로 반환합니다.
+    파일은 UPLOAD_CHUNK_BYTES 씩 읽어 스풀하므로 전체를 메모리로 읽지 않습니다.
     """
     try:
-        # PDF 파일 읽기
-        content = await file.read()
-        
-        # PDF 텍스트 추출
-        try:
-            import PyPDF2
-            import io
-            
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
-            text_content = ""
-            for page in pdf_reader.pages:
-                text_content += page.extract_text() + "\n"
-        except ImportError:
-            text_content = content.decode('utf-8', errors='ignore')
-        
-        if not text_content.strip():
-            raise HTTPException(status_code=400, detail="PDF에서 텍스트를 추출할 수 없습니다.")
-        
-        # 문서 서비스 초기화
-        doc_service = DocumentService()
-        chunk_service = ChunkService()
-        
-        # 문서 생성
-        document = Document(
-            title=title,
-            file_name=file.filename,
-            file_type="pdf",
-            content=text_content,
-            source_url=f"admin://pdf/{file.filename}",
-            metadata={
-                "source": source,
-                "category": category,
-                "upload_type": "pdf",
-                "original_filename": file.filename
-            }
-        )
-        
-        # 문서 저장
-        document_id = doc_service.create_document(document)
-        
-        # 청크 생성 및 임베딩
-        chunk_ids = chunk_service.create_chunks_for_document(
-            document_id,
-            text_content,
-            embedding_model,
-            chunk_size=500,
-            chunk_overlap=50
-        )
-        
-        return {
-            "success": True,
-            "message": "PDF 파일이 성공적으로 업로드되었습니다.",
-            "document_id": document_id,
-            "chunks_created": len(chunk_ids),
-            "extracted_text_length": len(text_content)
-        }
-        
-    except Exception as e:
-        logger.error(f"PDF 파일 업로드 실패: {e}")
-        raise HTTPException(status_code=500, detail=f"PDF 파일 업로드 실패: {str(e)}")
+        spool = await spool_stream(iter_upload_file(file))
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    return await run_in_threadpool(_submit_pdf, title, spool, file.filename, category, source, document_key)
+
+@router.post("/documents/pdf-stream", status_code=202)
+async def upload_pdf_stream(
+    request: Request,
+    title: str,
+    category: str = "general",
+    source: str = "admin_upload",
+    file_name: Optional[str] = None,
+    document_key: Optional[str] = None
+):
+    """
+    PDF 원본 스트리밍 업로드 (본문: PDF 바이트, 메타데이터: 쿼리 파라미터)
+    
+    대용량 PDF 권장 경로입니다. 본문을 받는 대로 스풀 파일에 쓰고, 크기 제한(UPLOAD_MAX_BYTES)을
+    넘으면 그 자리에서 413 으로 끊습니다.
+    """
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=str(UploadTooLargeError(UPLOAD_MAX_BYTES)))
+    
+    try:
+        spool = await spool_stream(request.stream())
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    return await run_in_threadpool(_submit_pdf, title, spool, file_name or f"{title}.pdf", category, source, document_key)
+
+@router.get("/jobs")
+async def list_ingestion_jobs(limit: int = 20):
+    """
+    최근 문서 적재 작업 목록
+    """
+    return {
+        "success": True,
+        "jobs": await run_in_threadpool(ingestion_queue.list, limit),
+        "stats": ingestion_queue.stats()
+    }
+
+@router.get("/jobs/{job_id}")
+async def get_ingestion_job(job_id: str):
+    """
+    문서 적재 작업 상태 조회 (queued → running → succeeded/failed, 청크 진행률)
+    
+    다른 uvicorn 워커가 받은 작업은 ingestion_jobs 테이블에서 읽습니다.
+    """
+    status = await run_in_threadpool(ingestion_queue.status, job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="적재 작업을 찾을 수 없습니다.")
+    
+    return {
+        "success": True,
+        **status
+    }
 
 @router.get("/documents")
 async def list_documents():
@@ -238,6 +199,7 @@ async def list_documents():
                     "file_name": doc.file_name,
                     "file_type": doc.file_type,
                     "source_url": doc.source_url,
+                    "document_key": doc.document_key,
                     "upload_date": doc.upload_date.isoformat() if doc.upload_date else None,
                     "metadata": doc.metadata,
                     "is_active": doc.is_active
@@ -250,6 +212,29 @@ async def list_documents():
         logger.error(f"문서 목록 조회 실패: {e}")
         raise HTTPException(status_code=500, detail=f"문서 목록 조회 실패: {str(e)}")
 
+@router.put("/documents/{document_id}/key")
+async def set_document_key(document_id: int, document_key: str):
+    """
+    문서 식별 키 지정
+    
+    키가 없는 기존 문서(키 도입 전에 올린 PDF 등)도 키를 지정해 두면, 같은 document_key 로 다시 올릴 때
+    새 문서를 만들지 않고 이 문서를 갱신합니다.
+    """
+    if not document_key.strip():
+        raise HTTPException(status_code=400, detail="document_key 가 비어 있습니다.")
+    key = admin_document_key("", document_key)
+    
+    try:
+        updated = await run_in_threadpool(DocumentService().set_document_key, document_id, key)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        logger.error(f"문서 키 지정 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"문서 키 지정 실패: {str(e)}")
+    if not updated:
+        raise HTTPException(status_code=404, detail="문서를 찾을 수 없습니다.")
+    return {"success": True, "document_id": document_id, "document_key": key}
+
 @router.delete("/documents/{document_id}")
 async def delete_document(document_id: int):
     """
@@ -265,6 +250,7 @@ async def delete_document(document_id: int):
         
         document.is_active = False
         doc_service.update_document(document)
+        invalidate_corpus()
         
         return {
             "success": True,
@@ -273,4 +259,44 @@ async def delete_document(document_id: int):
         
     except Exception as e:
         logger.error(f"문서 삭제 실패: {e}")
-        raise HTTPException(status_code=500, detail=f"문서 삭제 실패: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"문서 삭제 실패: {str(e)}")
+
+@router.post("/index/rebuild")
+async def rebuild_vector_index(method: Optional[str] = None):
+    """
+    벡터 인덱스 재생성 (HNSW/IVFFlat)
+    
+    현재 청크 수에 맞춰 인덱스 파라미터를 다시 계산하고 CONCURRENTLY 로 교체합니다.
+    method 를 지정하지 않으면 pgvector 버전에 따라 hnsw 를 우선 사용합니다.
+    재생성은 수 분이 걸릴 수 있으므로 스레드풀에서 실행해 다른 요청(이벤트 루프)을 막지 않습니다.
+    """
+    if method is not None and method not in ("hnsw", "ivfflat"):
+        raise HTTPException(status_code=400, detail="method 는 hnsw 또는 ivfflat 이어야 합니다.")
+    
+    try:
+        chunk_service = ChunkService()
+        result = await run_in_threadpool(chunk_service.rebuild_vector_index, method)
+        
+        return {
+            "success": True,
+            "message": f"{result['method']} 벡터 인덱스가 재생성되었습니다.",
+            **result
+        }
+        
+    except Exception as e:
+        logger.error(f"벡터 인덱스 재생성 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"벡터 인덱스 재생성 실패: {str(e)}")
+
+@router.delete("/cache/responses")
+async def purge_response_cache():
+    """
+    응답 캐시 전체 삭제
+    
+    문서 변경 시에는 코퍼스 버전으로 자동 무효화되므로,
+    프롬프트/캐릭터 설정 변경 등 코퍼스 외 요인으로 답변이 바뀌어야 할 때 사용합니다.
+    """
+    return {
+        "success": True,
+        **purge_responses(),
+        "stats": response_cache.stats()
+    }
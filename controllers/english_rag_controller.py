@@ -3,12 +3,17 @@ English RAG controller for handling English queries
 """
 import logging
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any
 
 from models.english_request_models import EnglishRAGQueryRequest
+from database.models import VectorSearchParams
 from models.english_response_models import EnglishRAGQueryResponse
 from services.english_relevance_service import EnglishRelevanceService
 from services.english_postgres_rag_service import EnglishPostgresRAGService
+from characters import CHARACTER_STYLE
+from utils.metrics import label_request
+from utils.streaming import SSE_HEADERS, sse_stream
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +25,11 @@ relevance_service = EnglishRelevanceService()
 rag_service = EnglishPostgresRAGService()
 
 
+def _label_request(character: str):
+    """Set the request metric labels (unknown character names share one label value)"""
+    label_request(language="en", character=character if character in CHARACTER_STYLE else "other")
+
+
 @router.post("/query-english", response_model=EnglishRAGQueryResponse)
 async def query_english_rag(request: EnglishRAGQueryRequest) -> EnglishRAGQueryResponse:
     """
@@ -33,6 +43,7 @@ async def query_english_rag(request: EnglishRAGQueryRequest) -> EnglishRAGQueryR
     """
     try:
         logger.info(f"English RAG query received: {request.message}")
+        _label_request(request.character)
         
         # Check relevance - temporarily bypass for debugging
         logger.info(f"Bypassing relevance check for: {request.message}")
@@ -45,10 +56,11 @@ async def query_english_rag(request: EnglishRAGQueryRequest) -> EnglishRAGQueryR
         #         sources=[]
         #     )
         
-        # Generate response using RAG
-        result = rag_service.generate_response(
+        # Generate response using RAG (async - does not block the event loop)
+        result = await rag_service.agenerate_response(
             query=request.message,
-            character=request.character
+            character=request.character,
+            search_params=VectorSearchParams(ef_search=request.ef_search, probes=request.probes)
         )
         
         logger.info(f"English RAG response generated: {result['response'][:100]}...")
@@ -64,3 +76,28 @@ async def query_english_rag(request: EnglishRAGQueryRequest) -> EnglishRAGQueryR
             status_code=500,
             detail=f"Error processing English query: {str(e)}"
         )
+
+
+
+@router.post("/query-english/stream")
+async def stream_english_rag(request: EnglishRAGQueryRequest) -> StreamingResponse:
+    """
+    Stream an English RAG answer as Server-Sent Events for voice playback
+    
+    Events are sent in this order: "sources", one "sentence" per completed
+    sentence, then "done" with the full response.
+    
+    Args:
+        request: English RAG query request
+        
+    Returns:
+        StreamingResponse: text/event-stream response
+    """
+    logger.info(f"English RAG stream received: {request.message}")
+    _label_request(request.character)
+    events = rag_service.astream_response(
+        query=request.message,
+        character=request.character,
+        search_params=VectorSearchParams(ef_search=request.ef_search, probes=request.probes)
+    )
+    return StreamingResponse(sse_stream(events), media_type="text/event-stream", headers=SSE_HEADERS)
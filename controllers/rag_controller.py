@@ -2,11 +2,15 @@
 RAG 컨트롤러
 """
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from models.request_models import ChatRequest
+from database.models import VectorSearchParams
 from models.response_models import ChatResponse
 from services.postgres_rag_service import PostgresRAGService
 from services.relevance_service import RelevanceService
 from characters import CHARACTER_STYLE
+from utils.metrics import label_request, span
+from utils.streaming import SSE_HEADERS, sse_stream, static_answer_events
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,9 +18,15 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/rag", tags=["RAG"])
 
 
+_rag_service: PostgresRAGService | None = None
+
+
 def get_rag_service() -> PostgresRAGService:
-    """RAG 서비스 의존성 주입"""
-    return PostgresRAGService()
+    """RAG 서비스 의존성 주입 (프로세스당 하나의 인스턴스 공유)"""
+    global _rag_service
+    if _rag_service is None:
+        _rag_service = PostgresRAGService()
+    return _rag_service
 
 
 def get_relevance_service() -> RelevanceService:
@@ -24,6 +34,14 @@ def get_relevance_service() -> RelevanceService:
     return RelevanceService()
 
 
+def _check_relevance(relevance_service: RelevanceService, message: str, character: str) -> bool:
+    """요청 메트릭 라벨 지정 + 관련성 검증 (relevance 단계로 계측)"""
+    # 알 수 없는 캐릭터 이름은 하나로 묶어 메트릭 라벨 수가 늘어나지 않게 함
+    label_request(language="ko", character=character if character in CHARACTER_STYLE else "other")
+    with span("relevance"):
+        return relevance_service.check_relevance(message)
+
+
 @router.post("/query", response_model=ChatResponse)
 async def generate_chat_response(
     req: ChatRequest,
@@ -68,12 +86,39 @@ async def generate_chat_response(
     character = req.character
     
     # 관련성 검증
-    if not relevance_service.check_relevance(user_message):
+    if not _check_relevance(relevance_service, user_message, character):
         char_style = CHARACTER_STYLE[character]
         return ChatResponse(
             response=f"전시와 관련이 없거나, 제가 잘 모르는 정보에요!",
             sources=[]
         )
     
-    # RAG 서비스를 통한 응답 생성
-    return rag_service.generate_response(user_message, character)
+    # RAG 서비스를 통한 응답 생성 (비동기 - 이벤트 루프를 막지 않음)
+    search_params = VectorSearchParams(ef_search=req.ef_search, probes=req.probes)
+    return await rag_service.agenerate_response(user_message, character, search_params)
+
+
+
+@router.post("/query/stream")
+async def stream_chat_response(
+    req: ChatRequest,
+    rag_service: PostgresRAGService = Depends(get_rag_service),
+    relevance_service: RelevanceService = Depends(get_relevance_service)
+):
+    """
+    음성 재생용 스트리밍 챗봇 API (Server-Sent Events)
+    
+    키오스크가 첫 문장부터 TTS 를 시작할 수 있도록 답변을 문장 단위로 보냅니다.
+    
+    **Events:**
+    - **sources**: 참고한 문서 출처 (가장 먼저 전송)
+    - **sentence**: 답변 문장 하나 (`index`, `text`)
+    - **done**: 전체 답변과 출처
+    """
+    if not _check_relevance(relevance_service, req.message, req.character):
+        events = static_answer_events([], "전시와 관련이 없거나, 제가 잘 모르는 정보에요!")
+    else:
+        search_params = VectorSearchParams(ef_search=req.ef_search, probes=req.probes)
+        events = rag_service.astream_response(req.message, req.character, search_params)
+
+    return StreamingResponse(sse_stream(events), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -0,0 +1,317 @@
+"""
+청크 BM25 역색인 (키워드 검색)
+
+하드코딩된 키워드 목록 + ILIKE 풀스캔 대신, document_chunks 전체로 만든 역색인에서
+BM25 점수로 청크를 찾습니다. 토큰화는 utils/korean_tokenizer.py (조사 제거) 규칙을 따릅니다.
+
+- 증분 갱신: corpus_change_log 에서 아직 반영하지 않은 변경의 문서만 다시 색인
+  (늦게 커밋된 낮은 ID 도 놓치지 않도록 database/change_log.ChangeLogCursor 로 추적)
+- 영속화: 색인을 파일로 저장해 재시작 시 다시 만들지 않고, 저장 이후 변경분만 반영
+- 동시성: 공개된 색인은 수정하지 않음. 증분 갱신은 사본(copy_for_update)에 적용한 뒤 참조를 교체하므로
+  다른 스레드의 search 는 잠금 없이 항상 완결된 한 버전을 읽음
+"""
+import heapq
+import logging
+import math
+import os
+import pickle
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from database.change_log import ChangeLogCursor
+from database.connection import get_db_cursor
+from utils.korean_tokenizer import tokenize
+
+logger = logging.getLogger(__name__)
+
+BM25_INDEX_PATH = os.getenv('BM25_INDEX_PATH', 'bm25_index.pkl')
+BM25_REFRESH_INTERVAL = float(os.getenv('BM25_REFRESH_INTERVAL', '5'))  # 변경 로그 확인 주기 (초)
+BM25_K1 = 1.2
+BM25_B = 0.75
+# 원점수 s 를 s / (s + k) 로 0~1 절대 점수로 바꾸는 k (드문 단어 하나가 정확히 맞으면 s ≈ idf ≈ 4 → 0.5)
+BM25_SCORE_SATURATION = float(os.getenv('BM25_SCORE_SATURATION', '4.0'))
+_FORMAT_VERSION = 2
+
+# 음성 인식 오류 등으로 자주 들어오는 질의어 보정 (호호도 -> 호작도)
+QUERY_ALIASES = {
+    "호호도": ["호작도"],
+}
+
+
+def saturate(score: float, saturation: float = BM25_SCORE_SATURATION) -> float:
+    """
+    BM25 원점수를 질문과 무관한 0~1 점수로 변환 (융합/임계값 판단용)
+
+    1위 대비로 나누면 아무리 약한 매칭도 1위는 1.0 이 되므로, 포화 함수로 절대 크기를 유지합니다.
+    흔한 단어 하나만 겹친 매칭(idf 가 낮음)은 낮게, 드문 단어 여러 개가 맞으면 1 에 가깝게 나옵니다.
+    """
+    score = max(score, 0.0)
+    return score / (score + saturation)
+
+
+class BM25Index:
+    """메모리 역색인 + BM25 점수 계산"""
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[int, int]] = defaultdict(dict)  # 토큰 -> {chunk_id: 빈도}
+        self.chunk_lengths: Dict[int, int] = {}
+        self.chunk_tokens: Dict[int, List[str]] = {}  # 삭제 시 postings 정리용 (고유 토큰)
+        self.document_chunks: Dict[int, List[int]] = defaultdict(list)
+        self.total_length = 0
+        self.log_cursor = ChangeLogCursor()  # 반영한 corpus_change_log 위치
+        # copy_for_update 로 만든 사본이면 원본과 공유 중인 posting 이 있으므로, 수정 전에 복사한 토큰을 기록
+        self._owned_tokens: Optional[set] = None
+
+    def __len__(self) -> int:
+        return len(self.chunk_lengths)
+
+    @property
+    def version(self) -> int:
+        """반영한 corpus_change_log 마지막 ID"""
+        return self.log_cursor.version
+
+    # ----------------- 색인 변경 -----------------
+
+    def copy_for_update(self) -> "BM25Index":
+        """
+        증분 갱신용 사본 (원본은 검색 중인 스레드를 위해 그대로 둠)
+
+        바깥 dict 만 복사하고 토큰별 posting 은 원본과 공유하다가, 사본에서 처음 수정할 때 복사합니다.
+        바뀐 문서의 토큰만큼만 복사하므로 전체 색인을 깊은 복사하지 않습니다.
+        """
+        clone = BM25Index(self.k1, self.b)
+        clone.postings = defaultdict(dict, self.postings)
+        clone.chunk_lengths = dict(self.chunk_lengths)
+        clone.chunk_tokens = dict(self.chunk_tokens)
+        clone.document_chunks = defaultdict(list, self.document_chunks)
+        clone.total_length = self.total_length
+        clone.log_cursor = self.log_cursor
+        clone._owned_tokens = set()
+        return clone
+
+    def _posting_for_write(self, token: str) -> Dict[int, int]:
+        """수정할 posting (사본이면 원본과 공유하지 않도록 처음 한 번 복사)"""
+        if self._owned_tokens is not None and token not in self._owned_tokens:
+            self.postings[token] = dict(self.postings.get(token, {}))
+            self._owned_tokens.add(token)
+        return self.postings[token]
+
+    def add_chunks(self, document_id: int, chunks: Iterable[Tuple[int, str]]):
+        """문서의 청크들을 색인에 추가"""
+        chunk_ids = list(self.document_chunks.get(document_id, []))
+        for chunk_id, text in chunks:
+            counts = Counter(tokenize(text))
+            for token, frequency in counts.items():
+                self._posting_for_write(token)[chunk_id] = frequency
+            length = sum(counts.values())
+            self.chunk_lengths[chunk_id] = length
+            self.chunk_tokens[chunk_id] = list(counts)
+            chunk_ids.append(chunk_id)
+            self.total_length += length
+        if chunk_ids:
+            self.document_chunks[document_id] = chunk_ids
+
+    def remove_document(self, document_id: int):
+        """문서의 청크들을 색인에서 제거"""
+        for chunk_id in self.document_chunks.pop(document_id, []):
+            for token in self.chunk_tokens.pop(chunk_id, []):
+                if token not in self.postings:
+                    continue
+                posting = self._posting_for_write(token)
+                posting.pop(chunk_id, None)
+                if not posting:
+                    del self.postings[token]
+            self.total_length -= self.chunk_lengths.pop(chunk_id, 0)
+
+    # ----------------- 검색 -----------------
+
+    def query_tokens(self, query: str) -> List[str]:
+        tokens = tokenize(query)
+        for token in list(tokens):
+            tokens.extend(QUERY_ALIASES.get(token, []))
+        return list(dict.fromkeys(tokens))
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[int, float]]:
+        """BM25 상위 limit 개 (chunk_id, 점수) - 점수 내림차순, 동점은 chunk_id 순"""
+        count = len(self.chunk_lengths)
+        if count == 0 or limit <= 0:
+            return []
+        average_length = self.total_length / count
+        scores: Dict[int, float] = defaultdict(float)
+        for token in self.query_tokens(query):
+            posting = self.postings.get(token)
+            if not posting:
+                continue
+            idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for chunk_id, frequency in posting.items():
+                norm = self.k1 * (1 - self.b + self.b * self.chunk_lengths[chunk_id] / average_length)
+                scores[chunk_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return heapq.nsmallest(limit, ((chunk_id, score) for chunk_id, score in scores.items()),
+                               key=lambda item: (-item[1], item[0]))
+
+    # ----------------- 영속화 -----------------
+
+    def save(self, path: str = BM25_INDEX_PATH):
+        """원자적으로 파일 저장 (임시 파일 작성 후 교체)"""
+        state = {
+            "format": _FORMAT_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "log_cursor": (self.log_cursor.version, self.log_cursor.gaps),
+            "postings": dict(self.postings),
+            "chunk_lengths": self.chunk_lengths,
+            "chunk_tokens": self.chunk_tokens,
+            "document_chunks": dict(self.document_chunks),
+            "total_length": self.total_length,
+        }
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str = BM25_INDEX_PATH) -> Optional["BM25Index"]:
+        """저장된 색인 로드 (파일이 없거나 형식이 다르면 None)"""
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state.get("format") != _FORMAT_VERSION:
+            return None
+        index = cls(state["k1"], state["b"])
+        index.log_cursor = ChangeLogCursor(*state["log_cursor"])
+        index.postings = defaultdict(dict, state["postings"])
+        index.chunk_lengths = state["chunk_lengths"]
+        index.chunk_tokens = state["chunk_tokens"]
+        index.document_chunks = defaultdict(list, state["document_chunks"])
+        index.total_length = state["total_length"]
+        return index
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "chunks": len(self.chunk_lengths),
+            "documents": len(self.document_chunks),
+            "tokens": len(self.postings),
+            "version": self.version,
+        }
+
+
+class BM25IndexManager:
+    """DB 와 동기화되는 공유 BM25 색인 (로드/빌드/증분 갱신/저장)"""
+
+    def __init__(self, path: str = BM25_INDEX_PATH, refresh_interval: float = BM25_REFRESH_INTERVAL):
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.index: Optional[BM25Index] = None
+        self._lock = threading.Lock()
+        self._last_checked = 0.0
+        self.refresh_failures = 0
+
+    @staticmethod
+    def _fetch_chunks(cursor, document_ids: Optional[Sequence[int]] = None) -> Dict[int, List[Tuple[int, str]]]:
+        query = """
+            SELECT dc.id, dc.document_id, dc.chunk_text
+            FROM document_chunks dc
+            JOIN documents d ON dc.document_id = d.id
+            WHERE d.is_active = TRUE
+        """
+        params = ()
+        if document_ids is not None:
+            query += " AND dc.document_id = ANY(%s)"
+            params = (list(document_ids),)
+        cursor.execute(query + " ORDER BY dc.id", params)
+        grouped: Dict[int, List[Tuple[int, str]]] = defaultdict(list)
+        for row in cursor.fetchall():
+            grouped[row['document_id']].append((row['id'], row['chunk_text']))
+        return grouped
+
+    def build(self) -> BM25Index:
+        """DB 전체로 색인 생성"""
+        started = time.perf_counter()
+        index = BM25Index()
+        with get_db_cursor() as (cursor, conn):
+            index.log_cursor = ChangeLogCursor.start(cursor)
+            for document_id, chunks in self._fetch_chunks(cursor).items():
+                index.add_chunks(document_id, chunks)
+        logger.info(f"BM25 색인 생성: 청크 {len(index)}개, {time.perf_counter() - started:.2f}s")
+        return index
+
+    def apply_changes(self, index: BM25Index) -> Optional[BM25Index]:
+        """
+        변경 로그 이후 바뀐 문서만 다시 색인한 새 색인 (변경이 없으면 None)
+
+        index 는 다른 스레드가 검색 중일 수 있으므로 수정하지 않고 사본에 반영합니다.
+        """
+        with get_db_cursor() as (cursor, conn):
+            changes, log_cursor = index.log_cursor.poll(cursor)
+            if not changes:
+                return None
+            document_ids = {change['document_id'] for change in changes if change['document_id'] is not None}
+            chunks = self._fetch_chunks(cursor, sorted(document_ids)) if document_ids else {}
+
+        updated = index.copy_for_update()
+        for document_id in document_ids:
+            updated.remove_document(document_id)
+            updated.add_chunks(document_id, chunks.get(document_id, []))
+        updated.log_cursor = log_cursor
+        logger.info(f"BM25 색인 증분 갱신: 문서 {len(document_ids)}개, 버전 {updated.version}, "
+                    f"대기 중인 변경 ID {len(log_cursor.gaps)}개")
+        return updated
+
+    def _save(self, index: BM25Index):
+        try:
+            index.save(self.path)
+        except OSError as e:
+            logger.warning(f"BM25 색인 저장 실패: {e}")
+
+    def get(self) -> Optional[BM25Index]:
+        """
+        최신 상태로 맞춘 색인 (준비 중이거나 DB 오류면 마지막 색인 또는 None)
+
+        돌려준 색인은 이후에도 수정되지 않으며, 갱신은 새 색인으로 참조를 교체합니다.
+        """
+        if self.index is not None and time.monotonic() - self._last_checked < self.refresh_interval:
+            return self.index
+        if not self._lock.acquire(blocking=self.index is None):
+            return self.index
+        try:
+            self._last_checked = time.monotonic()
+            if self.index is None:
+                index = BM25Index.load(self.path)
+                if index is None:
+                    index = self.build()
+                    self._save(index)
+                else:
+                    updated = self.apply_changes(index)
+                    if updated is not None:
+                        index = updated
+                        self._save(index)
+                self.index = index
+            else:
+                updated = self.apply_changes(self.index)
+                if updated is not None:
+                    self.index = updated
+                    self._save(updated)
+        except Exception as e:
+            self.refresh_failures += 1
+            logger.error(f"BM25 색인 갱신 실패: {e}")
+        finally:
+            self._lock.release()
+        return self.index
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[int, float]]:
+        index = self.get()
+        return index.search(query, limit) if index is not None else []
+
+    def stats(self) -> Dict[str, int]:
+        stats = self.index.stats() if self.index is not None else {"chunks": 0}
+        stats["refresh_failures"] = self.refresh_failures
+        return stats
+
+
+# 프로세스 전역 색인
+bm25_index = BM25IndexManager()
@@ -0,0 +1,63 @@
+"""
+corpus_change_log 증분 읽기 커서 (BM25 색인, 벡터 미러 공용)
+
+변경 로그 ID(BIGSERIAL)는 트랜잭션이 행을 INSERT 할 때 정해지므로 커밋 순서와 다를 수 있습니다.
+ID 5 를 받은 적재 작업이 ID 6 인 삭제보다 늦게 커밋되면, "마지막으로 본 ID 이후" 만 읽는 방식은
+6 을 읽은 뒤 5 를 영영 놓칩니다. 그래서 마지막 ID(version) 아래에서 아직 보이지 않은 ID(gaps)를
+기억해 두고 매번 함께 조회합니다. 롤백된 트랜잭션의 ID 는 끝내 나타나지 않으므로
+CHANGE_LOG_GAP_TIMEOUT 초가 지나면 더 기다리지 않습니다 (어떤 적재 트랜잭션보다 길게 설정).
+"""
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# 빈 ID 를 기다리는 최대 시간 (초)
+CHANGE_LOG_GAP_TIMEOUT = float(os.getenv('CHANGE_LOG_GAP_TIMEOUT', '600'))
+# 처음 읽을 때 마지막 ID 아래 이 개수 안에서 빠진 ID 는 진행 중인 트랜잭션으로 보고 기다림
+CHANGE_LOG_GAP_WINDOW = int(os.getenv('CHANGE_LOG_GAP_WINDOW', '1000'))
+
+
+@dataclass(frozen=True)
+class ChangeLogCursor:
+    """변경 로그 반영 위치 (불변 - 갱신하면 새 커서를 만들어 색인/스냅샷과 함께 교체)"""
+    version: int = 0                          # 반영한 가장 큰 변경 로그 ID
+    gaps: Tuple[Tuple[int, float], ...] = ()  # (version 아래 아직 보이지 않은 ID, 처음 확인한 시각 time.time())
+
+    @classmethod
+    def start(cls, cursor, now: Optional[float] = None) -> "ChangeLogCursor":
+        """
+        전체 적재 직전의 위치 (전체 적재와 같은 트랜잭션에서, 적재보다 먼저 호출)
+
+        마지막 ID 아래 CHANGE_LOG_GAP_WINDOW 안의 빠진 ID 는 아직 커밋되지 않았을 수 있으므로 기다립니다.
+        """
+        cursor.execute("""
+            SELECT id FROM corpus_change_log
+            WHERE id > (SELECT COALESCE(MAX(id), 0) FROM corpus_change_log) - %s
+            ORDER BY id
+        """, (CHANGE_LOG_GAP_WINDOW,))
+        ids = [row['id'] for row in cursor.fetchall()]
+        if not ids:
+            return cls()
+        return cls(version=max(ids[-1] - CHANGE_LOG_GAP_WINDOW, 0)).advance(ids, now)
+
+    def poll(self, cursor, now: Optional[float] = None) -> Tuple[List[Dict[str, Any]], "ChangeLogCursor"]:
+        """version 이후 + 기다리던 ID 의 변경 행 (id, document_id) 과 그것을 반영한 새 커서"""
+        cursor.execute(
+            "SELECT id, document_id FROM corpus_change_log WHERE id > %s OR id = ANY(%s) ORDER BY id",
+            (self.version, [gap_id for gap_id, _ in self.gaps])
+        )
+        changes = cursor.fetchall()
+        return changes, self.advance([change['id'] for change in changes], now)
+
+    def advance(self, ids: Iterable[int], now: Optional[float] = None) -> "ChangeLogCursor":
+        """ids 를 반영한 새 커서 (새로 건너뛴 ID 는 gaps 에 추가, 오래 기다린 ID 는 제외)"""
+        now = time.time() if now is None else now
+        seen = set(ids)
+        gaps = {gap_id: since for gap_id, since in self.gaps
+                if gap_id not in seen and now - since < CHANGE_LOG_GAP_TIMEOUT}
+        version = max(seen | {self.version})
+        for gap_id in range(self.version + 1, version):
+            if gap_id not in seen:
+                gaps[gap_id] = now
+        return ChangeLogCursor(version, tuple(sorted(gaps.items())))
@@ -2,10 +2,13 @@
 PostgreSQL 데이터베이스 연결 설정
 """
 import os
+import threading
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
 import logging
+from database.pool import ConnectionPool
+from database.vector_adapter import register_vector
 
 logger = logging.getLogger(__name__)
 
@@ -19,22 +22,66 @@ DB_CONFIG = {
     'sslmode': os.getenv('POSTGRES_SSLMODE', 'require')
 }
 
+# 커넥션 풀 설정
+POOL_CONFIG = {
+    'min_size': int(os.getenv('POSTGRES_POOL_MIN', '1')),
+    'max_size': int(os.getenv('POSTGRES_POOL_MAX', '10')),
+    'max_lifetime': float(os.getenv('POSTGRES_POOL_MAX_LIFETIME', '1800')),  # 초
+    'max_idle': float(os.getenv('POSTGRES_POOL_MAX_IDLE', '300')),  # 초
+    'wait_timeout': float(os.getenv('POSTGRES_POOL_TIMEOUT', '5')),  # 초
+    'health_check_interval': float(os.getenv('POSTGRES_POOL_HEALTH_CHECK', '30')),  # 초
+}
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def _connect():
+    """새 물리 연결 생성 (numpy <-> vector 변환 등록 포함)"""
+    conn = psycopg2.connect(**DB_CONFIG)
+    conn.autocommit = False
+    register_vector(conn)
+    return conn
+
+
+def get_pool() -> ConnectionPool:
+    """프로세스 전역 커넥션 풀 (최초 호출 시 생성)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(_connect, **POOL_CONFIG)
+    return _pool
+
+
+def get_pool_stats() -> dict:
+    """커넥션 풀 메트릭"""
+    return get_pool().stats()
+
+
 @contextmanager
 def get_db_connection():
-    """데이터베이스 연결 컨텍스트 매니저"""
+    """데이터베이스 연결 컨텍스트 매니저 (풀에서 빌려서 반납)"""
+    pool = get_pool()
     conn = None
+    broken = False
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        conn.autocommit = False
+        conn = pool.getconn()
         yield conn
     except Exception as e:
         logger.error(f"데이터베이스 연결 오류: {e}")
         if conn:
-            conn.rollback()
+            # 연결 자체가 끊긴 경우 풀에 되돌리지 않고 폐기
+            broken = isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+            if not broken:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    broken = True
         raise
     finally:
         if conn:
-            conn.close()
+            pool.putconn(conn, discard=broken)
 
 @contextmanager
 def get_db_cursor():
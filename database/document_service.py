@@ -1,41 +1,78 @@
 """
 문서 및 청크 관리 서비스
 """
+import os
 import logging
 import json
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import numpy as np
-from database.connection import get_db_cursor
-from database.models import Document, DocumentChunk, SearchResult
+import bisect
+import math
+import time
+from collections import Counter, defaultdict, deque
+from psycopg2.extras import execute_values
+from database.bm25_index import bm25_index, saturate
+from database.connection import get_db_connection, get_db_cursor
+from database.models import Document, DocumentChunk, IngestionResult, PdfPage, SearchResult, VectorSearchParams
+from database.vector_adapter import Vector
+from utils.content_hash import CONTENT_KEY_PREFIX, text_hash
+from utils.korean_tokenizer import token_set
+from utils.metrics import span
 
 logger = logging.getLogger(__name__)
 
+# 벡터 인덱스 설정
+VECTOR_INDEX_NAME = "document_chunks_embedding_idx"
+# 인덱스 스캔 후 비활성 문서/임계값으로 걸러지는 만큼 여유 있게 후보를 가져옴
+VECTOR_CANDIDATE_FACTOR = int(os.getenv('VECTOR_CANDIDATE_FACTOR', '4'))
+# 요청에서 지정하지 않았을 때의 기본 검색 파라미터 (미설정 시 pgvector 기본값)
+DEFAULT_EF_SEARCH = int(os.getenv('VECTOR_EF_SEARCH', '40'))
+DEFAULT_PROBES = int(os.getenv('VECTOR_PROBES')) if os.getenv('VECTOR_PROBES') else None
+
+# 적재 설정
+EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', '32'))
+# execute_values 한 번에 보내는 행 수 (384차원 벡터 기준 약 5KB/행)
+CHUNK_INSERT_PAGE_SIZE = int(os.getenv('CHUNK_INSERT_PAGE_SIZE', '500'))
+
+
+class DocumentChangedError(RuntimeError):
+    """재적재 중 다른 작업이 같은 문서를 먼저 갱신함 (다시 읽어 비교하면 해결되므로 재시도 대상)"""
+
+
 class DocumentService:
     """문서 관리 서비스"""
     
     def create_document(self, document: Document) -> int:
         """새 문서 생성"""
         with get_db_cursor() as (cursor, conn):
-            query = """
-                INSERT INTO documents (title, file_name, file_type, source_url, content, metadata, is_active)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                RETURNING id
-            """
-            # Document 객체의 속성을 직접 전달
-            cursor.execute(query, (
-                document.title,
-                document.file_name,
-                document.file_type,
-                document.source_url,
-                document.content,
-                json.dumps(document.metadata) if document.metadata else None,
-                document.is_active
-            ))
-            document_id = cursor.fetchone()['id']
+            document_id = self.insert_document(cursor, document)
             conn.commit()
             logger.info(f"문서 생성 완료: ID {document_id}")
             return document_id
 
+    @staticmethod
+    def insert_document(cursor, document: Document) -> int:
+        """주어진 커서(트랜잭션)에 문서 INSERT - 커밋은 호출자가 담당"""
+        query = """
+            INSERT INTO documents (title, file_name, file_type, source_url, content, metadata, is_active,
+                                   content_hash, document_key)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            RETURNING id
+        """
+        # Document 객체의 속성을 직접 전달
+        cursor.execute(query, (
+            document.title,
+            document.file_name,
+            document.file_type,
+            document.source_url,
+            document.content,
+            json.dumps(document.metadata) if document.metadata else None,
+            document.is_active,
+            document.content_hash,
+            document.document_key
+        ))
+        return cursor.fetchone()['id']
+
     def get_document(self, document_id: int) -> Optional[Document]:
         """문서 조회"""
         with get_db_cursor() as (cursor, conn):
@@ -62,20 +99,187 @@ class DocumentService:
                 UPDATE documents 
                 SET title = %(title)s, file_name = %(file_name)s, file_type = %(file_type)s,
                     source_url = %(source_url)s, content = %(content)s, metadata = %(metadata)s,
-                    is_active = %(is_active)s
+                    is_active = %(is_active)s, content_hash = %(content_hash)s, document_key = %(document_key)s
                 WHERE id = %(id)s
             """
             cursor.execute(query, document.to_dict())
+            updated = cursor.rowcount > 0
+            if updated:
+                self.record_corpus_change(cursor, document.id, "update")
+            conn.commit()
+            return updated
+
+    def set_document_key(self, document_id: int, document_key: Optional[str]) -> bool:
+        """
+        문서 식별 키 지정 (이후 같은 키로 적재하면 이 문서를 새 버전으로 갱신)
+
+        키가 없는 기존 문서(특히 원본 해시를 알 수 없는 PDF)를 재업로드로 갱신하려면 먼저 키를 지정합니다.
+        같은 키의 다른 활성 문서가 있으면 ValueError 를 냅니다.
+        """
+        with get_db_cursor() as (cursor, conn):
+            if document_key is not None:
+                cursor.execute(
+                    "SELECT id FROM documents WHERE document_key = %s AND is_active = TRUE AND id <> %s LIMIT 1",
+                    (document_key, document_id)
+                )
+                taken = cursor.fetchone()
+                if taken is not None:
+                    raise ValueError(f"이미 다른 문서(ID {taken['id']})가 사용 중인 키입니다: {document_key}")
+            cursor.execute("UPDATE documents SET document_key = %s WHERE id = %s", (document_key, document_id))
+            updated = cursor.rowcount > 0
+            conn.commit()
+            return updated
+
+    def backfill_document_keys(self) -> int:
+        """
+        document_key 가 비어 있는 기존 문서의 키 채우기 - 갱신한 문서 수 반환
+
+        - source_url 이 있는 문서(upload_documents.py 적재분)는 source_url 을 키로 사용
+        - 나머지 텍스트 문서는 내용 해시(content_hash 도 함께 채움)를 키로 사용해,
+          같은 내용을 다시 올리면 중복 문서 대신 기존 문서가 그대로 유지됨
+        - 원본 PDF 해시를 알 수 없는 PDF 업로드는 비워 둠 (set_document_key 로 직접 지정)
+        """
+        with get_db_cursor() as (cursor, conn):
+            cursor.execute(
+                "UPDATE documents SET document_key = source_url WHERE document_key IS NULL AND source_url IS NOT NULL"
+            )
+            updated = cursor.rowcount
+            cursor.execute("""
+                UPDATE documents
+                SET content_hash = COALESCE(content_hash, encode(sha256(convert_to(content, 'UTF8')), 'hex'))
+                WHERE document_key IS NULL AND file_type = 'text' AND COALESCE(content, '') <> ''
+            """)
+            cursor.execute(
+                "UPDATE documents SET document_key = %s || content_hash "
+                "WHERE document_key IS NULL AND file_type = 'text' AND content_hash IS NOT NULL",
+                (CONTENT_KEY_PREFIX,)
+            )
+            updated += cursor.rowcount
             conn.commit()
-            return cursor.rowcount > 0
+        logger.info(f"문서 키 백필 완료: {updated}개")
+        return updated
 
     def delete_document(self, document_id: int) -> bool:
         """문서 삭제 (CASCADE로 청크도 함께 삭제)"""
         with get_db_cursor() as (cursor, conn):
             query = "DELETE FROM documents WHERE id = %s"
             cursor.execute(query, (document_id,))
+            deleted = cursor.rowcount > 0
+            if deleted:
+                self.record_corpus_change(cursor, document_id, "delete")
             conn.commit()
-            return cursor.rowcount > 0
+            return deleted
+
+    @staticmethod
+    def record_corpus_change(cursor, document_id: Optional[int], action: str) -> int:
+        """코퍼스 변경 기록 (같은 트랜잭션) - 새 코퍼스 버전 반환"""
+        cursor.execute(
+            "INSERT INTO corpus_change_log (document_id, action) VALUES (%s, %s) RETURNING id",
+            (document_id, action)
+        )
+        return cursor.fetchone()['id']
+
+    def get_corpus_version(self) -> int:
+        """현재 코퍼스 버전 (변경 로그의 마지막 ID, 변경 이력이 없으면 0)"""
+        with get_db_cursor() as (cursor, conn):
+            cursor.execute("SELECT COALESCE(MAX(id), 0) AS version FROM corpus_change_log")
+            return cursor.fetchone()['version']
+
+def encode_in_batches(embedding_model, texts: List[str],
+                      batch_size: int = EMBEDDING_BATCH_SIZE,
+                      on_batch: Optional[Callable[[int, int], None]] = None) -> np.ndarray:
+    """
+    텍스트들을 batch_size 개씩 묶어 임베딩 (청크마다 forward pass 하지 않음)
+
+    on_batch(완료 수, 전체 수) 는 배치마다 호출됩니다 (진행률 보고, 질문 처리에 양보).
+    """
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+    batches = []
+    for start in range(0, len(texts), batch_size):
+        batches.append(embedding_model.encode(
+            texts[start:start + batch_size],
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        ))
+        if on_batch is not None:
+            on_batch(min(start + batch_size, len(texts)), len(texts))
+    return np.vstack(batches).astype(np.float32, copy=False)
+
+
+def _chunk_spans(text: str, start: int, chunk_size: int, chunk_overlap: int,
+                 final: bool = True) -> Tuple[List[Tuple[int, int]], int]:
+    """
+    text[start:] 을 청크 (시작, 끝) 위치로 분할하고 다음 청크 시작 위치를 함께 반환
+    
+    final=False 면 뒤에 텍스트가 더 올 수 있으므로, 분할점을 정할 수 없는 마지막 청크는 남겨 둡니다.
+    분할점은 문장 끝(마침표/줄바꿈)을 우선하고, 없을 때만 공백을 씁니다. 경계가 글자 위치가 아니라 내용으로
+    정해지므로 앞부분이 수정되어도 뒤쪽 청크는 같은 텍스트로 다시 나뉘어 재적재 시 재사용됩니다.
+    """
+    spans = []
+    length = len(text)
+    min_split = chunk_size // 2  # 너무 작은 청크 방지
+    while start < length:
+        end = start + chunk_size
+        if end >= length and not final:
+            break  # 다음 텍스트가 와야 이 청크의 분할점을 정할 수 있음
+        
+        # 문장 경계에서 자르기
+        if end < length:
+            chunk = text[start:end]
+            split_point = chunk.rfind('\n')
+            if split_point <= min_split:
+                split_point = chunk.rfind('.')
+            if split_point <= min_split:
+                split_point = chunk.rfind(' ')
+            if split_point > min_split:
+                end = start + split_point + 1
+        
+        spans.append((start, end))
+        start = end - chunk_overlap
+    return spans, start
+
+
+def iter_chunks(segments: Iterable[Tuple[Optional[int], str]], chunk_size: int,
+                chunk_overlap: int) -> Iterator[Tuple[str, Optional[int], Optional[int]]]:
+    """
+    (페이지 번호, 텍스트) 스트림을 이어 붙인 텍스트를 청크로 분할 → (청크, 시작 페이지, 끝 페이지)
+
+    전체 텍스트를 한 번에 나눈 결과와 같은 청크를 내되, 청크 경계를 정할 만큼 텍스트가 모이면
+    바로 내보내므로 PDF 추출이 끝나기 전에 임베딩을 시작할 수 있습니다.
+    이미 내보낸 앞부분은 버퍼에서 버려 메모리는 페이지 몇 개 분량만 씁니다.
+    """
+    buffer = ""
+    base = 0  # buffer[0] 의 전체 텍스트 기준 위치
+    start = 0  # 다음 청크 시작 위치 (buffer 기준)
+    offsets: List[int] = []  # 페이지 시작 위치 (전체 기준)
+    numbers: List[Optional[int]] = []  # 페이지 번호
+
+    def page_at(position: int) -> Optional[int]:
+        return numbers[max(0, bisect.bisect_right(offsets, position) - 1)]
+
+    def emit(spans: List[Tuple[int, int]]) -> Iterator[Tuple[str, Optional[int], Optional[int]]]:
+        for span_start, span_end in spans:
+            chunk = buffer[span_start:span_end].strip()
+            if chunk:
+                yield chunk, page_at(base + span_start), page_at(base + min(span_end, len(buffer)) - 1)
+
+    for page, text in segments:
+        offsets.append(base + len(buffer))
+        numbers.append(page)
+        buffer += text
+        spans, start = _chunk_spans(buffer, start, chunk_size, chunk_overlap, final=False)
+        yield from emit(spans)
+        # 이미 내보낸 앞부분 버리기 (현재 청크 시작 위치의 페이지 표시는 유지)
+        if start > 0:
+            buffer = buffer[start:]
+            base += start
+            start = 0
+            keep = max(0, bisect.bisect_right(offsets, base) - 1)
+            del offsets[:keep], numbers[:keep]
+    spans, _ = _chunk_spans(buffer, start, chunk_size, chunk_overlap, final=True)
+    yield from emit(spans)
 
 class ChunkService:
     """청크 관리 서비스"""
@@ -83,225 +287,709 @@ class ChunkService:
     def create_chunks_for_document(self, document_id: int, content: str, 
                                  embedding_model, chunk_size: int = 500, 
                                  chunk_overlap: int = 50) -> List[int]:
-        """문서 내용을 청크로 분할하고 임베딩하여 저장"""
-        from sentence_transformers import SentenceTransformer
-        
+        """문서 내용을 청크로 분할하고 임베딩하여 저장 (배치 임베딩 + 일괄 INSERT)"""
         # 텍스트를 청크로 분할
         chunks = self._split_text_into_chunks(content, chunk_size, chunk_overlap)
         
-        # 각 청크에 대해 임베딩 생성 및 저장
-        chunk_ids = []
-        for i, chunk_text in enumerate(chunks):
-            # 임베딩 생성
-            embedding = embedding_model.encode(chunk_text).tolist()
-            
-            # 청크 객체 생성
-            chunk = DocumentChunk(
-                document_id=document_id,
+        # 배치 단위 임베딩 생성 후 한 트랜잭션으로 저장
+        embeddings = encode_in_batches(embedding_model, chunks)
+        return self.create_chunks(document_id, self._build_chunks(chunks, embeddings))
+
+    def ingest_document(self, document: Document, embedding_model,
+                        chunk_size: int = 500, chunk_overlap: int = 50,
+                        batch_size: int = EMBEDDING_BATCH_SIZE,
+                        on_batch: Optional[Callable[[int, Optional[int]], None]] = None,
+                        pages: Optional[Iterable[PdfPage]] = None) -> IngestionResult:
+        """
+        문서 적재: 청크 분할 → 배치 임베딩 → 문서 + 청크를 단일 트랜잭션으로 저장
+        
+        임베딩은 트랜잭션 밖에서 먼저 끝내 DB 연결 점유 시간을 줄이고,
+        저장 중 실패하면 문서 행까지 함께 롤백되어 청크가 일부만 남지 않습니다.
+        
+        pages(PDF 페이지 스트림)를 주면 추출되는 대로 청크를 나누고 batch_size 개가 모일 때마다
+        임베딩하며, 청크 metadata 에 page_start/page_end 를 남깁니다. 큰 PDF 도 전체 텍스트를 문자열 하나로
+        모으지 않도록 document.content 는 비워 두고, 문서 metadata 에 page_count/text_length 를 기록합니다.
+        on_batch 는 임베딩 배치마다 (완료 청크 수, 전체 청크 수) 로 호출됩니다 (스트림이 끝나기 전에는 전체 수가 None).
+        
+        같은 document_key 의 활성 문서가 이미 있으면 새 문서를 만들지 않고 그 문서를 새 버전으로 갱신합니다
+        (document_key 가 없으면 항상 새 문서).
+        - content_hash 가 같으면 추출/임베딩/저장 없이 기존 문서를 그대로 반환 (status="unchanged")
+        - 다르면 청크 해시로 비교해 바뀐 청크만 임베딩하고, 그대로인 청크는 ID 와 임베딩을 유지 (status="updated").
+          바뀐 청크는 새 버전에서 사라진 기존 청크 행을 순서대로 덮어써 청크 ID 도 최대한 유지합니다.
+        """
+        if document.content_hash is None and pages is None:
+            document.content_hash = text_hash(document.content)
+        previous = self.get_previous_version(document.document_key) if document.document_key else None
+        if previous is not None and document.content_hash and previous[0].content_hash == document.content_hash:
+            return self._unchanged(document, *previous, on_batch=on_batch)
+        
+        if pages is None:
+            segments: Iterable[Tuple[Optional[int], str]] = [(None, document.content)]
+        else:
+            page_stats = {"page_count": 0, "text_length": 0}
+            segments = self._page_segments(pages, page_stats)
+        
+        # 이전 버전에 같은 텍스트의 청크가 남아 있으면 임베딩하지 않고 재사용
+        reusable = Counter(chunk.chunk_hash for chunk in previous[1]) if previous is not None else Counter()
+        chunks: List[str] = []
+        hashes: List[str] = []
+        page_ranges: List[Tuple[Optional[int], Optional[int]]] = []
+        to_embed: List[int] = []  # 임베딩이 필요한 청크 위치
+        embeddings: Dict[int, np.ndarray] = {}
+        embedding_seconds = 0.0
+        started = time.perf_counter()
+        
+        def embed_pending(total: Optional[int]):
+            nonlocal embedding_seconds
+            pending = to_embed[len(embeddings):]
+            if pending:
+                batch_started = time.perf_counter()
+                vectors = encode_in_batches(embedding_model, [chunks[i] for i in pending], batch_size)
+                embeddings.update(zip(pending, vectors))
+                embedding_seconds += time.perf_counter() - batch_started
+            if on_batch is not None:
+                on_batch(len(chunks), total)
+        
+        for chunk_text, page_start, page_end in iter_chunks(segments, chunk_size, chunk_overlap):
+            chunk_hash = text_hash(chunk_text)
+            chunks.append(chunk_text)
+            hashes.append(chunk_hash)
+            page_ranges.append((page_start, page_end))
+            if reusable[chunk_hash] > 0:
+                reusable[chunk_hash] -= 1
+                continue
+            to_embed.append(len(chunks) - 1)
+            if len(to_embed) - len(embeddings) >= batch_size:
+                embed_pending(None)
+        embed_pending(len(chunks))
+        
+        if pages is not None:
+            document.metadata = {**(document.metadata or {}), **page_stats}
+            if not chunks:
+                raise ValueError("PDF에서 텍스트를 추출할 수 없습니다.")
+        
+        built = self._build_chunks(chunks, [embeddings.get(i) for i in range(len(chunks))],
+                                   page_ranges if pages is not None else None)
+        for chunk, chunk_hash in zip(built, hashes):
+            chunk.chunk_hash = chunk_hash
+        saving_started = time.perf_counter()
+        if previous is None:
+            document_id, chunk_ids = self.create_document_with_chunks(document, built)
+            status, deleted = "created", 0
+        else:
+            document.id = document_id = previous[0].id
+            moved, rewritten, inserted, stale_ids = self._plan_chunk_updates(previous[1], built)
+            self.update_document_with_chunks(document, previous[0].content_hash,
+                                             moved, rewritten, inserted, stale_ids)
+            chunk_ids = [chunk.id for chunk in built]
+            status, deleted = "updated", len(stale_ids)
+        result = IngestionResult(
+            document_id=document_id,
+            chunk_ids=chunk_ids,
+            embedding_seconds=embedding_seconds,
+            insert_seconds=time.perf_counter() - saving_started,
+            status=status,
+            chunks_embedded=len(to_embed),
+            chunks_deleted=deleted
+        )
+        logger.info(
+            f"문서 적재 완료 ({status}): ID {document_id}, 청크 {len(chunk_ids)}개 "
+            f"(임베딩 {result.chunks_embedded}, 재사용 {result.chunks_reused}, 삭제 {deleted}), "
+            f"임베딩 {result.embedding_seconds:.2f}s, 저장 {result.insert_seconds:.2f}s, "
+            f"전체 {time.perf_counter() - started:.2f}s, {result.chunks_per_second:.1f} chunks/sec"
+        )
+        return result
+
+    @staticmethod
+    def _unchanged(document: Document, stored: Document, stored_chunks: List[DocumentChunk],
+                   on_batch: Optional[Callable[[int, Optional[int]], None]] = None) -> IngestionResult:
+        """이전 버전과 내용이 같은 재업로드 - 저장된 문서를 그대로 반환"""
+        document.id = stored.id
+        document.metadata = stored.metadata
+        if on_batch is not None:
+            on_batch(len(stored_chunks), len(stored_chunks))
+        logger.info(f"문서 내용 변경 없음: ID {stored.id} ({document.document_key}), 적재 생략")
+        return IngestionResult(
+            document_id=stored.id,
+            chunk_ids=[chunk.id for chunk in stored_chunks],
+            status="unchanged"
+        )
+
+    @staticmethod
+    def _page_segments(pages: Iterable[PdfPage], page_stats: Dict[str, int]) -> Iterator[Tuple[int, str]]:
+        """PDF 페이지 스트림 → 청크 분할 입력 (페이지마다 줄바꿈, 페이지 수/글자 수는 page_stats 에 누적)"""
+        for page in pages:
+            text = page.text + "\n"
+            page_stats["page_count"] += 1
+            page_stats["text_length"] += len(text)
+            yield page.number, text
+
+    def create_document_with_chunks(self, document: Document,
+                                    chunks: List[DocumentChunk]) -> Tuple[int, List[int]]:
+        """문서와 청크들을 한 트랜잭션으로 저장하고 (document_id, chunk_ids) 반환"""
+        with get_db_cursor() as (cursor, conn):
+            document_id = DocumentService.insert_document(cursor, document)
+            chunk_ids = self._insert_chunks(cursor, document_id, chunks)
+            DocumentService.record_corpus_change(cursor, document_id, "create")
+            conn.commit()
+            return document_id, chunk_ids
+
+    def get_previous_version(self, document_key: str) -> Optional[Tuple[Document, List[DocumentChunk]]]:
+        """
+        같은 document_key 의 현재(활성) 문서와 청크 목록 (청크는 id/순서/metadata/chunk_hash 만 읽음)
+
+        chunk_hash 컬럼이 비어 있는 이전 데이터는 DB 에서 chunk_text 로 계산합니다.
+        """
+        with get_db_cursor() as (cursor, conn):
+            cursor.execute("""
+                SELECT id, title, file_name, file_type, source_url, upload_date, metadata, is_active,
+                       content_hash, document_key
+                FROM documents
+                WHERE document_key = %s AND is_active = TRUE
+                ORDER BY id DESC
+                LIMIT 1
+            """, (document_key,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            cursor.execute("""
+                SELECT id, chunk_index, metadata,
+                       COALESCE(chunk_hash, encode(sha256(convert_to(chunk_text, 'UTF8')), 'hex')) AS chunk_hash
+                FROM document_chunks
+                WHERE document_id = %s
+                ORDER BY chunk_index, id
+            """, (row['id'],))
+            chunks = [
+                DocumentChunk(id=chunk['id'], document_id=row['id'], chunk_index=chunk['chunk_index'],
+                              metadata=chunk['metadata'], chunk_hash=chunk['chunk_hash'])
+                for chunk in cursor.fetchall()
+            ]
+            return Document.from_dict(row), chunks
+
+    @staticmethod
+    def _plan_chunk_updates(previous: List[DocumentChunk], chunks: List[DocumentChunk]
+                            ) -> Tuple[List[DocumentChunk], List[DocumentChunk], List[DocumentChunk], List[int]]:
+        """
+        새 버전 청크에 기존 청크 ID 배정 → (위치만 바뀐 청크, 덮어쓸 청크, 새로 추가할 청크, 삭제할 청크 ID)
+
+        embedding 이 None 인 청크는 같은 해시의 기존 청크를 재사용하는 청크입니다 (ingest_document 에서 결정).
+        새로 임베딩한 청크는 남은 기존 청크 행을 순서대로 받아 덮어쓰고, 모자라면 추가, 남으면 삭제합니다.
+        """
+        pools: Dict[str, deque] = defaultdict(deque)
+        for old in previous:
+            pools[old.chunk_hash].append(old)
+        moved, fresh = [], []
+        for chunk in chunks:
+            if chunk.embedding is not None:
+                fresh.append(chunk)
+                continue
+            old = pools[chunk.chunk_hash].popleft()
+            chunk.id = old.id
+            if (old.chunk_index, old.metadata) != (chunk.chunk_index, chunk.metadata):
+                moved.append(chunk)
+        stale = sorted((old for pool in pools.values() for old in pool), key=lambda old: old.chunk_index)
+        for chunk, old in zip(fresh, stale):
+            chunk.id = old.id
+        return moved, fresh[:len(stale)], fresh[len(stale):], [old.id for old in stale[len(fresh):]]
+
+    def update_document_with_chunks(self, document: Document, expected_hash: Optional[str],
+                                    moved: List[DocumentChunk], rewritten: List[DocumentChunk],
+                                    inserted: List[DocumentChunk], stale_ids: List[int]) -> List[int]:
+        """
+        기존 문서를 새 버전으로 갱신 (바뀐 행만 쓰기, 단일 트랜잭션) - 새로 추가한 청크 ID 반환
+
+        비교에 쓴 버전(expected_hash) 이후 다른 작업이 문서를 먼저 바꿨으면 DocumentChangedError 를 냅니다.
+        """
+        with get_db_cursor() as (cursor, conn):
+            cursor.execute("""
+                UPDATE documents
+                SET title = %s, file_name = %s, file_type = %s, content = %s, metadata = %s,
+                    content_hash = %s, upload_date = CURRENT_TIMESTAMP
+                WHERE id = %s AND is_active = TRUE AND content_hash IS NOT DISTINCT FROM %s
+            """, (
+                document.title,
+                document.file_name,
+                document.file_type,
+                document.content,
+                json.dumps(document.metadata) if document.metadata else None,
+                document.content_hash,
+                document.id,
+                expected_hash
+            ))
+            if cursor.rowcount == 0:
+                raise DocumentChangedError(f"문서(ID {document.id})가 적재 중 다른 작업으로 변경되었습니다.")
+            if moved:
+                execute_values(
+                    cursor,
+                    """
+                        UPDATE document_chunks AS dc SET chunk_index = v.chunk_index, metadata = v.metadata
+                        FROM (VALUES %s) AS v(id, chunk_index, metadata)
+                        WHERE dc.id = v.id
+                    """,
+                    [(chunk.id, chunk.chunk_index, json.dumps(chunk.metadata) if chunk.metadata else None)
+                     for chunk in moved],
+                    template="(%s, %s, %s::jsonb)",
+                    page_size=CHUNK_INSERT_PAGE_SIZE
+                )
+            if rewritten:
+                execute_values(
+                    cursor,
+                    """
+                        UPDATE document_chunks AS dc
+                        SET chunk_text = v.chunk_text, chunk_index = v.chunk_index, embedding = v.embedding,
+                            metadata = v.metadata, chunk_hash = v.chunk_hash, tokens = v.tokens
+                        FROM (VALUES %s) AS v(id, chunk_text, chunk_index, embedding, metadata, chunk_hash, tokens)
+                        WHERE dc.id = v.id
+                    """,
+                    [(chunk.id,) + ChunkService._chunk_row(chunk) for chunk in rewritten],
+                    template="(%s, %s, %s, %s, %s::jsonb, %s, %s::text[])",
+                    page_size=CHUNK_INSERT_PAGE_SIZE
+                )
+            if stale_ids:
+                cursor.execute("DELETE FROM document_chunks WHERE id = ANY(%s)", (stale_ids,))
+            inserted_ids = self._insert_chunks(cursor, document.id, inserted)
+            for chunk, chunk_id in zip(inserted, inserted_ids):
+                chunk.id = chunk_id
+            DocumentService.record_corpus_change(cursor, document.id, "update")
+            conn.commit()
+            return inserted_ids
+
+    @staticmethod
+    def _build_chunks(chunks: List[str], embeddings: np.ndarray,
+                      page_ranges: Optional[List[Tuple[Optional[int], Optional[int]]]] = None) -> List[DocumentChunk]:
+        built = []
+        for i, (chunk_text, embedding) in enumerate(zip(chunks, embeddings)):
+            metadata = {"chunk_size": len(chunk_text)}
+            if page_ranges is not None:
+                metadata["page_start"], metadata["page_end"] = page_ranges[i]
+            built.append(DocumentChunk(
                 chunk_text=chunk_text,
                 chunk_index=i,
                 embedding=embedding,
-                metadata={"chunk_size": len(chunk_text)}
-            )
-            
-            # 청크 저장
-            chunk_id = self.create_chunk(chunk)
-            chunk_ids.append(chunk_id)
-        
-        return chunk_ids
+                metadata=metadata
+            ))
+        return built
     
     def _split_text_into_chunks(self, text: str, chunk_size: int, chunk_overlap: int) -> List[str]:
         """텍스트를 청크로 분할"""
-        chunks = []
-        start = 0
-        
-        while start < len(text):
-            end = start + chunk_size
-            chunk = text[start:end]
-            
-            # 문장 경계에서 자르기 (개선된 분할)
-            if end < len(text):
-                last_period = chunk.rfind('.')
-                last_newline = chunk.rfind('\n')
-                last_space = chunk.rfind(' ')
-                
-                # 가장 적절한 분할점 찾기
-                split_point = max(last_period, last_newline, last_space)
-                if split_point > start + chunk_size // 2:  # 너무 작은 청크 방지
-                    chunk = text[start:start + split_point + 1]
-                    end = start + split_point + 1
-            
-            chunks.append(chunk.strip())
-            start = end - chunk_overlap
-            
-            if start >= len(text):
-                break
-        
-        return [chunk for chunk in chunks if chunk.strip()]
+        spans, _ = _chunk_spans(text, 0, chunk_size, chunk_overlap)
+        chunks = (text[start:end].strip() for start, end in spans)
+        return [chunk for chunk in chunks if chunk]
     
     def create_chunk(self, chunk: DocumentChunk) -> int:
         """단일 청크 생성"""
         with get_db_cursor() as (cursor, conn):
             query = """
-                INSERT INTO document_chunks (document_id, chunk_text, chunk_index, embedding, metadata)
-                VALUES (%s, %s, %s, %s, %s)
+                INSERT INTO document_chunks (document_id, chunk_text, chunk_index, embedding, metadata, chunk_hash, tokens)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
                 RETURNING id
             """
             # DocumentChunk 객체의 속성을 직접 전달
-            cursor.execute(query, (
-                chunk.document_id,
-                chunk.chunk_text,
-                chunk.chunk_index,
-                chunk.embedding,
-                json.dumps(chunk.metadata) if chunk.metadata else None
-            ))
+            cursor.execute(query, (chunk.document_id,) + self._chunk_row(chunk))
             chunk_id = cursor.fetchone()['id']
+            DocumentService.record_corpus_change(cursor, chunk.document_id, "update")
             conn.commit()
             return chunk_id
     
     def create_chunks(self, document_id: int, chunks: List[DocumentChunk]) -> List[int]:
-        """문서 청크들 생성"""
+        """문서 청크들 생성 (단일 트랜잭션, 다중 행 INSERT)"""
         with get_db_cursor() as (cursor, conn):
-            chunk_ids = []
-            for chunk in chunks:
-                chunk.document_id = document_id
-                query = """
-                    INSERT INTO document_chunks (document_id, chunk_text, chunk_index, embedding, metadata)
-                    VALUES (%(document_id)s, %(chunk_text)s, %(chunk_index)s, %(embedding)s, %(metadata)s)
-                    RETURNING id
-                """
-                cursor.execute(query, chunk.to_dict())
-                chunk_id = cursor.fetchone()['id']
-                chunk_ids.append(chunk_id)
+            chunk_ids = self._insert_chunks(cursor, document_id, chunks)
+            DocumentService.record_corpus_change(cursor, document_id, "update")
             conn.commit()
             logger.info(f"청크 {len(chunks)}개 생성 완료: 문서 ID {document_id}")
             return chunk_ids
 
-    def search_similar_chunks(self, query_embedding: List[float], 
+    @staticmethod
+    def _insert_chunks(cursor, document_id: int, chunks: List[DocumentChunk]) -> List[int]:
+        """주어진 커서(트랜잭션)에 청크 일괄 INSERT - 커밋은 호출자가 담당"""
+        if not chunks:
+            return []
+        rows = []
+        for chunk in chunks:
+            chunk.document_id = document_id
+            rows.append((document_id,) + ChunkService._chunk_row(chunk))
+        returned = execute_values(
+            cursor,
+            """
+                INSERT INTO document_chunks (document_id, chunk_text, chunk_index, embedding, metadata, chunk_hash, tokens)
+                VALUES %s
+                RETURNING id
+            """,
+            rows,
+            page_size=CHUNK_INSERT_PAGE_SIZE,
+            fetch=True
+        )
+        return [row['id'] for row in returned]
+
+    @staticmethod
+    def _chunk_row(chunk: DocumentChunk) -> Tuple[Any, ...]:
+        """청크 저장 컬럼 값 (chunk_text, chunk_index, embedding, metadata, chunk_hash, tokens)"""
+        if chunk.chunk_hash is None:
+            chunk.chunk_hash = text_hash(chunk.chunk_text)
+        return (
+            chunk.chunk_text,
+            chunk.chunk_index,
+            Vector.of(chunk.embedding),
+            json.dumps(chunk.metadata) if chunk.metadata else None,
+            chunk.chunk_hash,
+            ChunkService._chunk_tokens(chunk)
+        )
+
+    @staticmethod
+    def _chunk_tokens(chunk: DocumentChunk) -> List[str]:
+        """적재 시 한 번만 계산하는 청크 정규화 토큰 집합 (질의 시 키워드 확인은 집합 교집합으로)"""
+        if chunk.tokens is None:
+            chunk.tokens = token_set(chunk.chunk_text)
+        return chunk.tokens
+
+    def backfill_chunk_tokens(self, batch_size: int = CHUNK_INSERT_PAGE_SIZE) -> int:
+        """tokens 컬럼이 비어 있는 기존 청크의 토큰 계산 - 갱신한 청크 수 반환"""
+        updated = 0
+        while True:
+            with get_db_cursor() as (cursor, conn):
+                cursor.execute(
+                    "SELECT id, chunk_text FROM document_chunks WHERE tokens IS NULL ORDER BY id LIMIT %s",
+                    (batch_size,)
+                )
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                execute_values(
+                    cursor,
+                    """
+                        UPDATE document_chunks AS dc SET tokens = v.tokens
+                        FROM (VALUES %s) AS v(id, tokens)
+                        WHERE dc.id = v.id
+                    """,
+                    [(row['id'], token_set(row['chunk_text'])) for row in rows],
+                    template="(%s, %s::text[])",
+                    page_size=batch_size
+                )
+                conn.commit()
+                updated += len(rows)
+        logger.info(f"청크 토큰 백필 완료: {updated}개")
+        return updated
+
+    def search_similar_chunks(self, query_embedding: Union[np.ndarray, List[float]], 
                             match_threshold: float = 0.7, 
-                            match_count: int = 5) -> List[SearchResult]:
-        """유사한 청크 검색"""
+                            match_count: int = 5,
+                            search_params: Optional[VectorSearchParams] = None) -> List[SearchResult]:
+        """
+        유사한 청크 검색 (인덱스 스캔 친화적)
+        
+        거리 계산은 한 번만 하고, 내부 쿼리는 ORDER BY distance LIMIT 만 사용해
+        HNSW/IVFFlat 인덱스를 항상 타도록 합니다. 비활성 문서/임계값 필터는
+        인덱스 스캔 이후 바깥 쿼리에서 적용합니다.
+        """
+        candidate_count = match_count * VECTOR_CANDIDATE_FACTOR
         with get_db_cursor() as (cursor, conn):
+            self._apply_search_params(cursor, search_params, candidate_count)
             query = """
+                WITH nearest AS (
+                    SELECT
+                        dc.id,
+                        dc.document_id,
+                        dc.chunk_text,
+                        dc.metadata,
+                        dc.tokens,
+                        dc.embedding <=> %(embedding)s::vector AS distance
+                    FROM document_chunks dc
+                    ORDER BY distance
+                    LIMIT %(candidate_count)s
+                )
                 SELECT 
-                    dc.id as chunk_id,
-                    dc.document_id,
-                    dc.chunk_text,
-                    1 - (dc.embedding <=> %s::vector) as similarity,
-                    dc.metadata,
+                    n.id as chunk_id,
+                    n.document_id,
+                    n.chunk_text,
+                    1 - n.distance as similarity,
+                    n.metadata,
+                    n.tokens,
                     d.title as document_title,
                     d.source_url
-                FROM document_chunks dc
-                JOIN documents d ON dc.document_id = d.id
+                FROM nearest n
+                JOIN documents d ON n.document_id = d.id
                 WHERE d.is_active = TRUE
-                AND 1 - (dc.embedding <=> %s::vector) > %s
-                ORDER BY dc.embedding <=> %s::vector
-                LIMIT %s
+                AND 1 - n.distance > %(threshold)s
+                ORDER BY n.distance
+                LIMIT %(match_count)s
             """
-            cursor.execute(query, (query_embedding, query_embedding, match_threshold, query_embedding, match_count))
+            cursor.execute(query, {
+                'embedding': Vector(query_embedding),
+                'candidate_count': candidate_count,
+                'threshold': match_threshold,
+                'match_count': match_count,
+            })
             results = cursor.fetchall()
             
-            search_results = []
-            for row in results:
-                # metadata 처리 - 이미 딕셔너리인 경우와 JSON 문자열인 경우 모두 처리
-                metadata = row['metadata']
-                if isinstance(metadata, str):
-                    try:
-                        metadata = json.loads(metadata)
-                    except (json.JSONDecodeError, TypeError):
-                        metadata = None
-                elif metadata is None:
-                    metadata = None
-                
-                search_results.append(SearchResult(
-                    chunk_id=row['chunk_id'],
-                    document_id=row['document_id'],
-                    chunk_text=row['chunk_text'],
-                    similarity=float(row['similarity']),
-                    metadata=metadata,
-                    document_title=row['document_title'],
-                    source_url=row['source_url']
-                ))
-            
-            return search_results
+            return [self._row_to_search_result(row) for row in results]
 
     def search_by_keywords(self, query: str, match_count: int = 5) -> List[SearchResult]:
-        """키워드 기반 검색"""
-        # 호랑이 관련 키워드들
-        keywords = [
-            "호작도", "용호도", "산신도", "호렵도", "월하송림호족도", "호호도",
-            "호랑이", "범", "호", "까치", "호족도"
-        ]
-        
-        # 쿼리에서 키워드 추출
-        found_keywords = [kw for kw in keywords if kw in query]
-        
-        # 호호도 관련 키워드 매핑 (호호도 -> 호작도)
-        if "호호도" in found_keywords and "호작도" not in found_keywords:
-            found_keywords.append("호작도")
-            print(f"키워드 검색 - 호호도 관련으로 호작도 추가")
-        
-        print(f"키워드 검색 - 쿼리: {query}")
-        print(f"키워드 검색 - 찾은 키워드: {found_keywords}")
-        
-        if not found_keywords:
-            print("키워드 검색 - 매칭되는 키워드 없음")
+        """키워드 기반 검색 (BM25 역색인 점수 순)"""
+        hits = self._keyword_hits(query, match_count)
+        if not hits:
+            logger.info("키워드 검색 - 매칭되는 청크 없음")
             return []
         
         with get_db_cursor() as (cursor, conn):
-            # 키워드로 검색
-            keyword_conditions = " OR ".join([f"dc.chunk_text ILIKE '%{kw}%'" for kw in found_keywords])
-            
-            query_sql = f"""
+            query_sql = """
                 SELECT 
                     dc.id as chunk_id,
                     dc.document_id,
                     dc.chunk_text,
-                    0.9 as similarity,
+                    k.keyword_score as similarity,
+                    k.keyword_score,
                     dc.metadata,
+                    dc.tokens,
                     d.title as document_title,
                     d.source_url
-                FROM document_chunks dc
+                FROM unnest(%(keyword_ids)s::int[], %(keyword_scores)s::float8[])
+                    WITH ORDINALITY AS k(chunk_id, keyword_score, keyword_rank)
+                JOIN document_chunks dc ON dc.id = k.chunk_id
                 JOIN documents d ON dc.document_id = d.id
                 WHERE d.is_active = TRUE
-                AND ({keyword_conditions})
-                ORDER BY dc.id
-                LIMIT {match_count}
+                ORDER BY k.keyword_rank
             """
+            cursor.execute(query_sql, {
+                'keyword_ids': [chunk_id for chunk_id, _ in hits],
+                'keyword_scores': [score for _, score in hits],
+            })
+            results = cursor.fetchall()
             
-            print(f"키워드 검색 SQL: {query_sql}")
-            
-            cursor.execute(query_sql)
+            return [self._row_to_search_result(row) for row in results]
+
+    def hybrid_search(self, query_embedding: Union[np.ndarray, List[float]], query: str,
+                      vector_count: int = 5, keyword_count: int = 5,
+                      match_threshold: float = 0.0,
+                      search_params: Optional[VectorSearchParams] = None) -> List[SearchResult]:
+        """
+        벡터 + 키워드 하이브리드 검색 (단일 SQL, 1회 왕복)
+        
+        두 검색 경로를 CTE 로 실행하고 chunk_id 기준으로 중복 제거한 뒤
+        문서 테이블은 마지막에 한 번만 조인합니다.
+        쿼리 벡터는 query_vector CTE 로 한 번만 전송합니다.
+        키워드 경로는 BM25 역색인 결과(chunk_id, 정규화 점수)를 배열로 넘겨 unnest 합니다.
+        결과 순서는 벡터 검색 순위 → 키워드 전용 결과(BM25 순위) 순이며,
+        각 행에 vector_similarity / keyword_score 를 함께 담습니다.
+        """
+        keyword_hits = self._keyword_hits(query, keyword_count)
+        candidate_count = vector_count * VECTOR_CANDIDATE_FACTOR
+        
+        with span("vector_search"), get_db_cursor() as (cursor, conn):
+            self._apply_search_params(cursor, search_params, candidate_count)
+            query_sql = """
+                WITH query_vector AS (
+                    SELECT %(embedding)s::vector AS embedding
+                ),
+                vector_arm AS (
+                    SELECT
+                        dc.id AS chunk_id,
+                        dc.document_id,
+                        dc.embedding <=> (SELECT embedding FROM query_vector) AS distance
+                    FROM document_chunks dc
+                    ORDER BY distance
+                    LIMIT %(candidate_count)s
+                ),
+                vector_ranked AS (
+                    SELECT
+                        v.chunk_id,
+                        1 - v.distance AS vector_similarity,
+                        row_number() OVER (ORDER BY v.distance) AS vector_rank
+                    FROM vector_arm v
+                    JOIN documents d ON v.document_id = d.id
+                    WHERE d.is_active = TRUE
+                    AND 1 - v.distance > %(threshold)s
+                    ORDER BY v.distance
+                    LIMIT %(vector_count)s
+                ),
+                keyword_arm AS (
+                    SELECT k.chunk_id, k.keyword_score, k.keyword_rank
+                    FROM unnest(%(keyword_ids)s::int[], %(keyword_scores)s::float8[])
+                        WITH ORDINALITY AS k(chunk_id, keyword_score, keyword_rank)
+                    JOIN document_chunks dc ON dc.id = k.chunk_id
+                    JOIN documents d ON dc.document_id = d.id
+                    WHERE d.is_active = TRUE
+                ),
+                candidates AS (
+                    SELECT
+                        COALESCE(v.chunk_id, k.chunk_id) AS chunk_id,
+                        v.vector_similarity,
+                        v.vector_rank,
+                        k.keyword_score,
+                        k.keyword_rank
+                    FROM vector_ranked v
+                    FULL OUTER JOIN keyword_arm k ON v.chunk_id = k.chunk_id
+                )
+                SELECT
+                    c.chunk_id,
+                    dc.document_id,
+                    dc.chunk_text,
+                    COALESCE(c.vector_similarity, c.keyword_score) AS similarity,
+                    COALESCE(c.vector_similarity, 1 - (dc.embedding <=> (SELECT embedding FROM query_vector))) AS vector_similarity,
+                    c.keyword_score,
+                    dc.metadata,
+                    dc.tokens,
+                    d.title as document_title,
+                    d.source_url
+                FROM candidates c
+                JOIN document_chunks dc ON dc.id = c.chunk_id
+                JOIN documents d ON dc.document_id = d.id
+                ORDER BY c.vector_rank NULLS LAST, c.keyword_rank
+            """
+            cursor.execute(query_sql, {
+                'embedding': Vector(query_embedding),
+                'candidate_count': candidate_count,
+                'vector_count': vector_count,
+                'threshold': match_threshold,
+                'keyword_ids': [chunk_id for chunk_id, _ in keyword_hits],
+                'keyword_scores': [score for _, score in keyword_hits],
+            })
             results = cursor.fetchall()
             
-            search_results = []
-            for row in results:
-                # metadata 처리
-                metadata = row['metadata']
-                if isinstance(metadata, str):
-                    try:
-                        metadata = json.loads(metadata)
-                    except (json.JSONDecodeError, TypeError):
-                        metadata = None
-                elif metadata is None:
-                    metadata = None
-                
-                search_results.append(SearchResult(
-                    chunk_id=row['chunk_id'],
-                    document_id=row['document_id'],
-                    chunk_text=row['chunk_text'],
-                    similarity=float(row['similarity']),
-                    metadata=metadata,
-                    document_title=row['document_title'],
-                    source_url=row['source_url']
-                ))
+            return [self._row_to_search_result(row) for row in results]
+
+    @staticmethod
+    def _keyword_hits(query: str, limit: int) -> List[Tuple[int, float]]:
+        """BM25 상위 청크 (chunk_id, 포화 변환한 절대 점수 0~1 - bm25_index.saturate)"""
+        with span("keyword_search"):
+            hits = bm25_index.search(query, limit)
+        logger.info(f"키워드 검색 - 쿼리: {query}, BM25 결과 {len(hits)}개")
+        if not hits:
+            return []
+        return [(chunk_id, saturate(score)) for chunk_id, score in hits]
+
+    def _apply_search_params(self, cursor, search_params: Optional[VectorSearchParams],
+                             candidate_count: int):
+        """현재 트랜잭션에만 적용되는 인덱스 검색 파라미터 설정 (SET LOCAL)"""
+        ef_search = search_params.ef_search if search_params and search_params.ef_search else None
+        probes = search_params.probes if search_params and search_params.probes else DEFAULT_PROBES
+        # HNSW 는 ef_search 보다 많은 결과를 돌려주지 못하므로 후보 수 이상으로 보장
+        ef_search = max(ef_search or DEFAULT_EF_SEARCH, candidate_count)
+        cursor.execute("SELECT set_config('hnsw.ef_search', %s, true)", (str(ef_search),))
+        if probes:
+            cursor.execute("SELECT set_config('ivfflat.probes', %s, true)", (str(probes),))
+
+    def rebuild_vector_index(self, method: Optional[str] = None) -> Dict[str, Any]:
+        """
+        벡터 인덱스를 현재 데이터 기준으로 재생성 (대량 적재 후 실행)
+        
+        CREATE INDEX CONCURRENTLY 로 새 인덱스를 만든 뒤 기존 인덱스를 교체하므로
+        검색 트래픽을 막지 않습니다. 인덱스 파라미터는 행 수에 맞춰 자동 결정됩니다.
+        
+        Args:
+            method: 'hnsw' 또는 'ivfflat' (None 이면 pgvector 버전에 따라 자동 선택)
             
-            return search_results
+        Returns:
+            dict: 사용한 방식, 파라미터, 행 수, 소요 시간
+        """
+        started = time.perf_counter()
+        with get_db_connection() as conn:
+            # CONCURRENTLY 는 트랜잭션 블록 밖에서만 실행 가능
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT count(*) FROM document_chunks WHERE embedding IS NOT NULL")
+                row_count = cursor.fetchone()[0]
+                cursor.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+                version_row = cursor.fetchone()
+                pgvector_version = version_row[0] if version_row else "0"
+
+                if method is None:
+                    method = "hnsw" if self._supports_hnsw(pgvector_version) else "ivfflat"
+                if method not in ("hnsw", "ivfflat"):
+                    raise ValueError(f"지원하지 않는 인덱스 방식: {method}")
+
+                params = self._tune_index_params(method, row_count)
+                with_clause = ", ".join(f"{key} = {value}" for key, value in params["build"].items())
+                temp_name = f"{VECTOR_INDEX_NAME}_new"
+
+                cursor.execute(
+                    "SELECT indexname FROM pg_indexes "
+                    "WHERE tablename = 'document_chunks' AND indexdef ~* 'using (hnsw|ivfflat)'"
+                )
+                old_indexes = [row[0] for row in cursor.fetchall()]
+
+                logger.info(f"벡터 인덱스 재생성 시작: {method} ({with_clause}), 행 수 {row_count}")
+                cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {temp_name}")
+                cursor.execute(
+                    f"CREATE INDEX CONCURRENTLY {temp_name} ON document_chunks "
+                    f"USING {method} (embedding vector_cosine_ops) WITH ({with_clause})"
+                )
+                for index_name in old_indexes:
+                    if index_name != temp_name:
+                        cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"')
+                cursor.execute(f"ALTER INDEX {temp_name} RENAME TO {VECTOR_INDEX_NAME}")
+                cursor.execute("ANALYZE document_chunks")
+
+        elapsed = time.perf_counter() - started
+        logger.info(f"벡터 인덱스 재생성 완료: {elapsed:.1f}초")
+        return {
+            "method": method,
+            "row_count": row_count,
+            "build_params": params["build"],
+            "recommended_search_params": params["search"],
+            "replaced_indexes": old_indexes,
+            "elapsed_seconds": round(elapsed, 2),
+        }
+
+    @staticmethod
+    def _supports_hnsw(pgvector_version: str) -> bool:
+        """HNSW 는 pgvector 0.5.0 이상에서 지원"""
+        try:
+            major, minor = (int(part) for part in pgvector_version.split(".")[:2])
+        except ValueError:
+            return False
+        return (major, minor) >= (0, 5)
+
+    @staticmethod
+    def _tune_index_params(method: str, row_count: int) -> Dict[str, Dict[str, int]]:
+        """행 수에 따른 인덱스 빌드/검색 파라미터 (pgvector 권장값 기준)"""
+        if method == "hnsw":
+            if row_count < 100_000:
+                build = {"m": 16, "ef_construction": 64}
+            else:
+                build = {"m": 24, "ef_construction": 128}
+            return {"build": build, "search": {"ef_search": DEFAULT_EF_SEARCH}}
+
+        # IVFFlat: 100만 행 이하는 rows / 1000, 그 이상은 sqrt(rows) 개의 리스트
+        if row_count <= 1_000_000:
+            lists = max(1, row_count // 1000)
+        else:
+            lists = int(math.sqrt(row_count))
+        return {"build": {"lists": lists}, "search": {"probes": max(1, int(math.sqrt(lists)))}}
+
+    @staticmethod
+    def _row_to_search_result(row: Dict[str, Any]) -> SearchResult:
+        """검색 쿼리 결과 행을 SearchResult 로 변환"""
+        # metadata 처리 - 이미 딕셔너리인 경우와 JSON 문자열인 경우 모두 처리
+        metadata = row['metadata']
+        if isinstance(metadata, str):
+            try:
+                metadata = json.loads(metadata)
+            except (json.JSONDecodeError, TypeError):
+                metadata = None
+        
+        vector_similarity = row.get('vector_similarity')
+        keyword_score = row.get('keyword_score')
+        return SearchResult(
+            chunk_id=row['chunk_id'],
+            document_id=row['document_id'],
+            chunk_text=row['chunk_text'],
+            similarity=float(row['similarity']),
+            metadata=metadata,
+            document_title=row['document_title'],
+            source_url=row['source_url'],
+            vector_similarity=float(vector_similarity) if vector_similarity is not None else None,
+            keyword_score=float(keyword_score) if keyword_score is not None else None,
+            tokens=row.get('tokens')
+        )
 
     def delete_chunks_by_document(self, document_id: int) -> bool:
         """문서의 모든 청크 삭제"""
         with get_db_cursor() as (cursor, conn):
             query = "DELETE FROM document_chunks WHERE document_id = %s"
             cursor.execute(query, (document_id,))
+            deleted = cursor.rowcount > 0
+            if deleted:
+                DocumentService.record_corpus_change(cursor, document_id, "update")
             conn.commit()
-            return cursor.rowcount > 0
+            return deleted
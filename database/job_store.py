@@ -0,0 +1,78 @@
+"""
+문서 적재 작업 상태 저장소 (ingestion_jobs 테이블)
+
+작업은 업로드를 받은 프로세스의 작업 스레드가 처리하지만, uvicorn 워커가 여러 개면
+GET /admin/jobs/{job_id} 는 다른 프로세스로 갈 수 있습니다. 그래서 services/ingestion_jobs 가
+상태가 바뀔 때마다 IngestionJob.to_dict() 를 여기에 기록하고, 자기 프로세스에 없는 작업은 여기서 읽습니다.
+"""
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from database.connection import get_db_cursor
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = """
+    id AS job_id, kind, title, status, stage, attempts, max_attempts,
+    chunks_done, chunks_total, result, error,
+    EXTRACT(EPOCH FROM created_at)::float8 AS created_at,
+    EXTRACT(EPOCH FROM started_at)::float8 AS started_at,
+    EXTRACT(EPOCH FROM finished_at)::float8 AS finished_at,
+    EXTRACT(EPOCH FROM updated_at)::float8 AS updated_at
+"""
+
+
+class IngestionJobStore:
+    """적재 작업 상태를 PostgreSQL 에 기록/조회 (값은 IngestionJob.to_dict() 형식)"""
+
+    def save(self, state: Dict[str, Any]):
+        """작업 상태 upsert"""
+        with get_db_cursor() as (cursor, conn):
+            cursor.execute("""
+                INSERT INTO ingestion_jobs (
+                    id, kind, title, status, stage, attempts, max_attempts,
+                    chunks_done, chunks_total, result, error, created_at, started_at, finished_at, updated_at
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
+                          to_timestamp(%s), to_timestamp(%s), to_timestamp(%s), CURRENT_TIMESTAMP)
+                ON CONFLICT (id) DO UPDATE SET
+                    status = EXCLUDED.status,
+                    stage = EXCLUDED.stage,
+                    attempts = EXCLUDED.attempts,
+                    chunks_done = EXCLUDED.chunks_done,
+                    chunks_total = EXCLUDED.chunks_total,
+                    result = EXCLUDED.result,
+                    error = EXCLUDED.error,
+                    started_at = EXCLUDED.started_at,
+                    finished_at = EXCLUDED.finished_at,
+                    updated_at = CURRENT_TIMESTAMP
+            """, (
+                state["job_id"], state["kind"], state["title"], state["status"], state["stage"],
+                state["attempts"], state["max_attempts"],
+                state["progress"]["chunks_done"], state["progress"]["chunks_total"],
+                json.dumps(state["result"]) if state["result"] is not None else None,
+                state["error"], state["created_at"], state["started_at"], state["finished_at"]
+            ))
+            conn.commit()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 상태 (없으면 None)"""
+        with get_db_cursor() as (cursor, conn):
+            cursor.execute(f"SELECT {_COLUMNS} FROM ingestion_jobs WHERE id = %s", (job_id,))
+            row = cursor.fetchone()
+        return self._to_state(row) if row else None
+
+    def list(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """최근 작업부터 상태 목록"""
+        with get_db_cursor() as (cursor, conn):
+            cursor.execute(f"SELECT {_COLUMNS} FROM ingestion_jobs ORDER BY created_at DESC LIMIT %s", (limit,))
+            rows = cursor.fetchall()
+        return [self._to_state(row) for row in rows]
+
+    @staticmethod
+    def _to_state(row: Dict[str, Any]) -> Dict[str, Any]:
+        state = dict(row)
+        state["progress"] = {"chunks_done": state.pop("chunks_done"), "chunks_total": state.pop("chunks_total")}
+        if isinstance(state["result"], str):
+            state["result"] = json.loads(state["result"])
+        return state
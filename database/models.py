@@ -2,9 +2,11 @@
 데이터베이스 모델 정의
 """
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
 from datetime import datetime
 import json
+import numpy as np
+from utils.korean_tokenizer import token_set
 
 @dataclass
 class Document:
@@ -17,6 +19,8 @@ class Document:
     content: str = ""
     metadata: Optional[Dict[str, Any]] = None
     is_active: bool = True
+    content_hash: Optional[str] = None  # 업로드 원본 SHA-256 (같은 내용 재업로드 감지)
+    document_key: Optional[str] = None  # 문서 식별 키 (같은 키로 다시 적재하면 같은 문서의 새 버전)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -28,7 +32,9 @@ class Document:
             'upload_date': self.upload_date,
             'content': self.content,
             'metadata': json.dumps(self.metadata) if self.metadata else None,
-            'is_active': self.is_active
+            'is_active': self.is_active,
+            'content_hash': self.content_hash,
+            'document_key': self.document_key
         }
 
     @classmethod
@@ -60,7 +66,9 @@ class Document:
             upload_date=data.get('upload_date'),
             content=data.get('content', ''),
             metadata=parsed_metadata,
-            is_active=data.get('is_active', True)
+            is_active=data.get('is_active', True),
+            content_hash=data.get('content_hash'),
+            document_key=data.get('document_key')
         )
 
 @dataclass
@@ -69,9 +77,11 @@ class DocumentChunk:
     document_id: int = 0
     chunk_text: str = ""
     chunk_index: int = 0
-    embedding: Optional[List[float]] = None
+    embedding: Optional[np.ndarray] = None  # float32, vector_adapter 가 pgvector 와 변환
     metadata: Optional[Dict[str, Any]] = None
     created_at: Optional[datetime] = None
+    tokens: Optional[List[str]] = None  # 정규화 토큰 집합 (적재 시 korean_tokenizer.token_set 으로 계산)
+    chunk_hash: Optional[str] = None  # chunk_text SHA-256 (재적재 시 바뀐 청크 판별)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -81,7 +91,9 @@ class DocumentChunk:
             'chunk_index': self.chunk_index,
             'embedding': self.embedding,
             'metadata': json.dumps(self.metadata) if self.metadata else None,
-            'created_at': self.created_at
+            'created_at': self.created_at,
+            'tokens': self.tokens,
+            'chunk_hash': self.chunk_hash
         }
 
     @classmethod
@@ -93,7 +105,9 @@ class DocumentChunk:
             chunk_index=data.get('chunk_index', 0),
             embedding=data.get('embedding'),
             metadata=json.loads(data['metadata']) if data.get('metadata') else None,
-            created_at=data.get('created_at')
+            created_at=data.get('created_at'),
+            tokens=data.get('tokens'),
+            chunk_hash=data.get('chunk_hash')
         )
 
 @dataclass
@@ -105,3 +119,51 @@ class SearchResult:
     metadata: Optional[Dict[str, Any]] = None
     document_title: Optional[str] = None
     source_url: Optional[str] = None
+    # 하이브리드 검색 시 각 검색 경로(arm)별 점수 (디버깅용)
+    vector_similarity: Optional[float] = None
+    keyword_score: Optional[float] = None
+    rerank_score: Optional[float] = None  # Cross-encoder 재정렬 점수
+    tokens: Optional[List[str]] = None  # 청크 정규화 토큰 (document_chunks.tokens)
+
+    def token_set(self) -> Set[str]:
+        """청크 토큰 집합 (tokens 컬럼이 비어 있는 이전 데이터는 chunk_text 로 계산)"""
+        return set(self.tokens) if self.tokens is not None else set(token_set(self.chunk_text))
+
+
+@dataclass
+class VectorSearchParams:
+    """요청별 벡터 인덱스 검색 파라미터 (None 이면 서버 기본값 사용)"""
+    ef_search: Optional[int] = None  # HNSW: 탐색 후보 리스트 크기 (클수록 recall↑, 속도↓)
+    probes: Optional[int] = None     # IVFFlat: 탐색할 리스트 수 (클수록 recall↑, 속도↓)
+
+
+@dataclass
+class PdfPage:
+    """PDF 에서 추출한 페이지 하나 (number 는 1부터)"""
+    number: int
+    text: str
+
+@dataclass
+class IngestionResult:
+    """문서 적재 결과 (문서 1건 + 청크 일괄 저장)"""
+    document_id: int
+    chunk_ids: List[int]
+    embedding_seconds: float = 0.0
+    insert_seconds: float = 0.0
+    status: str = "created"  # created: 새 문서, updated: 바뀐 청크만 반영, unchanged: 같은 내용이라 건너뜀
+    chunks_embedded: int = 0  # 새로 임베딩한 청크 수 (나머지는 기존 청크/임베딩 재사용)
+    chunks_deleted: int = 0  # 새 버전에 없어 삭제한 기존 청크 수
+
+    @property
+    def chunks_reused(self) -> int:
+        return len(self.chunk_ids) - self.chunks_embedded
+
+    @property
+    def total_seconds(self) -> float:
+        return self.embedding_seconds + self.insert_seconds
+
+    @property
+    def chunks_per_second(self) -> float:
+        if self.total_seconds <= 0:
+            return 0.0
+        return len(self.chunk_ids) / self.total_seconds
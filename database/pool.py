@@ -0,0 +1,257 @@
+"""
+PostgreSQL 커넥션 풀
+
+요청마다 TCP + TLS + 인증 핸드셰이크를 반복하지 않도록 연결을 재사용합니다.
+- 최소/최대 크기 제한
+- 최대 연결 수명(max lifetime) 초과 시 재생성
+- 체크아웃 시 생존 확인(liveness check)
+- 대기 타임아웃 및 대기 시간 히스토그램
+"""
+import threading
+import time
+import logging
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+logger = logging.getLogger(__name__)
+
+# 대기 시간 히스토그램 버킷 (초)
+WAIT_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolTimeoutError(Exception):
+    """대기 타임아웃 내에 연결을 얻지 못한 경우"""
+
+
+class ConnectionPool:
+    """스레드 안전한 커넥션 풀"""
+
+    def __init__(self, connect: Callable[[], Any], min_size: int = 1, max_size: int = 10,
+                 max_lifetime: float = 1800.0, max_idle: float = 300.0,
+                 wait_timeout: float = 5.0, health_check_interval: float = 30.0):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"잘못된 풀 크기: min={min_size}, max={max_size}")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.wait_timeout = wait_timeout
+        self.health_check_interval = health_check_interval
+
+        self._cond = threading.Condition()
+        # (conn, created_at, last_used_at)
+        self._idle: Deque[Tuple[Any, float, float]] = deque()
+        # id(conn) -> created_at
+        self._in_use: Dict[int, float] = {}
+        self._size = 0
+        self._waiters = 0
+        self._closed = False
+
+        # 메트릭
+        self._wait_buckets: List[int] = [0] * (len(WAIT_TIME_BUCKETS) + 1)
+        self._wait_sum = 0.0
+        self._wait_count = 0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+
+    # ------------------------------------------------------------------
+    # 체크아웃 / 반납
+    # ------------------------------------------------------------------
+    def getconn(self):
+        """풀에서 연결을 꺼냄 (필요시 새로 생성, 가득 차면 대기)"""
+        started = time.monotonic()
+        deadline = started + self.wait_timeout
+
+        while True:
+            candidate = None
+            create = False
+            with self._cond:
+                if self._closed:
+                    raise PoolTimeoutError("커넥션 풀이 닫혔습니다")
+                self._waiters += 1
+                try:
+                    while not self._idle and self._size >= self.max_size:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._timeouts += 1
+                            raise PoolTimeoutError(
+                                f"{self.wait_timeout:.1f}초 내에 DB 연결을 얻지 못했습니다 "
+                                f"(사용 중 {len(self._in_use)}/{self.max_size})"
+                            )
+                        self._cond.wait(remaining)
+                finally:
+                    self._waiters -= 1
+
+                if self._idle:
+                    candidate = self._idle.pop()  # LIFO: 최근 사용 연결 우선
+                else:
+                    self._size += 1
+                    create = True
+
+            if create:
+                conn, created_at = self._open_connection()
+            else:
+                conn, created_at, last_used = candidate
+                if not self._is_usable(conn, created_at, last_used):
+                    self._close_connection(conn)
+                    continue
+
+            with self._cond:
+                self._in_use[id(conn)] = created_at
+                self._record_wait(time.monotonic() - started)
+            return conn
+
+    def putconn(self, conn, discard: bool = False):
+        """연결을 풀에 반납 (discard=True 이면 폐기)"""
+        with self._cond:
+            created_at = self._in_use.pop(id(conn), None)
+        if created_at is None:
+            logger.warning("풀에서 빌려가지 않은 연결 반납 시도 - 무시")
+            return
+
+        now = time.monotonic()
+        discard = (discard or self._closed or conn.closed
+                   or (now - created_at) > self.max_lifetime)
+        if not discard:
+            discard = not self._reset(conn)
+
+        if discard:
+            self._close_connection(conn)
+            return
+
+        with self._cond:
+            self._idle.append((conn, created_at, now))
+            expired = self._pop_expired_idle(now)
+            self._cond.notify()
+        for stale in expired:
+            self._close_connection(stale)
+
+    # ------------------------------------------------------------------
+    # 관리
+    # ------------------------------------------------------------------
+    def warm(self):
+        """min_size 만큼 연결을 미리 생성"""
+        conns = []
+        try:
+            while True:
+                with self._cond:
+                    if self._size >= self.min_size:
+                        break
+                conns.append(self.getconn())
+        finally:
+            for conn in conns:
+                self.putconn(conn)
+
+    def closeall(self):
+        """모든 유휴 연결 종료 (사용 중 연결은 반납 시 종료)"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn, _, _ in idle:
+            self._close_connection(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """풀 메트릭 (사용 중/유휴/대기자 수, 대기 시간 히스토그램)"""
+        with self._cond:
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip(WAIT_TIME_BUCKETS, self._wait_buckets):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            buckets["+Inf"] = cumulative + self._wait_buckets[-1]
+            return {
+                "size": self._size,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "waiters": self._waiters,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "connections_created": self._created,
+                "connections_discarded": self._discarded,
+                "wait_timeouts": self._timeouts,
+                "wait_time_seconds": {
+                    "buckets": buckets,
+                    "sum": round(self._wait_sum, 6),
+                    "count": self._wait_count,
+                },
+            }
+
+    # ------------------------------------------------------------------
+    # 내부 헬퍼
+    # ------------------------------------------------------------------
+    def _open_connection(self) -> Tuple[Any, float]:
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._created += 1
+        return conn, time.monotonic()
+
+    def _close_connection(self, conn):
+        try:
+            conn.close()
+        except Exception as e:
+            logger.debug(f"연결 종료 중 오류 무시: {e}")
+        with self._cond:
+            self._size -= 1
+            self._discarded += 1
+            self._cond.notify()
+
+    def _is_usable(self, conn, created_at: float, last_used: float) -> bool:
+        """체크아웃 시 생존 확인: 수명 초과/끊김 여부, 오래 쉰 연결은 SELECT 1"""
+        now = time.monotonic()
+        if conn.closed or (now - created_at) > self.max_lifetime:
+            return False
+        if (now - last_used) < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception as e:
+            logger.info(f"끊어진 DB 연결 폐기: {e}")
+            return False
+
+    def _reset(self, conn) -> bool:
+        """반납 전 트랜잭션 상태 초기화"""
+        try:
+            if conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            if conn.autocommit:
+                conn.autocommit = False
+            return True
+        except Exception as e:
+            logger.info(f"연결 초기화 실패 - 폐기: {e}")
+            return False
+
+    def _pop_expired_idle(self, now: float) -> List[Any]:
+        """min_size 를 넘는 오래된 유휴 연결을 꺼냄 (lock 보유 상태에서 호출)"""
+        expired = []
+        while self._idle and (self._size - len(expired)) > self.min_size:
+            conn, created_at, last_used = self._idle[0]
+            if (now - last_used) <= self.max_idle:
+                break
+            self._idle.popleft()
+            expired.append(conn)
+        return expired
+
+    def _record_wait(self, elapsed: float):
+        for i, bound in enumerate(WAIT_TIME_BUCKETS):
+            if elapsed <= bound:
+                self._wait_buckets[i] += 1
+                break
+        else:
+            self._wait_buckets[-1] += 1
+        self._wait_sum += elapsed
+        self._wait_count += 1
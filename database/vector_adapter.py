@@ -0,0 +1,77 @@
+"""
+pgvector <-> numpy 변환 어댑터
+
+- 전송: Vector(배열) 로 감싼 파라미터를 pgvector 텍스트 리터럴('[0.1,0.2,...]'::vector)로 직접 변환
+  (.tolist() 후 psycopg2 가 ARRAY[...] 로 만드는 경로보다 CPU/바이트 모두 적음).
+  np.ndarray 전체에 전역 어댑터를 등록하지 않으므로, 벡터가 아닌 배열 파라미터의 기본 변환에는 영향이 없습니다.
+- 수신: vector 타입 컬럼을 numpy float32 배열로 파싱
+
+psycopg2 는 파라미터를 항상 텍스트로 보내므로 pgvector 바이너리 포맷은 쓸 수 없습니다.
+대신 float32 최단 표현(str(np.float32))으로 손실 없이 가장 짧은 텍스트를 만듭니다.
+"""
+import logging
+from typing import Optional
+
+import numpy as np
+from psycopg2.extensions import ISQLQuote, new_type, register_type
+
+logger = logging.getLogger(__name__)
+
+
+def to_vector_literal(vector) -> str:
+    """1차원 벡터를 pgvector 텍스트 표현으로 변환"""
+    array = np.asarray(vector, dtype=np.float32)
+    if array.ndim != 1:
+        raise ValueError(f"vector 는 1차원이어야 합니다: shape={array.shape}")
+    # np.float32 의 str 은 float32 를 정확히 복원하는 최단 10진 표현
+    return "[" + ",".join(map(str, array)) + "]"
+
+
+def parse_vector(value: Optional[str], cursor=None) -> Optional[np.ndarray]:
+    """pgvector 텍스트 출력('[1,2,3]')을 numpy float32 배열로 변환"""
+    if value is None:
+        return None
+    body = value[1:-1]
+    if not body:
+        return np.empty(0, dtype=np.float32)
+    return np.array(body.split(","), dtype=np.float32)
+
+
+class Vector:
+    """pgvector 파라미터 (psycopg2 에 넘기면 '[...]'::vector 로 변환, 배열/리스트 모두 가능)"""
+
+    def __init__(self, array):
+        self._array = array
+
+    @classmethod
+    def of(cls, array) -> Optional["Vector"]:
+        """None 은 그대로 두고(NULL) 나머지는 Vector 로 감쌈"""
+        return None if array is None else cls(array)
+
+    def __conform__(self, protocol):
+        if protocol is ISQLQuote:
+            return self
+
+    def prepare(self, conn):
+        pass
+
+    def getquoted(self) -> bytes:
+        return f"'{to_vector_literal(self._array)}'::vector".encode("ascii")
+
+
+def register_vector(conn) -> bool:
+    """
+    연결에 vector 타입 캐스터 등록 (조회 결과의 embedding 이 numpy 배열로 반환됨)
+
+    pgvector 확장이 없는 DB 에서는 아무것도 하지 않습니다.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT oid FROM pg_type WHERE typname = 'vector'")
+        row = cursor.fetchone()
+    # 타입 조회 트랜잭션이 풀에 열린 채 남지 않도록 정리
+    conn.rollback()
+    if row is None:
+        logger.warning("pgvector 타입을 찾을 수 없어 vector 캐스터를 등록하지 않습니다.")
+        return False
+    register_type(new_type((row[0],), "VECTOR", parse_vector), conn)
+    return True
@@ -0,0 +1,367 @@
+"""
+프로세스 내 벡터 인덱스 미러 (numpy)
+
+전시 코퍼스는 수천 개의 384차원 청크라 전부 메모리에 올려도 몇 MB 입니다.
+활성 문서의 청크 임베딩을 정규화된 float32 행렬 하나로 보관하고,
+행렬-벡터 곱 한 번 + argpartition 으로 정확한(exact) top-k 검색을 합니다.
+
+- 갱신: corpus_change_log 에서 아직 반영하지 않은 변경의 문서만 다시 읽음
+  (BM25 색인과 같은 database/change_log.ChangeLogCursor 로 늦게 커밋된 낮은 ID 까지 추적)
+- 폴백: 미러가 없거나 오래되면(MAX_STALENESS 초 이상 갱신 실패) PostgreSQL 검색 사용
+- 선택: VECTOR_SEARCH_BACKEND=memory 일 때 get_chunk_service() 가 미러 사용 서비스를 반환
+"""
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from database.change_log import ChangeLogCursor
+from database.connection import get_db_cursor
+from database.document_service import ChunkService
+from database.models import SearchResult, VectorSearchParams
+from utils.metrics import span
+
+logger = logging.getLogger(__name__)
+
+VECTOR_SEARCH_BACKEND = os.getenv('VECTOR_SEARCH_BACKEND', 'postgres')  # 'postgres' | 'memory'
+# 변경 로그 확인 주기 (초) - 검색 요청 시 주기가 지났으면 갱신
+MIRROR_REFRESH_INTERVAL = float(os.getenv('VECTOR_MIRROR_REFRESH_INTERVAL', '5'))
+# 마지막 성공 갱신 후 이 시간이 지나면 미러를 쓰지 않고 PostgreSQL 로 폴백 (초)
+MIRROR_MAX_STALENESS = float(os.getenv('VECTOR_MIRROR_MAX_STALENESS', '60'))
+# 한 번에 이보다 많은 문서가 바뀌었으면 증분 대신 전체 재적재
+MIRROR_FULL_RELOAD_DOCUMENTS = int(os.getenv('VECTOR_MIRROR_FULL_RELOAD_DOCUMENTS', '200'))
+
+
+@dataclass
+class _Snapshot:
+    """읽기 전용 미러 스냅샷 - 갱신 시 통째로 교체하므로 검색 중 잠금 불필요"""
+    matrix: np.ndarray          # (n, dim) float32, 행 단위 L2 정규화
+    chunk_ids: np.ndarray       # (n,) int64, 오름차순
+    document_ids: np.ndarray    # (n,) int64
+    rows: List[Dict[str, Any]]  # 청크 텍스트/메타데이터/문서 정보
+    log_cursor: ChangeLogCursor  # 반영한 corpus_change_log 위치
+
+    @property
+    def version(self) -> int:
+        """반영한 corpus_change_log 마지막 ID"""
+        return self.log_cursor.version
+
+    @classmethod
+    def empty(cls, log_cursor: ChangeLogCursor = ChangeLogCursor()) -> "_Snapshot":
+        return cls(np.empty((0, 0), dtype=np.float32), np.empty(0, dtype=np.int64),
+                   np.empty(0, dtype=np.int64), [], log_cursor)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+class VectorMirror:
+    """활성 청크 임베딩의 메모리 미러"""
+
+    def __init__(self, refresh_interval: float = MIRROR_REFRESH_INTERVAL,
+                 max_staleness: float = MIRROR_MAX_STALENESS):
+        self.refresh_interval = refresh_interval
+        self.max_staleness = max_staleness
+        self._snapshot: Optional[_Snapshot] = None
+        self._refresh_lock = threading.Lock()
+        self._last_checked = 0.0
+        self._last_success = 0.0
+        self.full_loads = 0
+        self.incremental_refreshes = 0
+        self.refresh_failures = 0
+
+    # ----------------- 적재/갱신 -----------------
+
+    def _load_rows(self, cursor, document_ids: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+        query = """
+            SELECT
+                dc.id AS chunk_id,
+                dc.document_id,
+                dc.chunk_text,
+                dc.embedding,
+                dc.metadata,
+                dc.tokens,
+                d.title AS document_title,
+                d.source_url
+            FROM document_chunks dc
+            JOIN documents d ON dc.document_id = d.id
+            WHERE d.is_active = TRUE
+            AND dc.embedding IS NOT NULL
+        """
+        params = ()
+        if document_ids is not None:
+            query += " AND dc.document_id = ANY(%s)"
+            params = (list(document_ids),)
+        cursor.execute(query + " ORDER BY dc.id", params)
+        return cursor.fetchall()
+
+    @staticmethod
+    def _build(rows: List[Dict[str, Any]], log_cursor: ChangeLogCursor) -> _Snapshot:
+        if not rows:
+            return _Snapshot.empty(log_cursor)
+        matrix = _normalize_rows(np.stack([np.asarray(row['embedding'], dtype=np.float32) for row in rows]))
+        entries = []
+        for row in rows:
+            metadata = row['metadata']
+            if isinstance(metadata, str):
+                try:
+                    metadata = json.loads(metadata)
+                except (json.JSONDecodeError, TypeError):
+                    metadata = None
+            entries.append({
+                'chunk_id': row['chunk_id'],
+                'document_id': row['document_id'],
+                'chunk_text': row['chunk_text'],
+                'metadata': metadata,
+                'tokens': row.get('tokens'),
+                'document_title': row['document_title'],
+                'source_url': row['source_url'],
+            })
+        return _Snapshot(
+            matrix=matrix,
+            chunk_ids=np.array([row['chunk_id'] for row in rows], dtype=np.int64),
+            document_ids=np.array([row['document_id'] for row in rows], dtype=np.int64),
+            rows=entries,
+            log_cursor=log_cursor
+        )
+
+    def load(self):
+        """전체 재적재"""
+        with get_db_cursor() as (cursor, conn):
+            # 위치를 먼저 읽음 - 이후 커밋된 변경은 다음 갱신 때 한 번 더 반영될 뿐 (문서 단위 교체라 멱등)
+            log_cursor = ChangeLogCursor.start(cursor)
+            snapshot = self._build(self._load_rows(cursor), log_cursor)
+        self._snapshot = snapshot
+        self.full_loads += 1
+        logger.info(f"벡터 미러 전체 적재: 청크 {len(snapshot.rows)}개, 버전 {snapshot.version}")
+
+    def refresh(self):
+        """변경 로그 기준 증분 갱신 (미러가 없으면 전체 적재)"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.load()
+            return
+
+        with get_db_cursor() as (cursor, conn):
+            changes, log_cursor = snapshot.log_cursor.poll(cursor)
+            if not changes:
+                return
+            document_ids = {change['document_id'] for change in changes}
+            if None in document_ids or len(document_ids) > MIRROR_FULL_RELOAD_DOCUMENTS:
+                full_reload = True
+            else:
+                full_reload = False
+                changed_rows = self._load_rows(cursor, sorted(document_ids))
+
+        if full_reload:
+            self.load()
+            return
+
+        self._snapshot = self._merge(snapshot, document_ids, self._build(changed_rows, log_cursor))
+        self.incremental_refreshes += 1
+        logger.info(f"벡터 미러 증분 갱신: 문서 {len(document_ids)}개, 버전 {log_cursor.version}, "
+                    f"대기 중인 변경 ID {len(log_cursor.gaps)}개")
+
+    @staticmethod
+    def _merge(snapshot: _Snapshot, document_ids: set, changed: _Snapshot) -> _Snapshot:
+        """바뀐 문서의 기존 행을 빼고 새로 읽은 행을 합쳐 chunk_id 순으로 정렬한 새 스냅샷"""
+        keep = ~np.isin(snapshot.document_ids, list(document_ids))
+        rows = [row for row, flag in zip(snapshot.rows, keep) if flag] + changed.rows
+        if not rows:
+            return _Snapshot.empty(changed.log_cursor)
+
+        matrix = np.vstack([m for m in (snapshot.matrix[keep], changed.matrix) if m.shape[0]])
+        chunk_ids = np.concatenate([snapshot.chunk_ids[keep], changed.chunk_ids])
+        order = np.argsort(chunk_ids, kind="stable")
+        return _Snapshot(
+            matrix=np.ascontiguousarray(matrix[order]),
+            chunk_ids=chunk_ids[order],
+            document_ids=np.concatenate([snapshot.document_ids[keep], changed.document_ids])[order],
+            rows=[rows[i] for i in order],
+            log_cursor=changed.log_cursor
+        )
+
+    def maybe_refresh(self):
+        """갱신 주기가 지났으면 갱신 (다른 스레드가 갱신 중이면 기다리지 않음)"""
+        if time.monotonic() - self._last_checked < self.refresh_interval:
+            return
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_checked = time.monotonic()
+            self.refresh()
+            self._last_success = time.monotonic()
+        except Exception as e:
+            self.refresh_failures += 1
+            logger.error(f"벡터 미러 갱신 실패: {e}")
+        finally:
+            self._refresh_lock.release()
+
+    def is_fresh(self) -> bool:
+        return self._snapshot is not None and time.monotonic() - self._last_success < self.max_staleness
+
+    # ----------------- 검색 -----------------
+
+    def search(self, query_embedding, match_threshold: float = 0.7, match_count: int = 5) -> List[SearchResult]:
+        """ChunkService.search_similar_chunks 와 같은 의미의 정확한 코사인 검색"""
+        snapshot = self._snapshot
+        scores = self._scores(snapshot, query_embedding)
+        return [self._to_result(snapshot, i, float(scores[i])) for i in self._top_k(scores, match_threshold, match_count)]
+
+    def hybrid_search(self, query_embedding, keyword_hits: Sequence[Tuple[int, float]],
+                      vector_count: int = 5, match_threshold: float = 0.0) -> List[SearchResult]:
+        """ChunkService.hybrid_search 와 같은 결과 순서/점수의 메모리 버전 (keyword_hits 는 BM25 결과)"""
+        snapshot = self._snapshot
+        scores = self._scores(snapshot, query_embedding)
+        vector_rows = list(self._top_k(scores, match_threshold, vector_count))
+
+        # 키워드 경로: BM25 순위 그대로, 미러에 없는(비활성) 청크는 제외
+        keyword_rows: Dict[int, float] = {}
+        if keyword_hits and snapshot.rows:
+            hit_ids = np.array([chunk_id for chunk_id, _ in keyword_hits], dtype=np.int64)
+            positions = np.minimum(np.searchsorted(snapshot.chunk_ids, hit_ids), len(snapshot.rows) - 1)
+            for (chunk_id, keyword_score), i in zip(keyword_hits, positions.tolist()):
+                if snapshot.chunk_ids[i] == chunk_id:
+                    keyword_rows[i] = keyword_score
+
+        results = []
+        for i in vector_rows:
+            result = self._to_result(snapshot, i, float(scores[i]))
+            result.vector_similarity = result.similarity
+            result.keyword_score = keyword_rows.get(i)
+            results.append(result)
+        vector_set = set(vector_rows)
+        for i, keyword_score in keyword_rows.items():
+            if i in vector_set:
+                continue
+            result = self._to_result(snapshot, i, keyword_score)
+            result.vector_similarity = float(scores[i])
+            result.keyword_score = keyword_score
+            results.append(result)
+        return results
+
+    @staticmethod
+    def _scores(snapshot: _Snapshot, query_embedding) -> np.ndarray:
+        if not snapshot.rows:
+            return np.empty(0, dtype=np.float32)
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+        return snapshot.matrix @ query
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, threshold: float, k: int) -> np.ndarray:
+        """임계값 초과 점수 중 상위 k 개 행 번호 (점수 내림차순)"""
+        candidates = np.flatnonzero(scores > threshold)
+        if k <= 0 or candidates.size == 0:
+            return candidates[:0]
+        if candidates.size > k:
+            top = np.argpartition(-scores[candidates], k - 1)[:k]
+            candidates = candidates[top]
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+    @staticmethod
+    def _to_result(snapshot: _Snapshot, index: int, similarity: float) -> SearchResult:
+        row = snapshot.rows[index]
+        return SearchResult(
+            chunk_id=row['chunk_id'],
+            document_id=row['document_id'],
+            chunk_text=row['chunk_text'],
+            similarity=similarity,
+            metadata=row['metadata'],
+            document_title=row['document_title'],
+            source_url=row['source_url'],
+            tokens=row['tokens'],
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """미러 메트릭 (/health/detailed 용)"""
+        snapshot = self._snapshot
+        return {
+            "loaded": snapshot is not None,
+            "fresh": self.is_fresh(),
+            "chunks": len(snapshot.rows) if snapshot else 0,
+            "version": snapshot.version if snapshot else None,
+            "memory_mb": round(snapshot.matrix.nbytes / (1024 * 1024), 2) if snapshot else 0.0,
+            "seconds_since_refresh": round(time.monotonic() - self._last_success, 1) if self._last_success else None,
+            "full_loads": self.full_loads,
+            "incremental_refreshes": self.incremental_refreshes,
+            "refresh_failures": self.refresh_failures,
+        }
+
+
+class MirroredChunkService(ChunkService):
+    """검색은 메모리 미러로, 미러가 오래되었거나 없으면 PostgreSQL 로 폴백하는 ChunkService"""
+
+    def __init__(self, mirror: VectorMirror):
+        self.mirror = mirror
+        self.mirror_searches = 0
+        self.fallbacks = 0
+
+    def _use_mirror(self) -> bool:
+        self.mirror.maybe_refresh()
+        if self.mirror.is_fresh():
+            self.mirror_searches += 1
+            return True
+        self.fallbacks += 1
+        return False
+
+    def search_similar_chunks(self, query_embedding: Union[np.ndarray, List[float]],
+                              match_threshold: float = 0.7,
+                              match_count: int = 5,
+                              search_params: Optional[VectorSearchParams] = None) -> List[SearchResult]:
+        if not self._use_mirror():
+            return super().search_similar_chunks(query_embedding, match_threshold, match_count, search_params)
+        return self.mirror.search(query_embedding, match_threshold, match_count)
+
+    def hybrid_search(self, query_embedding: Union[np.ndarray, List[float]], query: str,
+                      vector_count: int = 5, keyword_count: int = 5,
+                      match_threshold: float = 0.0,
+                      search_params: Optional[VectorSearchParams] = None) -> List[SearchResult]:
+        if not self._use_mirror():
+            return super().hybrid_search(query_embedding, query, vector_count, keyword_count,
+                                         match_threshold, search_params)
+        keyword_hits = self._keyword_hits(query, keyword_count)
+        with span("vector_search"):
+            return self.mirror.hybrid_search(query_embedding, keyword_hits, vector_count, match_threshold)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "mirror_searches": self.mirror_searches,
+            "postgres_fallbacks": self.fallbacks,
+            **self.mirror.stats(),
+        }
+
+
+_chunk_service: Optional[ChunkService] = None
+_chunk_service_lock = threading.Lock()
+
+
+def get_chunk_service() -> ChunkService:
+    """검색용 ChunkService (VECTOR_SEARCH_BACKEND 설정에 따라 PostgreSQL 또는 메모리 미러)"""
+    global _chunk_service
+    if _chunk_service is None:
+        with _chunk_service_lock:
+            if _chunk_service is None:
+                if VECTOR_SEARCH_BACKEND == 'memory':
+                    _chunk_service = MirroredChunkService(VectorMirror())
+                else:
+                    _chunk_service = ChunkService()
+    return _chunk_service
+
+
+def get_vector_search_stats() -> Dict[str, Any]:
+    service = get_chunk_service()
+    if isinstance(service, MirroredChunkService):
+        return service.stats()
+    return {"backend": "postgres"}
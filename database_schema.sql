@@ -11,8 +11,17 @@ CREATE TABLE documents (
     upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     content TEXT, -- 원본 전체 텍스트
     metadata JSONB, -- 추가 메타데이터
-    is_active BOOLEAN DEFAULT TRUE
+    is_active BOOLEAN DEFAULT TRUE,
+    content_hash CHAR(64), -- 업로드 원본(텍스트 또는 PDF 바이트) SHA-256, 같은 내용 재업로드 감지용
+    document_key TEXT -- 문서 식별 키: 같은 키로 다시 적재하면 이 문서를 새 버전으로 갱신
+                      -- (관리자 업로드는 'admin:<지정 키>', 키가 없으면 'sha256:<content_hash>', upload_documents.py 는 URL/경로)
 );
+-- 기존 DB: ALTER TABLE documents ADD COLUMN content_hash CHAR(64);
+--          ALTER TABLE documents ADD COLUMN document_key TEXT;
+-- 이후 DocumentService().backfill_document_keys() 로 기존 문서의 키를 채움
+-- (source_url 이 있으면 그 값, 관리자 텍스트 업로드는 내용 해시 - 같은 내용을 다시 올려도 중복 문서가 생기지 않음)
+-- 기존 PDF 업로드는 원본 PDF 해시를 알 수 없으므로 PUT /admin/documents/{id}/key 로 키를 지정한 뒤
+-- 같은 document_key 로 다시 올리면 그 문서가 갱신됨 (키를 지정하지 않으면 새 문서로 추가)
 
 -- 2. 문서 청크 테이블 (RAG 검색용)
 CREATE TABLE document_chunks (
@@ -22,16 +31,57 @@ CREATE TABLE document_chunks (
     chunk_index INTEGER NOT NULL, -- 문서 내 청크 순서
     embedding VECTOR(384), -- 벡터 임베딩 (sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2)
     metadata JSONB, -- 청크별 메타데이터
+    tokens TEXT[], -- 정규화 토큰 집합 (조사 제거, 적재 시 계산 - utils/korean_tokenizer.token_set)
+    chunk_hash CHAR(64), -- chunk_text SHA-256 (재적재 시 바뀐 청크만 다시 임베딩)
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
+-- 기존 DB 는 컬럼 추가 후 ChunkService().backfill_chunk_tokens() 로 채움
+-- ALTER TABLE document_chunks ADD COLUMN tokens TEXT[];
+-- ALTER TABLE document_chunks ADD COLUMN chunk_hash CHAR(64);
+-- (chunk_hash 가 비어 있는 청크는 재적재 비교 시 chunk_text 로 계산)
 
 -- 3. 벡터 검색을 위한 인덱스
-CREATE INDEX ON document_chunks USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
+-- HNSW 는 빈 테이블에서 만들어도 품질이 유지됨 (IVFFlat 은 데이터 적재 후 생성해야 클러스터링이 의미 있음)
+-- 대량 적재 후에는 POST /admin/index/rebuild 로 행 수에 맞춰 재생성
+CREATE INDEX document_chunks_embedding_idx ON document_chunks USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
 
 -- 4. 일반 검색을 위한 인덱스
 CREATE INDEX ON document_chunks (document_id);
 CREATE INDEX ON documents (is_active);
 CREATE INDEX ON documents (file_type);
+CREATE INDEX ON documents (document_key); -- 재업로드 시 같은 키의 현재 문서 조회
+
+-- 4-1. 코퍼스 변경 로그 (문서 추가/수정/비활성화/삭제마다 한 행)
+-- MAX(id) 가 코퍼스 버전 - 응답 캐시 무효화 등에 사용
+-- 삭제된 문서도 기록해야 하므로 documents 를 참조(FK)하지 않음
+CREATE TABLE corpus_change_log (
+    id BIGSERIAL PRIMARY KEY,
+    document_id INTEGER,
+    action VARCHAR(20) NOT NULL, -- 'create', 'update', 'delete'
+    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 4-2. 문서 적재 작업 상태 (uvicorn 워커 여러 개가 같은 작업 상태를 조회하도록 공유)
+-- 작업은 업로드를 받은 프로세스가 처리하고, 상태가 바뀔 때마다 여기에 기록 (database/job_store.py)
+-- 기존 DB 는 이 CREATE TABLE 만 실행
+CREATE TABLE ingestion_jobs (
+    id VARCHAR(32) PRIMARY KEY, -- 작업 ID (uuid4 hex)
+    kind VARCHAR(20) NOT NULL, -- 'text', 'pdf'
+    title VARCHAR(255),
+    status VARCHAR(20) NOT NULL, -- queued → running (retrying) → succeeded/failed
+    stage VARCHAR(20) NOT NULL,
+    attempts INTEGER DEFAULT 0,
+    max_attempts INTEGER,
+    chunks_done INTEGER DEFAULT 0,
+    chunks_total INTEGER DEFAULT 0,
+    result JSONB,
+    error TEXT,
+    created_at TIMESTAMPTZ,
+    started_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP -- 진행 중인데 오래 갱신되지 않았으면 처리하던 프로세스가 종료된 것
+);
+CREATE INDEX ON ingestion_jobs (created_at);
 
 -- 5. 벡터 검색 함수 (코사인 유사도)
 CREATE OR REPLACE FUNCTION search_similar_chunks(
@@ -48,17 +98,29 @@ RETURNS TABLE (
 )
 LANGUAGE SQL
 AS $$
+    -- 인덱스 스캔(ORDER BY distance LIMIT)을 먼저 하고, 필터는 바깥에서 적용
+    WITH nearest AS (
+        SELECT
+            dc.id,
+            dc.document_id,
+            dc.chunk_text,
+            dc.metadata,
+            dc.embedding <=> query_embedding AS distance
+        FROM document_chunks dc
+        ORDER BY distance
+        LIMIT match_count * 4
+    )
     SELECT 
-        dc.id as chunk_id,
-        dc.document_id,
-        dc.chunk_text,
-        1 - (dc.embedding <=> query_embedding) as similarity,
-        dc.metadata
-    FROM document_chunks dc
-    JOIN documents d ON dc.document_id = d.id
+        n.id as chunk_id,
+        n.document_id,
+        n.chunk_text,
+        1 - n.distance as similarity,
+        n.metadata
+    FROM nearest n
+    JOIN documents d ON n.document_id = d.id
     WHERE d.is_active = TRUE
-    AND 1 - (dc.embedding <=> query_embedding) > match_threshold
-    ORDER BY dc.embedding <=> query_embedding
+    AND 1 - n.distance > match_threshold
+    ORDER BY n.distance
     LIMIT match_count;
 $$;
 
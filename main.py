@@ -5,14 +5,26 @@ Guidely RAG Server - 메인 애플리케이션
 import os
 import logging
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from sentence_transformers import CrossEncoder
 from dotenv import load_dotenv
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 
 from config.app_config import CROSS_ENCODER_MODEL
+from services.model_registry import model_registry
+from services.embedding_cache import embedding_cache
+from services.reranker import reranker
+from services.topic_gate import topic_gate
+from services.ingestion_jobs import ingestion_queue
+from services.response_cache import inflight, response_cache
+from database.bm25_index import bm25_index
+from database.connection import get_pool, get_pool_stats
+from database.vector_mirror import MirroredChunkService, get_chunk_service, get_vector_search_stats
+from utils.executors import executor_queue_depths, shutdown_executors
+from utils.pdf_extractor import shutdown_pdf_pool
+from utils.metrics import CONTENT_TYPE, MetricsMiddleware, metrics
 from controllers.rag_controller import router as rag_router
 from controllers.summary_controller import router as summary_router
 from controllers.admin_controller import router as admin_router
@@ -41,17 +53,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
-# 전역 변수
-cross_encoder: CrossEncoder | None = None
+# RAG 요청 단계별 지연 계측 (Server-Timing 헤더 + /metrics 히스토그램)
+app.add_middleware(MetricsMiddleware, path_prefixes=("/rag",))
+
+# 오토스케일러용 포화도 게이지
+metrics.gauge("guidely_db_pool_waiters", "DB 커넥션 풀 대기 스레드 수", lambda: get_pool_stats()["waiters"])
+metrics.gauge("guidely_db_pool_in_use", "사용 중인 DB 연결 수", lambda: get_pool_stats()["in_use"])
+metrics.gauge("guidely_db_pool_max_size", "DB 커넥션 풀 최대 크기", lambda: get_pool_stats()["max_size"])
+metrics.gauge("guidely_executor_queue_depth", "executor 실행 대기 작업 수",
+              lambda: {(name,): depth for name, depth in executor_queue_depths().items()}, ("executor",))
 
 
 @app.on_event("startup")
 def startup_event():
     """애플리케이션 시작시 초기화"""
-    global cross_encoder
-    
     print("===== RAG 서비스 초기화 중 =====")
     
     # 환경변수 확인
@@ -62,17 +80,35 @@ def startup_event():
     print(f"OPENAI_API_KEY: {'SET' if os.getenv('OPENAI_API_KEY') else 'NOT_SET'}")
 
     try:
-        print("===== Cross-encoder 모델 로드 중 =====")
-        cross_encoder = CrossEncoder(CROSS_ENCODER_MODEL)
-        print("===== Cross-encoder 모델 로드 완료 =====")
+        # 첫 요청이 콜드 로딩을 떠안지 않도록 공유 임베딩 모델 미리 로드
+        print("===== 임베딩 모델 로드 중 =====")
+        model_registry.get_embedding_model()
+        print("===== 임베딩 모델 로드 완료 =====")
+        
+        # 재정렬 사용 시 Cross-encoder 도 미리 로드
+        reranker.warm()
         
         # PostgreSQL 연결 테스트
         print("===== PostgreSQL 연결 테스트 =====")
         from database.connection import get_db_cursor
+        get_pool().warm()
         with get_db_cursor() as (cursor, conn):
             cursor.execute("SELECT 1")
             print("PostgreSQL 연결 성공")
         
+        # 메모리 벡터 미러 사용 시 첫 요청 전에 적재
+        chunk_service = get_chunk_service()
+        if isinstance(chunk_service, MirroredChunkService):
+            print("===== 벡터 미러 적재 중 =====")
+            chunk_service.mirror.maybe_refresh()
+        
+        # 키워드 검색용 BM25 색인 로드 (저장 파일이 없으면 DB 에서 생성)
+        print("===== BM25 색인 로드 중 =====")
+        bm25_index.get()
+        
+        # 주제 게이트용 코퍼스 주제 중심 벡터 계산
+        topic_gate.refresh()
+        
         print("===== PostgreSQL RAG 서비스 준비 완료 =====")
     except Exception as e:
         print(f"❌ 초기화 실패: {e}")
@@ -80,6 +116,15 @@ def startup_event():
         traceback.print_exc()
 
 
+@app.on_event("shutdown")
+def shutdown_event():
+    """애플리케이션 종료시 적재 작업 스레드, executor, PDF 추출 프로세스 및 커넥션 풀 정리"""
+    ingestion_queue.shutdown()
+    shutdown_executors()
+    shutdown_pdf_pool()
+    get_pool().closeall()
+
+
 @app.get("/", tags=["System"])
 async def root():
     """RAG 서비스 루트 엔드포인트"""
@@ -98,6 +143,11 @@ async def health_check():
         "service": "Guidely RAG Service"
     }
 
+@app.get("/metrics", tags=["System"], response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus 텍스트 형식 메트릭 (단계별 지연 히스토그램, 포화도 게이지)"""
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
+
 @app.get("/health/detailed", tags=["System"])
 async def detailed_health_check():
     """RAG 서비스 상세 헬스체크"""
@@ -105,7 +155,17 @@ async def detailed_health_check():
         "status": "healthy",
         "service": "Guidely RAG Service",
         "postgres_ready": True,
-        "cross_encoder_ready": cross_encoder is not None,
+        "cross_encoder_ready": model_registry.is_loaded("reranker", CROSS_ENCODER_MODEL),
+        "models": model_registry.stats(),
+        "db_pool": get_pool_stats(),
+        "embedding_cache": embedding_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "request_coalescing": inflight.stats(),
+        "vector_search": get_vector_search_stats(),
+        "keyword_index": bm25_index.stats(),
+        "reranker": reranker.stats(),
+        "topic_gate": topic_gate.stats(),
+        "ingestion": ingestion_queue.stats(),
         "description": "PostgreSQL-based RAG service for exhibition chatbot"
     }
 
@@ -9,6 +9,8 @@ class EnglishRAGQueryRequest(BaseModel):
     """English RAG query request model"""
     character: str = Field(..., description="Character name (rumi, yuna, etc.)")
     message: str = Field(..., description="User message in English")
+    ef_search: Optional[int] = Field(default=None, ge=1, le=1000, description="HNSW ef_search for vector search (optional, server default if omitted)")
+    probes: Optional[int] = Field(default=None, ge=1, le=1000, description="IVFFlat probes for vector search (optional, server default if omitted)")
     
     class Config:
         json_schema_extra = {
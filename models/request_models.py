@@ -1,13 +1,15 @@
 """
 요청 모델 정의
 """
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 
 class ChatRequest(BaseModel):
     message: str = Field(..., description="유저의 채팅 메시지", example="안녕하세요! 케이팝에 대해 알려주세요")
     character: str = Field(default="rumi", description="챗봇 페르소나", example="rumi")
+    ef_search: Optional[int] = Field(default=None, ge=1, le=1000, description="HNSW 벡터 검색 ef_search (선택, 미지정 시 서버 기본값)")
+    probes: Optional[int] = Field(default=None, ge=1, le=1000, description="IVFFlat 벡터 검색 probes (선택, 미지정 시 서버 기본값)")
 
     class Config:
         json_schema_extra = {
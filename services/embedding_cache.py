@@ -0,0 +1,71 @@
+"""
+쿼리 임베딩 캐시
+
+키오스크 방문자는 같은 질문을 반복하므로, 정규화된 질문 텍스트 + 모델 이름을 키로
+임베딩 결과를 LRU/TTL 캐시에 보관합니다. 한국어/영어 RAG 서비스가 같은 캐시를 공유합니다.
+정규화는 캐시 키에만 쓰고, 모델에는 원래 질문을 그대로 넣습니다 (캐시를 끄거나 비워도 검색 결과가 같도록).
+"""
+import re
+import unicodedata
+from typing import Dict, Optional
+
+import numpy as np
+
+from config.app_config import EMBEDDING_CACHE_SIZE, EMBEDDING_CACHE_TTL, EMBEDDING_MODEL
+from utils.executors import run_cpu_bound
+from utils.metrics import span
+from utils.ttl_cache import TTLCache
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """캐시 키용 질문 정규화 (유니코드 NFC, 공백 정리, 대소문자 통일)"""
+    text = unicodedata.normalize("NFC", text)
+    return _WHITESPACE.sub(" ", text).strip().casefold()
+
+
+class EmbeddingCache(TTLCache):
+    """LRU + TTL 임베딩 캐시 (float32 읽기 전용 배열로 저장)"""
+
+    def __init__(self, max_entries: int = EMBEDDING_CACHE_SIZE, ttl_seconds: float = EMBEDDING_CACHE_TTL):
+        super().__init__(max_entries, ttl_seconds)
+
+    def get(self, model_name: str, text: str) -> Optional[np.ndarray]:
+        """캐시된 임베딩 반환 (없거나 만료되면 None)"""
+        return super().get((model_name, normalize_query(text)))
+
+    def put(self, model_name: str, text: str, vector) -> np.ndarray:
+        """임베딩 저장 후 캐시에 보관된 배열 반환"""
+        stored = np.array(vector, dtype=np.float32)
+        stored.setflags(write=False)
+        return super().put((model_name, normalize_query(text)), stored)
+
+    def stats(self) -> Dict[str, float]:
+        """캐시 메트릭 (/health/detailed 용)"""
+        stats = super().stats()
+        stats["memory_kb"] = round(sum(v.nbytes for v in self.values()) / 1024, 1)
+        return stats
+
+
+# 프로세스 전역 캐시 (한국어/영어 서비스 공유)
+embedding_cache = EmbeddingCache()
+
+
+def encode_query(embedding_model, text: str, model_name: str = EMBEDDING_MODEL) -> np.ndarray:
+    """캐시를 거쳐 쿼리 임베딩 (캐시 미스일 때만 모델 forward pass)"""
+    with span("embedding"):
+        cached = embedding_cache.get(model_name, text)
+        if cached is not None:
+            return cached
+        return embedding_cache.put(model_name, text, embedding_model.encode(text))
+
+
+async def aencode_query(embedding_model, text: str, model_name: str = EMBEDDING_MODEL) -> np.ndarray:
+    """encode_query 의 비동기 버전 - 캐시 미스일 때만 CPU executor 사용"""
+    with span("embedding"):
+        cached = embedding_cache.get(model_name, text)
+        if cached is not None:
+            return cached
+        vector = await run_cpu_bound(embedding_model.encode, text)
+        return embedding_cache.put(model_name, text, vector)
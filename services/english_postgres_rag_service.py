@@ -3,15 +3,30 @@ English RAG service using PostgreSQL + pgvector for retrieval
 """
 import os
 import logging
-from typing import List, Dict, Any
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+import numpy as np
 from dotenv import load_dotenv
 
-from sentence_transformers import SentenceTransformer
-from langchain_openai import ChatOpenAI
 from langchain.schema import HumanMessage, SystemMessage
 
-from database.document_service import DocumentService, ChunkService
-from database.models import SearchResult
+from config.app_config import FUSION_SCORE_THRESHOLD
+from database.document_service import DocumentService
+from database.vector_mirror import get_chunk_service
+from database.models import SearchResult, VectorSearchParams
+from services.embedding_cache import aencode_query, encode_query
+from services.fusion import fuse
+from services.model_registry import get_embedding_model, get_llm
+from services.reranker import reranker
+from services.topic_gate import topic_gate
+from services.response_cache import (
+    acached_call, aresponse_cache_key, cached_call, inflight, label_cache_outcome, response_cache,
+    response_cache_key
+)
+from utils.executors import run_db_bound
+from utils.korean_tokenizer import query_terms
+from utils.metrics import span
+from utils.streaming import answer_events, static_answer_events
 
 # Load environment variables
 load_dotenv()
@@ -24,131 +39,257 @@ class EnglishPostgresRAGService:
     """English RAG service using PostgreSQL for retrieval"""
     
     def __init__(self):
-        # Initialize embedding model
-        self.embedding_model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
-        
-        # Initialize LLM
-        self.llm = ChatOpenAI(
+        # Shared models from the process-wide registry
+        self.embedding_model = get_embedding_model()
+        self.llm = get_llm(
             model=os.getenv('LLM_MODEL', 'gpt-4o-mini'),
-            temperature=float(os.getenv('LLM_TEMPERATURE', '0.7')),
-            api_key=os.getenv('OPENAI_API_KEY')
+            temperature=float(os.getenv('LLM_TEMPERATURE', '0.7'))
         )
         
         # Initialize services
         self.document_service = DocumentService()
-        self.chunk_service = ChunkService()
+        self.chunk_service = get_chunk_service()
         
         logger.info("English PostgresRAGService initialized successfully")
     
-    def generate_response(self, query: str, character: str = "rumi") -> Dict[str, Any]:
+    def generate_response(self, query: str, character: str = "rumi",
+                          search_params: Optional[VectorSearchParams] = None) -> Dict[str, Any]:
         """
         Generate English response using RAG
         
         Args:
             query: User query in English
             character: Character name (rumi, yuna, etc.)
+            search_params: Optional per-request vector index search parameters
             
         Returns:
             Dict containing response and sources
         """
         try:
-            logger.info(f"Generating English response for query: {query}")
-            
-            # Generate query embedding
-            query_embedding = self.embedding_model.encode(query).tolist()
-            
-            # Search for similar chunks using vector search
-            vector_results = self.chunk_service.search_similar_chunks(
-                query_embedding, 
-                match_threshold=0.0,  # Low threshold for broader results
-                match_count=10
-            )
-            
-            # Search for keyword matches
-            keyword_results = self.chunk_service.search_by_keywords(
-                query, 
-                match_count=10
-            )
-            
-            # Combine and deduplicate results
-            all_results = vector_results + keyword_results
-            unique_results = {}
-            for result in all_results:
-                if result.chunk_id not in unique_results:
-                    unique_results[result.chunk_id] = result
-            
-            # Sort by similarity score (higher is better)
-            sorted_results = sorted(
-                unique_results.values(), 
-                key=lambda x: x.similarity, 
-                reverse=True
-            )
-            
-            # Take top results
-            top_results = sorted_results[:5]
+            cache_key = response_cache_key(query, character, "en", search_params)
+            return cached_call(cache_key, self._generate_response, query, character, search_params)
             
-            logger.info(f"Found {len(top_results)} relevant chunks")
-            
-            # Check for "unknown information" - no results or low similarity
-            if not top_results:
-                logger.info("No search results found - generating 'unknown' response")
-                return self._generate_unknown_english_response(query, character)
-            
-            # Check maximum similarity score
-            max_similarity = max(result.similarity for result in top_results)
-            logger.info(f"Maximum similarity score: {max_similarity:.4f}")
-            
-            # Similarity threshold (if below 0.6, generate "unknown" response)
-            SIMILARITY_THRESHOLD = 0.6
-            if max_similarity < SIMILARITY_THRESHOLD:
-                logger.info(f"Similarity below threshold ({SIMILARITY_THRESHOLD}) - generating 'unknown' response")
-                return self._generate_unknown_english_response(query, character)
+        except Exception as e:
+            logger.error(f"Error generating English response: {e}")
+            return self._generate_error_response()
+    
+    def _generate_response(self, query: str, character: str,
+                           search_params: Optional[VectorSearchParams]) -> Dict[str, Any]:
+        """Run the RAG pipeline on a response cache miss (errors propagate and are not cached)"""
+        logger.info(f"Generating English response for query: {query}")
+        started = time.perf_counter()
+        
+        # Generate query embedding (shared cache)
+        query_embedding = encode_query(self.embedding_model, query)
+        
+        # Clearly off-topic questions get the unknown response without search or LLM calls
+        if not topic_gate.is_on_topic(query_embedding):
+            return self._generate_unknown_english_response(query, character)
+        
+        # Vector search + keyword search (single round trip)
+        top_results = self._rank_results(self._hybrid_search(query_embedding, query, search_params))
+        
+        if self._is_unknown(query, top_results):
+            return self._generate_unknown_english_response(query, character)
+        
+        # Optional cross-encoder rerank (skipped when the latency budget is spent)
+        top_results = reranker.rerank(query, top_results, started)
+        
+        # Generate response
+        with span("prompt"):
+            messages = self._build_messages(query, character, top_results)
+        with span("llm"):
+            response = self.llm.invoke(messages)
+        
+        return self._build_result(response.content, top_results)
+    
+    async def agenerate_response(self, query: str, character: str = "rumi",
+                                 search_params: Optional[VectorSearchParams] = None) -> Dict[str, Any]:
+        """
+        Async version of generate_response that never blocks the event loop
+        
+        Encoding runs on the CPU executor, database searches run concurrently
+        on the DB executor, and the LLM is called with ainvoke.
+        
+        Args:
+            query: User query in English
+            character: Character name (rumi, yuna, etc.)
+            search_params: Optional per-request vector index search parameters
             
-            # Additional validation: Check if question keywords are actually in search results
-            import re
-            english_words = re.findall(r'[a-zA-Z]{3,}', query)
-            question_keywords = english_words
+        Returns:
+            Dict containing response and sources
+        """
+        try:
+            cache_key = await aresponse_cache_key(query, character, "en", search_params)
+            return await acached_call(cache_key, self._agenerate_response, query, character, search_params)
             
-            context_text = " ".join([result.chunk_text for result in top_results]).lower()
-            keyword_found = any(keyword.lower() in context_text for keyword in question_keywords)
+        except Exception as e:
+            logger.error(f"Error generating English response: {e}")
+            return self._generate_error_response()
+    
+    async def _agenerate_response(self, query: str, character: str,
+                                  search_params: Optional[VectorSearchParams]) -> Dict[str, Any]:
+        """Async RAG pipeline run on a response cache miss"""
+        logger.info(f"Generating English response for query: {query}")
+        started = time.perf_counter()
+        
+        top_results = await self._aretrieve(query, search_params)
+        
+        if self._is_unknown(query, top_results):
+            return self._generate_unknown_english_response(query, character)
+        
+        # Optional cross-encoder rerank (skipped when the latency budget is spent)
+        top_results = await reranker.arerank(query, top_results, started)
+        
+        # Generate response
+        with span("prompt"):
+            messages = self._build_messages(query, character, top_results)
+        with span("llm"):
+            response = await self.llm.ainvoke(messages)
+        
+        return self._build_result(response.content, top_results)
+    
+    async def astream_response(self, query: str, character: str = "rumi",
+                               search_params: Optional[VectorSearchParams] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream an English response for voice playback
+        
+        Sends the sources first, then the LLM output split at sentence
+        boundaries, then a final done event.
+        
+        Args:
+            query: User query in English
+            character: Character name (rumi, yuna, etc.)
+            search_params: Optional per-request vector index search parameters
             
-            if not keyword_found and question_keywords:
-                logger.info(f"Question keywords({question_keywords}) not found in search results - generating 'unknown' response")
-                return self._generate_unknown_english_response(query, character)
+        Yields:
+            Dict with "event" name and "data" payload
+        """
+        try:
+            logger.info(f"Streaming English response for query: {query}")
             
-            # Build context from retrieved chunks
-            context_parts = []
-            sources = []
+            # Replay a cached answer in the same event format
+            cache_key = await aresponse_cache_key(query, character, "en", search_params)
+            cached = response_cache.get(cache_key) if cache_key else None
+            label_cache_outcome(cache_key, cached, ("stream", cache_key))
+            if cached is not None:
+                events = static_answer_events(cached["sources"], cached["response"])
+            elif cache_key:
+                # Identical concurrent questions subscribe to one shared stream
+                events = inflight.stream(("stream", cache_key), self._astream_pipeline,
+                                         query, character, search_params, cache_key)
+            else:
+                events = self._astream_pipeline(query, character, search_params, None)
             
-            for i, result in enumerate(top_results):
-                context_parts.append(result.chunk_text)
+            async for event in events:
+                yield event
                 
-                # Add detailed source information with ranking
-                source_info = {
-                    "source": result.source_url or f"Document: {result.document_title}",
-                    "content": result.chunk_text[:300],
-                    "ranking": i + 1,  # 1부터 시작하는 랭킹
-                    "similarity_score": round(result.similarity, 4),  # 유사도 점수
-                    "document_title": result.document_title,
-                    "chunk_id": result.chunk_id
-                }
-                sources.append(source_info)
-            
-            context = "\n\n".join(context_parts)
-            
-            # Create character-specific system prompt
-            character_prompts = {
-                "rumi": "You are Rumi, a cheerful and knowledgeable guide for the Tiger Exhibition at the National Museum. You love sharing interesting facts about Korean tiger art and culture. Keep your responses concise (2-3 sentences) and always reference specific artworks or cultural elements when possible.",
-                "mira": "You are Mira, a curious and adventurous guide for the Tiger Exhibition. You enjoy exploring new perspectives on traditional Korean art and connecting it to modern culture. Keep your responses concise (2-3 sentences) and always reference specific artworks or cultural elements when possible.",
-                "zoey": "You are Zoey, an imaginative and creative guide for the Tiger Exhibition. You love using metaphors and creative explanations to help visitors understand Korean tiger art. Keep your responses concise (2-3 sentences) and always reference specific artworks or cultural elements when possible.",
-                "jinu": "You are Jinu, a logical and systematic guide for the Tiger Exhibition. You focus on facts and provide clear, structured explanations about Korean tiger art and culture. Keep your responses concise (2-3 sentences) and always reference specific artworks or cultural elements when possible.",
-                "default": "You are a knowledgeable guide for the Tiger Exhibition at the National Museum. You help visitors understand Korean tiger art and culture. Keep your responses concise (2-3 sentences) and always reference specific artworks or cultural elements when possible."
-            }
-            
-            system_prompt = character_prompts.get(character, character_prompts["default"])
-            
-            # Create the prompt
-            prompt = f"""You are a guide for the Tiger Exhibition at the National Museum. Answer the user's question about Korean tiger art and culture based on the provided context.
+        except Exception as e:
+            logger.error(f"Error streaming English response: {e}")
+            error = self._generate_error_response()
+            yield {"event": "error", "data": error}
+    
+    async def _astream_pipeline(self, query: str, character: str,
+                                search_params: Optional[VectorSearchParams],
+                                cache_key) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming RAG pipeline; stores the finished answer in the response cache"""
+        started = time.perf_counter()
+        top_results = await self._aretrieve(query, search_params)
+        
+        if self._is_unknown(query, top_results):
+            unknown = self._generate_unknown_english_response(query, character)
+            events = static_answer_events(unknown["sources"], unknown["response"])
+        else:
+            top_results = await reranker.arerank(query, top_results, started)
+            with span("prompt"):
+                messages = self._build_messages(query, character, top_results)
+            events = answer_events(self._build_sources(top_results), self._astream_llm(messages))
+        
+        async for event in events:
+            if event["event"] == "done" and cache_key:
+                response_cache.put(cache_key, event["data"])
+            yield event
+    
+    async def _aretrieve(self, query: str,
+                         search_params: Optional[VectorSearchParams] = None) -> List[SearchResult]:
+        """Encode via the shared embedding cache (CPU executor on a miss), then run the hybrid search on the DB executor"""
+        query_embedding = await aencode_query(self.embedding_model, query)
+        
+        # Skip the search for clearly off-topic questions (empty results -> unknown response)
+        if not await topic_gate.ais_on_topic(query_embedding):
+            return []
+        
+        results = await run_db_bound(self._hybrid_search, query_embedding, query, search_params)
+        return self._rank_results(results)
+    
+    async def _astream_llm(self, messages: list) -> AsyncIterator[str]:
+        """Stream LLM output tokens"""
+        with span("llm"):
+            async for chunk in self.llm.astream(messages):
+                if chunk.content:
+                    yield chunk.content
+    
+    def _hybrid_search(self, query_embedding: np.ndarray, query: str,
+                       search_params: Optional[VectorSearchParams] = None) -> List[SearchResult]:
+        """Vector search + keyword search in one query, deduplicated by chunk_id"""
+        return self.chunk_service.hybrid_search(
+            query_embedding=query_embedding,
+            query=query,
+            vector_count=10,
+            keyword_count=10,
+            match_threshold=0.0,  # Low threshold for broader results
+            search_params=search_params
+        )
+    
+    def _rank_results(self, results: List[SearchResult]) -> List[SearchResult]:
+        """Fuse vector/keyword scores and keep the top 5 (similarity becomes the calibrated score)"""
+        with span("fusion"):
+            top_results = fuse(results, limit=5)
+        
+        logger.info(f"Found {len(top_results)} relevant chunks")
+        return top_results
+    
+    def _is_unknown(self, query: str, top_results: List[SearchResult]) -> bool:
+        """Check for "unknown information" - no results, low similarity or missing keywords"""
+        if not top_results:
+            logger.info("No search results found - generating 'unknown' response")
+            return True
+        
+        # Check maximum similarity score
+        max_similarity = max(result.similarity for result in top_results)
+        logger.info(f"Maximum similarity score: {max_similarity:.4f}")
+        
+        # Calibrated fusion score threshold (below it, generate "unknown" response)
+        if max_similarity < FUSION_SCORE_THRESHOLD:
+            logger.info(f"Similarity below threshold ({FUSION_SCORE_THRESHOLD}) - generating 'unknown' response")
+            return True
+        
+        # Additional validation: Check if question keywords are in the chunks' precomputed token sets
+        question_keywords = query_terms(query)
+        keyword_found = any(not question_keywords.isdisjoint(result.token_set()) for result in top_results)
+        
+        if not keyword_found and question_keywords:
+            logger.info(f"Question keywords({question_keywords}) not found in search results - generating 'unknown' response")
+            return True
+        return False
+    
+    def _build_messages(self, query: str, character: str, top_results: List[SearchResult]) -> list:
+        """Build the system + user messages for the LLM"""
+        context = "\n\n".join(result.chunk_text for result in top_results)
+        
+        # Create character-specific system prompt
+        character_prompts = {
+            "rumi": "You are Rumi, a cheerful and knowledgeable guide for the Tiger Exhibition at the National Museum. You love sharing interesting facts about Korean tiger art and culture. Keep your responses concise (2-3 sentences) and always reference specific artworks or cultural elements when possible.",
+            "mira": "You are Mira, a curious and adventurous guide for the Tiger Exhibition. You enjoy exploring new perspectives on traditional Korean art and connecting it to modern culture. Keep your responses concise (2-3 sentences) and always reference specific artworks or cultural elements when possible.",
+            "zoey": "You are Zoey, an imaginative and creative guide for the Tiger Exhibition. You love using metaphors and creative explanations to help visitors understand Korean tiger art. Keep your responses concise (2-3 sentences) and always reference specific artworks or cultural elements when possible.",
+            "jinu": "You are Jinu, a logical and systematic guide for the Tiger Exhibition. You focus on facts and provide clear, structured explanations about Korean tiger art and culture. Keep your responses concise (2-3 sentences) and always reference specific artworks or cultural elements when possible.",
+            "default": "You are a knowledgeable guide for the Tiger Exhibition at the National Museum. You help visitors understand Korean tiger art and culture. Keep your responses concise (2-3 sentences) and always reference specific artworks or cultural elements when possible."
+        }
+        
+        system_prompt = character_prompts.get(character, character_prompts["default"])
+        
+        # Create the prompt
+        prompt = f"""You are a guide for the Tiger Exhibition at the National Museum. Answer the user's question about Korean tiger art and culture based on the provided context.
 
 Context about the Tiger Exhibition:
 {context}
@@ -164,29 +305,47 @@ Guidelines:
 - Always be helpful and encouraging about visiting the exhibition
 
 Response:"""
-            
-            # Generate response
-            messages = [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=prompt)
-            ]
-            
-            response = self.llm.invoke(messages)
-            response_text = response.content.strip()
-            
-            logger.info(f"Generated English response: {response_text[:100]}...")
-            
-            return {
-                "response": response_text,
-                "sources": sources
-            }
-            
-        except Exception as e:
-            logger.error(f"Error generating English response: {e}")
-            return {
-                "response": "I'm sorry, I'm having trouble accessing information about the Tiger Exhibition right now. Please try again later or visit the museum for more details!",
-                "sources": []
+        
+        messages = [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=prompt)
+        ]
+        return messages
+    
+    def _build_result(self, response_text: str, top_results: List[SearchResult]) -> Dict[str, Any]:
+        """Build the response dict with detailed source information"""
+        sources = self._build_sources(top_results)
+        
+        response_text = response_text.strip()
+        logger.info(f"Generated English response: {response_text[:100]}...")
+        
+        return {
+            "response": response_text,
+            "sources": sources
+        }
+    
+    def _build_sources(self, top_results: List[SearchResult]) -> List[dict]:
+        """Convert search results into ranked source entries"""
+        sources = []
+        for i, result in enumerate(top_results):
+            # Add detailed source information with ranking
+            source_info = {
+                "source": result.source_url or f"Document: {result.document_title}",
+                "content": result.chunk_text[:300],
+                "ranking": i + 1,  # 1부터 시작하는 랭킹
+                "similarity_score": round(result.similarity, 4),  # 유사도 점수
+                "document_title": result.document_title,
+                "chunk_id": result.chunk_id
             }
+            sources.append(source_info)
+        return sources
+    
+    def _generate_error_response(self) -> Dict[str, Any]:
+        """Fallback response when the pipeline fails"""
+        return {
+            "response": "I'm sorry, I'm having trouble accessing information about the Tiger Exhibition right now. Please try again later or visit the museum for more details!",
+            "sources": []
+        }
     
     def _generate_unknown_english_response(self, query: str, character: str) -> Dict[str, Any]:
         """
@@ -4,6 +4,8 @@ English relevance service for checking if user queries are related to the Tiger
 import logging
 from typing import List
 
+from utils.keyword_matcher import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,6 +44,19 @@ class EnglishRelevanceService:
             "weather", "restaurant", "hotel", "transportation",
             "unrelated", "random", "test", "hello", "hi", "bye", "goodbye"
         ]
+        
+        # Question words that alone do not make a query relevant
+        self.exhibition_indicators = [
+            "what", "how", "when", "where", "why", "tell me", "explain",
+            "show", "describe", "about", "information", "details"
+        ]
+        
+        # Compile every keyword list once so each query is scanned in a single pass
+        self.matcher = KeywordMatcher({
+            "irrelevant": self.irrelevant_keywords,
+            "relevant": self.relevant_keywords,
+            "question": self.exhibition_indicators,
+        })
     
     def check_relevance(self, query: str) -> bool:
         """
@@ -60,25 +75,20 @@ class EnglishRelevanceService:
         query_lower = query.lower().strip()
         logger.info(f"Checking relevance for query: '{query_lower}'")
         
+        found = self.matcher.scan(query_lower)
+        
         # Check for irrelevant keywords first
-        for keyword in self.irrelevant_keywords:
-            if keyword in query_lower:
-                logger.info(f"Query rejected due to irrelevant keyword: {keyword}")
-                return False
+        if found["irrelevant"]:
+            logger.info(f"Query rejected due to irrelevant keyword: {found['irrelevant'][0]}")
+            return False
         
         # Check for relevant keywords
-        for keyword in self.relevant_keywords:
-            if keyword in query_lower:
-                logger.info(f"Query accepted due to relevant keyword: {keyword}")
-                return True
+        if found["relevant"]:
+            logger.info(f"Query accepted due to relevant keyword: {found['relevant'][0]}")
+            return True
         
         # If no keywords match, be more strict for exhibition-related queries
-        exhibition_indicators = [
-            "what", "how", "when", "where", "why", "tell me", "explain",
-            "show", "describe", "about", "information", "details"
-        ]
-        
-        has_question_word = any(indicator in query_lower for indicator in exhibition_indicators)
+        has_question_word = bool(found["question"])
         logger.info(f"Has question word: {has_question_word}")
         
         # Be more strict - reject questions without relevant keywords
@@ -86,11 +96,6 @@ class EnglishRelevanceService:
             logger.info("Query rejected - question word without relevant keywords")
             return False
         
-        # Accept any query that mentions "tiger" or "exhibition" even without question words
-        if "tiger" in query_lower or "exhibition" in query_lower:
-            logger.info("Query accepted due to tiger/exhibition mention")
-            return True
-        
         logger.info(f"Query rejected as not relevant to Tiger Exhibition: {query_lower}")
         return False
     
@@ -6,9 +6,10 @@ import logging
 from typing import List, Dict, Any
 from dotenv import load_dotenv
 
-from langchain_openai import ChatOpenAI
 from langchain.schema import HumanMessage, SystemMessage
 
+from services.model_registry import get_llm
+
 # Load environment variables
 load_dotenv()
 
@@ -20,10 +21,9 @@ class EnglishSummaryService:
     
     def __init__(self):
         # Initialize LLM
-        self.llm = ChatOpenAI(
+        self.llm = get_llm(
             model=os.getenv('LLM_MODEL', 'gpt-4o-mini'),
-            temperature=float(os.getenv('LLM_TEMPERATURE', '0.7')),
-            api_key=os.getenv('OPENAI_API_KEY')
+            temperature=float(os.getenv('LLM_TEMPERATURE', '0.7'))
         )
         
         logger.info("English SummaryService initialized successfully")
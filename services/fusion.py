@@ -0,0 +1,109 @@
+"""
+검색 결과 융합 (벡터 + BM25 키워드)
+
+하이브리드 검색의 두 경로 점수를 하나의 순위와 보정된 점수로 합칩니다.
+한국어/영어 RAG 서비스가 같은 융합 단계를 공유합니다.
+
+- weighted: 가중 합 (벡터 코사인 0~1 × w + BM25 키워드 점수 × (1 - w)) 순으로 정렬
+- rrf: Reciprocal Rank Fusion (경로별 순위 r 에 대해 Σ 1 / (k + r)) 순으로 정렬
+
+정렬 방식과 무관하게 결과의 similarity 에는 보정 점수(가중 합, 0~1)를 담습니다.
+RRF 점수는 순위만 반영해 질문과 무관한 결과도 높게 나올 수 있으므로,
+"모르겠다" 판단(FUSION_SCORE_THRESHOLD)에는 항상 보정 점수를 사용합니다.
+
+키워드 점수는 BM25 원점수를 포화 함수 s / (s + k) 로 바꾼 절대 점수입니다 (database.bm25_index.saturate).
+1위 대비로 나누면 아무리 약한 매칭도 1위는 1.0 이 되어 임계값 판단이 질문에 따라 달라지므로,
+흔한 단어 하나만 겹친 매칭은 낮은 점수로 남도록 합니다.
+"""
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from config.app_config import FUSION_RRF_K, FUSION_STRATEGY, FUSION_VECTOR_WEIGHT
+from database.models import SearchResult
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("weighted", "rrf")
+
+
+def _ranks(scores: np.ndarray) -> np.ndarray:
+    """점수 내림차순 순위 (1부터, 동점은 입력 순서)"""
+    ranks = np.empty(scores.size, dtype=np.float64)
+    ranks[np.argsort(-scores, kind="stable")] = np.arange(1, scores.size + 1)
+    return ranks
+
+
+def calibrated_scores(vector_scores: np.ndarray, keyword_scores: np.ndarray,
+                      vector_weight: float = FUSION_VECTOR_WEIGHT) -> np.ndarray:
+    """
+    임계값 비교에 쓰는 0~1 보정 점수
+
+    vector_scores 는 코사인 유사도, keyword_scores 는 bm25_index.saturate 로 변환한 BM25 점수
+    (키워드 경로에 없으면 NaN) 입니다.
+    """
+    vector_part = np.clip(vector_scores, 0.0, 1.0)
+    keyword_part = np.nan_to_num(keyword_scores, nan=0.0)
+    return vector_weight * vector_part + (1.0 - vector_weight) * keyword_part
+
+
+def fuse_scores(vector_scores: np.ndarray, keyword_scores: np.ndarray,
+                strategy: str = FUSION_STRATEGY, vector_weight: float = FUSION_VECTOR_WEIGHT,
+                rrf_k: int = FUSION_RRF_K) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    두 경로 점수 배열을 융합
+
+    Returns:
+        (order, calibrated): 융합 순위대로 정렬한 행 번호, 행별 보정 점수
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"지원하지 않는 융합 방식입니다: {strategy} (사용 가능: {', '.join(STRATEGIES)})")
+    vector_scores = np.asarray(vector_scores, dtype=np.float64)
+    keyword_scores = np.asarray(keyword_scores, dtype=np.float64)
+    calibrated = calibrated_scores(vector_scores, keyword_scores, vector_weight)
+
+    if strategy == "weighted":
+        return np.argsort(-calibrated, kind="stable"), calibrated
+
+    has_keyword = ~np.isnan(keyword_scores)
+    # 키워드 경로에 없는 행은 -inf 로 두어 순위가 키워드 결과 뒤로 가고, 기여도는 0
+    keyword_ranks = _ranks(np.where(has_keyword, keyword_scores, -np.inf))
+    fused = 1.0 / (rrf_k + _ranks(vector_scores)) + np.where(has_keyword, 1.0 / (rrf_k + keyword_ranks), 0.0)
+    # RRF 동점은 보정 점수로 결정
+    return np.lexsort((-calibrated, -fused)), calibrated
+
+
+def fuse(results: List[SearchResult], strategy: str = FUSION_STRATEGY,
+         limit: Optional[int] = None, vector_weight: float = FUSION_VECTOR_WEIGHT,
+         rrf_k: int = FUSION_RRF_K) -> List[SearchResult]:
+    """
+    하이브리드 검색 결과를 융합 순위로 정렬하고 similarity 를 보정 점수로 교체
+
+    Args:
+        results: ChunkService.hybrid_search 결과 (vector_similarity / keyword_score 포함)
+        strategy: 'weighted' 또는 'rrf'
+        limit: 상위 몇 개만 남길지 (None 이면 전부)
+        vector_weight: 보정 점수의 벡터 가중치 (평가 하네스에서 설정 비교용)
+        rrf_k: RRF 순위 완화 상수
+    """
+    if not results:
+        return []
+    vector_scores = np.array([
+        r.vector_similarity if r.vector_similarity is not None else r.similarity for r in results
+    ], dtype=np.float64)
+    keyword_scores = np.array([
+        r.keyword_score if r.keyword_score is not None else np.nan for r in results
+    ], dtype=np.float64)
+
+    order, calibrated = fuse_scores(vector_scores, keyword_scores, strategy, vector_weight, rrf_k)
+    if limit is not None:
+        order = order[:limit]
+
+    fused = []
+    for i in order.tolist():
+        result = results[i]
+        result.similarity = float(calibrated[i])
+        fused.append(result)
+    logger.info(f"검색 결과 융합({strategy}): {len(results)}개 -> {len(fused)}개")
+    return fused
@@ -0,0 +1,495 @@
+"""
+백그라운드 문서 적재 작업 큐
+
+관리자 업로드의 PDF 텍스트 추출 → 청크 분할 → 배치 임베딩 → 저장을 HTTP 요청 밖에서 처리합니다.
+PDF 는 utils/pdf_extractor 의 페이지 스트림을 그대로 넘겨, 추출과 청크 분할/임베딩이 겹쳐 진행됩니다.
+업로드 API 는 작업 ID 를 바로 돌려주고, 진행 상황은 /admin/jobs/{job_id} 로 조회합니다.
+작업은 업로드를 받은 프로세스가 처리하고, 상태는 database/job_store 로 PostgreSQL 에도 기록하므로
+uvicorn 워커가 여러 개여도 어느 워커에서든 조회됩니다 (INGEST_JOB_STORE).
+
+- 작업 스레드 INGEST_WORKERS 개 + 크기 제한 대기열 (가득 차면 IngestionQueueFullError → 503)
+- 일시적 오류(DB 연결 끊김 등)는 지수 백오프로 INGEST_MAX_ATTEMPTS 번까지 재시도,
+  입력 문제(빈 문서, 손상되었거나 텍스트가 없는 PDF 등 ValueError)는 재시도 없이 실패 처리
+- 질문 트래픽 우선: 작업 스레드의 OS 우선순위를 낮추고(nice), torch intra-op 스레드 수를
+  INGEST_TORCH_THREADS 로 제한하고(nice 는 임베딩이 쓰는 병렬 스레드 수를 줄이지 않음), 임베딩 배치 사이마다
+  처리 중인 질문이 있으면 최대 INGEST_YIELD_MAX_WAIT 초까지 기다렸다가 다음 배치를 진행
+- 중복 등록 방지: 같은 업로드(문서 키 + 내용 해시)가 대기/진행 중이면 새 작업 대신 그 작업을 돌려줌.
+  이미 적재된 내용과 같으면 ChunkService.ingest_document 가 아무것도 하지 않음 (result.outcome == "unchanged")
+- 문서 식별(document_key): 관리자가 document_key 를 지정한 업로드만 같은 키의 기존 문서를 새 버전으로 교체.
+  지정하지 않으면 내용 해시가 키라서, 제목/파일 이름이 같아도 내용이 다르면 별도 문서로 추가됨
+"""
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from config.app_config import (
+    INGEST_JOB_HISTORY, INGEST_JOB_STORE, INGEST_MAX_ATTEMPTS, INGEST_NICENESS, INGEST_QUEUE_SIZE,
+    INGEST_RETRY_BACKOFF, INGEST_TORCH_THREADS, INGEST_WORKERS, INGEST_YIELD_MAX_WAIT
+)
+from database.document_service import ChunkService
+from database.job_store import IngestionJobStore
+from database.models import Document, PdfPage
+from services.model_registry import get_embedding_model
+from services.response_cache import invalidate_corpus
+from utils.content_hash import content_document_key, source_hash, text_hash
+from utils.metrics import inflight_requests
+from utils.pdf_extractor import PdfSource, iter_pdf_pages
+
+logger = logging.getLogger(__name__)
+
+# 적재 청크 설정 (기존 관리자 업로드와 동일)
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 50
+# 질문 처리 중일 때 다시 확인하는 간격 (초)
+YIELD_POLL_INTERVAL = 0.05
+# 임베딩 진행률을 작업 저장소에 기록하는 최소 간격 (초, 단계/상태 변경은 바로 기록)
+PROGRESS_SAVE_INTERVAL = 1.0
+
+QUEUED = "queued"
+RUNNING = "running"
+RETRYING = "retrying"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class IngestionQueueFullError(Exception):
+    """대기 중인 적재 작업이 INGEST_QUEUE_SIZE 개를 넘음"""
+
+
+class InvalidDocumentError(ValueError):
+    """입력 자체의 문제로 재시도해도 성공할 수 없는 적재 (예: 빈 문서)"""
+
+
+# (문서, PDF 페이지 스트림 또는 None) - 작업 스레드에서 만들어 ChunkService.ingest_document 로 전달
+PreparedDocument = Tuple[Document, Optional[Iterable[PdfPage]]]
+
+
+def admin_document_key(content_hash: str, document_key: Optional[str] = None) -> str:
+    """
+    관리자 업로드의 documents.document_key
+
+    관리자가 키를 지정하면 'admin:<키>' (같은 키로 다시 올리면 그 문서를 새 버전으로 교체, 텍스트/PDF 공통),
+    지정하지 않으면 내용 해시 키라서 내용이 똑같은 재업로드만 같은 문서로 취급합니다.
+    제목이나 파일 이름은 키에 쓰지 않습니다 (서로 다른 문서가 이름만 같아 덮어써지는 것을 막기 위해).
+    """
+    if document_key is not None and document_key.strip():
+        return f"admin:{document_key.strip()}"
+    return content_document_key(content_hash)
+
+
+def upload_key(document_key: str, content_hash: str) -> str:
+    """같은 업로드 판별 키 (IngestionQueue.submit 의 중복 등록 방지)"""
+    return f"{document_key}#{content_hash}"
+
+
+def text_document(title: str, content: str, category: str, source: str,
+                  content_hash: Optional[str] = None, document_key: Optional[str] = None) -> PreparedDocument:
+    """관리자 텍스트 업로드 문서 (content_hash 를 생략하면 여기서 계산, document_key 는 admin_document_key 참고)"""
+    if not content.strip():
+        raise InvalidDocumentError("문서 내용이 비어 있습니다.")
+    content_hash = content_hash or text_hash(content)
+    return Document(
+        title=title,
+        file_name=f"{title}.txt",
+        file_type="text",
+        content=content,
+        content_hash=content_hash,
+        document_key=admin_document_key(content_hash, document_key),
+        metadata={
+            "source": source,
+            "category": category,
+            "upload_type": "text"
+        }
+    ), None
+
+
+def pdf_document(title: str, content: PdfSource, file_name: str, category: str, source: str,
+                 content_hash: Optional[str] = None, document_key: Optional[str] = None) -> PreparedDocument:
+    """
+    관리자 PDF 업로드 문서 (content 는 PDF 바이트 또는 스풀 파일 경로, 적재 중 페이지 스트림으로 읽음)
+
+    content_hash 는 PDF 원본 해시입니다 (스풀이 받으면서 계산한 값, 생략하면 여기서 계산).
+    """
+    content_hash = content_hash or source_hash(content)
+    return Document(
+        title=title,
+        file_name=file_name,
+        file_type="pdf",
+        content="",
+        content_hash=content_hash,
+        document_key=admin_document_key(content_hash, document_key),
+        metadata={
+            "source": source,
+            "category": category,
+            "upload_type": "pdf",
+            "original_filename": file_name
+        }
+    ), iter_pdf_pages(content)
+
+
+@dataclass
+class IngestionJob:
+    """적재 작업 하나의 상태"""
+    id: str
+    kind: str
+    title: str
+    prepare: Optional[Callable[[], PreparedDocument]] = field(repr=False)
+    cleanup: Optional[Callable[[], None]] = field(default=None, repr=False)
+    key: Optional[str] = None  # 같은 업로드 판별 키 (upload_key)
+    max_attempts: int = INGEST_MAX_ATTEMPTS
+    status: str = QUEUED
+    stage: str = QUEUED  # preparing → embedding (PDF 는 페이지 추출과 겹쳐 진행) → saving
+    attempts: int = 0
+    chunks_done: int = 0
+    chunks_total: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+    saved_at: float = field(default=0.0, repr=False)  # 마지막으로 작업 저장소에 기록한 시각 (monotonic)
+    save_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)  # 기록 순서 = 상태 순서
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "title": self.title,
+            "status": self.status,
+            "stage": self.stage,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "progress": {"chunks_done": self.chunks_done, "chunks_total": self.chunks_total},
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+def _lower_thread_priority(niceness: int):
+    """현재 스레드의 nice 값을 niceness 만큼 올림 (Linux 는 스레드 단위로 적용, 실패해도 계속 진행)"""
+    if niceness <= 0 or not hasattr(os, "setpriority"):
+        return
+    try:
+        thread_id = threading.get_native_id()
+        os.setpriority(os.PRIO_PROCESS, thread_id, os.getpriority(os.PRIO_PROCESS, thread_id) + niceness)
+    except (OSError, AttributeError) as e:
+        logger.warning(f"적재 스레드 우선순위 조정 실패: {e}")
+
+
+def _limit_torch_threads(threads: int):
+    """
+    현재(적재) 스레드의 torch intra-op 스레드 수를 threads 로 제한 (torch 가 없거나 이미 그 이하이면 그대로)
+
+    OpenMP 빌드의 torch.set_num_threads 는 호출한 스레드에 적용되면서, 이후 새로 생기는 스레드의 기본값도 바꿉니다.
+    질문 처리 스레드까지 제한되지 않도록 다른 스레드에서 원래 값으로 되돌려 둡니다.
+    """
+    if threads <= 0:
+        return
+    try:
+        import torch
+    except ImportError:
+        return
+    previous = torch.get_num_threads()
+    if threads >= previous:
+        return
+    torch.set_num_threads(threads)
+    restore = threading.Thread(target=torch.set_num_threads, args=(previous,), name="ingest-torch-restore")
+    restore.start()
+    restore.join()
+    logger.info(f"적재 스레드 torch 스레드 수: {previous} → {threads}")
+
+
+class IngestionQueue:
+    """크기 제한 대기열 + 작업 스레드로 문서를 적재하는 작업 큐"""
+
+    def __init__(self, workers: int = INGEST_WORKERS, queue_size: int = INGEST_QUEUE_SIZE,
+                 max_attempts: int = INGEST_MAX_ATTEMPTS, retry_backoff: float = INGEST_RETRY_BACKOFF,
+                 niceness: int = INGEST_NICENESS, yield_max_wait: float = INGEST_YIELD_MAX_WAIT,
+                 history: int = INGEST_JOB_HISTORY, torch_threads: int = INGEST_TORCH_THREADS,
+                 busy: Callable[[], int] = inflight_requests,
+                 chunk_service_factory: Callable[[], Any] = ChunkService,
+                 embedding_model_loader: Callable[[], Any] = get_embedding_model,
+                 job_store: Optional[Any] = None):
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_backoff = retry_backoff
+        self.niceness = niceness
+        self.yield_max_wait = yield_max_wait
+        self.history = max(1, history)
+        self.torch_threads = torch_threads
+        self._busy = busy
+        self._chunk_service_factory = chunk_service_factory
+        self._embedding_model_loader = embedding_model_loader
+        self._job_store = job_store  # None 이면 상태를 이 프로세스 메모리에만 보관
+        self._queue: "queue.Queue[Optional[IngestionJob]]" = queue.Queue(maxsize=max(1, queue_size))
+        self._jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self.succeeded = 0
+        self.failed = 0
+        self.retries = 0
+        self.deduplicated = 0
+        self.yield_seconds = 0.0
+
+    def submit(self, kind: str, title: str, prepare: Callable[[], PreparedDocument],
+               cleanup: Optional[Callable[[], None]] = None, key: Optional[str] = None) -> IngestionJob:
+        """
+        작업 등록 (prepare 는 작업 스레드에서 (Document, 페이지 스트림) 을 만들어 반환)
+
+        cleanup 은 작업이 끝나거나 등록에 실패하면 한 번 호출됩니다 (업로드 임시 파일 삭제 등).
+        key(upload_key) 가 같은 작업이 아직 끝나지 않았으면 새로 등록하지 않고 그 작업을 반환합니다.
+        """
+        job = IngestionJob(id=uuid.uuid4().hex, kind=kind, title=title, prepare=prepare,
+                           max_attempts=self.max_attempts, cleanup=cleanup, key=key)
+        self._ensure_workers()
+        full = False
+        with self._lock:
+            duplicate = self._pending_job(key)
+            if duplicate is None:
+                try:
+                    self._queue.put_nowait(job)
+                except queue.Full:
+                    full = True
+                else:
+                    self._jobs[job.id] = job
+                    self._prune()
+        if full:
+            self._release(job)
+            raise IngestionQueueFullError(
+                f"대기 중인 적재 작업이 너무 많습니다 (최대 {self._queue.maxsize}개)"
+            )
+        if duplicate is not None:
+            self._release(job)  # 새로 받은 업로드(스풀 임시 파일 등)는 쓰지 않으므로 바로 정리
+            self.deduplicated += 1
+            logger.info(f"같은 업로드가 이미 처리 중: {duplicate.id} ({kind}, {title})")
+            return duplicate
+        self._save(job)
+        logger.info(f"적재 작업 등록: {job.id} ({kind}, {title})")
+        return job
+
+    def _pending_job(self, key: Optional[str]) -> Optional[IngestionJob]:
+        """같은 key 로 등록되어 아직 끝나지 않은 작업 (잠금 안에서 호출)"""
+        if key is None:
+            return None
+        for job in self._jobs.values():
+            if job.key == key and not job.done.is_set():
+                return job
+        return None
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 상태 (이 프로세스의 작업이 아니면 작업 저장소에서 조회, 없으면 None)"""
+        job = self.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        if self._job_store is None:
+            return None
+        return self._job_store.get(job_id)
+
+    def list(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """최근 작업부터 상태 목록 (작업 저장소가 있으면 모든 프로세스의 작업, 이 프로세스 작업은 최신 진행률)"""
+        with self._lock:
+            jobs = list(self._jobs.values())[-limit:]
+        local = [job.to_dict() for job in reversed(jobs)]
+        if self._job_store is None:
+            return local
+        by_id = {state["job_id"]: state for state in local}
+        return [by_id.get(state["job_id"], state) for state in self._job_store.list(limit)]
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[IngestionJob]:
+        """작업이 끝날 때까지 대기 (스크립트/테스트용)"""
+        job = self.get(job_id)
+        if job is not None:
+            job.done.wait(timeout)
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {
+            "workers": sum(thread.is_alive() for thread in self._threads),
+            "queued": self._queue.qsize(),
+            "queue_size": self._queue.maxsize,
+            "running": statuses.count(RUNNING) + statuses.count(RETRYING),
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retries": self.retries,
+            "deduplicated": self.deduplicated,
+            "yield_seconds": round(self.yield_seconds, 2),
+        }
+
+    def shutdown(self, timeout: float = 5.0):
+        """작업 스레드 종료 (진행 중인 작업은 timeout 까지 기다림, 대기 작업은 취소)"""
+        self._stopping.set()
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                self._finish(job, FAILED, error="서버 종료로 취소되었습니다.")
+                self._release(job)
+        for _ in self._threads:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                break
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _ensure_workers(self):
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            for index in range(len(self._threads), self.workers):
+                thread = threading.Thread(target=self._worker, name=f"ingest-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _prune(self):
+        """끝난 작업부터 history 개를 넘는 만큼 삭제 (잠금 안에서 호출)"""
+        overflow = len(self._jobs) - self.history
+        for job_id in [job.id for job in self._jobs.values() if job.done.is_set()][:max(0, overflow)]:
+            del self._jobs[job_id]
+
+    def _worker(self):
+        _lower_thread_priority(self.niceness)
+        _limit_torch_threads(self.torch_threads)
+        while not self._stopping.is_set():
+            job = self._queue.get()
+            if job is None:
+                break
+            try:
+                self._run(job)
+            finally:
+                self._release(job)
+                self._queue.task_done()
+
+    def _run(self, job: IngestionJob):
+        job.started_at = time.time()
+        for attempt in range(1, job.max_attempts + 1):
+            job.attempts = attempt
+            job.status = RUNNING
+            try:
+                self._ingest(job)
+            except ValueError as e:
+                # 빈 문서, 손상된 PDF(PdfExtractionError) 등 입력 문제는 재시도하지 않음
+                self._finish(job, FAILED, error=str(e))
+                return
+            except Exception as e:
+                if attempt >= job.max_attempts or self._stopping.is_set():
+                    self._finish(job, FAILED, error=str(e))
+                    return
+                delay = self.retry_backoff * (2 ** (attempt - 1))
+                logger.warning(f"적재 작업 {job.id} 실패 ({attempt}/{job.max_attempts}), {delay:.1f}초 후 재시도: {e}")
+                job.status = RETRYING
+                job.error = str(e)
+                self.retries += 1
+                self._save(job)
+                self._stopping.wait(delay)
+            else:
+                self._finish(job, SUCCEEDED)
+                return
+
+    def _ingest(self, job: IngestionJob):
+        job.stage = "preparing"
+        job.chunks_done = job.chunks_total = 0
+        self._save(job)
+        document, pages = job.prepare()
+
+        job.stage = "embedding"
+        self._save(job)
+        result = self._chunk_service_factory().ingest_document(
+            document,
+            self._embedding_model_loader(),
+            chunk_size=CHUNK_SIZE,
+            chunk_overlap=CHUNK_OVERLAP,
+            on_batch=lambda done, total: self._on_batch(job, done, total),
+            pages=pages
+        )
+        if result.status != "unchanged":
+            invalidate_corpus()
+        job.result = {
+            "document_id": result.document_id,
+            "outcome": result.status,
+            "chunks_created": len(result.chunk_ids),
+            "chunks_embedded": result.chunks_embedded,
+            "chunks_reused": result.chunks_reused,
+            "chunks_deleted": result.chunks_deleted,
+            "chunks_per_second": round(result.chunks_per_second, 1),
+            "extracted_text_length": (document.metadata or {}).get("text_length", len(document.content)),
+        }
+
+    def _on_batch(self, job: IngestionJob, done: int, total: Optional[int]):
+        # PDF 는 추출이 끝날 때까지 전체 청크 수를 모르므로 지금까지 나온 수를 표시
+        job.chunks_done, job.chunks_total = done, total if total is not None else done
+        if total is not None and done >= total:
+            job.stage = "saving"
+            self._save(job)
+            return
+        if time.monotonic() - job.saved_at >= PROGRESS_SAVE_INTERVAL:
+            self._save(job)
+        self._yield_to_queries()
+
+    def _yield_to_queries(self):
+        """처리 중인 질문이 있으면 다음 임베딩 배치 전에 잠시 양보"""
+        if self._busy() <= 0:
+            return
+        started = time.monotonic()
+        deadline = started + self.yield_max_wait
+        while self._busy() > 0 and time.monotonic() < deadline and not self._stopping.is_set():
+            time.sleep(YIELD_POLL_INTERVAL)
+        self.yield_seconds += time.monotonic() - started
+
+    def _save(self, job: IngestionJob):
+        """작업 상태를 작업 저장소에 기록 (실패해도 적재는 계속 - 이 프로세스에서는 계속 조회됨)"""
+        if self._job_store is None:
+            return
+        try:
+            with job.save_lock:
+                self._job_store.save(job.to_dict())
+                job.saved_at = time.monotonic()
+        except Exception as e:
+            logger.warning(f"적재 작업 {job.id} 상태 기록 실패: {e}")
+
+    @staticmethod
+    def _release(job: IngestionJob):
+        """작업 종료 처리 - 업로드 임시 파일 정리, 입력을 붙잡고 있는 prepare 해제 후 대기자 깨움"""
+        try:
+            if job.cleanup is not None:
+                job.cleanup()
+        except Exception as e:
+            logger.warning(f"적재 작업 {job.id} 정리 실패: {e}")
+        finally:
+            job.prepare = job.cleanup = None
+            job.done.set()
+
+    def _finish(self, job: IngestionJob, status: str, error: Optional[str] = None):
+        job.status = status
+        job.stage = status
+        job.error = error
+        job.finished_at = time.time()
+        self._save(job)
+        if status == SUCCEEDED:
+            self.succeeded += 1
+            logger.info(f"적재 작업 완료: {job.id} ({job.result})")
+        else:
+            self.failed += 1
+            logger.error(f"적재 작업 실패: {job.id} ({job.attempts}회 시도): {error}")
+
+
+# 프로세스 전역 적재 작업 큐 (작업 스레드는 첫 작업 등록 시 시작)
+ingestion_queue = IngestionQueue(job_store=IngestionJobStore() if INGEST_JOB_STORE else None)
@@ -0,0 +1,148 @@
+"""
+프로세스 전역 모델 레지스트리
+
+임베딩 모델, Cross-encoder, LLM 클라이언트를 프로세스당 한 번만 로드하고
+모든 서비스/컨트롤러가 같은 인스턴스를 공유하도록 관리합니다.
+"""
+import os
+import sys
+import threading
+import time
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config.app_config import EMBEDDING_MODEL, CROSS_ENCODER_MODEL
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ModelEntry:
+    """레지스트리에 등록된 모델 정보"""
+    kind: str
+    name: str
+    instance: Any
+    load_seconds: float
+    memory_bytes: int
+
+
+def _estimate_memory_bytes(instance: Any) -> int:
+    """모델이 점유하는 메모리(파라미터 + 버퍼)를 바이트 단위로 추정"""
+    # SentenceTransformer 는 torch.nn.Module, CrossEncoder 는 .model 속성에 Module 을 가짐
+    module = instance if hasattr(instance, "parameters") else getattr(instance, "model", None)
+    if module is None or not hasattr(module, "parameters"):
+        return sys.getsizeof(instance)
+
+    total = 0
+    for tensor in module.parameters():
+        total += tensor.numel() * tensor.element_size()
+    for tensor in module.buffers():
+        total += tensor.numel() * tensor.element_size()
+    return total
+
+
+class ModelRegistry:
+    """지연 로드(load-once) 모델 레지스트리"""
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], ModelEntry] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+    def _get_or_load(self, kind: str, name: str, loader: Callable[[], Any]) -> Any:
+        key = (kind, name)
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry.instance
+
+        # 모델별 락: 서로 다른 모델은 병렬 로드, 같은 모델은 한 번만 로드
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry.instance
+
+            logger.info(f"모델 로드 중: {kind} / {name}")
+            started = time.perf_counter()
+            instance = loader()
+            elapsed = time.perf_counter() - started
+            entry = ModelEntry(
+                kind=kind,
+                name=name,
+                instance=instance,
+                load_seconds=elapsed,
+                memory_bytes=_estimate_memory_bytes(instance),
+            )
+            self._entries[key] = entry
+            logger.info(
+                f"모델 로드 완료: {kind} / {name} "
+                f"({elapsed:.2f}s, {entry.memory_bytes / (1024 * 1024):.1f} MB)"
+            )
+            return instance
+
+    def get_embedding_model(self, name: str = EMBEDDING_MODEL):
+        """SentenceTransformer 임베딩 모델 반환"""
+        def load():
+            from sentence_transformers import SentenceTransformer
+            return SentenceTransformer(name)
+        return self._get_or_load("encoder", name, load)
+
+    def get_cross_encoder(self, name: str = CROSS_ENCODER_MODEL):
+        """CrossEncoder 재정렬 모델 반환"""
+        def load():
+            from sentence_transformers import CrossEncoder
+            return CrossEncoder(name)
+        return self._get_or_load("reranker", name, load)
+
+    def get_llm(self, model: str = "gpt-4o-mini", temperature: float = 0.7):
+        """ChatOpenAI 클라이언트 반환 (모델명 + temperature 별로 공유)"""
+        def load():
+            from langchain_openai import ChatOpenAI
+            return ChatOpenAI(
+                model=model,
+                temperature=temperature,
+                api_key=os.getenv('OPENAI_API_KEY')
+            )
+        return self._get_or_load("llm", f"{model}@{temperature}", load)
+
+    def is_loaded(self, kind: str, name: str) -> bool:
+        """해당 모델이 이미 로드되었는지 여부"""
+        return (kind, name) in self._entries
+
+    def stats(self) -> Dict[str, Any]:
+        """모델별 메모리/로드 시간 통계"""
+        entries = list(self._entries.values())
+        return {
+            "models": [
+                {
+                    "kind": entry.kind,
+                    "name": entry.name,
+                    "load_seconds": round(entry.load_seconds, 3),
+                    "memory_mb": round(entry.memory_bytes / (1024 * 1024), 2),
+                }
+                for entry in entries
+            ],
+            "total_memory_mb": round(sum(e.memory_bytes for e in entries) / (1024 * 1024), 2),
+        }
+
+
+# 프로세스 전역 레지스트리
+model_registry = ModelRegistry()
+
+
+def get_embedding_model(name: str = EMBEDDING_MODEL):
+    """공유 임베딩 모델"""
+    return model_registry.get_embedding_model(name)
+
+
+def get_cross_encoder(name: str = CROSS_ENCODER_MODEL):
+    """공유 Cross-encoder 모델"""
+    return model_registry.get_cross_encoder(name)
+
+
+def get_llm(model: str = "gpt-4o-mini", temperature: float = 0.7):
+    """공유 LLM 클라이언트"""
+    return model_registry.get_llm(model, temperature)
@@ -2,15 +2,29 @@
 PostgreSQL + pgvector 기반 RAG 서비스
 """
 import logging
-import os
-from typing import List
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+import numpy as np
 from dotenv import load_dotenv
-from sentence_transformers import SentenceTransformer
-from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
-from database.document_service import DocumentService, ChunkService
-from database.models import Document, DocumentChunk, SearchResult
+from database.document_service import DocumentService, encode_in_batches
+from database.vector_mirror import get_chunk_service
+from database.models import Document, DocumentChunk, SearchResult, VectorSearchParams
 from models.response_models import ChatResponse
+from config.app_config import FUSION_SCORE_THRESHOLD
+from services.embedding_cache import aencode_query, encode_query
+from services.fusion import fuse
+from services.model_registry import get_embedding_model, get_llm
+from services.reranker import reranker
+from services.topic_gate import topic_gate
+from services.response_cache import (
+    acached_call, aresponse_cache_key, cached_call, inflight, label_cache_outcome, response_cache,
+    response_cache_key
+)
+from utils.executors import run_db_bound
+from utils.korean_tokenizer import query_terms
+from utils.metrics import span
+from utils.streaming import answer_events, static_answer_events
 from characters import CHARACTER_STYLE
 
 # 환경변수 로드
@@ -23,192 +37,259 @@ class PostgresRAGService:
     """PostgreSQL 기반 RAG 서비스"""
     
     def __init__(self):
-        self.embedding_model = SentenceTransformer('sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2')
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini", 
-            temperature=0.7,
-            api_key=os.getenv('OPENAI_API_KEY')
-        )
+        # 모델은 프로세스 전역 레지스트리에서 공유 (요청마다 재로딩하지 않음)
+        self.embedding_model = get_embedding_model()
+        self.llm = get_llm(model="gpt-4o-mini", temperature=0.7)
         self.document_service = DocumentService()
-        self.chunk_service = ChunkService()
+        self.chunk_service = get_chunk_service()
     
-    def generate_response(self, user_message: str, character: str) -> ChatResponse:
+    def generate_response(self, user_message: str, character: str,
+                          search_params: Optional[VectorSearchParams] = None) -> ChatResponse:
         """
         PostgreSQL RAG를 사용하여 챗봇 응답 생성
         
         Args:
             user_message: 사용자 메시지
             character: 캐릭터 이름
+            search_params: 요청별 벡터 인덱스 검색 파라미터 (선택)
             
         Returns:
             ChatResponse: 생성된 응답
         """
+        cache_key = response_cache_key(user_message, character, "ko", search_params)
+        return cached_call(cache_key, self._generate_response, user_message, character, search_params)
+
+    def _generate_response(self, user_message: str, character: str,
+                           search_params: Optional[VectorSearchParams]) -> ChatResponse:
+        """응답 캐시 미스일 때 실제 RAG 파이프라인 실행"""
         logger.info(f"User message: {user_message}")
         logger.info(f"Character: {character}")
-
-        # 캐릭터 스타일 가져오기
-        char_style = CHARACTER_STYLE[character]
+        started = time.perf_counter()
 
         # ----------------- 1) 쿼리 임베딩 생성 -----------------
         logger.info("1단계: 쿼리 임베딩 생성")
-        query_embedding = self.embedding_model.encode(user_message).tolist()
+        query_embedding = encode_query(self.embedding_model, user_message)
+
+        # 전시 주제와 명백히 무관하면 검색/LLM 없이 "모르겠다" 응답
+        if not topic_gate.is_on_topic(query_embedding):
+            return self._generate_unknown_response(user_message, character)
 
         # ----------------- 2) 벡터 검색 + 키워드 검색 -----------------
         logger.info("2단계: PostgreSQL 벡터 검색 + 키워드 검색")
+        search_results = self._rank_results(user_message, self._hybrid_search(query_embedding, user_message, search_params))
+
+        # ----------------- 3) "모르는 정보" 처리 로직 -----------------
+        if self._is_unknown(user_message, search_results):
+            return self._generate_unknown_response(user_message, character)
+
+        # ----------------- 4) Cross-encoder 재정렬 (선택, 지연 예산 초과 시 건너뜀) -----------------
+        search_results = reranker.rerank(user_message, search_results, started)
+
+        # ----------------- 5) 프롬프트 생성 -----------------
+        with span("prompt"):
+            final_prompt = self._build_prompt(user_message, character, search_results)
         
-        # 벡터 검색
-        vector_results = self.chunk_service.search_similar_chunks(
-            query_embedding=query_embedding,
-            match_threshold=0.0,
-            match_count=5
-        )
-        
-        # 키워드 검색 (호작도, 용호도, 산신도 등)
-        keyword_results = self.chunk_service.search_by_keywords(
-            user_message, match_count=5
-        )
-        
-        # 결과 합치기 (중복 제거)
-        all_results = vector_results + keyword_results
-        seen_ids = set()
-        search_results = []
-        for result in all_results:
-            if result.chunk_id not in seen_ids:
-                seen_ids.add(result.chunk_id)
-                search_results.append(result)
-        
-        # 키워드 매칭 가중치 적용 (질문 기반 동적 키워드 추출)
-        user_message_lower = user_message.lower()
-        logger.info(f"키워드 매칭 가중치 적용 시작 - 검색 결과 {len(search_results)}개")
-        
-        # 질문에서 핵심 키워드 추출 (2글자 이상)
-        import re
-        question_keywords = []
+        # ----------------- 6) LLM 응답 생성 -----------------
+        with span("llm"):
+            response = self.llm.invoke(final_prompt)
+
+        # ----------------- 7) 응답 구성 -----------------
+        return self._build_response(response.content, search_results)
+
+    async def agenerate_response(self, user_message: str, character: str,
+                                 search_params: Optional[VectorSearchParams] = None) -> ChatResponse:
+        """
+        generate_response 의 비동기 버전 - 이벤트 루프를 막지 않음
         
-        # 한글 키워드 추출 (조사 제거)
-        korean_words = re.findall(r'[가-힣]{2,}', user_message)
-        # 조사 제거: '의', '은', '는', '이', '가', '을', '를', '에', '에서' 등
-        particles = ['의', '은', '는', '이', '가', '을', '를', '에', '에서', '로', '으로', '와', '과', '도', '만', '부터', '까지']
+        임베딩은 CPU executor, DB 검색은 DB executor 에서 실행하고
+        LLM 은 ainvoke 로 호출합니다.
         
-        for word in korean_words:
-            # 조사 제거
-            clean_word = word
-            for particle in particles:
-                if clean_word.endswith(particle):
-                    clean_word = clean_word[:-len(particle)]
-                    break
+        Args:
+            user_message: 사용자 메시지
+            character: 캐릭터 이름
+            search_params: 요청별 벡터 인덱스 검색 파라미터 (선택)
             
-            if len(clean_word) >= 2:  # 조사 제거 후 2글자 이상인 경우만
-                question_keywords.append(clean_word)
-        
-        # 영어 키워드 추출
-        english_words = re.findall(r'[a-zA-Z]{3,}', user_message)
-        question_keywords.extend(english_words)
-        
-        # 숫자 포함 키워드도 추출
-        number_words = re.findall(r'[가-힣a-zA-Z]*\d+[가-힣a-zA-Z]*', user_message)
-        question_keywords.extend(number_words)
-        
-        # 중복 제거
-        question_keywords = list(set(question_keywords))
+        Returns:
+            ChatResponse: 생성된 응답
+        """
+        cache_key = await aresponse_cache_key(user_message, character, "ko", search_params)
+        return await acached_call(cache_key, self._agenerate_response, user_message, character, search_params)
+
+    async def _agenerate_response(self, user_message: str, character: str,
+                                  search_params: Optional[VectorSearchParams]) -> ChatResponse:
+        """응답 캐시 미스일 때 실제 RAG 파이프라인 실행 (비동기)"""
+        logger.info(f"User message: {user_message}")
+        logger.info(f"Character: {character}")
+        started = time.perf_counter()
+
+        # ----------------- 1~2) 쿼리 임베딩 + 검색 -----------------
+        search_results = await self._aretrieve(user_message, search_params)
+
+        # ----------------- 3) "모르는 정보" 처리 로직 -----------------
+        if self._is_unknown(user_message, search_results):
+            return self._generate_unknown_response(user_message, character)
+
+        # ----------------- 4) Cross-encoder 재정렬 (선택, 지연 예산 초과 시 건너뜀) -----------------
+        search_results = await reranker.arerank(user_message, search_results, started)
+
+        # ----------------- 5) 프롬프트 생성 -----------------
+        with span("prompt"):
+            final_prompt = self._build_prompt(user_message, character, search_results)
+
+        # ----------------- 6) LLM 응답 생성 -----------------
+        with span("llm"):
+            response = await self.llm.ainvoke(final_prompt)
+
+        # ----------------- 7) 응답 구성 -----------------
+        return self._build_response(response.content, search_results)
+
+    async def astream_response(self, user_message: str, character: str,
+                               search_params: Optional[VectorSearchParams] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        음성 재생용 스트리밍 응답 생성
         
-        logger.info(f"질문: '{user_message}'")
-        logger.info(f"질문에서 추출된 키워드: {question_keywords}")
+        출처(sources) 이벤트를 먼저 보내고, LLM 출력을 문장 단위로 잘라
+        sentence 이벤트로 보낸 뒤 done 이벤트로 마무리합니다.
         
-        for i, result in enumerate(search_results):
-            chunk_text_lower = result.chunk_text.lower()
-            
-            # 질문 키워드가 문서에 포함된 개수 계산
-            keyword_matches = 0
-            matched_keywords = []
-            
-            for keyword in question_keywords:
-                if keyword.lower() in chunk_text_lower:
-                    keyword_matches += 1
-                    matched_keywords.append(keyword)
-            
-            # 키워드 매칭 개수를 result 객체에 저장
-            result.keyword_matches = keyword_matches
+        Args:
+            user_message: 사용자 메시지
+            character: 캐릭터 이름
+            search_params: 요청별 벡터 인덱스 검색 파라미터 (선택)
             
-            logger.info(f"문서 {i+1}: {result.document_title} - 키워드 매칭: {keyword_matches}개")
-            if keyword_matches > 0:
-                logger.info(f"  매칭된 키워드: {matched_keywords}")
-                
-                # 키워드 매칭 개수에 비례하여 가중치 부여 (최대 0.6까지)
-                boost = min(0.6, keyword_matches * 0.15)
-                original_similarity = result.similarity
-                result.similarity += boost
-                logger.info(f"  가중치 적용: {original_similarity:.4f} + {boost:.3f} = {result.similarity:.4f}")
-        
-        # 키워드 매칭 우선 정렬
-        # 1) 키워드 매칭된 문서를 먼저 정렬 (유사도 내림차순)
-        keyword_matches = [r for r in search_results if hasattr(r, 'keyword_matches') and r.keyword_matches > 0]
-        other_results = [r for r in search_results if not hasattr(r, 'keyword_matches') or r.keyword_matches == 0]
-        
-        # 키워드 매칭된 문서들을 키워드 개수 우선, 그 다음 유사도 순으로 정렬
-        keyword_matches.sort(key=lambda x: (-x.keyword_matches, -x.similarity))
-        other_results.sort(key=lambda x: x.similarity, reverse=True)
-        
-        # 최종 결과: 키워드 매칭 문서 + 나머지 문서
-        search_results = keyword_matches + other_results
-        
-        logger.info(f"키워드 매칭 우선 정렬 완료: {len(keyword_matches)}개 키워드 매칭, {len(other_results)}개 일반")
+        Yields:
+            dict: {"event": 이벤트 이름, "data": 이벤트 데이터}
+        """
+        try:
+            logger.info(f"User message (stream): {user_message}")
+            logger.info(f"Character: {character}")
+
+            # 캐시된 응답은 같은 이벤트 형식으로 바로 재생
+            cache_key = await aresponse_cache_key(user_message, character, "ko", search_params)
+            cached = response_cache.get(cache_key) if cache_key else None
+            label_cache_outcome(cache_key, cached, ("stream", cache_key))
+            if cached is not None:
+                events = static_answer_events(cached.sources, cached.response)
+            elif cache_key:
+                # 같은 질문이 동시에 들어오면 스트림 하나를 함께 구독
+                events = inflight.stream(("stream", cache_key), self._astream_pipeline,
+                                         user_message, character, search_params, cache_key)
+            else:
+                events = self._astream_pipeline(user_message, character, search_params, None)
+
+            async for event in events:
+                yield event
+
+        except Exception as e:
+            # 이미 보낸 이벤트는 되돌릴 수 없으므로 error 이벤트로 스트림을 마무리 (캐시에는 저장하지 않음)
+            logger.error(f"스트리밍 응답 생성 실패: {e}")
+            yield {"event": "error", "data": self._generate_error_response().model_dump()}
+
+    async def _astream_pipeline(self, user_message: str, character: str,
+                                search_params: Optional[VectorSearchParams],
+                                cache_key) -> AsyncIterator[Dict[str, Any]]:
+        """스트리밍 RAG 파이프라인 - 완료 시 응답 캐시에 저장"""
+        started = time.perf_counter()
+        search_results = await self._aretrieve(user_message, search_params)
+
+        if self._is_unknown(user_message, search_results):
+            unknown = self._generate_unknown_response(user_message, character)
+            events = static_answer_events(unknown.sources, unknown.response)
+        else:
+            search_results = await reranker.arerank(user_message, search_results, started)
+            with span("prompt"):
+                final_prompt = self._build_prompt(user_message, character, search_results)
+            sources = self._build_sources(search_results)
+            events = answer_events(sources, self._astream_llm(final_prompt))
+
+        async for event in events:
+            if event["event"] == "done" and cache_key:
+                response_cache.put(cache_key, ChatResponse(**event["data"]))
+            yield event
+
+    async def _aretrieve(self, user_message: str,
+                         search_params: Optional[VectorSearchParams] = None) -> List[SearchResult]:
+        """쿼리 임베딩(캐시 → CPU executor) + 하이브리드 검색(DB executor)"""
+        logger.info("1단계: 쿼리 임베딩 생성")
+        query_embedding = await aencode_query(self.embedding_model, user_message)
+
+        # 전시 주제와 명백히 무관하면 검색하지 않음 (빈 결과 → "모르겠다" 응답)
+        if not await topic_gate.ais_on_topic(query_embedding):
+            return []
+
+        logger.info("2단계: PostgreSQL 벡터 검색 + 키워드 검색")
+        results = await run_db_bound(self._hybrid_search, query_embedding, user_message, search_params)
+        return self._rank_results(user_message, results)
+
+    async def _astream_llm(self, prompt) -> AsyncIterator[str]:
+        """LLM 출력 토큰 스트림"""
+        with span("llm"):
+            async for chunk in self.llm.astream(prompt):
+                if chunk.content:
+                    yield chunk.content
+
+    def _hybrid_search(self, query_embedding: np.ndarray, user_message: str,
+                       search_params: Optional[VectorSearchParams] = None) -> List[SearchResult]:
+        """벡터 검색 + 키워드 검색 (호작도, 용호도, 산신도 등) - 단일 쿼리, 중복 제거됨"""
+        return self.chunk_service.hybrid_search(
+            query_embedding=query_embedding,
+            query=user_message,
+            vector_count=5,
+            keyword_count=5,
+            match_threshold=0.0,
+            search_params=search_params
+        )
+
+    def _rank_results(self, user_message: str, search_results: List[SearchResult]) -> List[SearchResult]:
+        """벡터/키워드 점수 융합 및 정렬 (similarity 는 보정 점수로 교체됨)"""
+        logger.info(f"질문: '{user_message}'")
+        with span("fusion"):
+            search_results = fuse(search_results)
         
         logger.info(f"  -> {len(search_results)}개 청크 검색 완료")
         for i, result in enumerate(search_results):
-            logger.info(f"    Top {i+1}: {result.document_title} (Similarity: {result.similarity:.4f})")
+            logger.info(f"    Top {i+1}: {result.document_title} (Score: {result.similarity:.4f}, "
+                        f"Vector: {result.vector_similarity}, Keyword: {result.keyword_score})")
             logger.info(f"    Content: {result.chunk_text[:100]}...")
 
-        # ----------------- 3) "모르는 정보" 처리 로직 -----------------
-        # 검색 결과가 없거나 유사도가 너무 낮은 경우
+        return search_results
+
+    def _is_unknown(self, user_message: str, search_results: List[SearchResult]) -> bool:
+        """검색 결과가 없거나 유사도가 너무 낮아 '모르겠다' 응답을 해야 하는지 여부"""
         if not search_results:
             logger.info("검색 결과가 없음 - '모르겠다' 응답 생성")
-            return self._generate_unknown_response(user_message, character)
+            return True
         
         # 최고 유사도 점수 확인
         max_similarity = max(result.similarity for result in search_results)
         logger.info(f"최고 유사도 점수: {max_similarity:.4f}")
         
-        # 유사도 임계값 (0.7 이하면 "모르겠다" 응답)
-        SIMILARITY_THRESHOLD = 0.7
-        if max_similarity < SIMILARITY_THRESHOLD:
-            logger.info(f"유사도가 임계값({SIMILARITY_THRESHOLD})보다 낮음 - '모르겠다' 응답 생성")
-            return self._generate_unknown_response(user_message, character)
+        # 융합 보정 점수 임계값 (미만이면 "모르겠다" 응답)
+        if max_similarity < FUSION_SCORE_THRESHOLD:
+            logger.info(f"유사도가 임계값({FUSION_SCORE_THRESHOLD})보다 낮음 - '모르겠다' 응답 생성")
+            return True
         
         # 추가 검증: 검색 결과에서 질문의 핵심 키워드가 실제로 포함되어 있는지 확인
-        user_message_lower = user_message.lower()
-        question_keywords = []
-        
-        # 한글 키워드 추출 (조사 제거)
-        import re
-        korean_words = re.findall(r'[가-힣]{2,}', user_message)
-        particles = ['의', '은', '는', '이', '가', '을', '를', '에', '에서', '로', '으로', '와', '과', '도', '만', '부터', '까지']
-        
-        for word in korean_words:
-            clean_word = word
-            for particle in particles:
-                if clean_word.endswith(particle):
-                    clean_word = clean_word[:-len(particle)]
-                    break
-            if len(clean_word) >= 2:
-                question_keywords.append(clean_word)
-        
-        # 검색 결과에서 질문의 핵심 키워드가 실제로 포함되어 있는지 확인
-        context_text = " ".join([result.chunk_text for result in search_results]).lower()
-        keyword_found = any(keyword.lower() in context_text for keyword in question_keywords)
-        
+        # (적재 시 계산해 둔 청크 토큰 집합과의 교집합 - 청크 텍스트를 다시 훑지 않음)
+        question_keywords = query_terms(user_message)
+        keyword_found = any(not question_keywords.isdisjoint(result.token_set()) for result in search_results)
         
         if not keyword_found and question_keywords:
             logger.info(f"질문의 핵심 키워드({question_keywords})가 검색 결과에 없음 - '모르겠다' 응답 생성")
-            return self._generate_unknown_response(user_message, character)
+            return True
+        return False
+
+    def _build_prompt(self, user_message: str, character: str,
+                      search_results: List[SearchResult]) -> str:
+        """검색 결과와 캐릭터 설정으로 최종 프롬프트 생성"""
+        # 캐릭터 스타일 가져오기
+        char_style = CHARACTER_STYLE[character]
 
-        # ----------------- 4) 컨텍스트 구성 -----------------
+        # 컨텍스트 구성
         context = "\n\n".join([
             f"[{result.document_title}] {result.chunk_text}" 
             for result in search_results
         ])
 
-        # ----------------- 4) 프롬프트 생성 -----------------
         prompt = PromptTemplate(
             input_variables=["message", "context", "character", "char_style"],
             template=(
@@ -244,18 +325,26 @@ class PostgresRAGService:
             ),
         )
 
-        final_prompt = prompt.format(
+        return prompt.format(
             message=user_message,
             context=context,
             character=character,
             char_style=char_style
         )
+
+    def _build_response(self, response_text: str, search_results: List[SearchResult]) -> ChatResponse:
+        """LLM 답변과 검색 결과로 ChatResponse 구성"""
+        sources = self._build_sources(search_results)
         
-        # ----------------- 5) LLM 응답 생성 -----------------
-        response = self.llm.invoke(final_prompt)
+        logger.info(f"Generated response: {response_text.strip()}")
+        return ChatResponse(
+            response=response_text.strip(),
+            sources=sources,
+        )
 
-        # ----------------- 6) 응답 구성 -----------------
-        sources = [
+    def _build_sources(self, search_results: List[SearchResult]) -> List[dict]:
+        """검색 결과를 응답용 출처 목록으로 변환"""
+        return [
             {
                 "source": result.source_url or f"문서: {result.document_title}",
                 "content": result.chunk_text[:300],
@@ -266,12 +355,6 @@ class PostgresRAGService:
             }
             for i, result in enumerate(search_results)
         ]
-        
-        logger.info(f"Generated response: {response.content.strip()}")
-        return ChatResponse(
-            response=response.content.strip(),
-            sources=sources,
-        )
 
     def add_document(self, title: str, content: str, file_type: str = "text", 
                     source_url: str = None, metadata: dict = None) -> int:
@@ -288,7 +371,7 @@ class PostgresRAGService:
         Returns:
             int: 생성된 문서 ID
         """
-        # 1) 문서 생성
+        # 1) 문서 객체 생성
         document = Document(
             title=title,
             file_type=file_type,
@@ -296,25 +379,24 @@ class PostgresRAGService:
             content=content,
             metadata=metadata or {}
         )
-        document_id = self.document_service.create_document(document)
         
         # 2) 청크 분할
         chunks = self._split_into_chunks(content)
         
-        # 3) 청크 임베딩 생성 및 저장
-        chunk_objects = []
-        for i, chunk_text in enumerate(chunks):
-            embedding = self.embedding_model.encode(chunk_text).tolist()
-            chunk_obj = DocumentChunk(
+        # 3) 청크 임베딩 생성 (배치)
+        embeddings = encode_in_batches(self.embedding_model, chunks)
+        chunk_objects = [
+            DocumentChunk(
                 chunk_text=chunk_text,
                 chunk_index=i,
                 embedding=embedding,
                 metadata={"chunk_length": len(chunk_text)}
             )
-            chunk_objects.append(chunk_obj)
+            for i, (chunk_text, embedding) in enumerate(zip(chunks, embeddings))
+        ]
         
-        # 4) 청크 저장
-        self.chunk_service.create_chunks(document_id, chunk_objects)
+        # 4) 문서 + 청크를 한 트랜잭션으로 저장
+        document_id, _ = self.chunk_service.create_document_with_chunks(document, chunk_objects)
         
         logger.info(f"문서 추가 완료: {title} (ID: {document_id}, 청크: {len(chunks)}개)")
         return document_id
@@ -345,6 +427,13 @@ class PostgresRAGService:
         
         return [chunk for chunk in chunks if chunk.strip()]
     
+    def _generate_error_response(self) -> ChatResponse:
+        """파이프라인 실패 시 대체 응답"""
+        return ChatResponse(
+            response="죄송해요, 지금은 호랑이 전시 정보를 불러오지 못하고 있어요. 잠시 후 다시 물어봐 주세요!",
+            sources=[]
+        )
+
     def _generate_unknown_response(self, user_message: str, character: str) -> ChatResponse:
         """
         모르는 정보에 대한 응답 생성
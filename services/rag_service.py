@@ -3,11 +3,11 @@ RAG 서비스
 """
 from typing import List
 from langchain.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
 from langchain_community.vectorstores import FAISS
 from sentence_transformers import CrossEncoder
 from characters import CHARACTER_STYLE
 from models.response_models import ChatResponse
+from services.model_registry import get_llm
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,7 +17,7 @@ class RAGService:
     def __init__(self, vectorstore: FAISS, cross_encoder: CrossEncoder):
         self.vectorstore = vectorstore
         self.cross_encoder = cross_encoder
-        self.llm = ChatOpenAI(model_name="gpt-4o", temperature=0.7)
+        self.llm = get_llm(model="gpt-4o", temperature=0.7)
     
     def generate_response(self, user_message: str, character: str) -> ChatResponse:
         """
@@ -49,7 +49,7 @@ class RAGService:
         pairs = [[user_message, doc.page_content] for doc in retrieved_docs]
 
         # Cross-encoder로 점수 계산
-        scores = self.cross_encoder.predict(pairs, show_progress_bar=True)
+        scores = self.cross_encoder.predict(pairs, show_progress_bar=False)
 
         # 점수와 문서를 튜플로 묶어 점수 기준 내림차순 정렬
         scored_docs = sorted(zip(scores, retrieved_docs), key=lambda x: x[0], reverse=True)
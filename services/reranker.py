@@ -0,0 +1,170 @@
+"""
+Cross-encoder 재정렬 단계
+
+융합된 하이브리드 검색 결과를 cross-encoder 로 한 번에(batch 1회) 재점수화하고
+상위 RERANK_K 개만 LLM 컨텍스트로 넘겨 프롬프트를 줄입니다.
+
+- 점수 캐시: (정규화된 질문, chunk_id) 별 점수를 재사용해 캐시된 쌍은 모델을 거치지 않음
+- 지연 예산: 요청 시작 후 남은 시간이 예상 재정렬 시간보다 짧으면 재정렬을 건너뜀
+- 실패/비활성: 모델 로드 실패 등으로 재정렬할 수 없으면 융합 순서를 그대로 사용
+"""
+import logging
+import threading
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from config.app_config import (
+    CROSS_ENCODER_MODEL, RERANK_CACHE_SIZE, RERANK_CACHE_TTL, RERANK_ENABLED, RERANK_K,
+    RERANK_LATENCY_BUDGET_MS
+)
+from database.models import SearchResult
+from services.embedding_cache import normalize_query
+from services.model_registry import get_cross_encoder
+from utils.executors import run_cpu_bound
+from utils.metrics import span
+from utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# 쌍당 소요 시간 지수이동평균 가중치 (최근 측정값 비중)
+_COST_SMOOTHING = 0.2
+
+
+class Reranker:
+    """배치 cross-encoder 재정렬기 (점수 캐시 + 지연 예산)"""
+
+    def __init__(self, enabled: bool = RERANK_ENABLED, top_k: int = RERANK_K,
+                 budget_ms: float = RERANK_LATENCY_BUDGET_MS, model_name: str = CROSS_ENCODER_MODEL):
+        self.enabled = enabled
+        self.top_k = top_k
+        self.budget_seconds = budget_ms / 1000
+        self.model_name = model_name
+        self.cache = TTLCache(RERANK_CACHE_SIZE, RERANK_CACHE_TTL)
+        self._seconds_per_pair: Optional[float] = None
+        self._lock = threading.Lock()
+        self.reranked = 0
+        self.skipped_budget = 0
+        self.failures = 0
+
+    # ----------------- 공개 API -----------------
+
+    def rerank(self, query: str, results: List[SearchResult],
+               started: Optional[float] = None) -> List[SearchResult]:
+        """
+        results 를 cross-encoder 점수 순으로 재정렬해 상위 top_k 개 반환
+
+        Args:
+            query: 사용자 질문
+            results: 융합된 검색 결과
+            started: 요청 시작 시각 (time.perf_counter) - None 이면 예산 검사 안 함
+        """
+        plan = self._plan(query, results, started)
+        if plan is None:
+            return results
+        keys, scores, pending = plan
+        if pending:
+            try:
+                with span("rerank"):
+                    predicted = self._score(query, [results[i] for i in pending])
+                self._store(keys, scores, pending, predicted)
+            except Exception as e:
+                return self._fail(results, e)
+        return self._apply(results, scores)
+
+    async def arerank(self, query: str, results: List[SearchResult],
+                      started: Optional[float] = None) -> List[SearchResult]:
+        """rerank 의 비동기 버전 (모델 추론은 CPU executor 에서 실행)"""
+        plan = self._plan(query, results, started)
+        if plan is None:
+            return results
+        keys, scores, pending = plan
+        if pending:
+            try:
+                with span("rerank"):
+                    predicted = await run_cpu_bound(self._score, query, [results[i] for i in pending])
+                self._store(keys, scores, pending, predicted)
+            except Exception as e:
+                return self._fail(results, e)
+        return self._apply(results, scores)
+
+    def warm(self):
+        """재정렬 사용 시 시작 시점에 모델 로드"""
+        if self.enabled:
+            get_cross_encoder(self.model_name)
+
+    # ----------------- 내부 단계 -----------------
+
+    def _plan(self, query: str, results: List[SearchResult], started: Optional[float]
+              ) -> Optional[Tuple[List[Hashable], Dict[int, float], List[int]]]:
+        """캐시 조회 후 (캐시 키, 캐시된 점수, 모델로 계산할 행 번호) - 재정렬하지 않으면 None"""
+        if not self.enabled or len(results) <= 1:
+            return None
+        normalized = normalize_query(query)
+        keys = [(normalized, result.chunk_id) for result in results]
+        scores: Dict[int, float] = {}
+        pending = []
+        for i, key in enumerate(keys):
+            cached = self.cache.get(key)
+            if cached is None:
+                pending.append(i)
+            else:
+                scores[i] = cached
+
+        if pending and started is not None and self._seconds_per_pair is not None:
+            remaining = self.budget_seconds - (time.perf_counter() - started)
+            estimated = self._seconds_per_pair * len(pending)
+            if estimated > remaining:
+                self.skipped_budget += 1
+                logger.info(f"재정렬 건너뜀 - 예상 {estimated * 1000:.0f}ms > 남은 예산 {remaining * 1000:.0f}ms")
+                return None
+        return keys, scores, pending
+
+    def _score(self, query: str, results: List[SearchResult]) -> List[float]:
+        """질문-청크 쌍 전체를 한 번의 배치로 점수화하고 쌍당 소요 시간 갱신"""
+        model = get_cross_encoder(self.model_name)
+        started = time.perf_counter()
+        pairs = [[query, result.chunk_text] for result in results]
+        scores = model.predict(pairs, batch_size=len(pairs), show_progress_bar=False)
+        per_pair = (time.perf_counter() - started) / len(pairs)
+        with self._lock:
+            if self._seconds_per_pair is None:
+                self._seconds_per_pair = per_pair
+            else:
+                self._seconds_per_pair += _COST_SMOOTHING * (per_pair - self._seconds_per_pair)
+        return [float(score) for score in scores]
+
+    def _store(self, keys: List[Hashable], scores: Dict[int, float],
+               pending: List[int], predicted: List[float]):
+        for i, score in zip(pending, predicted):
+            scores[i] = score
+            self.cache.put(keys[i], score)
+
+    def _apply(self, results: List[SearchResult], scores: Dict[int, float]) -> List[SearchResult]:
+        order = sorted(range(len(results)), key=lambda i: -scores[i])[:self.top_k]
+        reranked = []
+        for i in order:
+            results[i].rerank_score = scores[i]
+            reranked.append(results[i])
+        self.reranked += 1
+        logger.info(f"재정렬 완료: {len(results)}개 -> 상위 {len(reranked)}개")
+        return reranked
+
+    def _fail(self, results: List[SearchResult], error: Exception) -> List[SearchResult]:
+        self.failures += 1
+        logger.error(f"재정렬 실패 - 융합 순서 사용: {error}")
+        return results
+
+    def stats(self) -> Dict[str, object]:
+        """재정렬 메트릭 (/health/detailed 용)"""
+        return {
+            "enabled": self.enabled,
+            "reranked": self.reranked,
+            "skipped_budget": self.skipped_budget,
+            "failures": self.failures,
+            "ms_per_pair": round(self._seconds_per_pair * 1000, 2) if self._seconds_per_pair else None,
+            "score_cache": self.cache.stats(),
+        }
+
+
+# 프로세스 전역 재정렬기 (한국어/영어 서비스 공유)
+reranker = Reranker()
@@ -0,0 +1,173 @@
+"""
+RAG 응답 캐시
+
+같은 질문을 같은 캐릭터에게 하면 같은 근거로 같은 답이 나오므로,
+(정규화된 질문, 캐릭터, 언어, 코퍼스 버전) 을 키로 완성된 응답을 캐시합니다.
+관리자가 문서를 올리거나 비활성화하면 코퍼스 버전이 올라가 이전 응답은 더 이상 조회되지 않습니다.
+"""
+import copy
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from config.app_config import CORPUS_VERSION_TTL, RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL
+from database.document_service import DocumentService
+from database.models import VectorSearchParams
+from services.embedding_cache import normalize_query
+from utils.executors import run_db_bound
+from utils.metrics import label_request
+from utils.singleflight import SingleFlight
+from utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class CorpusVersion:
+    """
+    코퍼스 버전 조회기 (corpus_change_log 의 MAX(id))
+
+    매 요청마다 DB 를 조회하지 않도록 ttl_seconds 동안 값을 재사용합니다.
+    같은 프로세스의 관리자 API 는 invalidate() 로 즉시 재조회를 강제합니다.
+    """
+
+    def __init__(self, loader: Callable[[], int], ttl_seconds: float = CORPUS_VERSION_TTL):
+        self._loader = loader
+        self.ttl_seconds = ttl_seconds
+        self._version: Optional[int] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _is_fresh(self) -> bool:
+        return self._version is not None and time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    def _store(self, version: int) -> int:
+        with self._lock:
+            self._version = version
+            self._loaded_at = time.monotonic()
+        return version
+
+    def current(self) -> int:
+        """현재 코퍼스 버전"""
+        if self._is_fresh():
+            return self._version
+        return self._store(self._loader())
+
+    async def acurrent(self) -> int:
+        """current 의 비동기 버전 (재조회가 필요할 때만 DB executor 사용)"""
+        if self._is_fresh():
+            return self._version
+        return self._store(await run_db_bound(self._loader))
+
+    def invalidate(self):
+        """다음 조회 때 DB 에서 다시 읽도록 표시"""
+        with self._lock:
+            self._version = None
+
+
+class ResponseCache(TTLCache):
+    """완성된 RAG 응답 캐시 (조회 시 복사본을 돌려줘 캐시 값이 변경되지 않도록 함)"""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE, ttl_seconds: float = RESPONSE_CACHE_TTL):
+        super().__init__(max_entries, ttl_seconds)
+
+    @staticmethod
+    def make_key(message: str, character: str, language: str, version: int) -> Hashable:
+        return (normalize_query(message), character, language, version)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        cached = super().get(key)
+        return copy.deepcopy(cached) if cached is not None else None
+
+    def put(self, key: Hashable, value: Any) -> Any:
+        super().put(key, copy.deepcopy(value))
+        return value
+
+
+# 프로세스 전역 인스턴스 (한국어/영어 서비스 공유)
+corpus_version = CorpusVersion(lambda: DocumentService().get_corpus_version())
+response_cache = ResponseCache()
+# 같은 캐시 키로 동시에 들어온 요청 병합
+inflight = SingleFlight()
+
+
+def _bypasses_cache(search_params: Optional[VectorSearchParams]) -> bool:
+    # 인덱스 검색 파라미터를 직접 지정한 요청(튜닝/디버깅)은 캐시하지 않음
+    return bool(search_params and (search_params.ef_search or search_params.probes))
+
+
+def response_cache_key(message: str, character: str, language: str,
+                       search_params: Optional[VectorSearchParams] = None) -> Optional[Hashable]:
+    """현재 코퍼스 버전을 포함한 캐시 키 (캐시하지 않을 요청이면 None)"""
+    if _bypasses_cache(search_params):
+        return None
+    return ResponseCache.make_key(message, character, language, corpus_version.current())
+
+
+async def aresponse_cache_key(message: str, character: str, language: str,
+                              search_params: Optional[VectorSearchParams] = None) -> Optional[Hashable]:
+    """response_cache_key 의 비동기 버전"""
+    if _bypasses_cache(search_params):
+        return None
+    return ResponseCache.make_key(message, character, language, await corpus_version.acurrent())
+
+
+def label_cache_outcome(key: Optional[Hashable], cached: Any, flight_key: Optional[Hashable] = None):
+    """현재 요청 메트릭의 cache 라벨 지정 (bypass / hit / coalesced / miss)"""
+    if key is None:
+        outcome = "bypass"
+    elif cached is not None:
+        outcome = "hit"
+    elif flight_key is not None and inflight.running(flight_key):
+        outcome = "coalesced"
+    else:
+        outcome = "miss"
+    label_request(cache=outcome)
+
+
+def cached_call(key: Optional[Hashable], func: Callable[..., Any], *args, **kwargs) -> Any:
+    """캐시 적중 시 저장된 응답, 아니면 func 결과를 캐시에 넣고 반환 (예외는 캐시하지 않음)"""
+    if key is None:
+        label_cache_outcome(key, None)
+        return func(*args, **kwargs)
+    cached = response_cache.get(key)
+    label_cache_outcome(key, cached)
+    if cached is not None:
+        logger.info("응답 캐시 적중")
+        return cached
+    return response_cache.put(key, func(*args, **kwargs))
+
+
+async def acached_call(key: Optional[Hashable], func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+    """
+    cached_call 의 비동기 버전 (func 는 코루틴 함수)
+
+    캐시 미스인 동시 요청은 single-flight 로 병합되어 파이프라인을 한 번만 실행하고
+    각자 결과의 복사본을 받습니다.
+    """
+    if key is None:
+        label_cache_outcome(key, None)
+        return await func(*args, **kwargs)
+    cached = response_cache.get(key)
+    label_cache_outcome(key, cached, key)
+    if cached is not None:
+        logger.info("응답 캐시 적중")
+        return cached
+    result = await inflight.do(key, _acompute_and_store, key, func, *args, **kwargs)
+    return copy.deepcopy(result)
+
+
+async def _acompute_and_store(key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+    return response_cache.put(key, await func(*args, **kwargs))
+
+
+def invalidate_corpus():
+    """관리자 문서 변경 직후 호출 - 이 프로세스가 새 코퍼스 버전을 바로 읽도록 함"""
+    corpus_version.invalidate()
+
+
+def purge_responses() -> Dict[str, int]:
+    """응답 캐시 전체 삭제"""
+    purged = response_cache.purge()
+    logger.info(f"응답 캐시 {purged}개 삭제")
+    return {"purged": purged}
@@ -4,9 +4,9 @@
 import json
 import re
 from typing import List
-from langchain_openai import ChatOpenAI
 from models.request_models import ConversationMessage
 from models.response_models import ConversationSummaryResponse
+from services.model_registry import get_llm
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,7 +14,7 @@ logger = logging.getLogger(__name__)
 
 class SummaryService:
     def __init__(self):
-        self.llm = ChatOpenAI(model_name="gpt-4o", temperature=0.7)
+        self.llm = get_llm(model="gpt-4o", temperature=0.7)
     
     def generate_summary(self, session_id: int, messages: List[ConversationMessage], count: int) -> ConversationSummaryResponse:
         """
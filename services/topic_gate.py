@@ -0,0 +1,134 @@
+"""
+임베딩 기반 주제 게이트
+
+파이프라인이 이미 계산한 질문 임베딩을 코퍼스의 주제 중심 벡터들과 비교해,
+전시와 명백히 무관한 질문은 DB 검색과 LLM 호출 없이 "모르겠다" 응답으로 보냅니다.
+
+- 주제: 활성 문서의 연속 청크 TOPIC_WINDOW_CHUNKS 개마다 임베딩 평균 (문서 섹션 단위)
+  한 문서 전체 평균은 여러 소주제가 섞여 특정 질문과의 유사도가 낮아지므로 섹션으로 나눔
+- 갱신: 코퍼스 버전(corpus_change_log)이 바뀌면 다음 질문 때 다시 계산
+- 실패 시 통과: 중심 벡터를 읽지 못하면 게이트를 열어 둠 (기존 검색 경로의 판단에 맡김)
+"""
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Union
+
+import numpy as np
+
+from config.app_config import TOPIC_GATE_ENABLED, TOPIC_GATE_THRESHOLD, TOPIC_WINDOW_CHUNKS
+from database.connection import get_db_cursor
+from services.response_cache import corpus_version
+from utils.executors import run_db_bound
+
+logger = logging.getLogger(__name__)
+
+
+def load_topic_centroids(window: int = TOPIC_WINDOW_CHUNKS) -> np.ndarray:
+    """활성 문서의 섹션별 임베딩 평균 (행 단위 L2 정규화, float32)"""
+    with get_db_cursor() as (cursor, conn):
+        # pgvector 의 AVG(vector) 로 DB 에서 평균 - 청크 임베딩 전체를 가져오지 않음
+        cursor.execute("""
+            SELECT AVG(dc.embedding) AS centroid
+            FROM document_chunks dc
+            JOIN documents d ON dc.document_id = d.id
+            WHERE d.is_active = TRUE
+            AND dc.embedding IS NOT NULL
+            GROUP BY dc.document_id, dc.chunk_index / %s
+        """, (window,))
+        rows = cursor.fetchall()
+    if not rows:
+        return np.empty((0, 0), dtype=np.float32)
+    centroids = np.stack([np.asarray(row['centroid'], dtype=np.float32) for row in rows])
+    norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return centroids / norms
+
+
+class TopicGate:
+    """질문 임베딩이 코퍼스 주제 중 하나와 충분히 가까운지 판단"""
+
+    def __init__(self, loader: Callable[[], np.ndarray] = load_topic_centroids,
+                 threshold: float = TOPIC_GATE_THRESHOLD, enabled: bool = TOPIC_GATE_ENABLED):
+        self._loader = loader
+        self.threshold = threshold
+        self.enabled = enabled
+        self._centroids: Optional[np.ndarray] = None
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+        self.checks = 0
+        self.rejected = 0
+        self.failures = 0
+
+    def _centroids_for(self, version: int) -> np.ndarray:
+        """해당 코퍼스 버전의 중심 벡터 (버전이 바뀌었을 때만 다시 계산)"""
+        if self._version != version or self._centroids is None:
+            with self._lock:
+                if self._version != version or self._centroids is None:
+                    self._centroids = self._loader()
+                    self._version = version
+                    logger.info(f"주제 중심 벡터 갱신: {len(self._centroids)}개 (코퍼스 버전 {version})")
+        return self._centroids
+
+    def refresh(self):
+        """현재 코퍼스 버전으로 중심 벡터 계산 (시작 시 워밍업용)"""
+        if self.enabled:
+            self._centroids_for(corpus_version.current())
+
+    def is_on_topic(self, query_embedding: Union[np.ndarray, list]) -> bool:
+        """전시 주제와 관련 있어 보이면 True (비활성/중심 벡터 없음/조회 실패 시에도 True)"""
+        if not self.enabled:
+            return True
+        try:
+            centroids = self._centroids_for(corpus_version.current())
+        except Exception as e:
+            return self._fail_open(e)
+        return self._decide(query_embedding, centroids)
+
+    async def ais_on_topic(self, query_embedding: Union[np.ndarray, list]) -> bool:
+        """is_on_topic 의 비동기 버전 (중심 벡터 재계산이 필요할 때만 DB executor 사용)"""
+        if not self.enabled:
+            return True
+        try:
+            version = await corpus_version.acurrent()
+            centroids = self._centroids
+            if self._version != version or centroids is None:
+                centroids = await run_db_bound(self._centroids_for, version)
+        except Exception as e:
+            return self._fail_open(e)
+        return self._decide(query_embedding, centroids)
+
+    def _fail_open(self, error: Exception) -> bool:
+        self.failures += 1
+        logger.error(f"주제 중심 벡터 조회 실패 - 게이트 통과: {error}")
+        return True
+
+    def _decide(self, query_embedding: Union[np.ndarray, list], centroids: np.ndarray) -> bool:
+        if centroids.size == 0:
+            return True
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return True
+        score = float(np.max(centroids @ (query / norm)))
+        self.checks += 1
+        if score < self.threshold:
+            self.rejected += 1
+            logger.info(f"주제 게이트: 관련 없음 (최대 유사도 {score:.4f} < {self.threshold})")
+            return False
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """게이트 메트릭 (/health/detailed 용)"""
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            "topics": len(self._centroids) if self._centroids is not None else 0,
+            "corpus_version": self._version,
+            "checks": self.checks,
+            "rejected": self.rejected,
+            "failures": self.failures,
+        }
+
+
+# 프로세스 전역 게이트 (한국어/영어 서비스 공유)
+topic_gate = TopicGate()
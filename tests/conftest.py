@@ -0,0 +1,117 @@
+"""
+오프라인 테스트용 공통 fixture
+
+실제 모델/DB/OpenAI 없이 RAG 파이프라인을 돌릴 수 있도록 가짜 객체를 주입합니다.
+"""
+import asyncio
+import hashlib
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from database.models import SearchResult
+
+
+class FakeEmbeddingModel:
+    """텍스트 해시로 결정적인 384차원 벡터를 만드는 가짜 임베딩 모델"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts, **kwargs):
+        self.calls += 1
+        if isinstance(texts, str):
+            return self._vector(texts)
+        return np.stack([self._vector(t) for t in texts])
+
+    @staticmethod
+    def _vector(text):
+        seed = int(hashlib.md5(text.encode("utf-8")).hexdigest()[:8], 16)
+        vec = np.random.default_rng(seed).standard_normal(384).astype(np.float32)
+        return vec / np.linalg.norm(vec)
+
+
+class FakeChunkService:
+    """고정된 검색 결과를 돌려주는 가짜 ChunkService"""
+
+    def __init__(self, results=None):
+        self.results = results if results is not None else [
+            SearchResult(chunk_id=1, document_id=1, chunk_text="호작도는 까치와 호랑이를 그린 민화입니다. The Tiger Exhibition shows hojakdo.",
+                         similarity=0.82, document_title="호랑이 전시", source_url=None),
+            SearchResult(chunk_id=2, document_id=1, chunk_text="용호도는 용과 호랑이를 함께 그린 그림입니다.",
+                         similarity=0.55, document_title="호랑이 전시", source_url=None),
+        ]
+        self.calls = 0
+
+    def _copy(self):
+        return [SearchResult(**vars(r)) for r in self.results]
+
+    def search_similar_chunks(self, query_embedding, match_threshold=0.7, match_count=5, **kwargs):
+        self.calls += 1
+        return self._copy()[:match_count]
+
+    def search_by_keywords(self, query, match_count=5):
+        self.calls += 1
+        return []
+
+    def hybrid_search(self, query_embedding, query, vector_count=5, keyword_count=5, match_threshold=0.0, **kwargs):
+        self.calls += 1
+        return self._copy()[:vector_count]
+
+
+class FakeLLM:
+    """고정 답변을 돌려주는 가짜 LLM (invoke/ainvoke/astream)"""
+
+    def __init__(self, answer="호작도는 까치와 호랑이 그림이에요. 정말 멋지죠!", delay=0.0):
+        self.answer = answer
+        self.delay = delay
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return SimpleNamespace(content=self.answer)
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return SimpleNamespace(content=self.answer)
+
+    async def astream(self, prompt):
+        self.calls += 1
+        for i in range(0, len(self.answer), 3):
+            if self.delay:
+                await asyncio.sleep(self.delay / 10)
+            yield SimpleNamespace(content=self.answer[i:i + 3])
+
+
+def _wire(service):
+    from services.embedding_cache import embedding_cache
+    from services.response_cache import corpus_version, response_cache
+    embedding_cache.clear()
+    response_cache.clear()
+    corpus_version._loader = lambda: 0  # DB 없이 고정 코퍼스 버전
+    corpus_version.invalidate()
+    from services.topic_gate import topic_gate
+    topic_gate._loader = lambda: np.empty((0, 0), dtype=np.float32)  # DB 없이 게이트 통과
+    topic_gate._version = None
+    service.embedding_model = FakeEmbeddingModel()
+    service.chunk_service = FakeChunkService()
+    service.document_service = None
+    service.llm = FakeLLM()
+    return service
+
+
+@pytest.fixture
+def korean_service():
+    from services.postgres_rag_service import PostgresRAGService
+    return _wire(PostgresRAGService.__new__(PostgresRAGService))
+
+
+@pytest.fixture
+def english_service():
+    from services.english_postgres_rag_service import EnglishPostgresRAGService
+    service = _wire(EnglishPostgresRAGService.__new__(EnglishPostgresRAGService))
+    service.llm.answer = "Hojakdo shows a tiger and a magpie. You should see it!"
+    return service
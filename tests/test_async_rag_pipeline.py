@@ -0,0 +1,39 @@
+"""
+비동기 RAG 파이프라인 테스트 (오프라인)
+"""
+import asyncio
+import time
+
+
+def test_korean_async_matches_sync(korean_service):
+    sync_response = korean_service.generate_response("호작도가 뭐야?", "rumi")
+    async_response = asyncio.run(korean_service.agenerate_response("호작도가 뭐야?", "rumi"))
+
+    assert async_response.response == sync_response.response
+    assert [s["chunk_id"] for s in async_response.sources] == [s["chunk_id"] for s in sync_response.sources]
+
+
+def test_english_async_matches_sync(english_service):
+    sync_result = english_service.generate_response("What is hojakdo?", "rumi")
+    async_result = asyncio.run(english_service.agenerate_response("What is hojakdo?", "rumi"))
+
+    assert async_result == sync_result
+    assert async_result["sources"][0]["chunk_id"] == 1
+
+
+def test_concurrent_requests_overlap_on_llm_wait(korean_service):
+    """LLM 대기 중 다른 요청이 진행되어야 함 (이벤트 루프 비차단)"""
+    korean_service.llm.delay = 0.2
+
+    async def run_many():
+        return await asyncio.gather(*[
+            korean_service.agenerate_response(f"호작도가 뭐야? {i}", "rumi") for i in range(5)
+        ])
+
+    started = time.perf_counter()
+    responses = asyncio.run(run_many())
+    elapsed = time.perf_counter() - started
+
+    assert len(responses) == 5
+    assert korean_service.llm.calls == 5  # 서로 다른 질문이므로 병합되지 않음
+    assert elapsed < 0.2 * 5 * 0.6
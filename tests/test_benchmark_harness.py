@@ -0,0 +1,43 @@
+"""
+벤치마크 하네스 테스트 (오프라인)
+"""
+import json
+
+from benchmarks.harness import Measurement, compare, load_baselines, measure, save_baselines
+
+
+def test_measure_reports_per_call_time():
+    calls = []
+    measurement = measure("noop", lambda: calls.append(1), rounds=3, min_round_seconds=0.001)
+
+    assert measurement.loops > 1
+    assert 0 < measurement.min_us <= measurement.median_us
+    assert len(calls) >= 1 + measurement.loops * 3  # 워밍업 + 라운드 3회
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baselines = {"fast": {"median_us": 10.0}, "noisy": {"median_us": 10.0, "tolerance": 1.0}}
+    measurements = [
+        Measurement("fast", 13.0, 12.0, 100, 7),
+        Measurement("noisy", 15.0, 14.0, 100, 7),
+        Measurement("new", 5.0, 5.0, 100, 7),
+    ]
+
+    result = {c.name: c for c in compare(measurements, baselines, tolerance=0.25)}
+
+    assert result["fast"].regressed and round(result["fast"].ratio, 2) == 1.3
+    assert not result["noisy"].regressed
+    assert not result["new"].regressed and result["new"].baseline_us is None
+
+
+def test_save_keeps_tolerances_and_unmeasured_entries(tmp_path):
+    path = str(tmp_path / "baselines.json")
+    save_baselines(path, [Measurement("a", 1.23456, 1.0, 10, 7)],
+                   {"a": {"median_us": 2.0, "tolerance": 0.5}, "embedding.x": {"median_us": 900.0}})
+
+    baselines = load_baselines(path)
+
+    assert baselines["a"] == {"median_us": 1.235, "min_us": 1.0, "loops": 10, "rounds": 7, "tolerance": 0.5}
+    assert baselines["embedding.x"] == {"median_us": 900.0}
+    assert "machine" in json.loads(open(path, encoding="utf-8").read())
+    assert load_baselines(str(tmp_path / "missing.json")) == {}
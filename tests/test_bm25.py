@@ -0,0 +1,196 @@
+from database.bm25_index import BM25Index
+from database.change_log import ChangeLogCursor
+from database.models import SearchResult
+from utils.korean_tokenizer import query_terms, strip_particle, token_set, tokenize
+
+
+def build_index():
+    index = BM25Index()
+    index.add_chunks(1, [
+        (1, "호작도는 까치와 호랑이를 함께 그린 민화입니다."),
+        (2, "용호도에는 용과 호랑이가 마주 보고 있습니다."),
+    ])
+    index.add_chunks(2, [
+        (3, "산신도는 산신과 호랑이를 그린 그림입니다."),
+        (4, "The museum opens at 9 and closes at 18."),
+    ])
+    return index
+
+
+def test_tokenizer_strips_particles():
+    assert strip_particle("호랑이를") == "호랑이"
+    assert strip_particle("서울으로") == "서울"
+    assert "호랑이" in tokenize("호랑이가 있다")
+    assert tokenize("Museum HOURS 9") == ["museum", "hours", "9"]
+    assert query_terms("호작도의 까치는 무엇인가요? Tiger 3") == {
+        "호작도의", "호작도", "까치는", "까치", "무엇인가요", "tiger", "3"
+    }
+    assert token_set("호랑이가 호랑이를") == ["호랑이", "호랑이가", "호랑이를"]
+
+
+def test_search_ranks_matching_chunks():
+    index = build_index()
+
+    hits = index.search("호작도의 까치는?", limit=5)
+
+    assert hits[0][0] == 1
+    assert all(a[1] >= b[1] for a, b in zip(hits, hits[1:]))
+    assert index.search("closes", limit=5)[0][0] == 4
+    assert index.search("없는단어", limit=5) == []
+
+
+def test_query_alias_expands_misrecognized_title():
+    assert build_index().search("호호도 알려줘", limit=1)[0][0] == 1
+
+
+def test_remove_document_updates_postings():
+    index = build_index()
+
+    index.remove_document(1)
+
+    assert len(index) == 2
+    assert index.search("호작도", limit=5) == []
+    assert "까치" not in index.postings
+    assert index.total_length == sum(index.chunk_lengths.values())
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = build_index()
+    index.log_cursor = ChangeLogCursor(42, ((40, 1000.0),))
+    path = str(tmp_path / "bm25.pkl")
+
+    index.save(path)
+    loaded = BM25Index.load(path)
+
+    assert loaded.version == 42 and loaded.log_cursor == index.log_cursor
+    assert loaded.search("호랑이", limit=3) == index.search("호랑이", limit=3)
+    assert BM25Index.load(str(tmp_path / "missing.pkl")) is None
+
+
+
+def test_search_result_token_set_prefers_stored_tokens():
+    stored = SearchResult(chunk_id=1, document_id=1, chunk_text="호작도", similarity=0.8, tokens=["까치"])
+    legacy = SearchResult(chunk_id=2, document_id=1, chunk_text="호작도는 민화입니다", similarity=0.8)
+
+    assert stored.token_set() == {"까치"}
+    assert not query_terms("호작도가 뭐야?").isdisjoint(legacy.token_set())
+
+
+def test_bare_noun_question_matches_chunk_with_particle():
+    chunk = SearchResult(chunk_id=1, document_id=1, chunk_text="까치호랑이는 조선 민화입니다", similarity=0.3,
+                         tokens=token_set("까치호랑이는 조선 민화입니다"))
+
+    assert not query_terms("까치호랑이").isdisjoint(chunk.token_set())
+    assert not query_terms("까치호랑이?").isdisjoint(chunk.token_set())
+    assert not query_terms("호랑이").isdisjoint(token_set("호랑이는 산의 주인입니다"))
+
+
+def test_bare_noun_question_is_not_unknown(korean_service):
+    results = [SearchResult(chunk_id=1, document_id=1, chunk_text="까치호랑이는 조선 후기 민화입니다.",
+                            similarity=0.9, tokens=token_set("까치호랑이는 조선 후기 민화입니다."))]
+
+    assert not korean_service._is_unknown("까치호랑이", results)
+    assert korean_service._is_unknown("용호도", results)
+
+
+class FakeChangeLogCursor:
+    """corpus_change_log / document_chunks 조회만 흉내 내는 커서"""
+
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+
+    def execute(self, query, params=()):
+        if "corpus_change_log" in query:
+            # 커밋된 변경만 보임 (id > version OR id = ANY(gaps))
+            self.rows = [{"id": i, "document_id": d} for i, d in self.db["changes"]
+                         if i > params[0] or i in params[1]]
+        else:
+            self.rows = [{"id": c, "document_id": d, "chunk_text": t}
+                         for d, chunks in self.db["documents"].items() if d in params[0] for c, t in chunks]
+
+    def fetchall(self):
+        return self.rows
+
+
+def test_refresh_swaps_index_while_searches_run(monkeypatch, tmp_path):
+    import threading
+
+    from database.bm25_index import BM25IndexManager
+
+    db = {"changes": [], "documents": {}}
+    fake_db_cursor(monkeypatch, db)
+    manager = BM25IndexManager(path=str(tmp_path / "bm25.pkl"), refresh_interval=0)
+    manager.index = build_index()
+    errors, stop = [], threading.Event()
+
+    def searcher():
+        while not stop.is_set():
+            try:
+                for chunk_id, score in manager.index.search("호랑이 까치 민화", limit=50):
+                    assert score > 0
+            except Exception as e:  # dict 크기 변경 중 순회 등
+                errors.append(e)
+                return
+
+    threads = [threading.Thread(target=searcher) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    published = manager.index
+    before = published.search("호랑이", limit=50)
+    try:
+        for version in range(1, 150):
+            document_id = 10 + version % 7
+            db["documents"][document_id] = [(document_id * 1000 + n, f"호랑이 까치 민화 {version} 버전 {n}")
+                                            for n in range(version % 5 + 20)]
+            db["changes"].append((version, document_id))
+            manager.get()
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    assert errors == []
+    assert published.search("호랑이", limit=50) == before  # 공개된 색인은 수정되지 않음
+    assert manager.index is not published and manager.index.version == 149
+    assert manager.index.total_length == sum(manager.index.chunk_lengths.values())
+    assert "버전" in manager.index.postings and "까치" in published.postings
+
+
+def fake_db_cursor(monkeypatch, db):
+    import contextlib
+
+    @contextlib.contextmanager
+    def fake_cursor():
+        yield FakeChangeLogCursor(db), None
+
+    monkeypatch.setattr("database.bm25_index.get_db_cursor", fake_cursor)
+
+
+def test_late_commit_with_lower_change_id_is_indexed(monkeypatch, tmp_path):
+    from database.bm25_index import BM25IndexManager
+
+    db = {"changes": [], "documents": {}}
+    fake_db_cursor(monkeypatch, db)
+    manager = BM25IndexManager(path=str(tmp_path / "bm25.pkl"), refresh_interval=0)
+    manager.index = build_index()
+
+    # 변경 ID 1(용호도 적재)이 아직 커밋 전인데 ID 2(다른 문서)가 먼저 커밋됨
+    db["documents"][20] = [(2000, "산신도에는 산신과 호랑이가 함께 나옵니다.")]
+    db["changes"].append((2, 20))
+    manager.get()
+    assert manager.index.version == 2 and [gap for gap, _ in manager.index.log_cursor.gaps] == [1]
+
+    db["documents"][10] = [(1000, "용호도는 용과 호랑이를 함께 그린 그림입니다.")]
+    db["changes"].insert(0, (1, 10))
+    manager.get()
+    assert [chunk_id for chunk_id, _ in manager.index.search("용호도")] == [1000]
+    assert manager.index.log_cursor.gaps == ()
+
+    # 재시작해도 기다리던 ID 가 저장 파일에 남아 있음
+    db["changes"].append((4, 20))
+    manager.get()
+    restarted = BM25IndexManager(path=manager.path, refresh_interval=0)
+    db["documents"][30] = [(3000, "맹호도는 늠름한 호랑이 한 마리를 그렸습니다.")]
+    db["changes"].append((3, 30))
+    assert [chunk_id for chunk_id, _ in restarted.get().search("맹호도")] == [3000]
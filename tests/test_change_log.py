@@ -0,0 +1,54 @@
+"""
+변경 로그 커서 테스트 (오프라인)
+"""
+from database.change_log import CHANGE_LOG_GAP_TIMEOUT, CHANGE_LOG_GAP_WINDOW, ChangeLogCursor
+
+
+class LogCursor:
+    """corpus_change_log 조회만 흉내 내는 커서 (ids: 커밋된 변경 ID)"""
+
+    def __init__(self, ids):
+        self.ids = ids
+        self.rows = []
+
+    def execute(self, query, params=()):
+        if "MAX(id)" in query:
+            floor = max(self.ids, default=0) - params[0]
+            self.rows = [{"id": i} for i in sorted(self.ids) if i > floor]
+        else:
+            self.rows = [{"id": i, "document_id": i * 10} for i in sorted(self.ids)
+                         if i > params[0] or i in params[1]]
+
+    def fetchall(self):
+        return self.rows
+
+
+def test_poll_returns_late_commits_below_version():
+    committed = [1, 2, 4]
+    cursor = ChangeLogCursor()
+
+    changes, cursor = cursor.poll(LogCursor(committed), now=0.0)
+    assert [c["id"] for c in changes] == [1, 2, 4] and cursor.version == 4 and cursor.gaps == ((3, 0.0),)
+
+    committed.append(3)  # ID 3 트랜잭션이 늦게 커밋됨
+    changes, cursor = cursor.poll(LogCursor(committed), now=1.0)
+    assert [c["id"] for c in changes] == [3] and cursor == ChangeLogCursor(4)
+
+
+def test_rolled_back_ids_stop_being_polled_after_timeout():
+    cursor = ChangeLogCursor(2, ((1, 0.0),))
+
+    assert cursor.advance([5], now=CHANGE_LOG_GAP_TIMEOUT / 2).gaps == ((1, 0.0), (3, CHANGE_LOG_GAP_TIMEOUT / 2),
+                                                                        (4, CHANGE_LOG_GAP_TIMEOUT / 2))
+    assert cursor.advance([], now=CHANGE_LOG_GAP_TIMEOUT + 1).gaps == ()
+
+
+def test_start_waits_for_missing_ids_near_the_top():
+    ids = [1, 2, 3, 5, CHANGE_LOG_GAP_WINDOW + 10]
+
+    cursor = ChangeLogCursor.start(LogCursor(ids), now=0.0)
+
+    assert cursor.version == CHANGE_LOG_GAP_WINDOW + 10
+    gap_ids = [gap_id for gap_id, _ in cursor.gaps]
+    assert gap_ids[0] == 11 and 5 not in gap_ids and CHANGE_LOG_GAP_WINDOW + 9 in gap_ids
+    assert ChangeLogCursor.start(LogCursor([]), now=0.0) == ChangeLogCursor()
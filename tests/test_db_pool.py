@@ -0,0 +1,99 @@
+"""
+커넥션 풀 테스트 (오프라인, 가짜 연결 사용)
+"""
+import threading
+import time
+
+import pytest
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS
+
+from database.pool import ConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.autocommit = False
+        self.status = TRANSACTION_STATUS_IDLE
+        self.rollbacks = 0
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+def make_pool(**kwargs):
+    created = []
+
+    def connect():
+        conn = FakeConnection()
+        created.append(conn)
+        return conn
+
+    return ConnectionPool(connect, **kwargs), created
+
+
+def test_connection_is_reused():
+    pool, created = make_pool(max_size=2)
+    conn = pool.getconn()
+    pool.putconn(conn)
+    assert pool.getconn() is conn
+    assert len(created) == 1
+
+
+def test_checkout_times_out_when_exhausted():
+    pool, _ = make_pool(max_size=1, wait_timeout=0.05)
+    pool.getconn()
+    with pytest.raises(PoolTimeoutError):
+        pool.getconn()
+    assert pool.stats()["wait_timeouts"] == 1
+
+
+def test_waiter_gets_released_connection():
+    pool, _ = make_pool(max_size=1, wait_timeout=2)
+    conn = pool.getconn()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.getconn()))
+    waiter.start()
+    time.sleep(0.05)
+    assert pool.stats()["waiters"] == 1
+    pool.putconn(conn)
+    waiter.join()
+    assert got == [conn]
+
+
+def test_open_transaction_rolled_back_on_return():
+    pool, _ = make_pool()
+    conn = pool.getconn()
+    conn.status = TRANSACTION_STATUS_INTRANS
+    pool.putconn(conn)
+    assert conn.rollbacks == 1
+
+
+def test_expired_and_closed_connections_are_replaced():
+    pool, created = make_pool(max_lifetime=0.01)
+    conn = pool.getconn()
+    pool.putconn(conn)
+    time.sleep(0.02)
+    fresh = pool.getconn()
+    assert fresh is not conn and conn.closed
+
+    fresh.closed = 1  # 서버가 끊은 연결
+    pool.putconn(fresh)
+    assert pool.stats()["size"] == 0
+    assert len(created) == 2
+
+
+def test_stats_histogram_counts_checkouts():
+    pool, _ = make_pool(max_size=3, min_size=2)
+    pool.warm()
+    stats = pool.stats()
+    assert stats["idle"] == 2 and stats["in_use"] == 0
+    assert stats["wait_time_seconds"]["count"] == 2
+    assert stats["wait_time_seconds"]["buckets"]["+Inf"] == 2
@@ -0,0 +1,66 @@
+"""
+쿼리 임베딩 캐시 테스트 (오프라인)
+"""
+import asyncio
+import time
+
+import numpy as np
+
+from services.embedding_cache import EmbeddingCache, aencode_query, embedding_cache, encode_query
+
+
+def test_lru_eviction_and_counters():
+    cache = EmbeddingCache(max_entries=2, ttl_seconds=60)
+    cache.put("m", "a", [1.0, 2.0])
+    cache.put("m", "b", [3.0, 4.0])
+    assert cache.get("m", "a") is not None  # a 가 최근 사용으로 이동
+    cache.put("m", "c", [5.0, 6.0])
+
+    assert cache.get("m", "b") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["evictions"] == 1
+
+
+def test_key_is_normalized_and_scoped_by_model():
+    cache = EmbeddingCache()
+    stored = cache.put("m", "  What is   the Tiger Exhibition? ", np.ones(4))
+    assert stored.dtype == np.float32 and not stored.flags.writeable
+    assert cache.get("m", "what is the tiger exhibition?") is stored
+    assert cache.get("other-model", "what is the tiger exhibition?") is None
+
+
+def test_entries_expire_after_ttl():
+    cache = EmbeddingCache(ttl_seconds=0.01)
+    cache.put("m", "호작도가 뭐야?", [1.0])
+    time.sleep(0.02)
+    assert cache.get("m", "호작도가 뭐야?") is None
+
+
+def test_services_share_cache_and_skip_encoding(korean_service, english_service):
+    english_service.embedding_model = korean_service.embedding_model
+    model = korean_service.embedding_model
+
+    korean_service.generate_response("호작도가 뭐야?", "rumi")
+    asyncio.run(korean_service.agenerate_response("호작도가  뭐야?", "mira"))
+    asyncio.run(english_service.agenerate_response("호작도가 뭐야?", "rumi"))
+
+    assert model.calls == 1
+    assert embedding_cache.stats()["hits"] == 2
+
+
+def test_model_encodes_original_text_not_cache_key():
+    class RecordingModel:
+        def __init__(self):
+            self.texts = []
+
+        def encode(self, text):
+            self.texts.append(text)
+            return np.ones(4)
+
+    embedding_cache.clear()
+    model = RecordingModel()
+    encode_query(model, "  Tiger   Exhibition? ", model_name="m")
+    asyncio.run(aencode_query(model, "호작도가  뭐야?", model_name="m"))
+    encode_query(model, "tiger exhibition?", model_name="m")  # 정규화 키가 같아 캐시 적중
+
+    assert model.texts == ["  Tiger   Exhibition? ", "호작도가  뭐야?"]
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from config.app_config import FUSION_SCORE_THRESHOLD
+from database.bm25_index import BM25Index, saturate
+from database.models import SearchResult
+from services.fusion import calibrated_scores, fuse, fuse_scores
+
+
+def result(chunk_id, vector, keyword=None):
+    return SearchResult(chunk_id=chunk_id, document_id=1, chunk_text="", similarity=vector,
+                        vector_similarity=vector, keyword_score=keyword)
+
+
+def test_calibrated_scores_are_bounded():
+    scores = calibrated_scores(np.array([1.2, 0.5, -0.3]), np.array([1.0, np.nan, 0.5]), vector_weight=0.7)
+
+    assert scores == pytest.approx([1.0, 0.35, 0.15])
+
+
+def test_weighted_prefers_keyword_backed_results():
+    results = fuse([result(1, 0.62), result(2, 0.55, keyword=1.0), result(3, 0.10)], strategy="weighted")
+
+    assert [r.chunk_id for r in results] == [2, 1, 3]
+    assert results[0].similarity == pytest.approx(0.7 * 0.55 + 0.3)
+    assert results[0].vector_similarity == 0.55
+
+
+def test_rrf_orders_by_rank_but_keeps_calibrated_scores():
+    vector = np.array([0.9, 0.8, 0.2, 0.1])
+    keyword = np.array([np.nan, 1.0, 0.9, np.nan])
+
+    order, calibrated = fuse_scores(vector, keyword, strategy="rrf", rrf_k=60)
+
+    # 두 경로에 모두 있는 1, 2번이 벡터 1위(0번) 보다 앞섬
+    assert order.tolist() == [1, 2, 0, 3]
+    assert calibrated == pytest.approx(calibrated_scores(vector, keyword))
+
+
+def test_fuse_limit_and_unknown_strategy():
+    results = [result(i, 0.1 * i) for i in range(1, 8)]
+
+    assert [r.chunk_id for r in fuse(results, limit=3)] == [7, 6, 5]
+    assert fuse([]) == []
+    with pytest.raises(ValueError):
+        fuse_scores(np.zeros(1), np.zeros(1), strategy="max")
+
+
+def keyword_hit_scores(corpus, query):
+    index = BM25Index()
+    index.add_chunks(1, list(enumerate(corpus, start=1)))
+    return {chunk_id: saturate(score) for chunk_id, score in index.search(query, limit=len(corpus))}
+
+
+CORPUS = [f"{room}전시실의 호랑이 그림은 조선 시대 작품입니다." for room in range(1, 20)] + [
+    "호작도는 까치와 호랑이를 함께 그린 민화로, 까치는 기쁜 소식을 뜻합니다."
+]
+
+
+def test_weak_keyword_only_match_does_not_clear_threshold():
+    # 흔한 단어(호랑이) 하나만 겹침 - 1위라도 1.0 이 되지 않음
+    scores = keyword_hit_scores(CORPUS, "용호도에 나오는 호랑이")
+    top_id, top_keyword = max(scores.items(), key=lambda item: item[1])
+    assert top_keyword < 0.2
+
+    results = fuse([result(top_id, 0.30, keyword=top_keyword)])
+    assert results[0].similarity < FUSION_SCORE_THRESHOLD
+
+
+def test_distinctive_keyword_match_supports_moderate_cosine():
+    scores = keyword_hit_scores(CORPUS, "호작도의 까치는 무슨 뜻이야?")
+
+    assert max(scores, key=scores.get) == 20 and scores[20] > 0.5
+    assert fuse([result(20, 0.45, keyword=scores[20])])[0].similarity >= FUSION_SCORE_THRESHOLD
+    assert fuse([result(20, 0.45)])[0].similarity < FUSION_SCORE_THRESHOLD  # 벡터만으로는 부족
@@ -0,0 +1,185 @@
+"""
+콘텐츠 해시 중복 제거 + 증분 재적재 테스트 (오프라인)
+"""
+import base64
+import hashlib
+import threading
+
+from database.document_service import ChunkService
+from database.models import Document, DocumentChunk
+from services.ingestion_jobs import IngestionQueue, admin_document_key, pdf_document, text_document, upload_key
+from tests.conftest import FakeEmbeddingModel
+from utils.content_hash import text_hash
+from utils.upload_spool import spool_base64
+
+PARAGRAPHS = [
+    f"{number}번째 전시실에는 호랑이와 까치를 그린 민화가 있습니다. "
+    f"조선 후기 사람들은 호랑이가 나쁜 기운을 막고 까치가 기쁜 소식을 전한다고 믿었습니다. " * 3
+    for number in range(1, 13)
+]
+
+
+def wall_text(paragraphs=PARAGRAPHS):
+    return "\n".join(paragraphs)
+
+
+class MemoryChunkService(ChunkService):
+    """DB 대신 store 에 가장 최근 문서 한 건을 저장하는 ChunkService (갱신 시 쓴 행을 기록)"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def get_previous_version(self, document_key):
+        document = self.store.get("document")
+        if document is None or document.document_key != document_key:
+            return None
+        chunks = [DocumentChunk(id=chunk.id, chunk_index=chunk.chunk_index, metadata=dict(chunk.metadata),
+                                chunk_hash=chunk.chunk_hash) for chunk in self.store["chunks"]]
+        return Document(id=document.id, title=document.title, document_key=document_key,
+                        metadata=document.metadata, content_hash=document.content_hash), chunks
+
+    def create_document_with_chunks(self, document, chunks):
+        document.id = self.store.get("document_count", 0) + 1
+        self.store["document_count"] = document.id
+        for chunk_id, chunk in enumerate(chunks, start=100):
+            chunk.id = chunk_id
+        self.store.update(document=document, chunks=list(chunks), next_id=100 + len(chunks))
+        return document.id, [chunk.id for chunk in chunks]
+
+    def update_document_with_chunks(self, document, expected_hash, moved, rewritten, inserted, stale_ids):
+        assert expected_hash == self.store["document"].content_hash
+        rows = {chunk.id: chunk for chunk in self.store["chunks"] if chunk.id not in stale_ids}
+        for chunk in moved + rewritten:
+            rows[chunk.id] = chunk
+        for chunk in inserted:
+            chunk.id = self.store["next_id"]
+            self.store["next_id"] += 1
+            rows[chunk.id] = chunk
+        self.store.update(document=document, chunks=sorted(rows.values(), key=lambda c: c.chunk_index),
+                          writes={"moved": moved, "rewritten": rewritten, "inserted": inserted, "deleted": stale_ids})
+        return [chunk.id for chunk in inserted]
+
+
+def ingest(store, content, model=None, title="호랑이 전시 안내", document_key="tiger-wall"):
+    document, _ = text_document(title, content, "전시", "test", document_key=document_key)
+    return MemoryChunkService(store).ingest_document(document, model or FakeEmbeddingModel(), batch_size=4)
+
+
+def test_identical_upload_is_a_no_op():
+    store = {}
+    first = ingest(store, wall_text())
+    model = FakeEmbeddingModel()
+
+    again = ingest(store, wall_text(), model)
+
+    assert first.status == "created" and first.chunks_embedded == len(first.chunk_ids)
+    assert again.status == "unchanged" and model.calls == 0
+    assert again.document_id == first.document_id and again.chunk_ids == first.chunk_ids
+    assert "writes" not in store
+
+
+def test_edited_document_re_embeds_only_changed_chunks():
+    store = {}
+    first = ingest(store, wall_text())
+    old_text = {chunk.id: chunk.chunk_text for chunk in store["chunks"]}
+    edited = list(PARAGRAPHS)
+    edited[5] = edited[5].replace("민화가", "민화 세 점이", 1)
+
+    result = ingest(store, wall_text(edited))
+
+    assert result.status == "updated" and result.document_id == first.document_id
+    assert 0 < result.chunks_embedded <= 2 < len(result.chunk_ids)
+    assert result.chunk_ids == first.chunk_ids  # 바뀐 청크도 기존 행을 덮어써 ID 유지
+    changed = [chunk for chunk in store["chunks"] if chunk.chunk_text != old_text[chunk.id]]
+    assert len(changed) == result.chunks_embedded == len(store["writes"]["rewritten"])
+    assert all("민화 세 점이" in chunk.chunk_text for chunk in changed)
+    assert store["document"].content_hash == text_hash(wall_text(edited))
+
+
+def test_removed_and_added_paragraphs_delete_and_insert_chunks():
+    store = {}
+    ingest(store, wall_text())
+    kept = {chunk.chunk_hash: chunk.id for chunk in store["chunks"]}
+
+    shorter = ingest(store, wall_text(PARAGRAPHS[:6]))
+
+    assert shorter.chunks_deleted > 0 and store["writes"]["inserted"] == []
+    assert all(kept.get(chunk.chunk_hash) == chunk.id for chunk in store["chunks"][:-1])
+
+    longer = ingest(store, wall_text(PARAGRAPHS[:6] + ["새로 추가된 보존 처리 안내입니다. " * 40]))
+
+    assert longer.chunks_deleted == 0 and store["writes"]["inserted"]
+    assert [chunk.chunk_index for chunk in store["chunks"]] == list(range(len(longer.chunk_ids)))
+
+
+def test_same_title_without_key_adds_a_new_document():
+    store = {}
+    first = ingest(store, wall_text(), document_key=None)
+    model = FakeEmbeddingModel()
+
+    other = ingest(store, wall_text(PARAGRAPHS[:3]), model, document_key=None)
+    again = ingest(store, wall_text(PARAGRAPHS[:3]), document_key=None)
+
+    assert other.status == "created" and other.document_id != first.document_id
+    assert other.chunks_embedded == len(other.chunk_ids) and model.calls > 0 and "writes" not in store
+    assert again.status == "unchanged" and again.document_id == other.document_id
+
+
+def test_generic_file_names_do_not_share_a_document():
+    first, _ = pdf_document("1층 안내", b"%PDF-1.4 first", "document.pdf", "전시", "test")
+    second, _ = pdf_document("2층 안내", b"%PDF-1.4 second", "document.pdf", "전시", "test")
+    replaced, _ = pdf_document("1층 안내", b"%PDF-1.4 third", "document.pdf", "전시", "test", document_key="floor-1")
+
+    assert first.document_key != second.document_key
+    assert replaced.document_key == admin_document_key(second.content_hash, " floor-1 ") == "admin:floor-1"
+    assert first.source_url is None  # 응답 출처는 "문서: <제목>" 으로 표시
+
+
+def test_plan_reuses_stale_rows_for_changed_chunks():
+    previous = [DocumentChunk(id=10 + i, chunk_index=i, metadata={"chunk_size": 1}, chunk_hash=h)
+                for i, h in enumerate("abcd")]
+    new = [DocumentChunk(chunk_index=i, metadata={"chunk_size": 1}, chunk_hash=h,
+                         embedding=None if h in "bd" else [0.0])
+           for i, h in enumerate(["x", "b", "d", "y", "z"])]
+
+    moved, rewritten, inserted, stale_ids = ChunkService._plan_chunk_updates(previous, new)
+
+    assert [chunk.id for chunk in new[:4]] == [10, 11, 13, 12]
+    assert moved == [new[2]]  # d: 3번째 → 2번째
+    assert rewritten == [new[0], new[3]] and inserted == [new[4]] and stale_ids == []
+
+
+def test_duplicate_submissions_share_one_job(monkeypatch):
+    monkeypatch.setattr("services.ingestion_jobs.invalidate_corpus", lambda: None)
+    release = threading.Event()
+    store, cleaned = {}, []
+
+    def prepare():
+        release.wait(10)
+        return text_document("호랑이 전시 안내", wall_text(), "전시", "test")
+
+    queue = IngestionQueue(workers=1, niceness=0, busy=lambda: 0,
+                           chunk_service_factory=lambda: MemoryChunkService(store),
+                           embedding_model_loader=FakeEmbeddingModel)
+    key = upload_key(admin_document_key(text_hash(wall_text())), text_hash(wall_text()))
+    try:
+        first = queue.submit("text", "호랑이 전시 안내", prepare, key=key)
+        second = queue.submit("text", "호랑이 전시 안내", prepare, cleanup=lambda: cleaned.append(1), key=key)
+        release.set()
+        queue.wait(first.id, timeout=10)
+        third = queue.wait(queue.submit("text", "호랑이 전시 안내", prepare, key=key).id, timeout=10)
+    finally:
+        queue.shutdown()
+
+    assert second is first and cleaned == [1]
+    assert first.result["outcome"] == "created" and third.result["outcome"] == "unchanged"
+    assert third.result["document_id"] == first.result["document_id"]
+    assert queue.stats()["deduplicated"] == 1
+
+
+def test_spool_hashes_upload_while_receiving():
+    data = b"%PDF-1.4 tiger" * 1000
+    spool = spool_base64(base64.b64encode(data).decode(), chunk_bytes=300, max_memory=1024)
+
+    assert spool.content_hash == hashlib.sha256(data).hexdigest()
+    spool.close()
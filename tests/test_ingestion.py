@@ -0,0 +1,56 @@
+"""
+문서 적재 테스트 (오프라인)
+"""
+from database.document_service import ChunkService, encode_in_batches
+from database.models import Document
+from tests.conftest import FakeEmbeddingModel
+
+
+def test_encode_in_batches_uses_one_call_per_batch():
+    model = FakeEmbeddingModel()
+    texts = [f"청크 {i}" for i in range(70)]
+    embeddings = encode_in_batches(model, texts, batch_size=32)
+
+    assert model.calls == 3
+    assert embeddings.shape == (70, 384)
+    assert (embeddings[69] == model._vector("청크 69")).all()
+
+
+def test_ingest_document_writes_document_and_chunks_together(monkeypatch):
+    saved = {}
+
+    def fake_create(self, document, chunks):
+        saved["document"] = document
+        saved["chunks"] = chunks
+        return 7, list(range(100, 100 + len(chunks)))
+
+    monkeypatch.setattr(ChunkService, "create_document_with_chunks", fake_create)
+    model = FakeEmbeddingModel()
+    content = "호랑이는 한국 민화에 자주 등장합니다. " * 200
+
+    result = ChunkService().ingest_document(Document(title="호랑이", content=content), model, batch_size=8)
+
+    assert result.document_id == 7
+    assert len(result.chunk_ids) == len(saved["chunks"]) > 8
+    assert [c.chunk_index for c in saved["chunks"]] == list(range(len(saved["chunks"])))
+    assert model.calls == -(-len(saved["chunks"]) // 8)
+    assert result.chunks_per_second > 0
+
+
+def test_insert_chunks_stores_token_sets(monkeypatch):
+    captured = {}
+
+    def fake_execute_values(cursor, sql, rows, **kwargs):
+        captured["sql"] = sql
+        captured["rows"] = rows
+        return [{"id": i} for i in range(len(rows))]
+
+    monkeypatch.setattr("database.document_service.execute_values", fake_execute_values)
+    chunks = ChunkService._build_chunks(["호랑이가 까치를 봅니다", "Tiger art"], [None, None])
+
+    ChunkService._insert_chunks(None, 3, chunks)
+
+    assert "tokens" in captured["sql"]
+    assert captured["rows"][0][-1] == ["까치", "까치를", "봅니다", "호랑이", "호랑이가"]
+    assert captured["rows"][1][-1] == ["art", "tiger"]
+    assert chunks[1].tokens == ["art", "tiger"]
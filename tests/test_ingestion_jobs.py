@@ -0,0 +1,206 @@
+"""
+백그라운드 문서 적재 작업 큐 테스트 (오프라인)
+"""
+import threading
+
+import pytest
+
+import services.ingestion_jobs as ingestion_jobs
+from database.document_service import ChunkService
+from services.ingestion_jobs import (
+    FAILED, SUCCEEDED, IngestionQueue, IngestionQueueFullError, text_document
+)
+from tests.conftest import FakeEmbeddingModel
+
+CONTENT = "호작도는 까치와 호랑이를 그린 민화입니다. " * 800  # 임베딩 배치 2개 이상
+
+
+class FlakyChunkService(ChunkService):
+    """저장 단계가 처음 failures 번은 실패하는 ChunkService"""
+
+    def __init__(self, state):
+        self.state = state
+
+    def get_previous_version(self, document_key):
+        return None
+
+    def create_document_with_chunks(self, document, chunks):
+        self.state["saves"] += 1
+        if self.state["saves"] <= self.state["failures"]:
+            raise ConnectionError("연결이 끊어졌습니다")
+        return 7, list(range(1, len(chunks) + 1))
+
+
+@pytest.fixture
+def make_queue(monkeypatch):
+    invalidations = []
+    monkeypatch.setattr(ingestion_jobs, "invalidate_corpus", lambda: invalidations.append(1))
+    created = []
+
+    def factory(failures=0, busy=lambda: 0, **kwargs):
+        state = {"saves": 0, "failures": failures, "invalidations": invalidations}
+        queue = IngestionQueue(workers=1, retry_backoff=0.0, niceness=0, busy=busy,
+                               chunk_service_factory=lambda: FlakyChunkService(state),
+                               embedding_model_loader=FakeEmbeddingModel, **kwargs)
+        created.append(queue)
+        return queue, state
+
+    yield factory
+    for queue in created:
+        queue.shutdown()
+
+
+def submit_text(queue, content=CONTENT):
+    return queue.submit("text", "호랑이 전시", lambda: text_document("호랑이 전시", content, "전시품", "test"))
+
+
+def test_job_runs_in_background_and_reports_progress(make_queue):
+    queue, state = make_queue()
+
+    job = queue.wait(submit_text(queue).id, timeout=10)
+
+    status = job.to_dict()
+    assert status["status"] == SUCCEEDED and status["attempts"] == 1
+    assert status["result"]["document_id"] == 7
+    assert status["result"]["chunks_created"] == status["progress"]["chunks_total"] > 0
+    assert status["progress"]["chunks_done"] == status["progress"]["chunks_total"]
+    assert state["invalidations"] == [1]
+    assert queue.list()[0]["job_id"] == job.id
+
+
+def test_transient_errors_are_retried(make_queue):
+    queue, state = make_queue(failures=1)
+
+    job = queue.wait(submit_text(queue).id, timeout=10)
+
+    assert job.status == SUCCEEDED and job.attempts == 2 and job.error is None
+    assert queue.stats()["retries"] == 1
+
+
+def test_invalid_documents_fail_without_retry(make_queue):
+    queue, state = make_queue()
+
+    job = queue.wait(submit_text(queue, content="   ").id, timeout=10)
+
+    assert job.status == FAILED and job.attempts == 1
+    assert "비어" in job.error
+    assert state["saves"] == 0 and state["invalidations"] == []
+
+
+def test_gives_up_after_max_attempts(make_queue):
+    queue, state = make_queue(failures=5, max_attempts=2)
+
+    job = queue.wait(submit_text(queue).id, timeout=10)
+
+    assert job.status == FAILED and job.attempts == 2 and state["saves"] == 2
+
+
+def test_full_queue_rejects_new_jobs(make_queue):
+    started, release = threading.Event(), threading.Event()
+
+    def blocker():
+        started.set()
+        release.wait(10)
+        return text_document("a", CONTENT, "c", "s")
+
+    queue, _ = make_queue(queue_size=1)
+    queue.submit("text", "blocker", blocker)
+    assert started.wait(5)  # 작업 스레드가 첫 작업을 처리 중
+    queue.submit("text", "waiting", lambda: text_document("b", CONTENT, "c", "s"))
+
+    try:
+        with pytest.raises(IngestionQueueFullError):
+            queue.submit("text", "overflow", lambda: text_document("c", CONTENT, "c", "s"))
+    finally:
+        release.set()
+
+
+def test_embedding_batches_yield_to_inflight_queries(make_queue):
+    checks = []
+
+    def busy():
+        checks.append(1)
+        return 1 if len(checks) <= 3 else 0
+
+    queue, _ = make_queue(busy=busy, yield_max_wait=5.0)
+
+    job = queue.wait(submit_text(queue).id, timeout=10)
+
+    assert job.status == SUCCEEDED
+    assert len(checks) > 3 and queue.stats()["yield_seconds"] > 0
+
+
+def test_invalid_pdf_is_not_retried(make_queue):
+    queue, state = make_queue()
+
+    job = queue.wait(queue.submit("pdf", "깨진 PDF", lambda: ingestion_jobs.pdf_document(
+        "깨진 PDF", b"not a pdf", "broken.pdf", "c", "s")).id, timeout=10)
+
+    assert job.status == FAILED and job.attempts == 1
+    assert "PDF" in job.error and state["saves"] == 0
+
+
+class FakeJobStore:
+    """ingestion_jobs 테이블 대신 dict 에 상태를 기록하는 작업 저장소 (워커 프로세스 간 공유 흉내)"""
+
+    def __init__(self, fail=False):
+        self.rows = {}
+        self.fail = fail
+
+    def save(self, state):
+        if self.fail:
+            raise ConnectionError("연결이 끊어졌습니다")
+        self.rows[state["job_id"]] = dict(state)
+
+    def get(self, job_id):
+        return self.rows.get(job_id)
+
+    def list(self, limit=20):
+        return sorted(self.rows.values(), key=lambda state: state["created_at"], reverse=True)[:limit]
+
+
+def test_job_status_is_visible_from_other_workers(make_queue):
+    store = FakeJobStore()
+    queue, _ = make_queue(job_store=store)
+    other_worker, _ = make_queue(job_store=store)  # 업로드를 받지 않은 다른 uvicorn 워커
+
+    job = queue.wait(submit_text(queue).id, timeout=10)
+
+    status = other_worker.status(job.id)
+    assert status["status"] == SUCCEEDED and status["result"]["document_id"] == 7
+    assert status["progress"]["chunks_done"] == status["progress"]["chunks_total"] > 0
+    assert [state["job_id"] for state in other_worker.list()] == [job.id]
+    assert other_worker.status("없는 작업") is None
+
+
+def test_job_store_errors_do_not_fail_ingestion(make_queue):
+    queue, _ = make_queue(job_store=FakeJobStore(fail=True))
+
+    job = queue.wait(submit_text(queue).id, timeout=10)
+
+    assert job.status == SUCCEEDED
+    assert queue.status(job.id)["status"] == SUCCEEDED
+
+
+def test_torch_threads_are_limited_in_ingest_thread_only():
+    torch = pytest.importorskip("torch")
+    previous = torch.get_num_threads()
+    torch.set_num_threads(2)
+    seen = {}
+
+    def worker():
+        ingestion_jobs._limit_torch_threads(1)
+        seen["ingest"] = torch.get_num_threads()
+
+    def query():
+        seen["query"] = torch.get_num_threads()
+
+    try:
+        for target in (worker, query):
+            thread = threading.Thread(target=target)
+            thread.start()
+            thread.join()
+    finally:
+        torch.set_num_threads(previous)
+
+    assert seen == {"ingest": 1, "query": 2}
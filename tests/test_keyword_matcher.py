@@ -0,0 +1,46 @@
+from services.english_relevance_service import EnglishRelevanceService
+from services.relevance_service import RelevanceService
+from utils.keyword_matcher import KeywordMatcher
+
+
+def test_finds_overlapping_patterns_in_one_pass():
+    matcher = KeywordMatcher({"art": ["호랑이", "호랑이그림", "그림", "랑이그"]})
+
+    matches = list(matcher.iter_matches("큰 호랑이그림"))
+
+    assert sorted((start, pattern) for start, pattern, _ in matches) == [
+        (2, "호랑이"), (2, "호랑이그림"), (3, "랑이그"), (5, "그림")
+    ]
+
+
+def test_scan_groups_and_ignores_case():
+    matcher = KeywordMatcher({"relevant": ["Tiger", "art"], "irrelevant": ["hi"]})
+
+    assert matcher.scan("THIS TIGER ART, tiger art") == {
+        "relevant": ["tiger", "art"], "irrelevant": ["hi"]
+    }
+    assert matcher.scan("") == {"relevant": [], "irrelevant": []}
+
+
+def test_failure_links_recover_partial_matches():
+    matcher = KeywordMatcher({"words": ["abcd", "bcx", "cx"]})
+
+    assert matcher.scan("abcx") == {"words": ["bcx", "cx"]}
+
+
+def test_korean_relevance_rules():
+    service = RelevanceService()
+
+    assert service.check_relevance("작호도가 뭐야?") is True
+    assert service.check_relevance("호랑이 그림 보러 가는데 날씨 어때?") is False
+    assert service.check_relevance("이거 어떻게 해?") is False
+    assert service.check_relevance("ㅋㅋㅋ") is False
+
+
+def test_english_relevance_rules():
+    service = EnglishRelevanceService()
+
+    assert service.check_relevance("Tell me about Joseon tiger paintings") is True
+    assert service.check_relevance("How is the weather") is False
+    assert service.check_relevance("where is a good place to eat") is False
+    assert service.check_relevance("") is False
@@ -0,0 +1,109 @@
+"""
+요청 계측 테스트 (오프라인)
+"""
+import asyncio
+import time
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from utils.executors import run_db_bound
+from utils.metrics import (
+    Gauge, Histogram, MetricsMiddleware, MetricsRegistry, current_timing, label_request,
+    metrics, span, track_request
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("stage_seconds", "단계 시간", ("stage",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage="llm")
+    histogram.observe(0.5, stage="llm")
+    histogram.observe(5.0, stage="llm")
+
+    lines = histogram.collect()
+
+    assert 'stage_seconds_bucket{stage="llm",le="0.1"} 1' in lines
+    assert 'stage_seconds_bucket{stage="llm",le="1.0"} 2' in lines
+    assert 'stage_seconds_bucket{stage="llm",le="+Inf"} 3' in lines
+    assert 'stage_seconds_sum{stage="llm"} 5.55' in lines
+    assert 'stage_seconds_count{stage="llm"} 3' in lines
+
+
+def test_registry_skips_unreadable_gauges():
+    registry = MetricsRegistry()
+    registry.register(Gauge("queue_depth", "대기", lambda: {("db",): 2, ("cpu",): 0}, ("executor",)))
+    registry.gauge("broken", "읽기 실패", lambda: 1 / 0)
+
+    text = registry.render()
+
+    assert 'queue_depth{executor="cpu"} 0' in text
+    assert 'queue_depth{executor="db"} 2' in text
+    assert "broken" not in text
+
+
+def test_spans_follow_request_context_into_executors():
+    def db_work():
+        with span("vector_search"):
+            time.sleep(0.01)
+
+    async def handle():
+        with span("embedding"):
+            pass
+        await run_db_bound(db_work)
+
+    with span("ignored"):  # 요청 컨텍스트 밖에서는 기록하지 않음
+        pass
+    with track_request() as timing:
+        label_request(language="ko", character="rumi", unknown="x")
+        asyncio.run(handle())
+
+    assert list(timing.durations()) == ["embedding", "vector_search"]
+    assert timing.durations()["vector_search"] >= 0.01
+    assert timing.labels == {"language": "ko", "character": "rumi", "cache": "none"}
+    assert current_timing() is None
+
+
+def test_pipeline_stages_and_cache_outcome(korean_service):
+    with track_request() as first:
+        asyncio.run(korean_service.agenerate_response("호작도가 뭐야?", "rumi"))
+    with track_request() as second:
+        asyncio.run(korean_service.agenerate_response("호작도가 뭐야?", "rumi"))
+
+    assert {"embedding", "fusion", "prompt", "llm"} <= set(first.durations())
+    assert first.labels["cache"] == "miss"
+    assert second.labels["cache"] == "hit"
+    assert "llm" not in second.durations()
+
+
+def test_middleware_adds_server_timing_and_records_streams():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, path_prefixes=("/rag",))
+
+    @app.get("/rag/answer")
+    async def answer():
+        label_request(language="en", character="test-middleware")
+        with span("embedding"):
+            pass
+
+        async def body():
+            with span("llm"):
+                yield "chunk"
+        return StreamingResponse(body())
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    client = TestClient(app)
+    response = client.get("/rag/answer")
+
+    assert response.headers["server-timing"].startswith("embedding;dur=")
+    assert "total;dur=" in response.headers["server-timing"]
+    assert "server-timing" not in client.get("/health").headers
+
+    text = metrics.render()
+    labels = 'character="test-middleware",cache="none"'
+    assert f'guidely_rag_stage_duration_seconds_count{{stage="llm",language="en",{labels}}} 1' in text
+    assert f'guidely_rag_request_duration_seconds_count{{language="en",{labels}}} 1' in text
+    assert "guidely_inflight_requests 0" in text
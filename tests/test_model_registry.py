@@ -0,0 +1,43 @@
+"""
+모델 레지스트리 테스트 (오프라인)
+"""
+import threading
+import time
+
+from services.model_registry import ModelRegistry
+
+
+def test_model_loaded_once_across_threads():
+    """동시에 요청해도 모델은 한 번만 로드되어야 함"""
+    registry = ModelRegistry()
+    load_calls = []
+
+    def loader():
+        load_calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(registry._get_or_load("encoder", "fake", loader)))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(load_calls) == 1
+    assert all(r is results[0] for r in results)
+    assert registry.is_loaded("encoder", "fake")
+
+
+def test_stats_reports_each_model():
+    """stats() 는 모델별 항목과 총 메모리를 보고해야 함"""
+    registry = ModelRegistry()
+    registry._get_or_load("encoder", "a", lambda: object())
+    registry._get_or_load("llm", "b", lambda: object())
+
+    stats = registry.stats()
+    assert {m["name"] for m in stats["models"]} == {"a", "b"}
+    assert stats["total_memory_mb"] >= 0
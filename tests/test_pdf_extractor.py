@@ -0,0 +1,92 @@
+"""
+PDF 페이지 병렬 추출 + 페이지 스트림 적재 테스트 (오프라인)
+"""
+import fitz
+import pytest
+
+from database.document_service import ChunkService, iter_chunks
+from database.models import Document, PdfPage
+from tests.conftest import FakeEmbeddingModel
+from utils.pdf_extractor import PdfExtractionError, extract_pdf_text, iter_pdf_pages, shutdown_pdf_pool
+
+
+def make_pdf(pages):
+    doc = fitz.open()
+    for number in range(1, pages + 1):
+        doc.new_page().insert_text((72, 72), f"Tiger painting page {number}. The magpie brings good news.")
+    content = doc.tobytes()
+    doc.close()
+    return content
+
+
+def test_pages_stream_in_order_from_bytes_and_path(tmp_path):
+    content = make_pdf(5)
+    path = tmp_path / "tiger.pdf"
+    path.write_bytes(content)
+
+    pages = list(iter_pdf_pages(content, workers=1))
+
+    assert [page.number for page in pages] == [1, 2, 3, 4, 5]
+    assert "page 3." in pages[2].text
+    assert [page.text for page in iter_pdf_pages(str(path), workers=1)] == [page.text for page in pages]
+
+
+def test_process_pool_matches_inline_extraction():
+    content = make_pdf(11)
+    try:
+        parallel = list(iter_pdf_pages(content, workers=2, pages_per_task=3, parallel_min_pages=2))
+    finally:
+        shutdown_pdf_pool()
+
+    assert parallel == list(iter_pdf_pages(content, workers=1))
+    assert extract_pdf_text(content, workers=1).count("\n") >= 11
+
+
+def test_broken_pdf_raises_value_error():
+    with pytest.raises(PdfExtractionError):
+        list(iter_pdf_pages(b"not a pdf"))
+    assert issubclass(PdfExtractionError, ValueError)
+
+
+def test_streamed_chunks_match_whole_text_split():
+    pages = [(1, "호작도는 까치와 호랑이를 그린 민화입니다. " * 30 + "\n"), (2, ""), (3, "용호도는 용과 호랑이입니다. " * 40 + "\n")]
+    text = "".join(page_text for _, page_text in pages)
+
+    chunks = list(iter_chunks(pages, 500, 50))
+
+    assert [chunk for chunk, _, _ in chunks] == ChunkService()._split_text_into_chunks(text, 500, 50)
+    assert chunks[0][1:] == (1, 1)
+    assert chunks[-1][1:] == (3, 3)
+    assert any(first == 1 and last == 3 for _, first, last in chunks)
+
+
+def test_ingest_pages_embeds_before_extraction_finishes(monkeypatch):
+    saved = {}
+    model = FakeEmbeddingModel()
+    calls_when_last_page_started = []
+
+    def pages():
+        for number in range(1, 21):
+            if number == 20:
+                calls_when_last_page_started.append(model.calls)
+            yield PdfPage(number, f"{number}쪽: 호랑이 그림과 까치 이야기입니다. " * 15)
+
+    def fake_create(self, document, chunks):
+        saved["document"], saved["chunks"] = document, chunks
+        return 3, list(range(len(chunks)))
+
+    monkeypatch.setattr(ChunkService, "create_document_with_chunks", fake_create)
+    progress = []
+
+    result = ChunkService().ingest_document(Document(title="PDF", content=""), model, batch_size=4,
+                                            on_batch=lambda done, total: progress.append((done, total)),
+                                            pages=pages())
+
+    assert calls_when_last_page_started[0] > 0  # 마지막 페이지 추출 전에 임베딩 시작
+    assert len(result.chunk_ids) == len(saved["chunks"])
+    assert saved["document"].content == ""  # 전체 텍스트를 문자열 하나로 모으지 않음
+    assert saved["document"].metadata["page_count"] == 20 and saved["document"].metadata["text_length"] > 0
+    metadata = [chunk.metadata for chunk in saved["chunks"]]
+    assert metadata[0]["page_start"] == 1 and metadata[-1]["page_end"] == 20
+    assert all(m["page_start"] <= m["page_end"] for m in metadata)
+    assert progress[0][1] is None and progress[-1] == (len(saved["chunks"]), len(saved["chunks"]))
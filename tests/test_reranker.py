@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+import pytest
+
+import services.reranker as reranker_module
+from database.models import SearchResult
+from services.reranker import Reranker
+
+
+class FakeCrossEncoder:
+    """청크 텍스트 길이를 점수로 쓰는 가짜 cross-encoder"""
+
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=None):
+        assert show_progress_bar is False
+        self.batches.append(len(pairs))
+        return [float(len(text)) for _, text in pairs]
+
+
+@pytest.fixture
+def model(monkeypatch):
+    fake = FakeCrossEncoder()
+    monkeypatch.setattr(reranker_module, "get_cross_encoder", lambda name=None: fake)
+    return fake
+
+
+def results():
+    texts = ["짧음", "아주 아주 긴 청크", "중간 길이", "가장 가장 가장 긴 청크입니다"]
+    return [SearchResult(chunk_id=i, document_id=1, chunk_text=text, similarity=0.8)
+            for i, text in enumerate(texts)]
+
+
+def test_rerank_scores_one_batch_and_keeps_top_k(model):
+    reranked = Reranker(enabled=True, top_k=2).rerank("호랑이", results())
+
+    assert [r.chunk_id for r in reranked] == [3, 1]
+    assert reranked[0].rerank_score == float(len("가장 가장 가장 긴 청크입니다"))
+    assert model.batches == [4]
+
+
+def test_cached_pairs_skip_the_model(model):
+    reranker = Reranker(enabled=True, top_k=2)
+
+    reranker.rerank("호랑이", results())
+    reranker.rerank("  호랑이 ", results())
+
+    assert model.batches == [4]
+    assert reranker.stats()["score_cache"]["hits"] == 4
+
+
+def test_skips_when_latency_budget_is_spent(model):
+    reranker = Reranker(enabled=True, top_k=2, budget_ms=100)
+    reranker.rerank("까치", results())
+
+    started = time.perf_counter() - 0.5
+    unchanged = reranker.rerank("호작도", results(), started)
+
+    assert [r.chunk_id for r in unchanged] == [0, 1, 2, 3]
+    assert reranker.stats()["skipped_budget"] == 1
+
+
+def test_disabled_or_failing_model_keeps_fused_order(monkeypatch):
+    assert len(Reranker(enabled=False).rerank("호랑이", results())) == 4
+
+    def broken(name=None):
+        raise OSError("model unavailable")
+    monkeypatch.setattr(reranker_module, "get_cross_encoder", broken)
+    reranker = Reranker(enabled=True)
+
+    assert [r.chunk_id for r in reranker.rerank("호랑이", results())] == [0, 1, 2, 3]
+    assert reranker.stats()["failures"] == 1
+
+
+def test_async_rerank_matches_sync(model):
+    sync = Reranker(enabled=True, top_k=3).rerank("호랑이", results())
+    reranked = asyncio.run(Reranker(enabled=True, top_k=3).arerank("호랑이", results()))
+
+    assert [r.chunk_id for r in reranked] == [r.chunk_id for r in sync]
@@ -0,0 +1,54 @@
+"""
+응답 캐시 테스트 (오프라인)
+"""
+import asyncio
+
+from database.models import VectorSearchParams
+from services.response_cache import corpus_version, purge_responses, response_cache
+
+
+def test_repeated_question_skips_pipeline(korean_service):
+    first = asyncio.run(korean_service.agenerate_response("호작도가 뭐야?", "rumi"))
+    second = asyncio.run(korean_service.agenerate_response("  호작도가 뭐야? ", "rumi"))
+
+    assert korean_service.llm.calls == 1
+    assert korean_service.chunk_service.calls == 1
+    assert second.response == first.response and second.sources == first.sources
+
+    second.sources.clear()  # 반환값을 수정해도 캐시는 영향 없음
+    assert asyncio.run(korean_service.agenerate_response("호작도가 뭐야?", "rumi")).sources == first.sources
+
+
+def test_key_includes_character_language_and_corpus_version(korean_service, english_service):
+    korean_service.generate_response("호작도가 뭐야?", "rumi")
+    korean_service.generate_response("호작도가 뭐야?", "mira")
+    english_service.generate_response("호작도가 뭐야?", "rumi")
+    assert korean_service.llm.calls == 2 and english_service.llm.calls == 1
+
+    corpus_version._loader = lambda: 1  # 관리자 업로드로 버전 증가
+    corpus_version.invalidate()
+    korean_service.generate_response("호작도가 뭐야?", "rumi")
+    assert korean_service.llm.calls == 3
+
+
+def test_errors_and_tuned_searches_are_not_cached(english_service):
+    english_service.llm.invoke = lambda messages: (_ for _ in ()).throw(RuntimeError("LLM down"))
+    english_service.generate_response("What is hojakdo?")
+    assert len(response_cache) == 0
+
+    params = VectorSearchParams(ef_search=100)
+    asyncio.run(english_service.agenerate_response("What is hojakdo?", search_params=params))
+    asyncio.run(english_service.agenerate_response("What is hojakdo?", search_params=params))
+    assert english_service.llm.calls == 2
+
+
+def test_stream_replays_cached_answer(korean_service):
+    async def collect():
+        return [event async for event in korean_service.astream_response("호작도가 뭐야?", "rumi")]
+
+    streamed = asyncio.run(collect())
+    replayed = asyncio.run(collect())
+
+    assert korean_service.llm.calls == 1
+    assert replayed[-1]["data"] == streamed[-1]["data"]
+    assert purge_responses() == {"purged": 1}
@@ -0,0 +1,99 @@
+"""
+검색 평가 하네스 테스트 (오프라인)
+"""
+import numpy as np
+import pytest
+
+from benchmarks.retrieval_eval import (
+    EvalConfig, GoldenQuestion, calibrate_threshold, evaluate, load_golden_set, recall_at_k, reciprocal_rank
+)
+from database.models import SearchResult
+
+
+def result(chunk_id, text, vector, keyword=None, title="호랑이 전시"):
+    return SearchResult(chunk_id=chunk_id, document_id=1, chunk_text=text, similarity=vector,
+                        vector_similarity=vector, keyword_score=keyword, document_title=title)
+
+
+class FakeChunkService:
+    """벡터 경로는 산신도 청크를 1위로, 키워드 경로는 호작도 청크를 돌려주는 가짜 검색"""
+
+    def __init__(self):
+        self.params = []
+
+    def hybrid_search(self, query_embedding, query, vector_count=5, keyword_count=5,
+                      match_threshold=0.0, search_params=None):
+        self.params.append((vector_count, keyword_count, search_params.ef_search))
+        return [
+            result(3, "산신도에는 산신과 호랑이가 등장합니다.", 0.62),
+            result(1, "호작도는 까치와 호랑이를 그린 민화입니다.", 0.60, keyword=1.0),
+            result(5, "박물관 관람 시간은 오전 10시부터입니다.", 0.20),
+        ][:vector_count]
+
+
+def test_metrics_for_chunk_ids_and_text_anchors():
+    ranked = [result(3, "산신도", 0.6), result(1, "호작도는 까치", 0.5), result(7, "까치호랑이", 0.4)]
+
+    by_ids = GoldenQuestion("q1", "호작도?", expected_chunk_ids=[1, 7])
+    by_text = GoldenQuestion("q2", "까치?", expected_text=["까치"])
+    by_title = GoldenQuestion("q3", "전시?", expected_documents=["다른 문서"])
+
+    assert recall_at_k(by_ids, ranked, 2) == 0.5
+    assert recall_at_k(by_ids, ranked, 3) == 1.0
+    assert recall_at_k(by_text, ranked, 1) == 0.0 and recall_at_k(by_text, ranked, 2) == 1.0
+    assert reciprocal_rank(by_text, ranked) == 0.5
+    assert reciprocal_rank(by_title, ranked) == 0.0
+
+
+def test_evaluate_reports_quality_and_latency_per_config():
+    questions = [
+        GoldenQuestion("hojakdo", "호작도가 뭐야?", expected_text=["호작도"]),
+        GoldenQuestion("hours", "관람 시간은?", expected_text=["관람 시간"]),
+    ]
+    embeddings = {q.id: np.zeros(384, dtype=np.float32) for q in questions}
+    chunk_service = FakeChunkService()
+
+    vector_only = evaluate(EvalConfig("vector", vector_weight=1.0), questions, embeddings,
+                           chunk_service, repeat=2, ks=(1, 3))
+    hybrid = evaluate(EvalConfig("hybrid", ef_search=80), questions, embeddings, chunk_service, repeat=2, ks=(1, 3))
+
+    # 벡터만 보면 호작도 청크가 2위, 키워드 점수를 섞으면 1위
+    assert vector_only["recall"] == {"@1": 0.0, "@3": 1.0}
+    assert hybrid["recall"] == {"@1": 0.5, "@3": 1.0}
+    assert hybrid["mrr"] == pytest.approx((1.0 + 1 / 3) / 2, abs=1e-4)
+    assert hybrid["answer_rate"] == 1.0 and vector_only["answer_rate"] == 1.0
+    assert hybrid["misses"] == []
+    assert set(hybrid["latency_ms"]) == {"p50", "p95"}
+    assert len(chunk_service.params) == 8 and chunk_service.params[-1] == (5, 5, 80)
+
+
+def test_shipped_golden_set_is_valid():
+    golden = load_golden_set()
+
+    ids = [q.id for q in golden["questions"]]
+    assert golden["version"]
+    assert len(ids) == len(set(ids))
+    assert {q.language for q in golden["questions"]} == {"ko", "en"}
+    assert {q.language for q in golden["questions"] if not q.answerable} == {"ko", "en"}
+
+
+def test_calibrated_threshold_separates_answerable_from_unanswerable():
+    threshold = calibrate_threshold([0.55, 0.62, 0.48, 0.71], [0.21, 0.33, 0.30])
+
+    assert 0.33 < threshold <= 0.48 and threshold == pytest.approx(0.41, abs=0.01)
+    assert calibrate_threshold([0.5], []) is None
+
+
+def test_evaluate_reports_reject_rate_for_unanswerable_questions():
+    questions = [
+        GoldenQuestion("hojakdo", "호작도가 뭐야?", expected_text=["호작도"]),
+        GoldenQuestion("weather", "오늘 날씨 어때?", answerable=False),
+    ]
+    embeddings = {q.id: np.zeros(384, dtype=np.float32) for q in questions}
+
+    report = evaluate(EvalConfig("hybrid", score_threshold=0.9), questions, embeddings,
+                      FakeChunkService(), repeat=1, ks=(1,))
+
+    assert report["unanswerable"] == 1 and report["reject_rate"] == 1.0
+    assert report["recall"] == {"@1": 1.0} and report["misses"] == []
+    assert report["recommended_threshold"] is not None
@@ -0,0 +1,82 @@
+"""
+동시 요청 병합(single-flight) 테스트 (오프라인)
+"""
+import asyncio
+
+import pytest
+
+from services.response_cache import inflight
+from utils.singleflight import SingleFlight
+
+
+def test_concurrent_identical_questions_share_one_pipeline(korean_service):
+    korean_service.llm.delay = 0.05
+    before = inflight.stats()["coalesced"]
+
+    async def burst():
+        return await asyncio.gather(*[
+            korean_service.agenerate_response("호작도가 뭐야?", "rumi") for _ in range(20)
+        ])
+
+    responses = asyncio.run(burst())
+
+    assert korean_service.llm.calls == 1
+    assert korean_service.chunk_service.calls == 1
+    assert inflight.stats()["coalesced"] - before == 19
+    assert len({r.response for r in responses}) == 1
+    assert responses[0] is not responses[1]  # 호출자마다 독립된 복사본
+
+
+def test_concurrent_streams_share_one_llm_stream(korean_service):
+    korean_service.llm.delay = 0.05
+
+    async def listen():
+        return [event async for event in korean_service.astream_response("호작도가 뭐야?", "rumi")]
+
+    async def burst():
+        return await asyncio.gather(*[listen() for _ in range(5)])
+
+    streams = asyncio.run(burst())
+
+    assert korean_service.llm.calls == 1
+    assert all(stream == streams[0] for stream in streams)
+    assert streams[0][-1]["event"] == "done"
+
+
+def test_failure_is_shared_and_not_remembered():
+    flight = SingleFlight()
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("LLM rate limited")
+
+    async def burst():
+        return await asyncio.gather(*[flight.do("k", flaky) for _ in range(3)], return_exceptions=True)
+
+    results = asyncio.run(burst())
+    assert len(attempts) == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(flight.do("k", flaky))
+    assert len(attempts) == 2
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    flight = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    async def scenario():
+        first = asyncio.create_task(flight.do("k", slow))
+        second = asyncio.create_task(flight.do("k", slow))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == "answer"
+    assert flight.stats()["executions"] == 1
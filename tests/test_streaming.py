@@ -0,0 +1,76 @@
+"""
+문장 단위 스트리밍 테스트 (오프라인)
+"""
+import asyncio
+
+from utils.streaming import SentenceSegmenter, format_sse
+
+
+def feed_all(tokens):
+    segmenter = SentenceSegmenter()
+    sentences = []
+    for token in tokens:
+        sentences.extend(segmenter.feed(token))
+    rest = segmenter.flush()
+    return sentences + ([rest] if rest else [])
+
+
+def test_korean_endings_split_without_trailing_space():
+    tokens = ["호작도는 까치와 ", "호랑이 그림이에", "요.", "정말 멋지", "죠!", " 가격은 3", ".5달러입니다."]
+    assert feed_all(tokens) == ["호작도는 까치와 호랑이 그림이에요.", "정말 멋지죠!", "가격은 3.5달러입니다."]
+
+
+def test_english_punctuation_and_decimals():
+    tokens = ["The tiger ", "is 3.5 m long. ", "Isn't it big? ", "Come and see"]
+    assert feed_all(tokens) == ["The tiger is 3.5 m long.", "Isn't it big?", "Come and see"]
+
+
+def test_format_sse_keeps_korean_readable():
+    assert format_sse("sentence", {"text": "안녕"}) == 'event: sentence\ndata: {"text": "안녕"}\n\n'
+
+
+def collect(agen):
+    async def run():
+        return [event async for event in agen]
+    return asyncio.run(run())
+
+
+def test_korean_stream_sends_sources_then_sentences_then_done(korean_service):
+    events = collect(korean_service.astream_response("호작도가 뭐야?", "rumi"))
+
+    names = [e["event"] for e in events]
+    assert names[0] == "sources" and names[-1] == "done"
+    sentences = [e["data"]["text"] for e in events if e["event"] == "sentence"]
+    assert sentences == ["호작도는 까치와 호랑이 그림이에요.", "정말 멋지죠!"]
+    assert events[-1]["data"]["response"] == korean_service.llm.answer
+
+
+def test_done_keeps_llm_whitespace_and_is_what_gets_cached(korean_service):
+    korean_service.llm.answer = "호작도는 민화예요.\n\n- 까치: 기쁜 소식\n- 호랑이: 액막이\n"
+    events = collect(korean_service.astream_response("호작도가 뭐야?", "rumi"))
+
+    sentences = [e["data"]["text"] for e in events if e["event"] == "sentence"]
+    assert sentences == ["호작도는 민화예요.", "- 까치: 기쁜 소식", "- 호랑이: 액막이"]
+    assert events[-1]["data"]["response"] == "호작도는 민화예요.\n\n- 까치: 기쁜 소식\n- 호랑이: 액막이"
+    replayed = collect(korean_service.astream_response("호작도가 뭐야?", "rumi"))
+    assert korean_service.llm.calls == 1 and replayed[-1] == events[-1]
+
+
+def test_korean_stream_failure_ends_with_error_event(korean_service, monkeypatch):
+    async def broken(*args, **kwargs):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(korean_service, "_aretrieve", broken)
+    events = collect(korean_service.astream_response("호작도가 뭐야?", "rumi"))
+
+    assert [e["event"] for e in events] == ["error"]
+    assert events[0]["data"]["sources"] == [] and events[0]["data"]["response"]
+
+
+def test_english_stream_unknown_response(english_service):
+    english_service.chunk_service.results = []
+    events = collect(english_service.astream_response("What is the weather?", "rumi"))
+
+    assert events[0] == {"event": "sources", "data": {"sources": []}}
+    assert events[-1]["event"] == "done"
+    assert english_service.llm.calls == 0
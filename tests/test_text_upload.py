@@ -24,7 +24,7 @@ def test_text_upload():
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
         
-        if response.status_code == 200:
+        if response.status_code == 202:
             print("✅ 텍스트 업로드 성공!")
         else:
             print("❌ 텍스트 업로드 실패!")
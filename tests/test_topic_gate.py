@@ -0,0 +1,81 @@
+import asyncio
+
+import numpy as np
+
+from services.response_cache import corpus_version
+from services.topic_gate import TopicGate, topic_gate
+
+
+def unit(*values):
+    vec = np.asarray(values, dtype=np.float32)
+    return vec / np.linalg.norm(vec)
+
+
+def centroids():
+    return np.stack([unit(1, 0, 0), unit(0, 1, 0)])
+
+
+def test_on_topic_and_off_topic_queries():
+    corpus_version._loader = lambda: 0
+    corpus_version.invalidate()
+    gate = TopicGate(loader=centroids, threshold=0.5, enabled=True)
+
+    assert gate.is_on_topic(unit(0.9, 0.1, 0.1)) is True
+    assert gate.is_on_topic(unit(0, 0, 1)) is False
+    assert asyncio.run(gate.ais_on_topic(unit(0, 0, 1))) is False
+    assert gate.stats()["rejected"] == 2
+
+
+def test_centroids_reload_only_when_corpus_changes():
+    version = {"value": 1}
+    corpus_version._loader = lambda: version["value"]
+    corpus_version.invalidate()
+    loads = []
+
+    def loader():
+        loads.append(version["value"])
+        return centroids()
+
+    gate = TopicGate(loader=loader, threshold=0.5, enabled=True)
+    gate.is_on_topic(unit(1, 0, 0))
+    gate.is_on_topic(unit(0, 1, 0))
+    assert loads == [1]
+
+    version["value"] = 2
+    corpus_version.invalidate()
+    asyncio.run(gate.ais_on_topic(unit(1, 0, 0)))
+    assert loads == [1, 2]
+    assert gate.stats()["corpus_version"] == 2
+
+
+def test_gate_fails_open():
+    corpus_version._loader = lambda: 0
+    corpus_version.invalidate()
+
+    def broken():
+        raise RuntimeError("db down")
+
+    gate = TopicGate(loader=broken, threshold=0.99, enabled=True)
+    empty = TopicGate(loader=lambda: np.empty((0, 0), dtype=np.float32), threshold=0.99, enabled=True)
+
+    assert gate.is_on_topic(unit(0, 0, 1)) is True
+    assert gate.stats()["failures"] == 1
+    assert empty.is_on_topic(unit(0, 0, 1)) is True
+    assert TopicGate(loader=broken, enabled=False).is_on_topic(unit(0, 0, 1)) is True
+
+
+def test_off_topic_question_skips_search_and_llm(korean_service, english_service, monkeypatch):
+    monkeypatch.setattr(topic_gate, "enabled", True)
+    monkeypatch.setattr(topic_gate, "threshold", 1.01)  # 어떤 질문도 통과하지 못하게
+    topic_gate._loader = lambda: np.ones((1, 384), dtype=np.float32) / np.sqrt(384)
+    topic_gate._version = None
+
+    korean = korean_service.generate_response("호작도가 뭐야?", "rumi")
+    korean_async = asyncio.run(korean_service.agenerate_response("호작도에서 까치는?", "rumi"))
+    english = english_service.generate_response("What is hojakdo?", "rumi")
+
+    assert korean.sources == [] and korean_async.sources == []
+    assert english["sources"] == []
+    for service in (korean_service, english_service):
+        assert service.chunk_service.calls == 0
+        assert service.llm.calls == 0
@@ -0,0 +1,130 @@
+"""
+업로드 스풀 + 스트리밍 PDF 업로드 API 테스트 (오프라인)
+"""
+import asyncio
+import base64
+import binascii
+import os
+
+import fitz
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import controllers.admin_controller as admin_controller
+from database.document_service import ChunkService
+from services.ingestion_jobs import SUCCEEDED, IngestionQueue
+from tests.conftest import FakeEmbeddingModel
+from utils.upload_spool import SpooledUpload, UploadTooLargeError, spool_base64, spool_stream
+
+
+def make_pdf(pages=3):
+    doc = fitz.open()
+    for number in range(1, pages + 1):
+        doc.new_page().insert_text((72, 72), f"Tiger painting page {number}. " * 5)
+    content = doc.tobytes()
+    doc.close()
+    return content
+
+
+async def chunks_of(data, size):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def test_spool_rolls_over_to_disk_and_cleans_up():
+    small = asyncio.run(spool_stream(chunks_of(b"a" * 100, 10), max_memory=1024))
+    large = asyncio.run(spool_stream(chunks_of(b"b" * 5000, 1000), max_memory=1024))
+
+    assert not small.on_disk and small.source() == b"a" * 100
+    assert large.on_disk and large.size == 5000
+    with open(large.source(), "rb") as f:
+        assert f.read() == b"b" * 5000
+
+    large.close()
+    assert not os.path.exists(large.path)
+
+
+def test_spool_rejects_oversized_upload_while_streaming():
+    received = []
+
+    async def body():
+        for _ in range(100):
+            received.append(1)
+            yield b"x" * 1000
+
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(spool_stream(body(), max_bytes=4500, max_memory=1024))
+    assert len(received) == 5  # 제한을 넘는 조각에서 바로 중단
+
+
+def test_spool_base64_decodes_in_pieces():
+    data = os.urandom(10000)
+    encoded = base64.b64encode(data).decode()
+    mime = base64.encodebytes(data).decode()  # 76자마다 줄바꿈
+
+    assert spool_base64(encoded, chunk_bytes=300).source() == data
+    assert spool_base64(mime, chunk_bytes=300).source() == data
+    with pytest.raises(binascii.Error):
+        spool_base64("@@@@" + encoded)
+    with pytest.raises(UploadTooLargeError):
+        spool_base64(encoded, max_bytes=1000)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    saved = []
+
+    class RecordingChunkService(ChunkService):
+        def get_previous_version(self, document_key):
+            return None
+
+        def create_document_with_chunks(self, document, chunks):
+            saved.append((document, chunks))
+            return 1, list(range(len(chunks)))
+
+    queue = IngestionQueue(workers=1, niceness=0, busy=lambda: 0,
+                           chunk_service_factory=RecordingChunkService,
+                           embedding_model_loader=FakeEmbeddingModel)
+    monkeypatch.setattr(admin_controller, "ingestion_queue", queue)
+    monkeypatch.setattr("services.ingestion_jobs.invalidate_corpus", lambda: None)
+    app = FastAPI()
+    app.include_router(admin_controller.router, prefix="/admin")
+    yield TestClient(app), queue, saved
+    queue.shutdown()
+
+
+def test_pdf_stream_endpoint_ingests_and_removes_spool(client, monkeypatch):
+    http, queue, saved = client
+    spools = []
+    original_close = SpooledUpload.close
+
+    def tracking_close(self):
+        spools.append(self)
+        original_close(self)
+
+    monkeypatch.setattr(SpooledUpload, "close", tracking_close)
+
+    response = http.post("/admin/documents/pdf-stream", params={"title": "호랑이 도록"}, content=make_pdf(),
+                         headers={"Content-Type": "application/pdf"})
+
+    assert response.status_code == 202
+    job = queue.wait(response.json()["job_id"], timeout=10)
+    assert job.status == SUCCEEDED and job.result["extracted_text_length"] > 0
+    document, chunks = saved[0]
+    assert document.file_name == "호랑이 도록.pdf" and chunks[0].metadata["page_start"] == 1
+    assert spools and job.prepare is None  # 작업이 끝나면 스풀 정리, 입력 해제
+
+
+def test_upload_endpoints_enforce_size_cap(client, monkeypatch):
+    http, _, _ = client
+    monkeypatch.setattr(admin_controller, "UPLOAD_MAX_BYTES", 100)
+
+    streamed = http.post("/admin/documents/pdf-stream", params={"title": "큰 파일"}, content=b"x" * 1000)
+    empty = http.post("/admin/documents/pdf-upload", data={"title": "빈 파일"},
+                      files={"file": ("empty.pdf", b"", "application/pdf")})
+    invalid = http.post("/admin/documents/pdf", json={"title": "깨진 Base64", "content": "@@@"})
+
+    assert streamed.status_code == 413
+    assert empty.status_code == 400
+    assert invalid.status_code == 400
@@ -0,0 +1,39 @@
+"""
+numpy <-> pgvector 어댑터 테스트 (오프라인)
+"""
+import numpy as np
+import pytest
+from psycopg2 import ProgrammingError
+from psycopg2.extensions import adapt
+
+from database.vector_adapter import Vector, parse_vector, to_vector_literal
+
+
+def test_vector_is_sent_as_vector_literal():
+    quoted = adapt(Vector(np.array([0.5, -1.0, 0.1], dtype=np.float32))).getquoted()
+    assert quoted == b"'[0.5,-1.0,0.1]'::vector"
+    assert adapt(Vector([0.5, 2])).getquoted() == b"'[0.5,2.0]'::vector"
+    assert Vector.of(None) is None
+
+
+def test_plain_ndarray_is_not_adapted_globally():
+    # Vector 로 감싸지 않은 배열은 psycopg2 기본 동작 그대로 (전역 어댑터 없음)
+    with pytest.raises(ProgrammingError):
+        adapt(np.array([1, 2]))
+
+
+def test_float32_roundtrip_is_lossless():
+    vector = np.random.default_rng(1).standard_normal(384).astype(np.float32)
+    restored = parse_vector(to_vector_literal(vector))
+    assert restored.dtype == np.float32
+    assert np.array_equal(restored, vector)
+
+
+def test_parse_handles_null_and_empty():
+    assert parse_vector(None) is None
+    assert parse_vector("[]").shape == (0,)
+
+
+def test_rejects_matrix():
+    with pytest.raises(ValueError):
+        to_vector_literal(np.zeros((2, 3), dtype=np.float32))
@@ -0,0 +1,67 @@
+"""
+벡터 인덱스 파라미터 테스트 (오프라인)
+"""
+import asyncio
+
+from database.document_service import ChunkService, DEFAULT_EF_SEARCH
+from database.models import VectorSearchParams
+
+
+def test_index_params_scale_with_row_count():
+    assert ChunkService._tune_index_params("hnsw", 1_000)["build"] == {"m": 16, "ef_construction": 64}
+    assert ChunkService._tune_index_params("hnsw", 500_000)["search"] == {"ef_search": DEFAULT_EF_SEARCH}
+
+    small = ChunkService._tune_index_params("ivfflat", 18)
+    assert small == {"build": {"lists": 1}, "search": {"probes": 1}}
+    assert ChunkService._tune_index_params("ivfflat", 4_000_000)["build"]["lists"] == 2000
+
+
+def test_hnsw_support_by_version():
+    assert ChunkService._supports_hnsw("0.6.2")
+    assert not ChunkService._supports_hnsw("0.4.4")
+
+
+def test_search_params_reach_chunk_service(korean_service):
+    received = []
+    original = korean_service.chunk_service.hybrid_search
+
+    def recording_hybrid_search(*args, **kwargs):
+        received.append(kwargs.get("search_params"))
+        return original(*args, **kwargs)
+
+    korean_service.chunk_service.hybrid_search = recording_hybrid_search
+    params = VectorSearchParams(ef_search=200)
+    asyncio.run(korean_service.agenerate_response("호작도가 뭐야?", "rumi", params))
+    assert received == [params]
+
+
+def test_rebuild_endpoint_runs_off_the_event_loop(monkeypatch):
+    import threading
+
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    import controllers.admin_controller as admin_controller
+
+    threads = []
+
+    def fake_rebuild(self, method=None):
+        threads.append(threading.current_thread())
+        return {"method": method or "hnsw", "row_count": 0, "build_params": {}, "recommended_search_params": {},
+                "replaced_indexes": [], "elapsed_seconds": 0.0}
+
+    monkeypatch.setattr(ChunkService, "rebuild_vector_index", fake_rebuild)
+    loop_threads = []
+    app = FastAPI()
+
+    @app.get("/loop-thread")
+    async def loop_thread():
+        loop_threads.append(threading.current_thread())
+
+    app.include_router(admin_controller.router, prefix="/admin")
+    with TestClient(app) as client:
+        client.get("/loop-thread")
+        response = client.post("/admin/index/rebuild")
+
+    assert response.status_code == 200 and response.json()["method"] == "hnsw"
+    assert threads and threads[0] is not loop_threads[0]  # 이벤트 루프 스레드에서 실행하지 않음
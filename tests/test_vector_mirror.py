@@ -0,0 +1,120 @@
+"""
+메모리 벡터 미러 테스트 (오프라인)
+"""
+import contextlib
+
+import numpy as np
+
+from database.change_log import ChangeLogCursor
+from database.document_service import ChunkService
+from database.vector_mirror import MirroredChunkService, VectorMirror
+
+
+def make_rows(document_id, start_id, count, seed):
+    vectors = np.random.default_rng(seed).standard_normal((count, 8)).astype(np.float32)
+    return [
+        {"chunk_id": start_id + i, "document_id": document_id, "chunk_text": f"문서{document_id} 호랑이 {i}",
+         "embedding": vectors[i], "metadata": None, "document_title": f"문서{document_id}", "source_url": None}
+        for i in range(count)
+    ]
+
+
+def loaded_mirror(rows, version=1):
+    mirror = VectorMirror()
+    mirror._snapshot = VectorMirror._build(rows, ChangeLogCursor(version))
+    mirror._last_success = mirror._last_checked = float("inf")  # 갱신하지 않는 신선한 미러
+    return mirror
+
+
+def test_search_matches_brute_force():
+    rows = make_rows(1, 1, 50, seed=0)
+    mirror = loaded_mirror(rows)
+    query = np.random.default_rng(1).standard_normal(8).astype(np.float32)
+
+    matrix = np.stack([r["embedding"] / np.linalg.norm(r["embedding"]) for r in rows])
+    expected = np.argsort(-(matrix @ (query / np.linalg.norm(query))))[:5] + 1
+
+    results = mirror.search(query, match_threshold=-1.0, match_count=5)
+    assert [r.chunk_id for r in results] == expected.tolist()
+    assert all(a.similarity >= b.similarity for a, b in zip(results, results[1:]))
+    assert all(r.similarity > 0.5 for r in mirror.search(query, match_threshold=0.5, match_count=50))
+
+
+def test_merge_replaces_changed_documents_only():
+    snapshot = VectorMirror._build(make_rows(1, 1, 3, seed=0) + make_rows(2, 4, 3, seed=1), ChangeLogCursor(1))
+    changed = VectorMirror._build(make_rows(2, 10, 2, seed=2), ChangeLogCursor(5))
+
+    merged = VectorMirror._merge(snapshot, {2, 3}, changed)
+
+    assert merged.chunk_ids.tolist() == [1, 2, 3, 10, 11]
+    assert merged.document_ids.tolist() == [1, 1, 1, 2, 2]
+    assert merged.matrix.shape == (5, 8) and merged.version == 5
+    assert merged.matrix.flags.c_contiguous
+
+
+def test_hybrid_search_adds_keyword_only_rows():
+    mirror = loaded_mirror(make_rows(1, 1, 10, seed=0))
+    query = mirror._snapshot.matrix[0]
+
+    results = mirror.hybrid_search(query, [(8, 1.0), (1, 0.5), (99, 0.2)], vector_count=1)
+
+    assert [r.chunk_id for r in results] == [1, 8]
+    assert results[0].keyword_score == 0.5
+    assert results[1].similarity == 1.0 and results[1].vector_similarity is not None
+
+
+def test_stale_mirror_falls_back_to_postgres(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ChunkService, "search_similar_chunks",
+                        lambda self, *args, **kwargs: calls.append("postgres") or [])
+    mirror = VectorMirror(refresh_interval=0)
+    monkeypatch.setattr(mirror, "refresh", lambda: (_ for _ in ()).throw(ConnectionError("db down")))
+    service = MirroredChunkService(mirror)
+
+    service.search_similar_chunks(np.ones(8, dtype=np.float32))
+
+    assert calls == ["postgres"]
+    assert service.stats()["postgres_fallbacks"] == 1
+    assert service.stats()["refresh_failures"] == 1
+
+
+class FakeMirrorCursor:
+    """corpus_change_log / document_chunks 조회만 흉내 내는 커서 (db: 커밋된 변경, 문서별 행)"""
+
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+
+    def execute(self, query, params=()):
+        if "corpus_change_log" in query:
+            self.rows = [{"id": i, "document_id": d} for i, d in self.db["changes"]
+                         if i > params[0] or i in params[1]]
+        else:
+            self.rows = [row for d, rows in self.db["documents"].items() if d in params[0] for row in rows]
+
+    def fetchall(self):
+        return self.rows
+
+
+def test_late_commit_with_lower_change_id_is_mirrored(monkeypatch):
+    db = {"changes": [], "documents": {}}
+
+    @contextlib.contextmanager
+    def fake_cursor():
+        yield FakeMirrorCursor(db), None
+
+    monkeypatch.setattr("database.vector_mirror.get_db_cursor", fake_cursor)
+    mirror = loaded_mirror(make_rows(1, 1, 3, seed=0), version=1)
+
+    # ID 2 를 받은 적재가 ID 3 인 적재보다 늦게 커밋됨
+    db["changes"].append((3, 3))
+    db["documents"][3] = make_rows(3, 20, 2, seed=3)
+    mirror.refresh()
+    assert mirror._snapshot.version == 3 and mirror._snapshot.log_cursor.gaps[0][0] == 2
+
+    db["changes"].append((2, 2))
+    db["documents"][2] = make_rows(2, 10, 2, seed=2)
+    mirror.refresh()
+
+    assert mirror._snapshot.chunk_ids.tolist() == [1, 2, 3, 10, 11, 20, 21]
+    assert mirror._snapshot.log_cursor == ChangeLogCursor(3)
@@ -3,9 +3,9 @@
 """
 import os
 import requests
-from database.document_service import DocumentService, ChunkService
+from database.document_service import ChunkService
 from utils.document_loader import load_document_from_url
-from sentence_transformers import SentenceTransformer
+from services.model_registry import get_embedding_model
 import logging
 
 # 로깅 설정
@@ -28,9 +28,8 @@ def upload_namu_wiki():
             return False
             
         # 문서 서비스 초기화
-        doc_service = DocumentService()
         chunk_service = ChunkService()
-        embedding_model = SentenceTransformer('sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2')
+        embedding_model = get_embedding_model()
         
         # 문서 저장
         print("문서 저장 중...")
@@ -41,23 +40,24 @@ def upload_namu_wiki():
             file_type="html",
             content=content,
             source_url=url,
+            document_key=url,
             metadata={"source": "namu_wiki", "category": "kpop_group"}
         )
-        document_id = doc_service.create_document(document)
-        
-        print(f"✅ 문서 저장 완료: ID {document_id}")
-        
-        # 청크 생성 및 임베딩
+        # 문서 + 청크를 한 트랜잭션으로 저장 (배치 임베딩, 같은 document_key(출처) 문서가 있으면 바뀐 청크만 갱신)
         print("청크 생성 및 임베딩 중...")
-        chunk_ids = chunk_service.create_chunks_for_document(
-            document_id, 
-            content, 
+        result = chunk_service.ingest_document(
+            document,
             embedding_model,
             chunk_size=500,
             chunk_overlap=50
         )
         
-        print(f"✅ 청크 생성 완료: {len(chunk_ids)}개")
+        if result.status == "unchanged":
+            print(f"✅ 변경 없음: 문서 ID {result.document_id} 에 같은 내용이 이미 적재되어 있습니다")
+            return True
+        print(f"✅ 문서 저장 완료: ID {result.document_id} ({'새 문서' if result.status == 'created' else '기존 문서 갱신'})")
+        print(f"✅ 청크 {len(result.chunk_ids)}개: 새로 임베딩 {result.chunks_embedded}개, "
+              f"재사용 {result.chunks_reused}개, 삭제 {result.chunks_deleted}개 ({result.chunks_per_second:.1f} chunks/sec)")
         return True
         
     except Exception as e:
@@ -82,9 +82,8 @@ def upload_pdf_file(pdf_path: str):
             return False
             
         # 문서 서비스 초기화
-        doc_service = DocumentService()
         chunk_service = ChunkService()
-        embedding_model = SentenceTransformer('sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2')
+        embedding_model = get_embedding_model()
         
         # 문서 저장
         print("문서 저장 중...")
@@ -95,23 +94,24 @@ def upload_pdf_file(pdf_path: str):
             file_type="pdf",
             content=content,
             source_url=f"file://{pdf_path}",
+            document_key=f"file://{pdf_path}",
             metadata={"source": "local_pdf", "category": "exhibition", "museum": "국립중앙박물관"}
         )
-        document_id = doc_service.create_document(document)
-        
-        print(f"✅ 문서 저장 완료: ID {document_id}")
-        
-        # 청크 생성 및 임베딩
+        # 문서 + 청크를 한 트랜잭션으로 저장 (배치 임베딩, 같은 document_key(출처) 문서가 있으면 바뀐 청크만 갱신)
         print("청크 생성 및 임베딩 중...")
-        chunk_ids = chunk_service.create_chunks_for_document(
-            document_id, 
-            content, 
+        result = chunk_service.ingest_document(
+            document,
             embedding_model,
             chunk_size=500,
             chunk_overlap=50
         )
         
-        print(f"✅ 청크 생성 완료: {len(chunk_ids)}개")
+        if result.status == "unchanged":
+            print(f"✅ 변경 없음: 문서 ID {result.document_id} 에 같은 내용이 이미 적재되어 있습니다")
+            return True
+        print(f"✅ 문서 저장 완료: ID {result.document_id} ({'새 문서' if result.status == 'created' else '기존 문서 갱신'})")
+        print(f"✅ 청크 {len(result.chunk_ids)}개: 새로 임베딩 {result.chunks_embedded}개, "
+              f"재사용 {result.chunks_reused}개, 삭제 {result.chunks_deleted}개 ({result.chunks_per_second:.1f} chunks/sec)")
         return True
         
     except Exception as e:
@@ -0,0 +1,42 @@
+"""
+콘텐츠 해시 (SHA-256 16진 문자열)
+
+문서 단위(documents.content_hash)와 청크 단위(document_chunks.chunk_hash)에서 같은 함수를 써서,
+재업로드된 내용이 이전 버전과 같은지 비교합니다.
+"""
+import hashlib
+from typing import Union
+
+FILE_READ_BYTES = 1024 * 1024
+# 식별 키를 지정하지 않은 문서의 document_key 접두사 (내용이 같아야 같은 문서)
+CONTENT_KEY_PREFIX = "sha256:"
+
+
+def bytes_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def text_hash(text: str) -> str:
+    """텍스트(UTF-8) 해시"""
+    return bytes_hash(text.encode("utf-8"))
+
+
+def file_hash(path: str, chunk_bytes: int = FILE_READ_BYTES) -> str:
+    """파일 해시 (chunk_bytes 씩 읽으므로 큰 파일도 메모리에 올리지 않음)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_bytes), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_hash(source: Union[str, bytes]) -> str:
+    """PDF 입력(바이트 또는 파일 경로) 해시"""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes_hash(bytes(source))
+    return file_hash(source)
+
+
+def content_document_key(content_hash: str) -> str:
+    """식별 키 없이 올린 문서의 document_key (같은 내용의 재업로드만 같은 문서로 취급)"""
+    return f"{CONTENT_KEY_PREFIX}{content_hash}"
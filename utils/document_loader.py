@@ -6,13 +6,14 @@ import tempfile
 from typing import List
 from urllib.parse import urlparse
 
-import fitz  # PyMuPDF
 import requests
 from bs4 import BeautifulSoup
 from langchain.schema import Document
 import textwrap
 import logging
 
+from utils.pdf_extractor import iter_pdf_pages
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,13 +28,14 @@ def load_pdf_from_url(url: str) -> Document:
             tmp_file_path = tmp_file.name
 
         try:
-            doc = fitz.open(tmp_file_path)
-            text_content = ""
+            page_texts = []
             total_chars = 0
+            page_count = 0
 
-            for page in doc:
-                raw_text = page.get_text().strip()
-                cleaned_text = raw_text  # 필요하면 clean_pdf_text(raw_text)
+            # 페이지 범위를 프로세스 풀에서 병렬 추출, 순서대로 받음
+            for page in iter_pdf_pages(tmp_file_path):
+                page_count += 1
+                cleaned_text = page.text.strip()  # 필요하면 clean_pdf_text(raw_text)
 
                 if cleaned_text:
                     # ────────────────────────────────────────────────
@@ -41,14 +43,16 @@ def load_pdf_from_url(url: str) -> Document:
                     # ────────────────────────────────────────────────
                     logger.info(
                         "Page %-3d | %5d chars | Preview: %s",
-                        page.number + 1,
+                        page.number,
                         len(cleaned_text),
                         textwrap.shorten(cleaned_text, width=80, placeholder=" …"),
                     )
 
-                    text_content += f"페이지 {page.number + 1}: {cleaned_text}\n\n"
+                    page_texts.append(f"페이지 {page.number}: {cleaned_text}\n\n")
                     total_chars += len(cleaned_text)
 
+            text_content = "".join(page_texts)
+
             # ────────────────────────────────────────────────────────
             # 📌 ② 전체 추출 결과 요약
             # ────────────────────────────────────────────────────────
@@ -56,9 +60,8 @@ def load_pdf_from_url(url: str) -> Document:
                 "Finished extracting PDF (%s) → total %d chars across %d pages",
                 url,
                 total_chars,
-                len(doc),
+                page_count,
             )
-            doc.close() 
             # arXiv 논문이면 출처 주석 추가
             if "arxiv.org" in url.lower():
                 text_content = f"arXiv 논문 출처: {url}\n\n" + text_content
@@ -0,0 +1,49 @@
+"""
+비동기 경로용 bounded executor
+
+이벤트 루프를 막는 동기 작업을 전용 스레드 풀로 넘깁니다.
+- CPU 작업(임베딩 encode): 작은 풀 - torch 가 내부에서 멀티스레드를 쓰므로 동시 실행 수 제한
+- DB 작업(psycopg2): 커넥션 풀 최대 크기만큼 - 풀 대기 대신 executor 큐에서 대기
+
+호출한 쪽의 contextvars(요청 계측 등)를 복사해 worker 스레드에서 실행합니다.
+"""
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from database.connection import POOL_CONFIG
+
+CPU_WORKERS = int(os.getenv('CPU_EXECUTOR_WORKERS', '2'))
+DB_WORKERS = int(os.getenv('DB_EXECUTOR_WORKERS', str(POOL_CONFIG['max_size'])))
+
+_cpu_executor = ThreadPoolExecutor(max_workers=CPU_WORKERS, thread_name_prefix="cpu")
+_db_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="db")
+
+
+async def run_cpu_bound(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """CPU 바운드 함수(임베딩 등)를 CPU executor 에서 실행"""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_cpu_executor, functools.partial(context.run, func, *args, **kwargs))
+
+
+async def run_db_bound(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """블로킹 DB 호출을 DB executor 에서 실행"""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_db_executor, functools.partial(context.run, func, *args, **kwargs))
+
+
+def executor_queue_depths() -> Dict[str, int]:
+    """executor 별 실행 대기 중인 작업 수 (포화도 지표)"""
+    # ThreadPoolExecutor 는 대기 큐 길이를 공개하지 않으므로 내부 큐 크기를 읽음
+    return {"cpu": _cpu_executor._work_queue.qsize(), "db": _db_executor._work_queue.qsize()}
+
+
+def shutdown_executors():
+    """애플리케이션 종료 시 executor 정리"""
+    _cpu_executor.shutdown(wait=False, cancel_futures=True)
+    _db_executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,94 @@
+"""
+Aho-Corasick 다중 패턴 매처
+
+키워드 목록을 한 번 오토마톤으로 컴파일해 두고, 텍스트를 한 번만 훑어
+모든 키워드의 등장(부분 문자열 포함)을 찾습니다.
+키워드마다 `keyword in text` 를 반복하던 관련성 검증 루프를 대체합니다.
+
+패턴은 그룹(예: 'relevant', 'irrelevant')으로 묶어 등록하며,
+한 번의 스캔으로 그룹별 매칭 결과를 돌려줍니다.
+"""
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class KeywordMatcher:
+    """그룹별 키워드를 한 번에 찾는 Aho-Corasick 오토마톤"""
+
+    def __init__(self, groups: Dict[str, Iterable[str]], ignore_case: bool = True):
+        self.ignore_case = ignore_case
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # 노드별 출력: 이 위치에서 끝나는 (패턴, 그룹) 목록 (실패 링크의 출력 포함)
+        self._output: List[List[Tuple[str, str]]] = [[]]
+        self.groups = list(groups)
+
+        for group, patterns in groups.items():
+            for pattern in patterns:
+                self._add(self._fold(pattern), group)
+        self._link()
+
+    def _fold(self, text: str) -> str:
+        return text.lower() if self.ignore_case else text
+
+    def _add(self, pattern: str, group: str):
+        if not pattern:
+            return
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][ch] = next_state
+            state = next_state
+        if (pattern, group) not in self._output[state]:
+            self._output[state].append((pattern, group))
+
+    def _link(self):
+        """
+        BFS 로 실패 링크를 계산하고 전이표를 완성(DFA 화)
+
+        각 상태의 전이 dict 에 실패 링크를 따라가서 갈 수 있는 전이까지 미리 채워 두어,
+        스캔 시 문자당 dict 조회 한 번으로 다음 상태가 정해집니다.
+        """
+        queue = deque()
+        for next_state in self._goto[0].values():
+            queue.append(next_state)
+        while queue:
+            state = queue.popleft()
+            fallback = self._fail[state]
+            self._output[state] = self._output[state] + self._output[fallback]
+            for ch, next_state in list(self._goto[state].items()):
+                queue.append(next_state)
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+            # 자기 전이가 없는 문자는 실패 상태의 (이미 완성된) 전이를 그대로 사용
+            for ch, target in self._goto[fallback].items():
+                self._goto[state].setdefault(ch, target)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str, str]]:
+        """(시작 위치, 패턴, 그룹) 을 텍스트 등장 순서(끝 위치 기준)로 반환"""
+        goto, output = self._goto, self._output
+        state = 0
+        for index, ch in enumerate(self._fold(text)):
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                for pattern, group in output[state]:
+                    yield index - len(pattern) + 1, pattern, group
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        """그룹별로 텍스트에 등장한 패턴 목록 (중복 제거, 등장 순서)"""
+        found: Dict[str, List[str]] = {group: [] for group in self.groups}
+        goto, output = self._goto, self._output
+        state = 0
+        # iter_matches 와 같은 스캔을 제너레이터 없이 수행 (요청 경로에서 호출되므로)
+        for ch in self._fold(text):
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                for pattern, group in output[state]:
+                    if pattern not in found[group]:
+                        found[group].append(pattern)
+        return found
@@ -0,0 +1,75 @@
+"""
+한국어/영어 혼합 텍스트 토크나이저
+
+형태소 분석기 없이 조사만 떼어내는 가벼운 규칙 기반 토크나이저입니다.
+BM25 색인, 청크 토큰 집합(document_chunks.tokens), 질문 키워드가 같은 규칙을 쓰도록 공유합니다.
+"""
+import re
+from typing import List, Set
+
+# 조사 제거: '의', '은', '는', '이', '가', '을', '를', '에', '에서' 등
+PARTICLES = ['의', '은', '는', '이', '가', '을', '를', '에', '에서', '로', '으로', '와', '과', '도', '만', '부터', '까지']
+# 긴 조사부터 확인 ('으로' 를 '로' 보다 먼저)
+_PARTICLES_BY_LENGTH = sorted(PARTICLES, key=len, reverse=True)
+
+_INDEX_TOKEN = re.compile(r'[가-힣]+|[a-zA-Z]+|\d+')
+
+
+def strip_particle(word: str) -> str:
+    """단어 끝의 조사 하나 제거"""
+    for particle in _PARTICLES_BY_LENGTH:
+        if word.endswith(particle):
+            return word[:-len(particle)]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    색인/검색용 토큰 목록 (중복 포함 - BM25 의 단어 빈도 계산용)
+
+    한글 단어는 원형과 조사를 뗀 형태를 모두 내보냅니다.
+    "호랑이" 처럼 조사로 끝나 보이는 명사도 "호랑이가" 와 매칭되도록 하기 위함입니다.
+    영어는 소문자 2글자 이상, 숫자는 그대로 사용합니다.
+    """
+    tokens = []
+    for token in _INDEX_TOKEN.findall(text):
+        if token[0].isdigit():
+            tokens.append(token)
+        elif token[0].isascii():
+            if len(token) >= 2:
+                tokens.append(token.lower())
+        elif len(token) >= 2:
+            tokens.append(token)
+            stem = strip_particle(token)
+            if stem != token and len(stem) >= 2:
+                tokens.append(stem)
+    return tokens
+
+
+def token_set(text: str) -> List[str]:
+    """청크 저장용 정규화 토큰 집합 (중복 제거, 정렬) - document_chunks.tokens 컬럼 값"""
+    return sorted(set(tokenize(text)))
+
+
+def query_terms(text: str) -> Set[str]:
+    """
+    질문 키워드를 청크 토큰과 같은 방식으로 정규화한 집합
+
+    한글은 tokenize 와 같이 원형과 조사를 뗀 형태(각각 2글자 이상)를 모두 넣습니다.
+    조사로 끝나 보이는 명사("호랑이")만 물어도 청크의 "호랑이는" → {"호랑이는", "호랑이"} 와 겹치도록 하기 위함입니다.
+    영어는 소문자 3글자 이상, 숫자는 그대로 사용합니다.
+    청크의 token_set 과 교집합을 구하면 "질문 키워드가 청크에 있는지" 를 알 수 있습니다.
+    """
+    terms = set()
+    for token in _INDEX_TOKEN.findall(text):
+        if token[0].isdigit():
+            terms.add(token)
+        elif token[0].isascii():
+            if len(token) >= 3:
+                terms.add(token.lower())
+        elif len(token) >= 2:
+            terms.add(token)
+            stem = strip_particle(token)
+            if len(stem) >= 2:
+                terms.add(stem)
+    return terms
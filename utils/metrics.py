@@ -0,0 +1,256 @@
+"""
+요청 단위 지연 계측 + Prometheus 메트릭
+
+- span(stage): 현재 요청 컨텍스트(contextvar)에 단계별 소요 시간을 기록
+  (executor 로 넘긴 작업도 utils/executors.py 가 컨텍스트를 복사하므로 같은 요청에 기록됨)
+- Server-Timing 응답 헤더: 응답 헤더를 보내는 시점까지 끝난 단계들
+  (스트리밍 응답은 헤더가 먼저 나가므로 검색 단계까지만 포함, LLM 은 /metrics 에만 반영)
+- /metrics: 단계별/요청 전체 지연 히스토그램 (language, character, cache 라벨) + 포화도 게이지
+
+prometheus_client 의존성 없이 텍스트 노출 형식(0.0.4)을 직접 출력합니다.
+"""
+import bisect
+import contextvars
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 단계별 지연 버킷 (초) - 키워드 검색(수 ms) 부터 LLM 호출(수 초) 까지
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+REQUEST_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUEST_LABELS = ("language", "character", "cache")
+UNLABELED = "none"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Histogram:
+    """라벨별 누적 히스토그램 (스레드 안전)"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = STAGE_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 값 튜플 -> [버킷별 개수..., +Inf 개수, 합계]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels.get(name, UNLABELED)) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        bucket_names = self.labelnames + ("le",)
+        for key, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), values[:-1]):
+                cumulative += count
+                labels = _format_labels(bucket_names, key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(values[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """스크레이프 시점에 read() 로 값을 읽는 게이지 (라벨이 있으면 {라벨 값 튜플: 값} 반환)"""
+
+    def __init__(self, name: str, documentation: str,
+                 read: Callable[[], Union[float, Dict[Tuple[str, ...], float]]],
+                 labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._read = read
+
+    def collect(self) -> List[str]:
+        value = self._read()
+        samples = value.items() if self.labelnames else [((), value)]
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        for key, sample in sorted(samples):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(sample)}")
+        return lines
+
+
+class MetricsRegistry:
+    """메트릭 모음 - render() 로 /metrics 본문 생성"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Union[Histogram, Gauge]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Union[Histogram, Gauge]) -> Union[Histogram, Gauge]:
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = STAGE_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name: str, documentation: str, read: Callable[[], Any],
+              labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, read, labelnames))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            try:
+                lines.extend(metric.collect())
+            except Exception:
+                # 게이지 원본(DB 풀 등)을 읽지 못해도 나머지 메트릭은 노출
+                continue
+        return "\n".join(lines) + "\n"
+
+
+# 프로세스 전역 레지스트리 (/metrics 에서 노출)
+metrics = MetricsRegistry()
+stage_duration = metrics.histogram(
+    "guidely_rag_stage_duration_seconds", "RAG 파이프라인 단계별 소요 시간",
+    ("stage",) + REQUEST_LABELS, STAGE_BUCKETS,
+)
+request_duration = metrics.histogram(
+    "guidely_rag_request_duration_seconds", "RAG 요청 전체 소요 시간 (스트리밍은 마지막 이벤트까지)",
+    REQUEST_LABELS, REQUEST_BUCKETS,
+)
+
+
+class RequestTiming:
+    """요청 하나의 단계별 소요 시간과 라벨"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float]] = []
+        self.labels: Dict[str, str] = {name: UNLABELED for name in REQUEST_LABELS}
+
+    def durations(self) -> Dict[str, float]:
+        """단계별 합계 (같은 단계가 여러 번이면 합산, 처음 등장 순서 유지)"""
+        totals: Dict[str, float] = {}
+        for stage, seconds in list(self.spans):
+            totals[stage] = totals.get(stage, 0.0) + seconds
+        return totals
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값 (ms, 지금까지 끝난 단계 + total)"""
+        entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in self.durations().items()]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(entries)
+
+    def record(self):
+        """히스토그램에 반영 (요청 종료 시 한 번)"""
+        for stage, seconds in self.durations().items():
+            stage_duration.observe(seconds, stage=stage, **self.labels)
+        request_duration.observe(time.perf_counter() - self.started, **self.labels)
+
+
+_current: contextvars.ContextVar[Optional[RequestTiming]] = contextvars.ContextVar("request_timing", default=None)
+_inflight = 0
+_inflight_lock = threading.Lock()
+
+metrics.gauge("guidely_inflight_requests", "처리 중인 RAG 요청 수", lambda: inflight_requests())
+
+
+def current_timing() -> Optional[RequestTiming]:
+    return _current.get()
+
+
+def inflight_requests() -> int:
+    """처리 중인 RAG 요청 수 (백그라운드 작업이 질문 트래픽에 양보할 때 사용)"""
+    return _inflight
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """현재 요청에 stage 소요 시간 기록 (요청 컨텍스트 밖이면 아무것도 하지 않음)"""
+    timing = _current.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timing is not None:
+            timing.spans.append((stage, time.perf_counter() - started))
+
+
+def label_request(**labels: str):
+    """현재 요청의 메트릭 라벨 지정 (language, character, cache)"""
+    timing = _current.get()
+    if timing is not None:
+        timing.labels.update({name: str(value) for name, value in labels.items() if name in timing.labels})
+
+
+@contextmanager
+def track_request() -> Iterator[RequestTiming]:
+    """요청 컨텍스트 시작 - 처리 중 요청 수를 세고, 끝나면 히스토그램에 기록"""
+    global _inflight
+    timing = RequestTiming()
+    token = _current.set(timing)
+    with _inflight_lock:
+        _inflight += 1
+    try:
+        yield timing
+    finally:
+        with _inflight_lock:
+            _inflight -= 1
+        _current.reset(token)
+        timing.record()
+
+
+class MetricsMiddleware:
+    """
+    RAG 요청 계측 ASGI 미들웨어
+
+    path_prefixes 로 시작하는 요청마다 track_request() 컨텍스트를 열고,
+    응답 헤더에 Server-Timing 을 추가합니다. 본문 전송(스트리밍 포함)이 끝난 뒤 기록합니다.
+    """
+
+    def __init__(self, app, path_prefixes: Sequence[str] = ("/rag",)):
+        self.app = app
+        self.path_prefixes = tuple(path_prefixes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        with track_request() as timing:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", timing.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
@@ -0,0 +1,146 @@
+"""
+PDF 텍스트 추출 엔진 (PyMuPDF)
+
+페이지 범위를 PDF_PAGES_PER_TASK 쪽씩 나눠 프로세스 풀에 분배하고, 결과를 페이지 순서대로
+스트림(iter_pdf_pages)으로 돌려줍니다. 소비자(청크 분할/임베딩)는 뒤쪽 페이지 추출이 끝나기 전에
+앞쪽 페이지부터 처리할 수 있습니다. MuPDF 의 텍스트 추출은 GIL 을 놓지 않으므로 스레드가 아닌 프로세스로 나눕니다.
+
+- 짧은 PDF(PDF_PARALLEL_MIN_PAGES 쪽 미만)는 프로세스 간 전달 비용이 더 크므로 현재 프로세스에서 추출
+- 작업 프로세스는 spawn 방식으로 첫 사용 시 생성 (모델/스레드를 가진 서버 프로세스를 fork 하지 않도록)
+- 바이트로 받은 PDF 는 임시 파일에 한 번 써 두고 작업 프로세스는 경로로 엽니다 (작업마다 PDF 전체를 피클링하지 않음)
+- 파일 경로로 열면 MuPDF 가 필요한 객체만 읽고, 페이지마다 MuPDF 캐시를 비워 큰 PDF(이미지 위주 수백 MB)도
+  메모리 사용량이 페이지 몇 개 분량으로 유지됩니다
+- 동시에 맡기는 범위는 작업자 수의 2배로 제한해, 소비가 느려도 추출 결과가 메모리에 쌓이지 않음
+"""
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Union
+
+import fitz  # PyMuPDF
+
+from config.app_config import PDF_EXTRACT_WORKERS, PDF_PAGES_PER_TASK, PDF_PARALLEL_MIN_PAGES
+from database.models import PdfPage
+
+logger = logging.getLogger(__name__)
+
+PdfSource = Union[str, bytes]
+
+# MuPDF 캐시를 비우는 페이지 간격 (이미지 위주 207MB PDF 기준 최대 메모리 약 40MB)
+STORE_FLUSH_PAGES = 8
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+class PdfExtractionError(ValueError):
+    """PDF 를 열거나 텍스트를 추출할 수 없음 (손상/암호화된 파일 등)"""
+
+
+def _open(source: PdfSource) -> "fitz.Document":
+    """PDF 열기 (파일 경로는 MuPDF 가 필요한 부분만 읽으므로 파일 전체를 메모리로 올리지 않음)"""
+    try:
+        if isinstance(source, (bytes, bytearray)):
+            return fitz.open(stream=bytes(source), filetype="pdf")
+        return fitz.open(source)
+    except Exception as e:
+        raise PdfExtractionError(f"PDF 파싱 실패: {e}") from e
+
+
+def _page_text(doc: "fitz.Document", number: int) -> str:
+    text = doc[number].get_text()
+    # MuPDF 는 읽은 객체(이미지 스트림 등)를 전역 캐시에 남기므로 몇 페이지마다 비워 메모리를 제한
+    # (매 페이지 비우면 공유 폰트까지 다시 읽어 텍스트 위주 PDF 가 2배 이상 느려짐)
+    if (number + 1) % STORE_FLUSH_PAGES == 0:
+        fitz.TOOLS.store_shrink(100)
+    return text
+
+
+def _extract_range(source: PdfSource, start: int, stop: int) -> List[str]:
+    """start ~ stop-1 페이지 텍스트 (작업 프로세스에서 실행되므로 모듈 최상위 함수)"""
+    with _open(source) as doc:
+        return [_page_text(doc, number) for number in range(start, stop)]
+
+
+def page_count(source: PdfSource) -> int:
+    with _open(source) as doc:
+        return doc.page_count
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_pdf_pool():
+    """애플리케이션 종료 시 추출 프로세스 정리"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def iter_pdf_pages(source: PdfSource, workers: int = PDF_EXTRACT_WORKERS,
+                   pages_per_task: int = PDF_PAGES_PER_TASK,
+                   parallel_min_pages: int = PDF_PARALLEL_MIN_PAGES) -> Iterator[PdfPage]:
+    """
+    PDF 페이지를 순서대로 추출하는 스트림 (파일 경로 또는 PDF 바이트)
+
+    텍스트가 없는 페이지도 빈 문자열로 돌려주므로 page.number 는 항상 연속입니다.
+    PDF 를 열 수 없거나 추출 중 실패하면 PdfExtractionError 를 냅니다.
+    """
+    total = page_count(source)
+    if workers <= 1 or total < max(parallel_min_pages, 2):
+        with _open(source) as doc:
+            for number in range(total):
+                yield PdfPage(number + 1, _page_text(doc, number))
+        return
+
+    temp_path = None
+    if isinstance(source, (bytes, bytearray)):
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
+            tmp_file.write(source)
+            temp_path = source = tmp_file.name
+
+    pool = _get_pool(workers)
+    ranges = deque((start, min(start + pages_per_task, total)) for start in range(0, total, pages_per_task))
+    pending = deque()
+    try:
+        while ranges or pending:
+            while ranges and len(pending) < workers * 2:
+                start, stop = ranges.popleft()
+                pending.append((start, pool.submit(_extract_range, source, start, stop)))
+            start, future = pending.popleft()
+            try:
+                texts = future.result()
+            except PdfExtractionError:
+                raise
+            except Exception as e:
+                raise PdfExtractionError(f"PDF 텍스트 추출 실패 ({start + 1}쪽~): {e}") from e
+            for offset, text in enumerate(texts):
+                yield PdfPage(start + offset + 1, text)
+    finally:
+        for _, future in pending:
+            future.cancel()
+        if temp_path is not None:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+
+def extract_pdf_text(source: PdfSource, **kwargs) -> str:
+    """PDF 전체 텍스트 (페이지마다 줄바꿈으로 구분)"""
+    return "".join(page.text + "\n" for page in iter_pdf_pages(source, **kwargs))
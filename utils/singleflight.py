@@ -0,0 +1,111 @@
+"""
+Single-flight 요청 병합
+
+같은 키의 작업이 이미 실행 중이면 새로 실행하지 않고 그 결과를 함께 기다립니다.
+단체 관람객이 여러 키오스크에서 같은 질문을 동시에 할 때 DB 와 LLM 호출을 한 번으로 줄입니다.
+"""
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional
+
+
+class _Broadcast:
+    """스트림 하나를 여러 구독자에게 나눠주는 버퍼 (늦게 합류한 구독자는 처음부터 재생)"""
+
+    def __init__(self):
+        self.events: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.changed = asyncio.Condition()
+        self.task: Optional[asyncio.Task] = None
+
+
+class SingleFlight:
+    """키별로 실행 중인 코루틴/스트림을 공유하는 요청 병합기 (이벤트 루프 스레드 전용)"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._streams: Dict[Hashable, _Broadcast] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        key 에 대해 func 를 한 번만 실행하고 모든 동시 호출자에게 같은 결과(또는 예외)를 반환
+
+        실행은 별도 Task 로 돌리고 shield 로 기다리므로, 한 호출자가 취소(클라이언트 연결 종료)되어도
+        나머지 호출자의 실행은 계속됩니다.
+        """
+        task = self._calls.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.executions += 1
+        task = asyncio.ensure_future(func(*args, **kwargs))
+        self._calls[key] = task
+        task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def running(self, key: Hashable) -> bool:
+        """key 의 작업/스트림이 실행 중이면 True (지금 호출하면 병합됨)"""
+        return key in self._calls or key in self._streams
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # 모든 호출자가 취소된 경우에도 "exception was never retrieved" 경고가 나지 않도록 소비
+        if not task.cancelled():
+            task.exception()
+
+    async def stream(self, key: Hashable, factory: Callable[..., AsyncIterator[Any]],
+                     *args, **kwargs) -> AsyncIterator[Any]:
+        """
+        key 에 대해 factory(*args) 스트림을 한 번만 실행하고 모든 동시 구독자에게 같은 이벤트를 전달
+
+        스트림은 별도 Task 가 끝까지 소비하므로 구독자 일부가 끊겨도 나머지는 계속 받습니다.
+        """
+        broadcast = self._streams.get(key)
+        if broadcast is not None and broadcast.task.get_loop() is asyncio.get_running_loop():
+            self.coalesced += 1
+        else:
+            self.executions += 1
+            broadcast = _Broadcast()
+            self._streams[key] = broadcast
+            broadcast.task = asyncio.ensure_future(self._pump(key, broadcast, factory(*args, **kwargs)))
+
+        index = 0
+        while True:
+            async with broadcast.changed:
+                await broadcast.changed.wait_for(lambda: index < len(broadcast.events) or broadcast.done)
+            while index < len(broadcast.events):
+                yield broadcast.events[index]
+                index += 1
+            if broadcast.done and index >= len(broadcast.events):
+                if broadcast.error is not None:
+                    raise broadcast.error
+                return
+
+    async def _pump(self, key: Hashable, broadcast: _Broadcast, source: AsyncIterator[Any]):
+        try:
+            async for event in source:
+                async with broadcast.changed:
+                    broadcast.events.append(event)
+                    broadcast.changed.notify_all()
+        except Exception as e:
+            broadcast.error = e
+        finally:
+            if self._streams.get(key) is broadcast:
+                del self._streams[key]
+            async with broadcast.changed:
+                broadcast.done = True
+                broadcast.changed.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """병합 메트릭"""
+        requests = self.executions + self.coalesced
+        return {
+            "in_flight": len(self._calls) + len(self._streams),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / requests, 4) if requests else 0.0,
+        }
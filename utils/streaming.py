@@ -0,0 +1,115 @@
+"""
+스트리밍 응답 유틸리티
+
+LLM 토큰 스트림을 문장 단위로 잘라 SSE(Server-Sent Events)로 내보냅니다.
+키오스크 TTS 가 첫 문장이 완성되는 즉시 재생을 시작할 수 있도록 합니다.
+"""
+import json
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+# 한국어 종결 어미 + 문장부호 (예: "~입니다.", "~해요!", "~죠?") - 뒤 공백을 기다리지 않고 즉시 분리
+KOREAN_SENTENCE_END = re.compile(r'[다요죠까네][.!?…]+["\'”’)\]]*')
+# 일반 문장부호 - "3.5" 같은 소수점과 구분하기 위해 뒤에 공백/줄바꿈이 올 때만 분리
+GENERIC_SENTENCE_END = re.compile(r'[.!?…。]+["\'”’)\]]*(?=\s)|\n+')
+
+
+class SentenceSegmenter:
+    """토큰 조각을 받아 완성된 문장 단위로 돌려주는 분리기"""
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, delta: str) -> List[str]:
+        """새 토큰 조각을 추가하고 완성된 문장들을 반환"""
+        if not delta:
+            return []
+        self._buffer += delta
+        sentences = []
+        while True:
+            end = self._find_boundary(self._buffer)
+            if end is None:
+                break
+            sentence = self._buffer[:end].strip()
+            self._buffer = self._buffer[end:]
+            if sentence:
+                sentences.append(sentence)
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """스트림 종료 시 남은 텍스트 반환"""
+        rest = self._buffer.strip()
+        self._buffer = ""
+        return rest or None
+
+    @staticmethod
+    def _find_boundary(text: str) -> Optional[int]:
+        ends = []
+        korean = KOREAN_SENTENCE_END.search(text)
+        if korean:
+            ends.append(korean.end())
+        generic = GENERIC_SENTENCE_END.search(text)
+        if generic:
+            ends.append(generic.end())
+        return min(ends) if ends else None
+
+
+async def segment_stream(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """비동기 텍스트 조각 스트림을 문장 스트림으로 변환"""
+    segmenter = SentenceSegmenter()
+    async for chunk in chunks:
+        for sentence in segmenter.feed(chunk):
+            yield sentence
+    rest = segmenter.flush()
+    if rest:
+        yield rest
+
+
+async def answer_events(sources: List[dict], chunks: AsyncIterator[str]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    출처 → 문장들 → 완료 순서의 스트리밍 이벤트 생성
+
+    문장 분리는 sentence 이벤트에만 쓰고, done 의 response 는 LLM 출력 원문을 이어 붙인 것입니다
+    (줄바꿈 등 원래 공백 유지 - 비스트리밍 응답과 같은 값이 응답 캐시에 저장됨).
+    """
+    yield {"event": "sources", "data": {"sources": sources}}
+    segmenter = SentenceSegmenter()
+    raw: List[str] = []
+    index = 0
+    async for chunk in chunks:
+        raw.append(chunk)
+        for sentence in segmenter.feed(chunk):
+            yield {"event": "sentence", "data": {"index": index, "text": sentence}}
+            index += 1
+    rest = segmenter.flush()
+    if rest:
+        yield {"event": "sentence", "data": {"index": index, "text": rest}}
+    yield {"event": "done", "data": {"response": "".join(raw).strip(), "sources": sources}}
+
+
+async def _single_chunk(text: str) -> AsyncIterator[str]:
+    yield text
+
+
+def static_answer_events(sources: List[dict], text: str) -> AsyncIterator[Dict[str, Any]]:
+    """이미 완성된 답변(모르겠다 응답 등)을 같은 이벤트 형식으로 변환"""
+    return answer_events(sources, _single_chunk(text))
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """SSE 이벤트 한 건을 wire 포맷으로 직렬화"""
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+async def sse_stream(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """이벤트 dict 스트림을 SSE 텍스트 스트림으로 변환 (StreamingResponse 용)"""
+    async for event in events:
+        yield format_sse(event["event"], event["data"])
+
+
+# SSE 응답 헤더 - 프록시 버퍼링 방지
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
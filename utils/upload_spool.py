@@ -0,0 +1,138 @@
+"""
+업로드 스풀 (크기 제한 + 큰 파일은 임시 파일로)
+
+업로드 본문을 UPLOAD_CHUNK_BYTES 씩 받아 UPLOAD_SPOOL_MAX_MEMORY 까지는 메모리에 두고,
+넘으면 임시 파일로 옮겨 이어 씁니다. UPLOAD_MAX_BYTES 를 넘는 순간 UploadTooLargeError 로 중단하므로
+전체를 다 받은 뒤에야 거절하지 않습니다.
+
+적재 작업에는 source() (작은 파일은 bytes, 큰 파일은 경로 - utils/pdf_extractor 가 필요한 부분만 읽음) 를 넘기고,
+작업이 끝나면 close() 로 임시 파일을 지웁니다. 받는 동안 SHA-256 을 함께 계산해 두므로(content_hash)
+같은 파일 재업로드를 감지하려고 다시 읽을 필요가 없습니다.
+"""
+import base64
+import hashlib
+import io
+import os
+import re
+import tempfile
+from typing import AsyncIterable, Optional, Union
+
+from starlette.concurrency import run_in_threadpool
+
+from config.app_config import UPLOAD_CHUNK_BYTES, UPLOAD_MAX_BYTES, UPLOAD_SPOOL_DIR, UPLOAD_SPOOL_MAX_MEMORY
+
+_WHITESPACE = re.compile(r"\s")
+
+
+class UploadTooLargeError(ValueError):
+    """업로드가 UPLOAD_MAX_BYTES 를 넘음"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"업로드 파일이 너무 큽니다 (최대 {max_bytes // (1024 * 1024)}MB)")
+        self.max_bytes = max_bytes
+
+
+class SpooledUpload:
+    """크기 제한이 있는 업로드 버퍼 (max_memory 를 넘으면 이름 있는 임시 파일로 전환)"""
+
+    def __init__(self, max_bytes: int = UPLOAD_MAX_BYTES, max_memory: int = UPLOAD_SPOOL_MAX_MEMORY,
+                 suffix: str = ".pdf", directory: Optional[str] = UPLOAD_SPOOL_DIR):
+        self.max_bytes = max_bytes
+        self.max_memory = max_memory
+        self.suffix = suffix
+        self.directory = directory
+        self.size = 0
+        self.path: Optional[str] = None
+        self._buffer: Optional[io.BytesIO] = io.BytesIO()
+        self._file = None
+        self._digest = hashlib.sha256()
+
+    @property
+    def content_hash(self) -> str:
+        """지금까지 받은 내용의 SHA-256"""
+        return self._digest.hexdigest()
+
+    @property
+    def on_disk(self) -> bool:
+        return self.path is not None
+
+    def write(self, data: bytes):
+        if self.size + len(data) > self.max_bytes:
+            self.close()
+            raise UploadTooLargeError(self.max_bytes)
+        self.size += len(data)
+        self._digest.update(data)
+        if self._file is None and self.size > self.max_memory:
+            self._rollover()
+        target = self._file if self._file is not None else self._buffer
+        target.write(data)
+
+    def _rollover(self):
+        self._file = tempfile.NamedTemporaryFile(delete=False, suffix=self.suffix, dir=self.directory)
+        self.path = self._file.name
+        self._file.write(self._buffer.getbuffer())
+        self._buffer = None
+
+    def source(self) -> Union[bytes, str]:
+        """추출기에 넘길 입력 (메모리면 bytes, 디스크면 파일 경로)"""
+        if self._file is not None:
+            self._file.flush()
+            return self.path
+        return self._buffer.getvalue()
+
+    def close(self):
+        """버퍼 해제 + 임시 파일 삭제 (여러 번 호출해도 안전)"""
+        self._buffer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+async def spool_stream(chunks: AsyncIterable[bytes], **kwargs) -> SpooledUpload:
+    """비동기 바이트 스트림(요청 본문, UploadFile) 을 스풀에 기록 (디스크 쓰기는 스레드풀에서)"""
+    spool = SpooledUpload(**kwargs)
+    try:
+        async for chunk in chunks:
+            if spool.on_disk:
+                await run_in_threadpool(spool.write, chunk)
+            else:
+                spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+async def iter_upload_file(file, chunk_bytes: int = UPLOAD_CHUNK_BYTES):
+    """UploadFile 을 chunk_bytes 씩 읽는 비동기 스트림 (file.read() 로 전체를 읽지 않음)"""
+    while True:
+        chunk = await file.read(chunk_bytes)
+        if not chunk:
+            break
+        yield chunk
+
+
+def spool_base64(encoded: str, chunk_bytes: int = UPLOAD_CHUNK_BYTES, **kwargs) -> SpooledUpload:
+    """
+    Base64 문자열을 조각별로 디코딩해 스풀에 기록 (디코딩된 전체 바이트를 한 번에 만들지 않음)
+
+    잘못된 Base64 면 binascii.Error, 디코딩 크기가 제한을 넘으면 UploadTooLargeError 를 냅니다.
+    """
+    spool = SpooledUpload(**kwargs)
+    if len(encoded) // 4 * 3 > spool.max_bytes:
+        raise UploadTooLargeError(spool.max_bytes)
+    if _WHITESPACE.search(encoded):
+        encoded = "".join(encoded.split())  # 줄바꿈이 들어간 Base64 (MIME 형식)
+    step = max(4, chunk_bytes // 3 * 4)  # 4글자 단위로 잘라야 조각별 디코딩 결과가 이어짐
+    try:
+        for start in range(0, len(encoded), step):
+            spool.write(base64.b64decode(encoded[start:start + step], validate=True))
+    except ValueError:  # binascii.Error, UploadTooLargeError
+        spool.close()
+        raise
+    return spool